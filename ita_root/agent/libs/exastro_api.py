@@ -12,6 +12,8 @@
 # limitations under the License.
 #
 
+import gzip
+import json
 import requests
 from requests_toolbelt.multipart.encoder import MultipartEncoder
 from requests_toolbelt.streaming_iterator import StreamingIterator
@@ -52,10 +54,11 @@ class Exastro_API:
             self.userid = userid
             self.headers["User-Id"] = self.userid
 
-    def api_request(self, method, endpoint, body=None, query=None):
+    def api_request(self, method, endpoint, body=None, query=None, compress=False):
         """
             method: "GET" or "POST"
             Content-Type: "application/json"(json引数に辞書を挿入するとデフォルトでContent-Typeがapplication/jsonになる)
+            compress: True の場合、リクエストボディをgzip圧縮して送信する(Content-Encoding: gzip)
         """
         response = None
         status_code = None
@@ -69,13 +72,22 @@ class Exastro_API:
         # ID/PASS認証（BAISC）
             auth = (self.username, self.password)
 
+        json_body = body
+        data = None
+        if compress is True and body is not None:
+            headers["Content-Type"] = "application/json"
+            headers["Content-Encoding"] = "gzip"
+            json_body = None
+            data = gzip.compress(json.dumps(body).encode("utf-8"))
+
         try:
             response = requests.request(
                 method=method,
                 url=f"{self.base_url}{endpoint}",
                 headers=headers,
                 auth=auth,
-                json=body,
+                json=json_body,
+                data=data,
                 params=query,
                 verify=False,
                 timeout=(12, 600)
@@ -1,8 +1,13 @@
 import base64
+import binascii
 import codecs
+import hashlib
+import hmac
 import os
 import subprocess
 import sys
+import Crypto.Cipher.AES as AES
+import Crypto.Util.Padding as Padding
 from common_libs.ansible_driver.functions.util import *
 from common_libs.common import *
 
@@ -10,6 +15,14 @@ from common_libs.common import *
   ansible vault関連モジュール
 """
 
+# $ANSIBLE_VAULT;1.1;AES256 形式(ansible-vault encryptと同じ形式)
+VAULT_HEADER = "$ANSIBLE_VAULT;1.1;AES256"
+VAULT_SALT_LENGTH = 32
+VAULT_KEY_LENGTH = 32
+VAULT_IV_LENGTH = 16
+VAULT_PBKDF2_ITERATIONS = 10000
+VAULT_LINE_LENGTH = 80
+
 
 class AnsibleVault:
     """
@@ -163,6 +176,82 @@ class AnsibleVault:
             result = False
         return result, mt_encode_value
 
+    def VaultEncrypt(self, vaultPassword, value, salt=None):
+        """
+          ansible-vaultを使用せずに指定文字列を暗号化($ANSIBLE_VAULT;1.1;AES256)
+          Arguments:
+            vaultPassword: ansible-vaultパスワード(平文)
+            value:         暗号化したい文字列
+            salt:          salt(テスト用 未指定の場合はランダム)
+          Returns:
+            暗号化された文字列(ansible-vault encryptの出力と同じ形式)
+        """
+        # ansible-vaultはパスワードファイルの前後の空白(改行・スペース・タブ)を除去する
+        b_password = vaultPassword.encode().strip()
+        # CR+LFをLFに置換
+        b_value = value.replace("\r\n", "\n").encode()
+        b_salt = salt if salt is not None else os.urandom(VAULT_SALT_LENGTH)
+
+        b_key1, b_key2, b_iv = self._VaultDeriveKey(b_password, b_salt)
+        aes = AES.new(b_key1, AES.MODE_CTR, nonce=b"", initial_value=b_iv)
+        b_ciphertext = aes.encrypt(Padding.pad(b_value, AES.block_size, "pkcs7"))
+        b_hmac = hmac.new(b_key2, b_ciphertext, hashlib.sha256).digest()
+
+        b_vaulttext = b"\n".join([binascii.hexlify(b_salt), binascii.hexlify(b_hmac), binascii.hexlify(b_ciphertext)])
+        vaulttext = binascii.hexlify(b_vaulttext).decode()
+
+        lines = [VAULT_HEADER]
+        lines += [vaulttext[i:i + VAULT_LINE_LENGTH] for i in range(0, len(vaulttext), VAULT_LINE_LENGTH)]
+        lines += [""]
+        return "\n".join(lines)
+
+    def VaultEncryptList(self, vaultPassword, value_list):
+        """
+          ansible-vaultを使用せずに複数の文字列を一括で暗号化
+          Arguments:
+            vaultPassword: ansible-vaultパスワード(平文)
+            value_list:    暗号化したい文字列のリスト
+          Returns:
+            {暗号化したい文字列: 暗号化された文字列(Vault()の戻り値と同じ形式)}
+        """
+        result = {}
+        for value in value_list:
+            if value in result:
+                continue
+            # Vault()と同様に先頭に改行を付加する
+            result[value] = "\n" + self.VaultEncrypt(vaultPassword, value)
+        return result
+
+    def VaultDecrypt(self, vaultPassword, vaulttext):
+        """
+          ansible-vaultを使用せずに$ANSIBLE_VAULT;1.1;AES256形式の文字列を復号
+          Arguments:
+            vaultPassword: ansible-vaultパスワード(平文)
+            vaulttext:     暗号化された文字列(インデント・前後の改行を含んでもよい)
+          Returns:
+            復号した文字列
+        """
+        lines = [line.strip() for line in vaulttext.strip().split("\n")]
+        if lines[0] != VAULT_HEADER:
+            raise ValueError("unsupported vault format: {}".format(lines[0]))
+        b_vaulttext = binascii.unhexlify("".join(lines[1:]))
+        b_salt, b_hmac, b_ciphertext = [binascii.unhexlify(b_data) for b_data in b_vaulttext.split(b"\n", 2)]
+
+        b_password = vaultPassword.encode().strip()
+        b_key1, b_key2, b_iv = self._VaultDeriveKey(b_password, b_salt)
+        if not hmac.compare_digest(hmac.new(b_key2, b_ciphertext, hashlib.sha256).digest(), b_hmac):
+            raise ValueError("HMAC verification failed")
+        aes = AES.new(b_key1, AES.MODE_CTR, nonce=b"", initial_value=b_iv)
+        return Padding.unpad(aes.decrypt(b_ciphertext), AES.block_size, "pkcs7").decode()
+
+    def _VaultDeriveKey(self, b_password, b_salt):
+        b_derivedkey = hashlib.pbkdf2_hmac("sha256", b_password, b_salt, VAULT_PBKDF2_ITERATIONS,
+                                           VAULT_KEY_LENGTH * 2 + VAULT_IV_LENGTH)
+        b_key1 = b_derivedkey[:VAULT_KEY_LENGTH]
+        b_key2 = b_derivedkey[VAULT_KEY_LENGTH:VAULT_KEY_LENGTH * 2]
+        b_iv = b_derivedkey[VAULT_KEY_LENGTH * 2:]
+        return b_key1, b_key2, b_iv
+
     def setValutPasswdIndento(self, val, indento):
         """
           ansible-vaulで暗号化された文字列に所定のインデントを付加
@@ -1447,6 +1447,19 @@ class CreateAnsibleExecFiles():
         indento_sp_host = spaceStr.ljust(8)
         indento_sp_param = spaceStr.ljust(10)
         indento_sp12 = spaceStr.ljust(24)
+
+        # ログインパスワード・パスフレーズを一括で暗号化
+        vault_pass_list = []
+        for host_id, host_name in ina_hosts.items():
+            if self.getAnsibleDriverID() == self.AnscObj.DF_LEGACY_DRIVER_ID or self.getAnsibleDriverID() == self.AnscObj.DF_LEGACY_ROLE_DRIVER_ID:
+                if ina_hostinfolist[host_name]['LOGIN_AUTH_TYPE'] == self.AnscObj.DF_LOGIN_AUTH_TYPE_PW or\
+                   ina_hostinfolist[host_name]['LOGIN_AUTH_TYPE'] == self.AnscObj.DF_LOGIN_AUTH_TYPE_PW_WINRM:
+                    vault_pass_list.append(ina_hostinfolist[host_name]['LOGIN_PW'])
+            if self.lv_exec_mode == self.AnscObj.DF_EXEC_MODE_AG and\
+               ina_hostinfolist[host_name]['LOGIN_AUTH_TYPE'] == self.AnscObj.DF_LOGIN_AUTH_TYPE_KEY_PP_USE:
+                vault_pass_list.append(ina_hostinfolist[host_name]['SSH_KEY_FILE_PASSPHRASE'])
+        self.preloadAnsibleVaultPassword(vault_pass_list)
+
         for host_id, host_name in ina_hosts.items():
             ssh_extra_args = ""
             # ssh_extra_argsの設定の有無を判定しssh_extra_argsの内容を退避
@@ -4882,6 +4895,51 @@ class CreateAnsibleExecFiles():
 
         return True
 
+    def getAnsibleVaultPassword(self):
+        """
+        ansible-vaultパスワード(平文)を取得
+        Arguments:
+            なし
+        Returns:
+            ansible-vaultパスワード(平文)
+        """
+        # ANSIBLE_VAULT_PASSWORDはrot13+base64で暗号化されている
+        if not self.lv_ans_if_info['ANSIBLE_VAULT_PASSWORD']:
+            self.lv_ans_if_info['ANSIBLE_VAULT_PASSWORD'] = ky_encrypt(AnscConst.DF_ANSIBLE_VAULT_PASSWORD)
+        return ky_decrypt(self.lv_ans_if_info['ANSIBLE_VAULT_PASSWORD'])
+
+    def AnsibleVaultEncrypt(self, obj, in_pass):
+        """
+        ansible-vaultコマンドを使用せずに指定文字列を暗号化
+        Arguments:
+            obj: AnsibleVaultクラス
+            in_pass: 暗号化する文字列
+        Returns:
+            True/False, 暗号化された文字列(Vault()の戻り値と同じ形式)/エラー内容
+        """
+        try:
+            return True, obj.VaultEncryptList(self.getAnsibleVaultPassword(), [in_pass])[in_pass]
+        except Exception as e:
+            return False, str(e)
+
+    def preloadAnsibleVaultPassword(self, in_pass_list):
+        """
+        複数の文字列を一括で暗号化しlv_vault_pass_listに退避
+        Arguments:
+            in_pass_list: 暗号化する文字列のリスト
+        Returns:
+            なし
+        """
+        in_pass_list = [in_pass for in_pass in in_pass_list if in_pass and in_pass not in self.lv_vault_pass_list]
+        if len(in_pass_list) == 0:
+            return
+        try:
+            vault_list = AnsibleVault().VaultEncryptList(self.getAnsibleVaultPassword(), in_pass_list)
+        except Exception:
+            # 一括暗号化に失敗した場合はmakeAnsibleVaultPasswordで個別に暗号化しエラーを出力する
+            return
+        self.lv_vault_pass_list.update(vault_list)
+
     def makeAnsibleVaultPassword(self, in_pass, in_vaultpass, in_indento, in_system_id):
         """
         指定文字列の暗号化及びインデント付加
@@ -4905,21 +4963,8 @@ class CreateAnsibleExecFiles():
             if in_pass in self.lv_vault_pass_list:
                 out_vaultpass = self.lv_vault_pass_list[in_pass]
             else:
-                VaultPasswordFilePath = obj.CreateVaultPasswordFilePath()
-                # in_passはrot13+base64で複合化されている
-                if not self.lv_ans_if_info['ANSIBLE_VAULT_PASSWORD']:
-                    self.lv_ans_if_info['ANSIBLE_VAULT_PASSWORD'] = ky_encrypt(AnscConst.DF_ANSIBLE_VAULT_PASSWORD)
-                obj.CreateVaultPasswordFile(VaultPasswordFilePath, self.lv_ans_if_info['ANSIBLE_VAULT_PASSWORD'])
-                # AnsibleのPATHは指定無し
-                retAry = obj.Vault("",
-                                   self.getAnsibleExecuteUser(),
-                                   VaultPasswordFilePath,
-                                   in_pass,
-                                   "",
-                                   self.lv_engine_virtualenv_name,
-                                   True)
-                ret = retAry[0]
-                out_vaultpass = retAry[1]
+                # ansible-vaultコマンドを使用せずに暗号化
+                ret, out_vaultpass = self.AnsibleVaultEncrypt(obj, in_pass)
                 if ret is False:
                     # ansible-vault失敗
                     msgstr = g.appmsg.get_api_message("MSG-10646", [in_system_id])
@@ -4965,20 +5010,8 @@ class CreateAnsibleExecFiles():
             else:
                 # in_passはrot13+base64で暗号化されている
                 # unuse enc_in_pass = in_pass
-                VaultPasswordFilePath = obj.CreateVaultPasswordFilePath()
-                # in_passはrot13+base64で暗号化されている
-                if not self.lv_ans_if_info['ANSIBLE_VAULT_PASSWORD']:
-                    self.lv_ans_if_info['ANSIBLE_VAULT_PASSWORD'] = ky_encrypt(AnscConst.DF_ANSIBLE_VAULT_PASSWORD)
-                obj.CreateVaultPasswordFile(VaultPasswordFilePath, self.lv_ans_if_info['ANSIBLE_VAULT_PASSWORD'])
-                # AnsibleのPATHは指定無し
-                retAry = obj.Vault("",
-                                   self.getAnsibleExecuteUser(),
-                                   VaultPasswordFilePath,
-                                   in_pass,
-                                   "",
-                                   self.lv_engine_virtualenv_name, True)
-                ret = retAry[0]
-                out_vaultpass = retAry[1]
+                # ansible-vaultコマンドを使用せずに暗号化
+                ret, out_vaultpass = self.AnsibleVaultEncrypt(obj, in_pass)
                 if ret is False:
                     # ansible-vault失敗
                     msgstr = g.appmsg.get_api_message("MSG-10626", [in_assign_id])
@@ -10446,21 +10479,8 @@ class CreateAnsibleExecFiles():
             if in_pass in self.lv_vault_pass_list:
                 out_vaultpass = self.lv_vault_pass_list[in_pass]
             else:
-                VaultPasswordFilePath = obj.CreateVaultPasswordFilePath()
-                # in_passはrot13+base64で複合化されている
-                if not self.lv_ans_if_info['ANSIBLE_VAULT_PASSWORD']:
-                    self.lv_ans_if_info['ANSIBLE_VAULT_PASSWORD'] = ky_encrypt(AnscConst.DF_ANSIBLE_VAULT_PASSWORD)
-                obj.CreateVaultPasswordFile(VaultPasswordFilePath, self.lv_ans_if_info['ANSIBLE_VAULT_PASSWORD'])
-                # AnsibleのPATHは指定無し
-                retAry = obj.Vault("",
-                                    self.getAnsibleExecuteUser(),
-                                    VaultPasswordFilePath,
-                                    in_pass,
-                                    "",
-                                    self.lv_engine_virtualenv_name,
-                                    True)
-                ret = retAry[0]
-                out_vaultpass = retAry[1]
+                # ansible-vaultコマンドを使用せずに暗号化
+                ret, out_vaultpass = self.AnsibleVaultEncrypt(obj, in_pass)
                 if ret is False:
                     # ansible-vault失敗
                     msgstr = g.appmsg.get_api_message("MSG-10646", [in_gbl_key])
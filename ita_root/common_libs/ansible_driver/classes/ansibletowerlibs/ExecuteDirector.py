@@ -1989,7 +1989,7 @@ class ExecuteDirector():
                     if len(JobDetail) <= 0:
                         JobDetail = {}
 
-                response_array = AnsibleTowerRestApiJobs.getStdOut(self.restApiCaller, JobId)
+                response_array = self.getJobStdOut(execution_no, JobId, JobDetail)
                 if not response_array['success']:
                     errorMessage = "Status not success.. (job id:%s)" % (JobId)
                     self.errorLogOut(errorMessage)
@@ -2008,6 +2008,84 @@ class ExecuteDirector():
 
         return True
 
+    def getJobStdOut(self, execution_no, JobId, JobData):
+        """
+        jobのstdoutを取得する
+            取得済みのstdoutは作業実行ディレクトリのtmp配下に保存し、
+            job_eventsから前回以降に追加された分だけを取得して追記する
+            取得済みのcounterと追記前のstdoutのサイズはjsonに保存し、
+            追記前にstdoutをそのサイズに切り詰めることで、同じイベントを重複して追記しない
+        Arguments:
+            execution_no: 作業番号
+            JobId: job id
+            JobData: jobの情報
+        Returns:
+            response_array
+                responseContents: jobのstdout
+        """
+        tmpDirectoryPath = '%s/tmp' % getAnsibleExecutDirPath(self.AnsConstObj, execution_no)
+        stdoutFullPath = '%s/job_stdout_%s.log' % (tmpDirectoryPath, JobId)
+        counterFullPath = '%s/job_stdout_%s.json' % (tmpDirectoryPath, JobId)
+
+        last_counter = 0
+        last_size = 0
+        if os.path.isfile(stdoutFullPath) and os.path.isfile(counterFullPath):
+            try:
+                # #2079 /storage配下のアクセスは/tmp経由にする。
+                obj = storage_read_text()
+                counter_data = json.loads(obj.read_text(counterFullPath))
+                # 保存したサイズよりstdoutが短い場合は不整合のため最初から取得し直す
+                if int(counter_data['size']) <= os.path.getsize(stdoutFullPath):
+                    last_counter = int(counter_data['counter'])
+                    last_size = int(counter_data['size'])
+            except Exception:
+                last_counter = 0
+                last_size = 0
+
+        # ジョブ終了後、イベントの登録が完了していれば未登録のイベントを待たない
+        allow_gap = JobData.get('status') not in ["new", "pending", "waiting", "running"] and JobData.get('event_processing_finished') is True
+        response_array = AnsibleTowerRestApiJobs.getStdOutEvents(self.restApiCaller, JobId, last_counter, allow_gap)
+        if not response_array['success']:
+            # job_eventsが取得出来ない場合はstdout全体を取得する
+            g.applogger.info("Faild to get job events. get stdout. (job id:%s)" % (JobId))
+            return AnsibleTowerRestApiJobs.getStdOut(self.restApiCaller, JobId)
+
+        try:
+            os.makedirs(tmpDirectoryPath, exist_ok=True)
+            # 追加されたstdoutを追記
+            # 前回の追記後にcounterを保存できなかった場合に備えて、保存したサイズに切り詰めてから追記する
+            # counterが無い場合は最初から取得しているので書き直す
+            # #2079 /storage配下のアクセスは/tmp経由にする。
+            b_stdout = response_array['responseContents']['stdout'].encode('utf-8')
+            obj = storage_write()
+            if last_counter == 0:
+                obj.open(stdoutFullPath, 'wb')
+            else:
+                fd = obj.open(stdoutFullPath, 'ab')
+                fd.truncate(last_size)
+            obj.write(b_stdout)
+            obj.close()
+
+            # counterとサイズは一時ファイルに書いてから置き換える
+            counter_data = {'counter': response_array['responseContents']['counter'], 'size': last_size + len(b_stdout)}
+            counterTmpPath = '%s.tmp' % (counterFullPath)
+            obj = storage_write_text()
+            obj.write_text(counterTmpPath, json.dumps(counter_data))
+            os.replace(counterTmpPath, counterFullPath)
+
+            obj = storage_read()
+            obj.open(stdoutFullPath, 'rb')
+            stdout = obj.read().decode('utf-8')
+            obj.close()
+
+        except Exception as e:
+            errorMessage = "getJobStdOut Faild to write file. %s" % (stdoutFullPath)
+            self.ExceptionErrorLog(e, errorMessage, "", "")
+            return AnsibleTowerRestApiJobs.getStdOut(self.restApiCaller, JobId)
+
+        response_array['responseContents'] = stdout
+        return response_array
+
     def getworkflowJobs(self, execution_no, error_log_need):
 
         self.workflowJobAry = {}
@@ -14,19 +14,23 @@
 
 
 import json
-import urllib
-import ssl
+import os
 import re
 import inspect
 import time
+import threading
 from flask import g
 import traceback
-from socket import timeout
+import requests
+import urllib3
+from urllib3.exceptions import InsecureRequestWarning
 
 from common_libs.common.util import ky_decrypt
 from common_libs.ansible_driver.functions.util import getAnsibleConst
 from common_libs.common.util import arrange_stacktrace_format
-from socket import timeout
+
+# 暫定対応 SSL認証エラー無視
+urllib3.disable_warnings(InsecureRequestWarning)
 
 def setAACRestAPITimoutVaule(objdbca):
     g.AACRestAPITimout = None
@@ -56,6 +60,9 @@ class RestApiCaller():
     API_BASE_PATH_GWC = "/api/controller/v2/"
     API_TOKEN_PATH = "authtoken/"
 
+    # スレッド毎のrequests.Session(keep-alive) key: 接続先URI+Proxy
+    _local = threading.local()
+
     def __init__(self, protocol, hostName, portNo, encryptedAuthToken, proxySetting, driver_id=None):
 
         self.baseURI = '%s://%s:%s%s' % (protocol, hostName, portNo, self.API_BASE_PATH)
@@ -83,11 +90,34 @@ class RestApiCaller():
 
         return response_array
 
+    def getSession(self, proxies):
+        """
+        接続先毎のrequests.Sessionを取得する
+            同じプロセス・スレッドのRestApiCallerで共有し、接続(TLSセッション)を再利用する
+            fork後は親プロセスと接続を共有しないように作り直す
+        Arguments:
+            proxies: requestsのproxies
+        Returns:
+            requests.Session
+        """
+        if getattr(self._local, 'pid', None) != os.getpid():
+            self._local.sessions = {}
+            self._local.pid = os.getpid()
+
+        key = (self.directURI, json.dumps(proxies, sort_keys=True))
+        session = self._local.sessions.get(key)
+        if session is None:
+            session = requests.Session()
+            session.verify = False
+            session.proxies.update(proxies)
+            self._local.sessions[key] = session
+        return session
+
     def restCall(self, method, apiUri, content=None, header=None, Rest_stdout_flg=False, DirectUrl=False):
 
         httpContext = {}
         headers = {}
-        ssl_context = None
+        proxies = {}
 
         response_array = {}
 
@@ -129,9 +159,10 @@ class RestApiCaller():
 
             httpContext['http']['proxy'] = address
             httpContext['http']['request_fulluri'] = True
+            proxies['http'] = 'http://%s' % (address)
+            proxies['https'] = 'http://%s' % (address)
 
         # 暫定対応 SSL認証エラー無視
-        ssl_context = ssl._create_unverified_context()
         httpContext['ssl'] = {}
         httpContext['ssl']['verify_peer'] = False
         httpContext['ssl']['verify_peer_name'] = False
@@ -156,26 +187,25 @@ class RestApiCaller():
             if 'content' in httpContext['http']:
                 data = httpContext['http']['content']
 
-            req = urllib.request.Request(url, data=data, headers=headers, method=method)
-            if 'address' in self.proxySetting and self.proxySetting['address']:
-                req.set_proxy(address, 'https')
-                req.set_proxy(address, 'https')
-
             try:
                 RestTimeout = getAACRestAPITimoutVaule()
                 startlog = "[Trace] ansible automation controller rest api request start. (url:{} method:{})".format(url, method)
                 endlog = "[Trace] ansible automation controller rest api request done."
                 g.applogger.info(startlog)     # 外部アプリへの処理開始・終了ログ
-                with urllib.request.urlopen(req, context=ssl_context, timeout=RestTimeout) as resp:
-                    g.applogger.info(endlog)
-                    status_code = resp.getcode()
-                    http_response_header = resp.getheaders()
-                    responseContents = resp.read().decode('utf-8')
-
-                    print_HttpStatusCode = "http ststus code: %s" % (str(status_code))
-                    print_HttpResponsHeader = "http response header\n%s" % (str(http_response_header))
-                    print_ResponseContents = "http response contents\n%s" % (str(responseContents))
-            except urllib.error.HTTPError as e:
+                # keep-aliveで接続を再利用する
+                resp = self.getSession(proxies).request(method, url, data=data, headers=headers, timeout=RestTimeout)
+                g.applogger.info(endlog)
+                status_code = resp.status_code
+                http_response_header = list(resp.headers.items())
+                responseContents = resp.content.decode('utf-8')
+
+                print_HttpStatusCode = "http ststus code: %s" % (str(status_code))
+                print_HttpResponsHeader = "http response header\n%s" % (str(http_response_header))
+                print_ResponseContents = "http response contents\n%s" % (str(responseContents))
+                if status_code >= 400:
+                    raise requests.exceptions.HTTPError(response=resp)
+
+            except requests.exceptions.HTTPError as e:
                 # 返却用のArrayを編集
                 response_array['statusCode'] = -2
                 response_array['responseContents'] = {"errorMessage": "HTTP access error "}
@@ -186,14 +216,13 @@ class RestApiCaller():
                     "http response contents: %s\n" \
                     "http response headers: %s\n" \
                     "http response body: %s" \
-                    % (e.code, e.reason, e.headers, e.read().decode())
+                    % (e.response.status_code, e.response.reason, e.response.headers, e.response.text)
                 self.apperrorloger(self.backtrace())
                 self.apperrorloger(print_url)
                 self.apperrorloger(print_HttpContext)
                 self.apperrorloger(print_Except)
 
-            # reference https://stackoverflow.com/questions/8763451/how-to-handle-urllibs-timeout-in-python-3
-            except timeout as e:
+            except requests.exceptions.Timeout as e:
                 timeout_chk = True
                 # 返却用のArrayを編集
                 response_array['statusCode'] = -2
@@ -205,12 +234,12 @@ class RestApiCaller():
                 self.apperrorloger(print_HttpContext)
                 self.apperrorloger(print_Except)
 
-            except urllib.error.URLError as e:
+            except requests.exceptions.RequestException as e:
                 # 返却用のArrayを編集
                 response_array['statusCode'] = -2
                 response_array['responseContents'] = {"errorMessage":"HTTP access error "}
 
-                print_Except = "Except URLError\nhttp response contents: %s" % (e.reason)
+                print_Except = "Except RequestException\nhttp response contents: %s" % (str(e))
                 self.apperrorloger(self.backtrace())
                 self.apperrorloger(print_url)
                 self.apperrorloger(print_HttpContext)
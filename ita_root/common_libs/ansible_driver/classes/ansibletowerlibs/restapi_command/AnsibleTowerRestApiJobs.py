@@ -11,6 +11,7 @@
 #   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
+import re
 from flask import g
 from common_libs.ansible_driver.classes.ansibletowerlibs.restapi_command.AnsibleTowerRestApiBase import AnsibleTowerRestApiBase
 
@@ -25,6 +26,10 @@ class AnsibleTowerRestApiJobs(AnsibleTowerRestApiBase):
     IDENTIFIED_NAME_PREFIX = "ita_executions_job_"
     API_SUB_PATH_STDOUT = "stdout/?format=txt_download"
     API_SUB_PATH_CANCEL = "cancel/"
+    API_SUB_PATH_JOB_EVENTS = "job_events/"
+    JOB_EVENTS_PAGE_SIZE = 200
+    # txt_downloadと同様にANSIエスケープシーケンス(SGR)を除去する
+    ANSI_SGR_PATTERN = re.compile(r'\x1b\[[0-9;]*m')
 
     @classmethod
     def getAll(cls, RestApiCaller, query=""):
@@ -170,6 +175,57 @@ class AnsibleTowerRestApiJobs(AnsibleTowerRestApiBase):
 
         return response_array
 
+    @classmethod
+    def getStdOutEvents(cls, RestApiCaller, id, last_counter=0, allow_gap=False):
+        """
+        job_eventsからlast_counter以降に追加されたstdoutを取得する
+            stdout/?format=txt_downloadと同じ形式(ANSIエスケープシーケンス除去)で差分だけを返す
+        Arguments:
+            RestApiCaller: RestApiCaller
+            id: job id
+            last_counter: 取得済みのjob eventのcounter
+            allow_gap: True=counterが連続していなくても取得する(ジョブ終了後のイベント処理完了時)
+                       False=未登録のイベントがある場合はその手前までを返す
+        Returns:
+            response_array
+                responseContents: {'stdout': 追加されたstdout, 'counter': 取得済みのjob eventのcounter}
+        """
+        method = "GET"
+        stdout = ""
+        counter = last_counter
+        while True:
+            # /api/v2/jobs/(job id)/job_events/?order_by=counter&counter__gt=(取得済みのcounter)
+            query = "?order_by=counter&counter__gt=%s&page_size=%s" % (counter, cls.JOB_EVENTS_PAGE_SIZE)
+            response_array = RestApiCaller.restCall(method, '%s%s/%s%s' % (cls.API_PATH, id, cls.API_SUB_PATH_JOB_EVENTS, query))
+
+            # REST失敗
+            if response_array['statusCode'] != 200:
+                response_array['success'] = False
+                if "errorMessage" not in response_array['responseContents']:
+                    response_array['responseContents']['errorMessage'] = "status_code not 200. =>%s" % (response_array['statusCode'])
+
+                return response_array
+
+            events = response_array['responseContents']['results']
+            for event in events:
+                if allow_gap is False and event['counter'] != counter + 1:
+                    # 未登録のイベントがある場合は次回取得する
+                    events = []
+                    break
+                counter = event['counter']
+                # stdoutが空のイベントは出力されない
+                if event['stdout']:
+                    stdout += cls.ANSI_SGR_PATTERN.sub('', event['stdout']) + "\n"
+
+            if len(events) < cls.JOB_EVENTS_PAGE_SIZE:
+                break
+
+        # REST成功
+        response_array['success'] = True
+        response_array['responseContents'] = {'stdout': stdout, 'counter': counter}
+
+        return response_array
+
     @classmethod
     def cancel(cls, RestApiCaller, id):
 
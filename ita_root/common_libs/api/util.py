@@ -15,9 +15,10 @@
 common_libs api common function module
 """
 import os
-from flask import g, request, Response
+from flask import g, request, Response, stream_with_context
 import traceback
 import re
+import json
 from urllib.parse import quote
 
 from common_libs.common.exception import AppException
@@ -121,6 +122,48 @@ def make_response_file_download(data=None, msg="", result_code="000-00000", stat
     return resp, status_code
 
 
+def make_response_stream(data=None, on_close=None):
+    """
+    make http response(chunked json)
+        dataをレコード単位でシリアライズして返す(レスポンス全体をメモリに保持しない)
+        レスポンス開始後のエラーはステータスコードを変更できないため、ログ出力してレスポンスを中断する
+
+    Argument:
+        data: iterable(list or generator)
+        on_close: レスポンス終了時の処理(DB切断など)
+    Returns:
+        (flask)response
+    """
+    res_body = {
+        "result": "000-00000",
+        "message": "SUCCESS",
+        "ts": api_timestamp
+    }
+
+    def __make_response():
+        # make_responseと同じ構造 {"data": [...], "message", "result", "ts"}
+        yield '{"data": ['
+        for index, row in enumerate(data):
+            yield (',' if index > 0 else '') + json.dumps(row, ensure_ascii=False, default=str)
+        yield '], ' + json.dumps(res_body, ensure_ascii=False)[1:]
+
+        g.applogger.info("[ts={}][api-end][SUCCESS][status_code=200]".format(api_timestamp))
+
+    def __make_response_with_error():
+        try:
+            yield from __make_response()
+        except Exception:
+            t = traceback.format_exc()
+            g.applogger.error("[ts={}] {}".format(api_timestamp, arrange_stacktrace_format(t)))
+            g.applogger.info("[ts={}][api-end][FAILURE][status_code=200]".format(api_timestamp))
+
+    resp = Response(stream_with_context(__make_response_with_error()), content_type="application/json")
+    if on_close is not None:
+        resp.call_on_close(on_close)
+
+    return resp, 200
+
+
 def app_exception_response(e, exception_log_need=False):
     '''
     make response when AppException occured
@@ -247,6 +290,42 @@ def api_filter(func):
     return wrapper
 
 
+def api_filter_stream(func):
+    '''
+    wrap api controller(chunked json response)
+
+    Argument:
+        func: controller(def) return (iterable data, on_close)
+    Returns:
+        controller wrapper
+    '''
+
+    def wrapper(*args, **kwargs):
+        '''
+        controller wrapper
+
+        Argument:
+            *args, **kwargs: controller args
+        Returns:
+            (flask)response
+        '''
+        try:
+            g.applogger.debug("[ts={}] controller start -> {}".format(api_timestamp, kwargs))
+
+            # controller execute and make response
+            controller_res = func(*args, **kwargs)
+
+            return make_response_stream(*controller_res)
+        except AppException as e:
+            # catch - raise AppException("xxx-xxxxx", log_format, msg_format)
+            return app_exception_response(e)
+        except Exception as e:
+            # catch - other all error
+            return exception_response(e)
+
+    return wrapper
+
+
 def api_filter_download_file(func):
     '''
     wrap api controller
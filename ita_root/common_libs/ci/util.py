@@ -14,18 +14,27 @@
 """
 common_libs CLI common function module
 """
-from flask import g
+from flask import g, current_app
+from concurrent.futures import ThreadPoolExecutor, wait as futures_wait
+import copy
 import os
+import threading
 import time
 import traceback
 import json
 
 from common_libs.common.dbconnect import *
+from common_libs.common.dbconnect.connection_pool import DBConnectionPool
 from common_libs.common.exception import AppException, ValidationException
+from common_libs.common.logger import AppLog
 from common_libs.common.util import get_iso_datetime, arrange_stacktrace_format, print_exception_msg
 from common_libs.common.storage_access import storage_write
 
 
+# ハングアップ監視用ファイル書き込みの排他用
+_liveness_lock = threading.Lock()
+
+
 def wrapper_job(main_logic, organization_id=None, workspace_id=None, loop_count=500):
     '''
     backyard job wrapper
@@ -44,6 +53,9 @@ def wrapper_job(main_logic, organization_id=None, workspace_id=None, loop_count=
     count = 1
     max = int(loop_count) if is_child_ps is False else 1
 
+    # ワークスペース単位のジョブ実行（子プロセスは対象のワークスペースのみのため並列化しない）
+    scheduler = WorkspaceScheduler() if is_child_ps is False else WorkspaceScheduler(1)
+
     while True:
         g.ORGANIZATION_ID = None
         g.WORKSPACE_ID = None
@@ -114,7 +126,7 @@ def wrapper_job(main_logic, organization_id=None, workspace_id=None, loop_count=
 
             # job for organization
             try:
-                organization_job(main_logic, organization_id, workspace_id)
+                organization_job(main_logic, organization_id, workspace_id, scheduler)
             except AppException as e:
                 # catch - raise AppException("xxx-xxxxx", log_format)
                 print_exception_msg(e)
@@ -124,11 +136,18 @@ def wrapper_job(main_logic, organization_id=None, workspace_id=None, loop_count=
                 print_exception_msg(e)
                 exception(e)
 
+        # 並列実行中のワークスペースのジョブを待つ
+        running_keys = scheduler.wait()
+        if len(running_keys) > 0:
+            g.applogger.info("Workspace jobs are still running. {}".format(running_keys))
+
         # ハングアップ監視用に時刻を出力する
-        with open(os.environ.get('FILE_PATH_LIVENESS'), 'w') as f:
-            f.write(str(int(time.time())))
+        write_liveness()
+        scheduler.write_timings()
+        g.applogger.debug("DB connection pool stats: {}".format(DBConnectionPool.get_stats()))
 
         if count >= max:
+            scheduler.shutdown()
             common_db.db_disconnect()
             break
         else:
@@ -136,12 +155,14 @@ def wrapper_job(main_logic, organization_id=None, workspace_id=None, loop_count=
             time.sleep(interval)
 
 
-def organization_job(main_logic, organization_id=None, workspace_id=None):
+def organization_job(main_logic, organization_id=None, workspace_id=None, scheduler=None):
     '''
     job for organization unit
 
     Argument:
         organization_id
+        workspace_id
+        scheduler: WorkspaceScheduler (None: run workspaces one at a time)
     '''
     org_db = DBConnectOrg(organization_id)  # noqa: F405
     g.applogger.debug("ORG_DB:{} can be connected".format(organization_id))
@@ -154,65 +175,244 @@ def organization_job(main_logic, organization_id=None, workspace_id=None):
 
     org_db.db_disconnect()
 
+    if scheduler is None:
+        scheduler = WorkspaceScheduler(1)
+
     for workspace_info in workspace_info_list:
-        # set applogger.set_level: default:INFO / Use ITA_DB config value
-        # set_service_loglevel()
+        scheduler.run((organization_id, workspace_info['WORKSPACE_ID']), workspace_job, main_logic, organization_id, workspace_info)
 
-        g.WORKSPACE_ID = None
-        g.applogger.set_env_message()
-        workspace_id = workspace_info['WORKSPACE_ID']
 
-        g.WORKSPACE_ID = workspace_id
-        # set log environ format
-        g.applogger.set_env_message()
+def workspace_job(main_logic, organization_id, workspace_info):
+    '''
+    job for workspace unit
 
-        # database connect info
-        g.db_connect_info["WSDB_HOST"] = workspace_info["DB_HOST"]
-        g.db_connect_info["WSDB_PORT"] = str(workspace_info["DB_PORT"])
-        g.db_connect_info["WSDB_USER"] = workspace_info["DB_USER"]
-        g.db_connect_info["WSDB_PASSWORD"] = workspace_info["DB_PASSWORD"]
-        g.db_connect_info["WSDB_DATABASE"] = workspace_info["DB_DATABASE"]
-        g.db_connect_info["WS_MONGO_CONNECTION_STRING"] = workspace_info["MONGO_CONNECTION_STRING"]
-        g.db_connect_info["WS_MONGO_DATABASE"] = workspace_info["MONGO_DATABASE"]
-        g.db_connect_info["WS_MONGO_USER"] = workspace_info["MONGO_USER"]
-        g.db_connect_info["WS_MONGO_PASSWORD"] = workspace_info["MONGO_PASSWORD"]
+    Argument:
+        main_logic
+        organization_id
+        workspace_info: row of T_COMN_WORKSPACE_DB_INFO
+    '''
+    # set applogger.set_level: default:INFO / Use ITA_DB config value
+    # set_service_loglevel()
 
-        ws_db = DBConnectWs(workspace_id)  # noqa: F405
-        g.applogger.debug("WS_DB:{} can be connected".format(workspace_id))
+    g.WORKSPACE_ID = None
+    g.applogger.set_env_message()
+    workspace_id = workspace_info['WORKSPACE_ID']
 
-        # set log-level for user setting
-        # g.applogger.set_user_setting(ws_db)
+    g.WORKSPACE_ID = workspace_id
+    # set log environ format
+    g.applogger.set_env_message()
 
-        ws_db.db_disconnect()
+    # database connect info
+    g.db_connect_info["WSDB_HOST"] = workspace_info["DB_HOST"]
+    g.db_connect_info["WSDB_PORT"] = str(workspace_info["DB_PORT"])
+    g.db_connect_info["WSDB_USER"] = workspace_info["DB_USER"]
+    g.db_connect_info["WSDB_PASSWORD"] = workspace_info["DB_PASSWORD"]
+    g.db_connect_info["WSDB_DATABASE"] = workspace_info["DB_DATABASE"]
+    g.db_connect_info["WS_MONGO_CONNECTION_STRING"] = workspace_info["MONGO_CONNECTION_STRING"]
+    g.db_connect_info["WS_MONGO_DATABASE"] = workspace_info["MONGO_DATABASE"]
+    g.db_connect_info["WS_MONGO_USER"] = workspace_info["MONGO_USER"]
+    g.db_connect_info["WS_MONGO_PASSWORD"] = workspace_info["MONGO_PASSWORD"]
 
-        # job for workspace
+    ws_db = DBConnectWs(workspace_id)  # noqa: F405
+    g.applogger.debug("WS_DB:{} can be connected".format(workspace_id))
+
+    # set log-level for user setting
+    # g.applogger.set_user_setting(ws_db)
+
+    ws_db.db_disconnect()
+
+    # job for workspace
+    try:
+        if allow_proc(organization_id, workspace_id) is True:
+            main_logic_exec = main_logic
+            main_logic_exec(organization_id, workspace_id)
+            # ハングアップ監視用に時刻を出力する
+            write_liveness()
+            del main_logic_exec
+    except AppException as e:
+        # catch - raise AppException("xxx-xxxxx", log_format)
+        print_exception_msg(e)
+        app_exception(e)
+    except Exception as e:
+        # catch - other all error
+        print_exception_msg(e)
+        exception(e)
+
+    # delete environment of workspace
+    g.db_connect_info.pop("WSDB_HOST")
+    g.db_connect_info.pop("WSDB_PORT")
+    g.db_connect_info.pop("WSDB_USER")
+    g.db_connect_info.pop("WSDB_PASSWORD")
+    g.db_connect_info.pop("WSDB_DATABASE")
+    g.db_connect_info.pop("WS_MONGO_CONNECTION_STRING")
+    g.db_connect_info.pop("WS_MONGO_DATABASE")
+    g.db_connect_info.pop("WS_MONGO_USER")
+    g.db_connect_info.pop("WS_MONGO_PASSWORD")
+
+
+class WorkspaceScheduler:
+    '''
+    backyard workspace scheduler
+        (organization_id, workspace_id)単位でジョブを実行する
+        max_workers > 1の場合はスレッドプールで並列実行し、ワークスペース毎にapp_context(g)を分離する
+    '''
+
+    def __init__(self, max_workers=None, wait_timeout=None):
+        '''
+        constructor
+
+        Argument:
+            max_workers: 同時実行数 (None: env BACKYARD_WORKSPACE_CONCURRENCY, default 1)
+            wait_timeout: 1サイクルで実行中ジョブの完了を待つ秒数 (None: env BACKYARD_WORKSPACE_WAIT_TIMEOUT, default 無制限)
+        '''
+        if max_workers is None:
+            max_workers = os.environ.get("BACKYARD_WORKSPACE_CONCURRENCY", "1")
+        if wait_timeout is None:
+            wait_timeout = os.environ.get("BACKYARD_WORKSPACE_WAIT_TIMEOUT")
+
+        self.max_workers = max(int(max_workers), 1)
+        self.wait_timeout = float(wait_timeout) if wait_timeout else None
+
+        self._executor = None
+        self._futures = {}
+        self._lock = threading.Lock()
+        # key: "organization_id/workspace_id", value: 実行時間の情報
+        self.timings = {}
+
+    def run(self, key, func, *args):
+        '''
+        run job for (organization_id, workspace_id)
+
+        Argument:
+            key: (organization_id, workspace_id)
+            func: job function
+            args: arguments of job function
+        Return:
+            bool: True=実行(投入)した / False=前回のジョブが実行中のためスキップした
+        '''
+        if self.max_workers == 1:
+            self._run(key, func, *args)
+            return True
+
+        future = self._futures.get(key)
+        if future is not None and future.done() is False:
+            # 前サイクルのジョブが実行中のワークスペースは投入しない（他ワークスペースのスロットを占有させない）
+            g.applogger.info("Skip workspace job because previous job is still running. org:{}, ws:{}".format(*key))
+            return False
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="workspace_job")
+
+        # gの内容はワークスペース毎のapp_contextに複製して渡す
+        app = current_app._get_current_object()
+        g_values = {name: getattr(g, name) for name in g}
+        if isinstance(g_values.get("db_connect_info"), dict):
+            g_values["db_connect_info"] = dict(g_values["db_connect_info"])
+        if isinstance(g_values.get("applogger"), AppLog):
+            # AppLogはenv_messageをインスタンスで保持しているため、ワークスペース毎に複製する
+            g_values["applogger"] = copy.copy(g_values["applogger"])
+
+        self._futures[key] = self._executor.submit(self._run_in_context, app, g_values, key, func, *args)
+        return True
+
+    def wait(self):
+        '''
+        wait for running jobs (up to wait_timeout)
+
+        Return:
+            list: keys of jobs that are still running
+        '''
+        if len(self._futures) == 0:
+            return []
+
+        futures_wait(list(self._futures.values()), timeout=self.wait_timeout)
+
+        running_keys = []
+        for key, future in list(self._futures.items()):
+            if future.done() is False:
+                running_keys.append(key)
+                continue
+
+            self._futures.pop(key)
+            e = future.exception()
+            if e is not None:
+                print_exception_msg(e)
+                exception(e)
+
+        return running_keys
+
+    def shutdown(self):
+        '''
+        wait for all jobs and stop worker threads
+        '''
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self._futures = {}
+
+    def write_timings(self):
+        '''
+        output per-workspace timings for liveness check
+            FILE_PATH_LIVENESS_WORKSPACE (default: FILE_PATH_LIVENESS + "_workspace")
+        '''
+        file_path = get_workspace_liveness_file_path()
+        if file_path is None:
+            return
+
+        with self._lock:
+            timings = dict(self.timings)
+
+        with _liveness_lock:
+            with open(file_path, 'w') as f:
+                json.dump(timings, f)
+
+    def _run_in_context(self, app, g_values, key, func, *args):
+        with app.app_context():
+            for name, value in g_values.items():
+                setattr(g, name, value)
+            g.applogger.set_env_message()
+
+            return self._run(key, func, *args)
+
+    def _run(self, key, func, *args):
+        start_time = time.time()
+        self._set_timing(key, {"started_at": int(start_time), "finished_at": None, "elapsed": None})
         try:
-            if allow_proc(organization_id, workspace_id) is True:
-                main_logic_exec = main_logic
-                main_logic_exec(organization_id, workspace_id)
-                # ハングアップ監視用に時刻を出力する
-                with open(os.environ.get('FILE_PATH_LIVENESS'), 'w') as f:
-                    f.write(str(int(time.time())))
-                del main_logic_exec
-        except AppException as e:
-            # catch - raise AppException("xxx-xxxxx", log_format)
-            print_exception_msg(e)
-            app_exception(e)
-        except Exception as e:
-            # catch - other all error
-            print_exception_msg(e)
-            exception(e)
+            return func(*args)
+        finally:
+            end_time = time.time()
+            self._set_timing(key, {"started_at": int(start_time), "finished_at": int(end_time), "elapsed": round(end_time - start_time, 3)})
+
+    def _set_timing(self, key, timing):
+        organization_id, workspace_id = key
+        with self._lock:
+            self.timings["{}/{}".format(organization_id, workspace_id)] = timing
+
+
+def write_liveness():
+    '''
+    ハングアップ監視用に時刻を出力する
+    '''
+    with _liveness_lock:
+        with open(os.environ.get('FILE_PATH_LIVENESS'), 'w') as f:
+            f.write(str(int(time.time())))
+
+
+def get_workspace_liveness_file_path():
+    '''
+    get file path of per-workspace timings
+
+    Return:
+        str or None
+    '''
+    file_path = os.environ.get('FILE_PATH_LIVENESS_WORKSPACE')
+    if file_path:
+        return file_path
 
-        # delete environment of workspace
-        g.db_connect_info.pop("WSDB_HOST")
-        g.db_connect_info.pop("WSDB_PORT")
-        g.db_connect_info.pop("WSDB_USER")
-        g.db_connect_info.pop("WSDB_PASSWORD")
-        g.db_connect_info.pop("WSDB_DATABASE")
-        g.db_connect_info.pop("WS_MONGO_CONNECTION_STRING")
-        g.db_connect_info.pop("WS_MONGO_DATABASE")
-        g.db_connect_info.pop("WS_MONGO_USER")
-        g.db_connect_info.pop("WS_MONGO_PASSWORD")
+    liveness_file_path = os.environ.get('FILE_PATH_LIVENESS')
+    if not liveness_file_path:
+        return None
+    return liveness_file_path + "_workspace"
 
 
 def wrapper_job_all_org(main_logic, loop_count=500):
@@ -248,8 +448,7 @@ def wrapper_job_all_org(main_logic, loop_count=500):
             main_logic_exec(common_db)
 
             # ハングアップ監視用に時刻を出力する
-            with open(os.environ.get('FILE_PATH_LIVENESS'), 'w') as f:
-                f.write(str(int(time.time())))
+            write_liveness()
 
             common_db.db_disconnect()
         except AppException as e:
@@ -660,8 +660,8 @@ class Column():
                         bind_value_list.append(option.get('uuid'))
 
                 result = self.objdbca.table_select(self.table_name, where_str, bind_value_list)
+                tmp_uuids = []
                 if result:
-                    tmp_uuids = []
                     for tmp_rows in result:
                         data_json = tmp_rows.get("DATA_JSON")
                         if data_json:
@@ -687,12 +687,18 @@ class Column():
                                                 tmp_uuids.append(tmp_rows.get(primary_key_list[0]))
                                                 retBool = False
 
-                    if not retBool:
-                        status_code = 'MSG-00025'
-                        str_uuids = ', '.join(map(str, tmp_uuids))
-                        msg_args = [str_uuids, val]
-                        msg = g.appmsg.get_api_message(status_code, msg_args)
-                        return retBool, msg
+                # 一括登録で未登録のレコードとの重複
+                pending_uuids = self.get_pending_unique_uuids(val)
+                if len(pending_uuids) != 0:
+                    tmp_uuids.extend(pending_uuids)
+                    retBool = False
+
+                if not retBool:
+                    status_code = 'MSG-00025'
+                    str_uuids = ', '.join(map(str, tmp_uuids))
+                    msg_args = [str_uuids, val]
+                    msg = g.appmsg.get_api_message(status_code, msg_args)
+                    return retBool, msg
 
             else:
                 if self.class_name == "IDColumn":
@@ -728,9 +734,11 @@ class Column():
                 result = self.objdbca.table_select(self.table_name, where_str, bind_value_list)
 
                 tmp_uuids = []
-                if len(result) != 0:
-                    for tmp_rows in result:
-                        tmp_uuids.append(tmp_rows.get(primary_key_list[0]))
+                for tmp_rows in result:
+                    tmp_uuids.append(tmp_rows.get(primary_key_list[0]))
+                # 一括登録で未登録のレコードとの重複
+                tmp_uuids.extend(self.get_pending_unique_uuids(val))
+                if len(tmp_uuids) != 0:
                     retBool = False
                     status_code = 'MSG-00025'
                     str_uuids = ', '.join(map(str, tmp_uuids))
@@ -739,6 +747,45 @@ class Column():
                     return retBool, msg
         return retBool,
 
+    def set_pending_unique_values(self, pending_unique_values):
+        """
+            一括登録で未登録のレコードの値を設定する(一意バリデーションで重複を確認する)
+            ARGS:
+                pending_unique_values:{get_unique_key(値): [uuid, ...]} / None
+        """
+        self.pending_unique_values = pending_unique_values
+
+    @staticmethod
+    def get_unique_key(val):
+        """
+            一意バリデーションで比較するキー(「空」「null(None)」は同一とする)
+            ARGS:
+                val:値
+            RETRUN:
+                string / None
+        """
+        return str(val) if val else None
+
+    def get_pending_unique_uuids(self, val):
+        """
+            一括登録で未登録のレコードのうち、値が重複するもののuuidを取得する
+            ARGS:
+                val:値
+            RETRUN:
+                [uuid, ...]
+        """
+        pending_unique_values = getattr(self, 'pending_unique_values', None)
+        if not pending_unique_values:
+            return []
+
+        # IDColumn系はID変換後の値と比較
+        if self.class_name in ["IDColumn", "JsonIDColumn", "NotificationIDColumn", "FilterConditionSettingColumn", "ConclusionEventSettingColumn"]:
+            tmp_result = self.convert_value_input(val)
+            if tmp_result[0] is True:
+                val = tmp_result[2]
+
+        return list(pending_unique_values.get(self.get_unique_key(val), []))
+
     # [maintenance] 必須バリデーション
     def is_valid_required(self, val='', option={}):
         """
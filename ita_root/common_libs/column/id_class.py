@@ -19,6 +19,7 @@ from flask import g
 
 # import column_class
 from .column_class import Column
+from .id_reference_cache import IDReferenceCache
 
 
 class IDColumn(Column):
@@ -65,6 +66,9 @@ class IDColumn(Column):
 
         self.data_list_set_flg = False
 
+        # データリストの値→キーの逆引き (データリスト, {str(value): [key, ...]})
+        self.id_data_index = None
+
     def get_id_data_list(self):
         """
             データリストを取得する
@@ -99,13 +103,10 @@ class IDColumn(Column):
             RETRUN:
                 データリスト
         """
-        values = {}
         language = g.LANGUAGE.upper()
         ref_malti_lang = self.get_objcol().get("REF_MULTI_LANG")
         ref_pkey_name = self.get_objcol().get("REF_PKEY_NAME")
         ref_table_name = self.get_objcol().get("REF_TABLE_NAME")
-        where_str = "WHERE `DISUSE_FLAG` = '0' "
-        bind_value_list = []
 
         # 連携先のテーブルが言語別のカラムを持つか判定
         if ref_malti_lang == '1':
@@ -113,11 +114,14 @@ class IDColumn(Column):
         else:
             ref_col_name = "{}".format(self.get_objcol().get("REF_COL_NAME"))
 
-        # 検索
-        return_values = self.objdbca.table_select(ref_table_name, where_str, bind_value_list)
+        def build_values(return_values):
+            values = {}
+            for record in return_values:
+                values[record[ref_pkey_name]] = record[ref_col_name]
+            return values
 
-        for record in return_values:
-            values[record[ref_pkey_name]] = record[ref_col_name]
+        # 検索(参照先テーブルが更新されていなければworkspace内で共有するリストを使用する)
+        values = IDReferenceCache.get_values(self.objdbca, ref_table_name, ref_pkey_name, ref_col_name, language, build_values)
 
         # 自テーブル名と参照先テーブル名が同一の場合、data_list_set_flgをFalseに設定する
         if self.table_name == ref_table_name:
@@ -127,6 +131,22 @@ class IDColumn(Column):
 
         return values
 
+    def get_id_data_index(self, id_data_list):
+        """
+            データリストの値→キーの逆引きを取得する
+            ARGS:
+                id_data_list:データリスト
+            RETRUN:
+                {str(value): [key, ...]}
+        """
+        if self.id_data_index is None or self.id_data_index[0] is not id_data_list:
+            index = {}
+            for key, value in id_data_list.items():
+                index.setdefault(str(value), []).append(key)
+            self.id_data_index = (id_data_list, index)
+
+        return self.id_data_index[1]
+
     def get_values_by_key(self, where_equal=[]):
         """
             Keyを検索条件に値を取得する
@@ -166,6 +186,7 @@ class IDColumn(Column):
 
         # 参照先のリストを格納
         id_data_list = {}
+        id_data_index = None
 
         # 一致検索
         if len(where_equal) > 0:
@@ -176,12 +197,12 @@ class IDColumn(Column):
                     continue
 
                 # 参照先のリストを必要なときだけ取得
-                if len(id_data_list) == 0:
+                if id_data_index is None:
                     id_data_list = self.get_id_data_list()
+                    id_data_index = self.get_id_data_index(id_data_list)
 
-                for key, value in id_data_list.items():
-                    if str(where_value) == str(value):
-                        tmp_values[key] = value
+                for key in id_data_index.get(str(where_value), []):
+                    tmp_values[key] = id_data_list[key]
         else:
             tmp_values = self.get_id_data_list()
 
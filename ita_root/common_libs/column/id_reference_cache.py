@@ -0,0 +1,142 @@
+# Copyright 2025 NEC Corporation#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""
+in-process cache of IDColumn reference lists
+"""
+import os
+import threading
+import textwrap
+from collections import OrderedDict
+
+
+class IDReferenceCache:
+    """
+    IDColumnの参照先リスト(key: 参照先の主キー, value: 表示値)をプロセス内でキャッシュする
+        key: 接続先のworkspace-db + (参照先テーブル, 主キー, 表示カラム, 言語)
+        参照先テーブルの最終更新日時・件数が変わった場合は再取得する
+        最終更新日時を持たないテーブル、VIEWはキャッシュしない(VIEWは結合先の更新を検知できないため)
+
+        env
+            IDCOLUMN_REFERENCE_CACHE_ENABLED: "1"=キャッシュを使用する(default) / "0"=使用しない
+            IDCOLUMN_REFERENCE_CACHE_SIZE: 保持する参照先リスト数の上限(default 500, 古いものから破棄する)
+    """
+
+    _lock = threading.Lock()
+
+    # key: (host, port, database, table, pkey, col, language), value: {"version": tuple, "values": dict}
+    _cache = OrderedDict()
+    # key: (host, port, database, table), value: bool キャッシュ可能なテーブルか
+    _cacheable_tables = {}
+
+    @classmethod
+    def is_enabled(cls):
+        """
+        キャッシュを使用するか
+
+        Returns:
+            bool
+        """
+        return os.environ.get("IDCOLUMN_REFERENCE_CACHE_ENABLED", "1") == "1"
+
+    @classmethod
+    def get_values(cls, objdbca, ref_table_name, ref_pkey_name, ref_col_name, language, build_values):
+        """
+        参照先リストを取得する
+
+        Arguments:
+            objdbca: DB接続クラス DBConnectWs()
+            ref_table_name: 参照先テーブル
+            ref_pkey_name: 参照先の主キー
+            ref_col_name: 参照先の表示カラム
+            language: 言語
+            build_values: 参照先テーブルのレコード(DISUSE_FLAG='0')から参照先リストを作成する関数
+        Returns:
+            values: dict (呼び出し元で変更できるようにコピーを返す)
+        """
+        if not cls.is_enabled() or not cls._is_cacheable(objdbca, ref_table_name):
+            return cls._select(objdbca, ref_table_name, build_values)
+
+        version = cls._get_version(objdbca, ref_table_name)
+        key = cls._get_table_key(objdbca, ref_table_name) + (ref_pkey_name, ref_col_name, language)
+        with cls._lock:
+            entry = cls._cache.get(key)
+            if entry is not None and entry["version"] == version:
+                cls._cache.move_to_end(key)
+                return dict(entry["values"])
+
+        values = cls._select(objdbca, ref_table_name, build_values)
+
+        max_size = int(os.environ.get("IDCOLUMN_REFERENCE_CACHE_SIZE", 500))
+        with cls._lock:
+            cls._cache[key] = {"version": version, "values": dict(values)}
+            cls._cache.move_to_end(key)
+            while len(cls._cache) > max_size:
+                cls._cache.popitem(last=False)
+
+        return values
+
+    @classmethod
+    def clear(cls):
+        """
+        キャッシュを破棄する
+        """
+        with cls._lock:
+            cls._cache.clear()
+            cls._cacheable_tables.clear()
+
+    @classmethod
+    def _select(cls, objdbca, ref_table_name, build_values):
+        where_str = "WHERE `DISUSE_FLAG` = '0' "
+        bind_value_list = []
+        return build_values(objdbca.table_select(ref_table_name, where_str, bind_value_list))
+
+    @classmethod
+    def _is_cacheable(cls, objdbca, ref_table_name):
+        table_key = cls._get_table_key(objdbca, ref_table_name)
+        with cls._lock:
+            cacheable = cls._cacheable_tables.get(table_key)
+        if cacheable is not None:
+            return cacheable
+
+        query_str = textwrap.dedent("""
+            SELECT `TAB_A`.`TABLE_TYPE`, COUNT(`TAB_B`.`COLUMN_NAME`) AS `TIMESTAMP_COUNT`
+            FROM `information_schema`.`TABLES` `TAB_A`
+            LEFT JOIN `information_schema`.`COLUMNS` `TAB_B` ON (
+                `TAB_A`.`TABLE_SCHEMA` = `TAB_B`.`TABLE_SCHEMA`
+                AND `TAB_A`.`TABLE_NAME` = `TAB_B`.`TABLE_NAME`
+                AND `TAB_B`.`COLUMN_NAME` = 'LAST_UPDATE_TIMESTAMP'
+            )
+            WHERE `TAB_A`.`TABLE_SCHEMA` = DATABASE()
+            AND `TAB_A`.`TABLE_NAME` = %s
+            GROUP BY `TAB_A`.`TABLE_TYPE`
+        """).strip()
+        rows = objdbca.sql_execute(query_str, [ref_table_name])
+        if len(rows) == 0:
+            # 未作成のテーブルは次回も確認する
+            return False
+
+        cacheable = rows[0]['TABLE_TYPE'] == 'BASE TABLE' and int(rows[0]['TIMESTAMP_COUNT']) > 0
+        with cls._lock:
+            cls._cacheable_tables[table_key] = cacheable
+        return cacheable
+
+    @classmethod
+    def _get_version(cls, objdbca, ref_table_name):
+        query_str = "SELECT MAX(`LAST_UPDATE_TIMESTAMP`) AS `LAST_UPDATE_TIMESTAMP`, COUNT(*) AS `ROW_COUNT` FROM `{}`".format(ref_table_name)
+        rows = objdbca.sql_execute(query_str)
+        return (rows[0]['LAST_UPDATE_TIMESTAMP'], rows[0]['ROW_COUNT'])
+
+    @staticmethod
+    def _get_table_key(objdbca, ref_table_name):
+        return (getattr(objdbca, "_host", None), getattr(objdbca, "_port", None), getattr(objdbca, "_db", None), ref_table_name)
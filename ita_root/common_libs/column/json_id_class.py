@@ -18,6 +18,7 @@ from common_libs.common import *  # noqa: F401,F403
 
 # import column_class
 from .id_class import IDColumn
+from .id_reference_cache import IDReferenceCache
 
 
 class JsonIDColumn(IDColumn):
@@ -33,26 +34,26 @@ class JsonIDColumn(IDColumn):
             RETRUN:
                 データリスト
         """
-        values = {}
         ref_pkey_name = self.get_objcol().get("REF_PKEY_NAME")
         ref_table_name = self.get_objcol().get("REF_TABLE_NAME")
         # REF_COL_NAMEに項目を特定するためのcolumn_name_restが入っている
         column_name_rest = self.get_objcol().get("REF_COL_NAME")
         # カラム名は「DATA_JSON」固定
         ref_col_name = "DATA_JSON"
-        where_str = "WHERE `DISUSE_FLAG` = '0' "
-        bind_value_list = []
-
-        # 検索
-        return_values = self.objdbca.table_select(ref_table_name, where_str, bind_value_list)
-
-        for record in return_values:
-            data_json_record = record.get(ref_col_name)
-            record_dict = json.loads(data_json_record)
-            for key, value in record_dict.items():
-                if key == column_name_rest:
-                    values[record[ref_pkey_name]] = value
-                    break
+
+        def build_values(return_values):
+            values = {}
+            for record in return_values:
+                data_json_record = record.get(ref_col_name)
+                record_dict = json.loads(data_json_record)
+                for key, value in record_dict.items():
+                    if key == column_name_rest:
+                        values[record[ref_pkey_name]] = value
+                        break
+            return values
+
+        # 検索(参照先テーブルが更新されていなければworkspace内で共有するリストを使用する)
+        values = IDReferenceCache.get_values(self.objdbca, ref_table_name, ref_pkey_name, "{}.{}".format(ref_col_name, column_name_rest), None, build_values)
 
         # 自テーブル名と参照先テーブル名が同一の場合、data_list_set_flgをFalseに設定する
         if self.table_name == ref_table_name:
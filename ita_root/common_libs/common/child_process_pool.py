@@ -0,0 +1,388 @@
+# Copyright 2025 NEC Corporation#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""
+forkserver for child processes (backyard_child_init.py, agent_child_init.py)
+"""
+import os
+import sys
+import json
+import random
+import threading
+import traceback
+import subprocess
+import importlib.util
+
+from flask import g
+
+
+class ForkServer:
+    """
+    子プロセスの起動スクリプトを1度だけimportしたサーバープロセスを起動し、以降の子プロセスはサーバープロセスからforkする
+        python3の起動・Flask等のimportを子プロセス毎に行わないため、起動がミリ秒単位になる
+        親プロセスが終了した場合(パイプのEOF)、サーバープロセスも終了する（起動済みの子プロセスは終了しない）
+    """
+
+    def __init__(self, child_init_path):
+        """
+        Arguments:
+            child_init_path: 子プロセスの起動スクリプト(ex. "backyard/backyard_child_init.py")
+        """
+        self.child_init_path = child_init_path
+
+        request_r, request_w = os.pipe()
+        response_r, response_w = os.pipe()
+        try:
+            self.process = subprocess.Popen(
+                [sys.executable, "-m", __name__, child_init_path, str(request_r), str(response_w)],
+                pass_fds=(request_r, response_w),
+            )
+        finally:
+            os.close(request_r)
+            os.close(response_w)
+        self._writer = os.fdopen(request_w, "w")
+        self._reader = os.fdopen(response_r, "r")
+
+    def start(self, args):
+        """
+        子プロセスを起動する
+
+        Arguments:
+            args: 起動スクリプトの引数(sys.argv[1:])
+        Returns:
+            pid
+        """
+        return self._request({"cmd": "start", "args": list(args)})["pid"]
+
+    def poll(self):
+        """
+        終了した子プロセスを取得する
+
+        Returns:
+            {pid: returncode}
+        """
+        return {int(pid): returncode for pid, returncode in self._request({"cmd": "poll"})["exited"].items()}
+
+    def is_alive(self):
+        return self.process.poll() is None
+
+    def stop(self):
+        """
+        サーバープロセスを終了する（起動済みの子プロセスは終了しない）
+        """
+        for stream in (self._writer, self._reader):
+            try:
+                stream.close()
+            except Exception:
+                pass
+        try:
+            self.process.wait(timeout=5)
+        except Exception:
+            self.process.kill()
+
+    def _request(self, request):
+        self._writer.write(json.dumps(request) + "\n")
+        self._writer.flush()
+        line = self._reader.readline()
+        if not line:
+            raise ChildProcessError("fork server({}) is not running".format(self.child_init_path))
+        response = json.loads(line)
+        if "error" in response:
+            raise ChildProcessError(response["error"])
+        return response
+
+
+class ChildProcessPool:
+    """
+    子プロセスの起動・生存確認
+        起動: ForkServer から fork する（ForkServer が使用できない場合は python3 で起動する）
+        生存確認: 起動した子プロセスのPID・終了コードはプロセス内で管理し、psコマンドは使用しない
+                  親プロセスの再起動前に起動された子プロセスは、pidファイル・/procのコマンドラインで確認する
+
+        env
+            CHILD_PROCESS_POOL_ENABLED: "1"=ForkServerを使用する(default) / "0"=使用しない(python3で起動する)
+            CHILD_PROCESS_POOL_PID_DIR: pidファイルの保存先(default /tmp/child_process_pool)
+    """
+
+    _lock = threading.Lock()
+
+    # key: child_init_path, value: ForkServer
+    _servers = {}
+
+    # key: pid, value: {"child_init_path", "args", "popen"}
+    _children = {}
+
+    @classmethod
+    def is_enabled(cls):
+        """
+        ForkServerを使用するか
+
+        Returns:
+            bool
+        """
+        return os.environ.get("CHILD_PROCESS_POOL_ENABLED", "1") == "1"
+
+    @classmethod
+    def start(cls, child_init_path, args):
+        """
+        子プロセスを起動する
+
+        Arguments:
+            child_init_path: 子プロセスの起動スクリプト(ex. "backyard/backyard_child_init.py")
+            args: 起動スクリプトの引数
+        Returns:
+            pid
+        """
+        args = [str(arg) for arg in args]
+        with cls._lock:
+            pid = None
+            popen = None
+            if cls.is_enabled():
+                try:
+                    pid = cls._get_server(child_init_path).start(args)
+                except Exception as e:
+                    # ForkServerが使用できない場合は、python3で起動する
+                    g.applogger.info("failed to start child process by fork server. {}".format(e))
+                    cls._stop_server(child_init_path)
+
+            if pid is None:
+                popen = subprocess.Popen(["python3", child_init_path, *args])
+                pid = popen.pid
+
+            cls._children[pid] = {"child_init_path": child_init_path, "args": args, "popen": popen}
+            if popen is None:
+                cls._write_pid_file(pid, child_init_path, args)
+
+        g.applogger.debug("child process started. pid={} {} {}".format(pid, child_init_path, " ".join(args)))
+        return pid
+
+    @classmethod
+    def is_running(cls, child_init_path, args):
+        """
+        子プロセスが実行中か
+
+        Arguments:
+            child_init_path: 子プロセスの起動スクリプト
+            args: 起動スクリプトの引数（前方一致）
+        Returns:
+            bool
+        """
+        args = [str(arg) for arg in args]
+        with cls._lock:
+            cls._reap()
+            for child in cls._children.values():
+                if child["child_init_path"] == child_init_path and child["args"][:len(args)] == args:
+                    return True
+
+        # 親プロセスの再起動前に起動された子プロセス
+        for process_args in cls._find_processes(child_init_path):
+            if process_args[:len(args)] == args:
+                return True
+        return False
+
+    @classmethod
+    def shutdown(cls):
+        """
+        ForkServerを終了する（起動済みの子プロセスは終了しない）
+        """
+        with cls._lock:
+            for child_init_path in list(cls._servers):
+                cls._stop_server(child_init_path)
+
+    @classmethod
+    def _get_server(cls, child_init_path):
+        server = cls._servers.get(child_init_path)
+        if server is None or not server.is_alive():
+            server = ForkServer(child_init_path)
+            cls._servers[child_init_path] = server
+        return server
+
+    @classmethod
+    def _stop_server(cls, child_init_path):
+        server = cls._servers.pop(child_init_path, None)
+        if server is not None:
+            server.stop()
+
+    @classmethod
+    def _reap(cls):
+        # 終了した子プロセスを管理対象から外す
+        exited = {}
+        for child_init_path, server in list(cls._servers.items()):
+            try:
+                exited.update(server.poll())
+            except Exception as e:
+                g.applogger.info("failed to poll fork server. {}".format(e))
+                cls._stop_server(child_init_path)
+        for pid, child in cls._children.items():
+            if child["popen"] is not None and child["popen"].poll() is not None:
+                exited[pid] = child["popen"].returncode
+
+        for pid, returncode in exited.items():
+            child = cls._children.pop(pid, None)
+            cls._remove_pid_file(pid)
+            if child is not None:
+                g.applogger.debug("child process exited. pid={} returncode={} {} {}".format(pid, returncode, child["child_init_path"], " ".join(child["args"])))
+
+    @classmethod
+    def _find_processes(cls, child_init_path):
+        """
+        他のプロセスが起動した子プロセスの引数のリストを取得する
+            ForkServerから起動したもの: pidファイル
+            python3で起動したもの: /proc/[pid]/cmdline
+        """
+        result = []
+
+        pid_dir = cls._get_pid_dir()
+        for file_name in os.listdir(pid_dir) if os.path.isdir(pid_dir) else []:
+            try:
+                with open(os.path.join(pid_dir, file_name)) as f:
+                    pid_info = json.load(f)
+            except Exception:
+                continue
+            if not file_name.isdigit() or _get_start_time(int(file_name)) != pid_info.get("start_time"):
+                # 終了済み(PIDの再利用を含む)
+                cls._remove_pid_file(file_name)
+                continue
+            if pid_info.get("child_init_path") == child_init_path:
+                result.append(pid_info.get("args", []))
+
+        for pid in os.listdir("/proc") if os.path.isdir("/proc") else []:
+            if not pid.isdigit():
+                continue
+            try:
+                with open("/proc/{}/cmdline".format(pid), "rb") as f:
+                    cmdline = [arg.decode("utf-8", "replace") for arg in f.read().split(b"\0")]
+            except Exception:
+                continue
+            if __name__ in cmdline:
+                # ForkServer（ForkServerから起動したものはpidファイルで確認する）
+                continue
+            if child_init_path in cmdline and _get_start_time(int(pid)) is not None:
+                result.append(cmdline[cmdline.index(child_init_path) + 1:])
+
+        return result
+
+    @staticmethod
+    def _get_pid_dir():
+        return os.environ.get("CHILD_PROCESS_POOL_PID_DIR", "/tmp/child_process_pool")
+
+    @classmethod
+    def _write_pid_file(cls, pid, child_init_path, args):
+        try:
+            pid_dir = cls._get_pid_dir()
+            os.makedirs(pid_dir, exist_ok=True)
+            with open(os.path.join(pid_dir, str(pid)), "w") as f:
+                json.dump({"child_init_path": child_init_path, "args": args, "start_time": _get_start_time(pid)}, f)
+        except Exception as e:
+            g.applogger.info("failed to write pid file. pid={} {}".format(pid, e))
+
+    @classmethod
+    def _remove_pid_file(cls, pid):
+        try:
+            os.remove(os.path.join(cls._get_pid_dir(), str(pid)))
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            g.applogger.info("failed to remove pid file. pid={} {}".format(pid, e))
+
+
+def _get_start_time(pid):
+    """
+    プロセスの起動時刻(/proc/[pid]/stat の starttime)を取得する
+
+    Returns:
+        int: 起動時刻 / None: プロセスが存在しない、またはゾンビプロセス
+    """
+    try:
+        with open("/proc/{}/stat".format(pid)) as f:
+            stat = f.read()
+    except Exception:
+        return None
+    # "pid (comm) state ..." commに空白・括弧が含まれることがあるため、最後の")"以降で分割する
+    fields = stat[stat.rindex(")") + 2:].split()
+    if fields[0] == "Z":
+        return None
+    return int(fields[19])
+
+
+def _serve(child_init_path, request_fd, response_fd):
+    """
+    ForkServerのサーバープロセス
+    """
+    # 子プロセスの起動スクリプトを __main__ 以外の名前でimportする（子プロセスが使用するモジュールの事前読み込み）
+    # sys.path はスクリプトとして起動した場合に合わせる
+    sys.path.insert(0, os.path.dirname(os.path.abspath(child_init_path)))
+    spec = importlib.util.spec_from_file_location("_child_init", child_init_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    reader = os.fdopen(request_fd, "r")
+    writer = os.fdopen(response_fd, "w")
+    exited = {}
+    for line in reader:
+        # 終了した子プロセスを回収する
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                break
+            exited[pid] = os.waitstatus_to_exitcode(status)
+
+        try:
+            request = json.loads(line)
+            if request["cmd"] == "start":
+                pid = os.fork()
+                if pid == 0:
+                    reader.close()
+                    writer.close()
+                    os._exit(_run_child(module, child_init_path, request["args"]))
+                response = {"pid": pid}
+            elif request["cmd"] == "poll":
+                response = {"exited": exited}
+                exited = {}
+            else:
+                response = {"error": "unknown command: {}".format(request["cmd"])}
+        except Exception as e:
+            response = {"error": str(e)}
+
+        writer.write(json.dumps(response) + "\n")
+        writer.flush()
+
+
+def _run_child(module, child_init_path, args):
+    """
+    forkした子プロセスで起動スクリプトのmainを実行する
+
+    Returns:
+        終了コード
+    """
+    random.seed()
+    sys.argv = [child_init_path, *args]
+    returncode = 0
+    try:
+        module.main()
+    except SystemExit as e:
+        returncode = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    except BaseException:
+        traceback.print_exc()
+        returncode = 1
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+    return returncode
+
+
+if __name__ == "__main__":
+    _serve(sys.argv[1], int(sys.argv[2]), int(sys.argv[3]))
@@ -0,0 +1,160 @@
+# Copyright 2025 NEC Corporation#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""
+in-process cache of organization-db / workspace-db connect infomation
+"""
+import os
+import threading
+import time
+
+from flask import g
+
+from .dbconnect_common import DBConnectCommon
+from .dbconnect_org import DBConnectOrg
+
+
+class ConnectInfoCache:
+    """
+    organization-db / workspace-db の接続情報をプロセス内でキャッシュする
+        API(before_request_handler)でリクエスト毎に接続情報を取得するためのDB接続を省略する
+        有効期限: env CONNECT_INFO_CACHE_TTL(秒, default 60, 0でキャッシュ無効)
+        期限切れ、またはinvalidateで破棄したものは次回取得時にDBから再取得する
+    """
+
+    # key: organization_id, value: {"expire": float, "info": dict}
+    _orgdb_cache = {}
+    # key: (organization_id, workspace_id), value: {"expire": float, "info": dict}
+    _wsdb_cache = {}
+
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_ttl(cls):
+        """
+        get cache ttl
+
+        Returns:
+            ttl: (float) seconds
+        """
+        return float(os.environ.get("CONNECT_INFO_CACHE_TTL", 60))
+
+    @classmethod
+    def is_cached(cls, organization_id, workspace_id):
+        """
+        organization/workspaceの接続情報が両方キャッシュされているか
+
+        Arguments:
+            organization_id: organization_id
+            workspace_id: workspace_id
+        Returns:
+            bool
+        """
+        now = time.time()
+        with cls._lock:
+            orgdb = cls._orgdb_cache.get(organization_id)
+            wsdb = cls._wsdb_cache.get((organization_id, workspace_id))
+            return orgdb is not None and orgdb["expire"] > now and wsdb is not None and wsdb["expire"] > now
+
+    @classmethod
+    def get_orgdb_connect_info(cls, organization_id):
+        """
+        get database connect infomation for organization
+
+        Arguments:
+            organization_id: organization_id
+        Returns:
+            database connect infomation for organization: dict
+            or
+            get failure: (bool)False
+        """
+        connect_info = cls._get(cls._orgdb_cache, organization_id)
+        if connect_info is not None:
+            return connect_info
+
+        common_db = DBConnectCommon()  # noqa: F405
+        g.applogger.debug("ITA_DB is connected")
+        connect_info = common_db.get_orgdb_connect_info(organization_id)
+        common_db.db_disconnect()
+
+        cls._set(cls._orgdb_cache, organization_id, connect_info)
+        return connect_info
+
+    @classmethod
+    def get_wsdb_connect_info(cls, organization_id, workspace_id):
+        """
+        get database connect infomation for workspace
+            organization-dbの接続情報がg.db_connect_infoに設定されていること
+
+        Arguments:
+            organization_id: organization_id
+            workspace_id: workspace_id
+        Returns:
+            database connect infomation for workspace: dict
+            or
+            get failure: (bool)False
+        """
+        connect_info = cls._get(cls._wsdb_cache, (organization_id, workspace_id))
+        if connect_info is not None:
+            return connect_info
+
+        org_db = DBConnectOrg(organization_id)  # noqa: F405
+        g.applogger.debug("ORG_DB:{} can be connected".format(organization_id))
+        connect_info = org_db.get_wsdb_connect_info(workspace_id)
+        org_db.db_disconnect()
+
+        cls._set(cls._wsdb_cache, (organization_id, workspace_id), connect_info)
+        return connect_info
+
+    @classmethod
+    def invalidate(cls, organization_id=None, workspace_id=None):
+        """
+        キャッシュを破棄する
+
+        Arguments:
+            organization_id: None=全て破棄
+            workspace_id: None=organization配下を全て破棄
+        """
+        with cls._lock:
+            if organization_id is None:
+                cls._orgdb_cache.clear()
+                cls._wsdb_cache.clear()
+                return
+
+            if workspace_id is None:
+                cls._orgdb_cache.pop(organization_id, None)
+                for key in [key for key in cls._wsdb_cache if key[0] == organization_id]:
+                    cls._wsdb_cache.pop(key)
+            else:
+                cls._wsdb_cache.pop((organization_id, workspace_id), None)
+
+    @classmethod
+    def _get(cls, cache, key):
+        with cls._lock:
+            entry = cache.get(key)
+            if entry is None:
+                return None
+            if entry["expire"] <= time.time():
+                return None
+            return entry["info"]
+
+    @classmethod
+    def _set(cls, cache, key, connect_info):
+        ttl = cls.get_ttl()
+        with cls._lock:
+            if connect_info is False or ttl <= 0:
+                # 存在しない(廃止された)ものはキャッシュしない
+                cache.pop(key, None)
+                return
+
+            cache[key] = {"expire": time.time() + ttl, "info": connect_info}
@@ -0,0 +1,264 @@
+# Copyright 2025 NEC Corporation#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""
+per-process connection pool for mariadb
+"""
+import os
+import threading
+import time
+
+
+class DBConnectionPool:
+    """
+    プロセス内のmariadbコネクションプール
+        key(host, port, user, database, ...)毎に接続を貸し出し・返却する
+
+        env
+            DB_POOL_ENABLED: "1"=プールを使用する(default) / "0"=使用しない
+            DB_POOL_SIZE: key毎の最大接続数(default 10)
+            DB_POOL_TIMEOUT: 最大接続数に達している場合に返却を待つ秒数(default 10)
+                             待っても空かない場合はプール外の接続を作成し、返却時に切断する
+            DB_POOL_MAX_IDLE: プロセス全体で保持する未使用接続の最大数(default 50)
+            DB_POOL_IDLE_TIMEOUT: 未使用のまま保持する秒数(default 60)
+            DB_POOL_RECYCLE: 接続を再利用する最大秒数(default 1800)
+            DB_POOL_PING_INTERVAL: 貸出時にpingで死活確認する未使用時間の秒数(default 10)
+    """
+
+    _lock = threading.Condition()
+    _pid = os.getpid()
+
+    # key: list of pymysql.connections.Connection (未使用の接続, 末尾が最後に返却されたもの)
+    _idle = {}
+    # key: プール管理下で貸出中の接続数
+    _in_use = {}
+    # key: 統計情報
+    _stats = {}
+
+    @classmethod
+    def is_enabled(cls):
+        """
+        プールを使用するか
+
+        Returns:
+            bool
+        """
+        return os.environ.get("DB_POOL_ENABLED", "1") == "1"
+
+    @classmethod
+    def checkout(cls, key, connect):
+        """
+        接続を貸し出す
+
+        Arguments:
+            key: tuple (host, port, user, database, ...) key[4]以降は統計情報に出力しない
+            connect: 新規に接続する関数 (pymysql.connectの呼び出し)
+        Returns:
+            (connection, pooled): pooled=False はプール外の接続(返却時に切断する)
+        """
+        pool_size = int(os.environ.get("DB_POOL_SIZE", 10))
+        timeout = float(os.environ.get("DB_POOL_TIMEOUT", 10))
+        ping_interval = float(os.environ.get("DB_POOL_PING_INTERVAL", 10))
+
+        start_time = time.time()
+        pooled = True
+        with cls._lock:
+            cls._check_pid()
+            stats = cls._get_stats(key)
+            while True:
+                con = cls._pop_idle(key)
+                if con is not None or cls._in_use.get(key, 0) < pool_size:
+                    cls._in_use[key] = cls._in_use.get(key, 0) + 1
+                    break
+
+                remaining = timeout - (time.time() - start_time)
+                if remaining <= 0:
+                    pooled = False
+                    stats["overflow"] += 1
+                    break
+                stats["wait_count"] += 1
+                cls._lock.wait(remaining)
+            stats["wait_time"] += time.time() - start_time
+
+        try:
+            if con is not None:
+                # 一定時間使われていない接続はpingで死活確認する
+                if time.time() - con._pool_last_used_at > ping_interval:
+                    try:
+                        con.ping(reconnect=False)
+                    except Exception:
+                        cls._close(con)
+                        con = None
+
+            if con is None:
+                con = connect()
+                con._pool_created_at = time.time()
+                con._pool_pid = os.getpid()
+                con._pool_session_changed = False
+                with cls._lock:
+                    stats["created"] += 1
+            else:
+                with cls._lock:
+                    stats["reused"] += 1
+        except Exception:
+            if pooled is True:
+                with cls._lock:
+                    cls._in_use[key] -= 1
+                    cls._lock.notify()
+            raise
+
+        return con, pooled
+
+    @classmethod
+    def checkin(cls, key, con, pooled=True):
+        """
+        接続を返却する
+            トランザクションをrollbackして返却する(rollbackできない接続は切断する)
+            セッション変数を変更した接続(mark_session_changed)は、次の貸出先に引き継がないように切断する
+
+        Arguments:
+            key: checkoutしたときのkey
+            con: pymysql.connections.Connection
+            pooled: checkoutの戻り値
+        """
+        if con._pool_pid != os.getpid():
+            # fork前に貸し出された接続は親プロセスと共有しているため、切断せずに破棄する
+            return
+
+        pool_size = int(os.environ.get("DB_POOL_SIZE", 10))
+        max_idle = int(os.environ.get("DB_POOL_MAX_IDLE", 50))
+        recycle = float(os.environ.get("DB_POOL_RECYCLE", 1800))
+
+        reusable = pooled is True and con.open is True and time.time() - con._pool_created_at < recycle and \
+            getattr(con, "_pool_session_changed", False) is False
+        if reusable is True:
+            try:
+                # 未確定のトランザクション・ロックを破棄する
+                con.rollback()
+            except Exception:
+                reusable = False
+
+        with cls._lock:
+            cls._check_pid()
+            stats = cls._get_stats(key)
+            if pooled is True:
+                cls._in_use[key] -= 1
+                cls._lock.notify()
+
+            cls._close_idle_timeout()
+            idle = cls._idle.setdefault(key, [])
+            if reusable is True and len(idle) < pool_size and cls._idle_count() < max_idle:
+                con._pool_last_used_at = time.time()
+                idle.append(con)
+                return
+
+            stats["closed"] += 1
+
+        cls._close(con)
+
+    @staticmethod
+    def mark_session_changed(con):
+        """
+        セッション変数(SET SESSION ...)を変更した接続として、返却時に切断する
+
+        Arguments:
+            con: pymysql.connections.Connection
+        """
+        con._pool_session_changed = True
+
+    @classmethod
+    def clear(cls):
+        """
+        未使用の接続を全て切断する
+        """
+        with cls._lock:
+            cls._check_pid()
+            idle_list = [con for idle in cls._idle.values() for con in idle]
+            cls._idle = {}
+
+        for con in idle_list:
+            cls._close(con)
+
+    @classmethod
+    def get_stats(cls):
+        """
+        プールの統計情報を取得する
+
+        Returns:
+            dict: key="user@host:port/database", value={in_use, idle, created, reused, closed, overflow, wait_count, wait_time}
+        """
+        with cls._lock:
+            cls._check_pid()
+            result = {}
+            for key, stats in cls._stats.items():
+                label = "{2}@{0}:{1}/{3}".format(*key[:4])
+                if label not in result:
+                    result[label] = {"in_use": 0, "idle": 0, "created": 0, "reused": 0, "closed": 0, "overflow": 0, "wait_count": 0, "wait_time": 0.0}
+                for name, value in stats.items():
+                    result[label][name] += value
+                result[label]["in_use"] += cls._in_use.get(key, 0)
+                result[label]["idle"] += len(cls._idle.get(key, []))
+            for values in result.values():
+                values["wait_time"] = round(values["wait_time"], 3)
+            return result
+
+    @classmethod
+    def _pop_idle(cls, key):
+        idle = cls._idle.get(key)
+        if not idle:
+            return None
+        return idle.pop()
+
+    @classmethod
+    def _idle_count(cls):
+        return sum(len(idle) for idle in cls._idle.values())
+
+    @classmethod
+    def _close_idle_timeout(cls):
+        idle_timeout = float(os.environ.get("DB_POOL_IDLE_TIMEOUT", 60))
+        limit = time.time() - idle_timeout
+        for key, idle in cls._idle.items():
+            while len(idle) > 0 and idle[0]._pool_last_used_at < limit:
+                cls._close(idle.pop(0))
+                cls._get_stats(key)["closed"] += 1
+
+    @classmethod
+    def _get_stats(cls, key):
+        if key not in cls._stats:
+            cls._stats[key] = {"created": 0, "reused": 0, "closed": 0, "overflow": 0, "wait_count": 0, "wait_time": 0.0}
+        return cls._stats[key]
+
+    @classmethod
+    def _check_pid(cls):
+        if cls._pid != os.getpid():
+            cls._reset_after_fork()
+
+    @classmethod
+    def _reset_after_fork(cls):
+        # fork前の接続は親プロセスと共有しているため、切断せずに破棄する
+        cls._lock = threading.Condition()
+        cls._pid = os.getpid()
+        cls._idle = {}
+        cls._in_use = {}
+        cls._stats = {}
+
+    @staticmethod
+    def _close(con):
+        try:
+            con.close()
+        except Exception:
+            pass
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=DBConnectionPool._reset_after_fork)
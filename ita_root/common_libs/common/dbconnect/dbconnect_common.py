@@ -16,6 +16,7 @@ database connection agnet module for ita-common-db on mariadb
 """
 import pymysql.cursors  # https://pymysql.readthedocs.io/en/latable_name/
 import pymysql
+import hashlib
 import uuid
 import os
 import re
@@ -24,6 +25,7 @@ import time
 from flask import g
 
 from common_libs.common.exception import AppException, DBException
+from .connection_pool import DBConnectionPool
 from common_libs.common.util import get_timestamp, ky_decrypt, ky_encrypt, generate_secrets
 
 
@@ -67,11 +69,46 @@ def connect_retry(db_connect):
 
     return wrapper
 
+
+def get_orgdb_connect_info_from_g(organization_id):
+    """
+    get database connect infomation for organization from g.db_connect_info
+
+    Arguments:
+        organization_id: organization_id
+    Returns:
+        database connect infomation for organization: dict
+        or
+        not registered in g: None
+    """
+    isnot_register_db_connect_info = "db_connect_info" not in g or "ORGDB_DATABASE" not in g.db_connect_info
+    isnot_same_organization = g.get('ORGANIZATION_ID') and g.get('ORGANIZATION_ID') != organization_id
+    if isnot_register_db_connect_info or isnot_same_organization:
+        return None
+
+    return {
+        'DB_HOST': g.db_connect_info.get('ORGDB_HOST'),
+        'DB_PORT': g.db_connect_info.get('ORGDB_PORT'),
+        'DB_USER': g.db_connect_info.get('ORGDB_USER'),
+        'DB_PASSWORD': g.db_connect_info.get('ORGDB_PASSWORD'),
+        'DB_ADMIN_USER': g.db_connect_info.get('ORGDB_ADMIN_USER'),
+        'DB_ADMIN_PASSWORD': g.db_connect_info.get('ORGDB_ADMIN_PASSWORD'),
+        'DB_DATABASE': g.db_connect_info.get('ORGDB_DATABASE'),
+        'MONGO_OWNER': g.db_connect_info.get('ORG_MONGO_OWNER'),
+        'MONGO_CONNECTION_STRING': g.db_connect_info.get('ORG_MONGO_CONNECTION_STRING'),
+        'MONGO_ADMIN_USER': g.db_connect_info.get('ORG_MONGO_ADMIN_USER'),
+        'MONGO_ADMIN_PASSWORD': g.db_connect_info.get('ORG_MONGO_ADMIN_PASSWORD'),
+        'INITIAL_DATA_ANSIBLE_IF': g.db_connect_info.get('INITIAL_DATA_ANSIBLE_IF'),
+        'NO_INSTALL_DRIVER': g.db_connect_info.get('NO_INSTALL_DRIVER')
+    }
+
+
 class DBConnectCommon:
     """
     database connection agnet class for ita-common-db on mariadb
     """
     _db_con = None  # database connection
+    _db_con_pool = None  # (pool key, pooled) of connection pool
 
     _is_transaction = False  # state of transaction
     _COLUMN_NAME_TIMESTAMP = 'LAST_UPDATE_TIMESTAMP'
@@ -114,18 +151,29 @@ class DBConnectCommon:
 
         try:
             _cursorclass = pymysql.cursors.SSDictCursor if mode_ss is True else pymysql.cursors.DictCursor
-            self._db_con = pymysql.connect(
-                host=self._host,
-                port=self._port,
-                user=self._db_user,
-                passwd=ky_decrypt(self._db_passwd),
-                database=self._db,
-                charset='utf8mb4',
-                collation='utf8mb4_general_ci',
-                cursorclass=_cursorclass,
-                local_infile=True,
-                connect_timeout=self.connect_timeout,
-            )
+            passwd = ky_decrypt(self._db_passwd)
+
+            def connect():
+                return pymysql.connect(
+                    host=self._host,
+                    port=self._port,
+                    user=self._db_user,
+                    passwd=passwd,
+                    database=self._db,
+                    charset='utf8mb4',
+                    collation='utf8mb4_general_ci',
+                    cursorclass=_cursorclass,
+                    local_infile=True,
+                    connect_timeout=self.connect_timeout,
+                )
+
+            if DBConnectionPool.is_enabled() is True:
+                # 接続はプロセス内のコネクションプールから貸し出す
+                pool_key = (self._host, self._port, self._db_user, self._db, _cursorclass.__name__, hashlib.sha256(passwd.encode()).hexdigest())
+                self._db_con, pooled = DBConnectionPool.checkout(pool_key, connect)
+                self._db_con_pool = (pool_key, pooled)
+            else:
+                self._db_con = connect()
         except pymysql.Error as e:
             raise DBException(self._db, e)
 
@@ -135,12 +183,35 @@ class DBConnectCommon:
         """
         disconnect database
         """
-        if self._db_con is not None and self._db_con.open is True:
+        if self._db_con is not None and self._db_con_pool is not None:
+            # コネクションプールに返却する
+            pool_key, pooled = self._db_con_pool
+            DBConnectionPool.checkin(pool_key, self._db_con, pooled)
+        elif self._db_con is not None and self._db_con.open is True:
             self._db_con.close()
 
         self._db_con = None
+        self._db_con_pool = None
         self._is_transaction = False
 
+    def set_session_isolation_level(self, isolation_level):
+        """
+        set session transaction isolation level
+            コネクションプールの接続の場合は、他の貸出先に引き継がないように返却時に切断する
+
+        Arguments:
+            isolation_level: "READ UNCOMMITTED" or "READ COMMITTED" or "REPEATABLE READ" or "SERIALIZABLE"
+        Returns:
+            is success:(bool)
+        """
+        if isolation_level not in ("READ UNCOMMITTED", "READ COMMITTED", "REPEATABLE READ", "SERIALIZABLE"):
+            raise AppException("999-00003", [self._db, "SET SESSION TRANSACTION ISOLATION LEVEL", isolation_level])
+
+        if self._db_con_pool is not None:
+            DBConnectionPool.mark_session_changed(self._db_con)
+        self.sql_execute("SET SESSION TRANSACTION ISOLATION LEVEL {};".format(isolation_level), bind_value_list=[])
+        return True
+
     def db_transaction_start(self):
         """
         begin
@@ -419,6 +490,78 @@ class DBConnectCommon:
 
         return data_list if is_last_res is True else is_last_res
 
+    def table_insert_bulk(self, table_name, data_list, primary_key_name, is_register_history=False, history_data_list=None):
+        """
+        insert table with multi-row INSERT statements
+            primary key / LAST_UPDATE_TIMESTAMP が設定済みのレコードはその値で登録する
+
+        Arguments:
+            data_list: data list for insert ex.[{"name":"なまえ", "number":"3"}]
+            primary_key_name: primary key column name
+            is_register_history: (bool)is register history table
+            history_data_list: addtinal data for history JNL table of each data (JOURNAL_SEQ_NO, ...) None=auto set
+        Returns:
+            table data list: list(tuple)
+        """
+        if isinstance(data_list, dict):
+            data_list = [data_list]
+
+        self.db_transaction_start()
+
+        history_list = []
+        for index, data in enumerate(data_list):
+            # auto set
+            if primary_key_name not in data or not data[primary_key_name]:
+                data[primary_key_name] = str(self._uuid_create())
+            if not data.get(self._COLUMN_NAME_TIMESTAMP):
+                data[self._COLUMN_NAME_TIMESTAMP] = get_timestamp()
+
+            if is_register_history is True:
+                if history_data_list is None:
+                    add_data = self._get_history_table_data("INSERT", data[self._COLUMN_NAME_TIMESTAMP])
+                else:
+                    add_data = history_data_list[index]
+                history_list.append(dict(data, **add_data))
+
+        self._table_insert_many(table_name, data_list)
+        if is_register_history is True:
+            self._table_insert_many(table_name + "_JNL", history_list)
+
+        return data_list
+
+    def _table_insert_many(self, table_name, data_list):
+        """
+        execute multi-row INSERT statements (rows are grouped by column list)
+
+        Arguments:
+            table_name: table name
+            data_list: data list for insert
+        """
+        bulk_rows = int(os.environ.get("DB_BULK_INSERT_ROWS", 1000))
+
+        groups = {}
+        for data in data_list:
+            groups.setdefault(tuple(data.keys()), []).append(tuple(data.values()))
+
+        for column_list, value_lists in groups.items():
+            prepared_list = ["%s"]*len(column_list)
+            sql = "INSERT INTO `{}` ({}) VALUES ({})".format(
+                table_name, ','.join(["`{}`".format(column) for column in column_list]), ','.join(prepared_list))
+
+            for start in range(0, len(value_lists), bulk_rows):
+                db_cursor = self._db_con.cursor()
+                try:
+                    # pymysqlのexecutemanyがmax_stmt_lengthごとの複数行INSERTにまとめる
+                    db_cursor.executemany(sql, value_lists[start:start + bulk_rows])
+                    if os.environ.get("DEBUUG_SQL") == "1":
+                        print(db_cursor._executed)
+                except pymysql.Error as e:
+                    last_executed = sql
+                    if self._db_con.open is True and db_cursor is not None and db_cursor._executed is not None:
+                        last_executed = db_cursor._executed
+                    raise AppException("999-00003", [self._db, last_executed, e])
+                db_cursor.close()
+
     def table_update(self, table_name, data_list, primary_key_name, is_register_history=False, last_timestamp=True):
         """
         update table
@@ -705,9 +848,8 @@ class DBConnectCommon:
             or
             get failure: (bool)False
         """
-        isnot_register_db_connect_info = "db_connect_info" not in g or "ORGDB_DATABASE" not in g.db_connect_info
-        isnot_same_organization = g.get('ORGANIZATION_ID') and g.get('ORGANIZATION_ID') != organization_id
-        if isnot_register_db_connect_info or isnot_same_organization:
+        connect_info = get_orgdb_connect_info_from_g(organization_id)
+        if connect_info is None:
             where = "WHERE `ORGANIZATION_ID`=%s and `DISUSE_FLAG`=0 LIMIT 1"
             data_list = self.table_select("T_COMN_ORGANIZATION_DB_INFO", where, [organization_id])
 
@@ -716,21 +858,7 @@ class DBConnectCommon:
 
             return data_list[0]
 
-        return {
-            'DB_HOST': g.db_connect_info.get('ORGDB_HOST'),
-            'DB_PORT': g.db_connect_info.get('ORGDB_PORT'),
-            'DB_USER': g.db_connect_info.get('ORGDB_USER'),
-            'DB_PASSWORD': g.db_connect_info.get('ORGDB_PASSWORD'),
-            'DB_ADMIN_USER': g.db_connect_info.get('ORGDB_ADMIN_USER'),
-            'DB_ADMIN_PASSWORD': g.db_connect_info.get('ORGDB_ADMIN_PASSWORD'),
-            'DB_DATABASE': g.db_connect_info.get('ORGDB_DATABASE'),
-            'MONGO_OWNER': g.db_connect_info.get('ORG_MONGO_OWNER'),
-            'MONGO_CONNECTION_STRING': g.db_connect_info.get('ORG_MONGO_CONNECTION_STRING'),
-            'MONGO_ADMIN_USER': g.db_connect_info.get('ORG_MONGO_ADMIN_USER'),
-            'MONGO_ADMIN_PASSWORD': g.db_connect_info.get('ORG_MONGO_ADMIN_PASSWORD'),
-            'INITIAL_DATA_ANSIBLE_IF': g.db_connect_info.get('INITIAL_DATA_ANSIBLE_IF'),
-            'NO_INSTALL_DRIVER': g.db_connect_info.get('NO_INSTALL_DRIVER')
-        }
+        return connect_info
 
     def sql_execute_cursor(self, sql, bind_value_list=[]):
         """
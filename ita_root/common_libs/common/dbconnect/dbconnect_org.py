@@ -19,11 +19,40 @@ import pymysql.cursors  # https://pymysql.readthedocs.io/en/latable_name/
 
 from flask import g
 
-from .dbconnect_common import DBConnectCommon, connect_retry
+from .dbconnect_common import DBConnectCommon, connect_retry, get_orgdb_connect_info_from_g
 from common_libs.common.exception import AppException, DBException
 from common_libs.common.util import ky_decrypt
 
 
+def get_wsdb_connect_info_from_g(workspace_id):
+    """
+    get database connect infomation for workspace from g.db_connect_info
+
+    Arguments:
+        workspace_id: workspace_id
+    Returns:
+        database connect infomation for workspace: dict
+        or
+        not registered in g: None
+    """
+    isnot_register_db_connect_info = "db_connect_info" not in g or "WSDB_DATABASE" not in g.db_connect_info
+    isnot_same_workspace = g.get('WORKSPACE_ID') and g.get('WORKSPACE_ID') != workspace_id
+    if isnot_register_db_connect_info or isnot_same_workspace:
+        return None
+
+    return {
+        "DB_HOST": g.db_connect_info.get("WSDB_HOST"),
+        "DB_PORT": g.db_connect_info.get("WSDB_PORT"),
+        "DB_USER": g.db_connect_info.get("WSDB_USER"),
+        "DB_PASSWORD": g.db_connect_info.get("WSDB_PASSWORD"),
+        "DB_DATABASE": g.db_connect_info.get("WSDB_DATABASE"),
+        'MONGO_CONNECTION_STRING': g.db_connect_info.get('WS_MONGO_CONNECTION_STRING'),
+        'MONGO_DATABASE': g.db_connect_info.get('WS_MONGO_DATABASE'),
+        'MONGO_USER': g.db_connect_info.get('WS_MONGO_USER'),
+        'MONGO_PASSWORD': g.db_connect_info.get('WS_MONGO_PASSWORD')
+    }
+
+
 class DBConnectOrg(DBConnectCommon):
     """
     database connection agnet class for organization-db on mariadb
@@ -41,9 +70,12 @@ class DBConnectOrg(DBConnectCommon):
         self.organization_id = organization_id
 
         # get db-connect-infomation from organization-db
-        common_db = DBConnectCommon()
-        connect_info = common_db.get_orgdb_connect_info(organization_id)
-        common_db.db_disconnect()
+        #   g.db_connect_infoに登録済みの場合はITA_DBへ接続しない
+        connect_info = get_orgdb_connect_info_from_g(organization_id)
+        if connect_info is None:
+            common_db = DBConnectCommon()
+            connect_info = common_db.get_orgdb_connect_info(organization_id)
+            common_db.db_disconnect()
         if connect_info is False:
             raise AppException("999-00001", ["ORGANIZATION_ID=" + self.organization_id])
 
@@ -106,9 +138,8 @@ class DBConnectOrg(DBConnectCommon):
             or
             get failure: (bool)False
         """
-        isnot_register_db_connect_info = "db_connect_info" not in g or "WSDB_DATABASE" not in g.db_connect_info
-        isnot_same_workspace = g.get('WORKSPACE_ID') and g.get('WORKSPACE_ID') != workspace_id
-        if isnot_register_db_connect_info or isnot_same_workspace:
+        connect_info = get_wsdb_connect_info_from_g(workspace_id)
+        if connect_info is None:
             where = "WHERE `WORKSPACE_ID`=%s and `DISUSE_FLAG`=0 LIMIT 1"
             data_list = self.table_select("T_COMN_WORKSPACE_DB_INFO", where, [workspace_id])
 
@@ -117,17 +148,7 @@ class DBConnectOrg(DBConnectCommon):
 
             return data_list[0]
 
-        return {
-            "DB_HOST": g.db_connect_info.get("WSDB_HOST"),
-            "DB_PORT": g.db_connect_info.get("WSDB_PORT"),
-            "DB_USER": g.db_connect_info.get("WSDB_USER"),
-            "DB_PASSWORD": g.db_connect_info.get("WSDB_PASSWORD"),
-            "DB_DATABASE": g.db_connect_info.get("WSDB_DATABASE"),
-            'MONGO_CONNECTION_STRING': g.db_connect_info.get('WS_MONGO_CONNECTION_STRING'),
-            'MONGO_DATABASE': g.db_connect_info.get('WS_MONGO_DATABASE'),
-            'MONGO_USER': g.db_connect_info.get('WS_MONGO_USER'),
-            'MONGO_PASSWORD': g.db_connect_info.get('WS_MONGO_PASSWORD')
-        }
+        return connect_info
 
     def get_inistial_data_ansible_if(self):
         """
@@ -17,7 +17,7 @@ database connection agent module for workspace-db on mariadb
 from flask import g
 
 from .dbconnect_common import DBConnectCommon
-from .dbconnect_org import DBConnectOrg
+from .dbconnect_org import DBConnectOrg, get_wsdb_connect_info_from_g
 from common_libs.common.exception import AppException
 
 
@@ -47,9 +47,12 @@ class DBConnectWs(DBConnectCommon):
         self._workspace_id = workspace_id
 
         # get db-connect-infomation from organization-db
-        org_db = DBConnectOrg(organization_id)
-        connect_info = org_db.get_wsdb_connect_info(workspace_id)
-        org_db.db_disconnect()
+        #   g.db_connect_infoに登録済みの場合はORG_DBへ接続しない
+        connect_info = get_wsdb_connect_info_from_g(workspace_id)
+        if connect_info is None:
+            org_db = DBConnectOrg(organization_id)
+            connect_info = org_db.get_wsdb_connect_info(workspace_id)
+            org_db.db_disconnect()
         if connect_info is False:
             db_info = "WORKSPACE_ID=" + workspace_id
             db_info = "ORGANIZATION_ID=" + organization_id + "," + db_info if organization_id else db_info
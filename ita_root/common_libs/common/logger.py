@@ -184,6 +184,25 @@ class AppLog:
         """
         self.__logger_obj.debug(self.__env_message + str(message))
 
+    def is_debug_enabled(self):
+        """
+        whether debug log is output or not
+
+        Returns:
+            bool
+        """
+        return self.__logger_obj.isEnabledFor(logging.DEBUG)
+
+    def debug_lazy(self, message_func):
+        """
+        output debug log (message is made only when debug log is output)
+
+        Arguments:
+            message_func: function that returns message for output
+        """
+        if self.__logger_obj.isEnabledFor(logging.DEBUG):
+            self.__logger_obj.debug(self.__env_message + str(message_func()))
+
     def set_env_message(self):
         """
         set env info message
@@ -14,6 +14,135 @@
 import os
 import json
 import glob
+import marshal
+import threading
+
+
+class MessageCatalog:
+    """
+    メッセージファイルのプロセス内共有キャッシュ
+        メッセージファイルはプロセス内で1回だけ読み込み、MessageTemplateのインスタンス間で共有する
+        LOG.jsonはログメッセージ取得時、API_[LANG].jsonは該当言語のメッセージ取得時に読み込む
+
+        env MESSAGE_CACHE_DIR: 指定した場合、読み込んだメッセージをmarshal形式で保存し、次回以降のプロセス起動時に利用する
+    """
+
+    _lock = threading.Lock()
+
+    # key: messages dir, value: {'log': dict, 'api': {lang: dict}}
+    _catalogs = {}
+    # key: messages dir, value: {'log': file path, 'api': {lang: file path}}
+    _files = {}
+
+    @classmethod
+    def get_log_messages(cls, path):
+        """
+        get messages for log
+
+        Arguments:
+            path: messages dir
+        Returns:
+            messages: dict
+        """
+        catalog = cls._catalogs.get(path)
+        if catalog is not None and 'log' in catalog:
+            return catalog['log']
+
+        with cls._lock:
+            catalog = cls._catalogs.setdefault(path, {'api': {}})
+            if 'log' not in catalog:
+                file = cls._get_files(path).get('log')
+                catalog['log'] = cls._load(file) if file else {}
+            return catalog['log']
+
+    @classmethod
+    def get_api_messages(cls, path, lang):
+        """
+        get messages for api
+
+        Arguments:
+            path: messages dir
+            lang: (str) "ja" | "en"
+        Returns:
+            messages: dict
+        """
+        catalog = cls._catalogs.get(path)
+        if catalog is not None and lang in catalog['api']:
+            return catalog['api'][lang]
+
+        with cls._lock:
+            catalog = cls._catalogs.setdefault(path, {'api': {}})
+            if lang not in catalog['api']:
+                file = cls._get_files(path)['api'].get(lang)
+                if file is None:
+                    # 存在しない言語はキャッシュしない
+                    return {}
+                catalog['api'][lang] = cls._load(file)
+            return catalog['api'][lang]
+
+    @classmethod
+    def clear(cls):
+        """
+        キャッシュを破棄する（メッセージファイル更新時用）
+        """
+        with cls._lock:
+            cls._catalogs = {}
+            cls._files = {}
+
+    @classmethod
+    def _get_files(cls, path):
+        if path in cls._files:
+            return cls._files[path]
+
+        files = {'log': None, 'api': {}}
+        for file in glob.glob(path + '/*.json'):
+            file_name = os.path.splitext(os.path.basename(file))[0]
+            file_type = file_name[:3].lower()
+            if file_type == 'log':
+                files['log'] = file
+            else:
+                s_file_name = file_name.split('_')
+                msg_lang = s_file_name[1].lower()
+                files['api'][msg_lang] = file
+
+        cls._files[path] = files
+        return files
+
+    @classmethod
+    def _load(cls, file):
+        cache_dir = os.environ.get('MESSAGE_CACHE_DIR')
+        if not cache_dir:
+            return cls._load_json(file)
+
+        stat = os.stat(file)
+        cache_file = os.path.join(cache_dir, os.path.basename(file) + '.marshal')
+        try:
+            with open(cache_file, 'rb') as f:
+                mtime, size, file_json = marshal.load(f)
+            if mtime == stat.st_mtime_ns and size == stat.st_size:
+                return file_json
+        except Exception:
+            # キャッシュが無い・壊れている場合はjsonから読み込む
+            pass
+
+        file_json = cls._load_json(file)
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp_file = "{}.{}".format(cache_file, os.getpid())
+            with open(tmp_file, 'wb') as f:
+                marshal.dump((stat.st_mtime_ns, stat.st_size, file_json), f)
+            os.replace(tmp_file, cache_file)
+        except Exception:
+            # キャッシュの保存に失敗しても処理は継続する
+            pass
+        return file_json
+
+    @staticmethod
+    def _load_json(file):
+        # read message file
+        #  #2079 /storage配下ではないので対象外
+        with open(file, 'r', encoding="utf-8") as op_file:
+            return json.load(op_file)
 
 
 class MessageTemplate:
@@ -34,34 +163,17 @@ class MessageTemplate:
         # set messages dir: Non Container mode
         self.path =  f'{os.environ.get("PYTHONPATH", None)}/messages' if os.environ.get("PYTHONPATH", None) else self.path
 
-        # define variable
-        self.messages = {'log': {}, 'api': {}}
-
-        # read message files
-        self.__read_message_files()
-
     """
-    メッセージファイル格納ディレクトリ配下の.jsonファイルを全て読み込み、
-    self.messages(dict)に保存する。
+    メッセージファイル格納ディレクトリ配下の.jsonファイルを全て読み込んだ内容を返却する。
+    (メッセージファイルはMessageCatalogでプロセス内で共有する)
     """
-    def __read_message_files(self):
-        message_files = glob.glob(self.path + '/*.json')
-        for file in message_files:
-            # read message file
-            #  #2079 /storage配下ではないので対象外
-            op_file = open(file, 'r', encoding="utf-8")
-            file_json = json.load(op_file)
-
-            # set messages in dict
-            file_name = os.path.splitext(os.path.basename(file))[0]
-            file_type = file_name[:3].lower()
-            if file_type == 'log':
-                file_type = file_name[:3].lower()
-                self.messages['log'] = file_json
-            else:
-                s_file_name = file_name.split('_')
-                msg_lang = s_file_name[1].lower()
-                self.messages['api'][msg_lang] = file_json
+    @property
+    def messages(self):
+        files = MessageCatalog._get_files(self.path)
+        return {
+            'log': MessageCatalog.get_log_messages(self.path),
+            'api': {lang: MessageCatalog.get_api_messages(self.path, lang) for lang in files['api']}
+        }
 
     """
     言語設定
@@ -84,7 +196,7 @@ class MessageTemplate:
 
     """
     def get_api_message(self, message_id, format_strings=[]):
-        ret_msg = self.messages.get('api', {}).get(self.lang, {}).get(str(message_id))
+        ret_msg = MessageCatalog.get_api_messages(self.path, self.lang).get(str(message_id))
 
         if ret_msg and format_strings:
             ret_msg = ret_msg.format(*format_strings)
@@ -106,7 +218,7 @@ class MessageTemplate:
 
     """
     def get_log_message(self, message_id, format_strings=[]):
-        ret_msg = self.messages.get('log', {}).get(str(message_id))
+        ret_msg = MessageCatalog.get_log_messages(self.path).get(str(message_id))
 
         if ret_msg and format_strings:
             ret_msg = ret_msg.format(*format_strings)
@@ -0,0 +1,286 @@
+# Copyright 2025 NEC Corporation#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""
+per-process MongoClient registry for mongodb
+"""
+import os
+import threading
+import time
+
+from pymongo import monitoring
+
+
+class MongoClientRegistry:
+    """
+    プロセス内で共有するMongoClientの管理
+        key(接続先URI, ユーザー, ...)毎にMongoClientを1つだけ作成し、貸し出し・返却する
+        MongoClientは監視スレッド・コネクションプールを持ち、作成時にサーバーの探索を行うため、
+        接続毎に作成せずに使い回す
+
+        env
+            MONGO_CLIENT_REGISTRY_ENABLED: "1"=使い回す(default) / "0"=接続毎に作成する
+            MONGO_CLIENT_MAX_IDLE: プロセス全体で保持する未使用のMongoClientの最大数(default 50)
+            MONGO_CLIENT_IDLE_TIMEOUT: 未使用のまま保持する秒数(default 600)
+    """
+
+    # MONGOConnectCommon.__del__からのreleaseが、ロック中のgcで同じスレッドから呼ばれてもデッドロックしないようにRLockを使う
+    _lock = threading.RLock()
+    _pid = os.getpid()
+
+    # key: _Entry
+    _entries = {}
+    # label: 統計情報(closeしたMongoClientの分も含めて累計する)
+    _stats = {}
+
+    @classmethod
+    def is_enabled(cls):
+        """
+        MongoClientを使い回すか
+
+        Returns:
+            bool
+        """
+        return os.environ.get("MONGO_CLIENT_REGISTRY_ENABLED", "1") == "1"
+
+    @classmethod
+    def acquire(cls, key, label, connect):
+        """
+        MongoClientを貸し出す
+
+        Arguments:
+            key: tuple (接続先, ユーザー, パスワードのhash, ...)
+            label: 統計情報に出力する接続先の名前(パスワードを含めないこと)
+            connect: MongoClientを作成する関数 connect(event_listeners)
+        Returns:
+            (client, version): MongoClientとサーバーのバージョン
+        """
+        with cls._lock:
+            cls._check_pid()
+            entry = cls._entries.get(key)
+            if entry is not None:
+                entry.in_use += 1
+                entry.last_used_at = time.time()
+                cls._get_stats(label)["reused"] += 1
+                return entry.client, entry.version
+
+        # サーバーの探索に時間がかかるため、ロックの外で作成する
+        listener = _PoolStatsListener()
+        client = connect([listener])
+        try:
+            version = client.server_info().get('version')
+        except Exception:
+            cls._close(client)
+            raise
+
+        with cls._lock:
+            cls._check_pid()
+            entry = cls._entries.get(key)
+            if entry is not None:
+                # 並行して作成された場合は先に登録された方を使う
+                entry.in_use += 1
+                entry.last_used_at = time.time()
+                cls._get_stats(label)["reused"] += 1
+                duplicate = client
+            else:
+                entry = _Entry(client, version, label, listener)
+                cls._entries[key] = entry
+                cls._get_stats(label)["created"] += 1
+                duplicate = None
+            result = (entry.client, entry.version)
+
+        if duplicate is not None:
+            cls._close(duplicate)
+
+        return result
+
+    @classmethod
+    def release(cls, key, client):
+        """
+        MongoClientを返却する
+            未使用のまま一定時間経過したMongoClientはcloseする
+
+        Arguments:
+            key: acquireしたときのkey
+            client: acquireで貸し出したMongoClient
+        """
+        close_list = []
+        with cls._lock:
+            if cls._pid != os.getpid():
+                # fork前に貸し出されたMongoClientは親プロセスのものなので、closeせずに破棄する
+                cls._reset_after_fork()
+                return
+
+            entry = cls._entries.get(key)
+            if entry is None or entry.client is not client:
+                return
+
+            entry.in_use -= 1
+            entry.last_used_at = time.time()
+            close_list = cls._pop_idle_entries()
+
+        for entry in close_list:
+            cls._close(entry.client)
+
+    @classmethod
+    def clear(cls):
+        """
+        未使用のMongoClientを全てcloseする
+        """
+        with cls._lock:
+            cls._check_pid()
+            close_list = []
+            for key, entry in list(cls._entries.items()):
+                if entry.in_use <= 0 and cls._entries.pop(key, None) is not None:
+                    cls._get_stats(entry.label)["closed"] += 1
+                    close_list.append(entry)
+
+        for entry in close_list:
+            cls._close(entry.client)
+
+    @classmethod
+    def get_stats(cls):
+        """
+        MongoClientとコネクションプールの統計情報を取得する
+
+        Returns:
+            dict: key=label, value={clients, in_use, created, reused, closed,
+                                    connections, checked_out, check_out_failed, pool_cleared}
+        """
+        with cls._lock:
+            cls._check_pid()
+            result = {}
+            for label, stats in list(cls._stats.items()):
+                result[label] = dict(stats, clients=0, in_use=0, connections=0, checked_out=0, check_out_failed=0, pool_cleared=0)
+            for entry in list(cls._entries.values()):
+                values = result.setdefault(entry.label, dict(
+                    cls._get_stats(entry.label), clients=0, in_use=0, connections=0, checked_out=0, check_out_failed=0, pool_cleared=0))
+                values["clients"] += 1
+                values["in_use"] += entry.in_use
+                for name, value in entry.listener.get_stats().items():
+                    values[name] += value
+            return result
+
+    @classmethod
+    def _pop_idle_entries(cls):
+        max_idle = int(os.environ.get("MONGO_CLIENT_MAX_IDLE", 50))
+        idle_timeout = float(os.environ.get("MONGO_CLIENT_IDLE_TIMEOUT", 600))
+        limit = time.time() - idle_timeout
+
+        idle_list = sorted(
+            [(key, entry) for key, entry in list(cls._entries.items()) if entry.in_use <= 0],
+            key=lambda item: item[1].last_used_at
+        )
+        close_list = []
+        for index, (key, entry) in enumerate(idle_list):
+            if entry.last_used_at < limit or len(idle_list) - index > max_idle:
+                # 再入したreleaseで既に取り除かれている場合は何もしない
+                if cls._entries.get(key) is not entry or entry.in_use > 0:
+                    continue
+                del cls._entries[key]
+                cls._get_stats(entry.label)["closed"] += 1
+                close_list.append(entry)
+        return close_list
+
+    @classmethod
+    def _get_stats(cls, label):
+        if label not in cls._stats:
+            cls._stats[label] = {"created": 0, "reused": 0, "closed": 0}
+        return cls._stats[label]
+
+    @classmethod
+    def _check_pid(cls):
+        if cls._pid != os.getpid():
+            cls._reset_after_fork()
+
+    @classmethod
+    def _reset_after_fork(cls):
+        # fork前のMongoClientは親プロセスの監視スレッド・接続を持つため、closeせずに破棄する
+        cls._lock = threading.RLock()
+        cls._pid = os.getpid()
+        cls._entries = {}
+        cls._stats = {}
+
+    @staticmethod
+    def _close(client):
+        try:
+            client.close()
+        except Exception:
+            pass
+
+
+class _Entry:
+    """
+    MongoClientRegistryで管理するMongoClient
+    """
+    def __init__(self, client, version, label, listener):
+        self.client = client
+        self.version = version
+        self.label = label
+        self.listener = listener
+        self.in_use = 1
+        self.last_used_at = time.time()
+
+
+class _PoolStatsListener(monitoring.ConnectionPoolListener):
+    """
+    MongoClientのコネクションプールの統計情報を集計する
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {"connections": 0, "checked_out": 0, "check_out_failed": 0, "pool_cleared": 0}
+
+    def get_stats(self):
+        with self._lock:
+            return dict(self._stats)
+
+    def _add(self, name, value=1):
+        with self._lock:
+            self._stats[name] += value
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self._add("pool_cleared")
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        self._add("connections")
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self._add("connections", -1)
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        self._add("check_out_failed")
+
+    def connection_checked_out(self, event):
+        self._add("checked_out")
+
+    def connection_checked_in(self, event):
+        self._add("checked_out", -1)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=MongoClientRegistry._reset_after_fork)
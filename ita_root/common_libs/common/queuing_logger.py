@@ -94,6 +94,24 @@ class QueuingAppLogger(logging.Logger):
     def set_level(self, level):
         super().setLevel(level)
 
+    def is_debug_enabled(self):
+        """debugログを出力するか
+
+        Returns:
+            bool: True=出力する
+        """
+        return self.isEnabledFor(logging.DEBUG)
+
+    def debug_lazy(self, message_func):
+        """debugログを出力する（メッセージはdebugログを出力する場合のみ生成する）
+
+        Args:
+            message_func: 出力するメッセージを返す関数
+        """
+        if self.isEnabledFor(logging.DEBUG):
+            # 出力元のファイル名・行番号は呼び出し元にする
+            self.debug(str(message_func()), stacklevel=2)
+
     def set_env_message(self):
         _thread_local.env_message = ""
         if "ORGANIZATION_ID" in g and g.ORGANIZATION_ID:
@@ -31,6 +31,8 @@ import json
 import shutil
 import inspect
 import traceback
+import copy
+import threading
 from urllib.parse import urlparse
 import uuid as uuid_lib
 
@@ -623,6 +625,112 @@ def encrypt_upload_file(file_path, text="", mode="w", tmp_file_path=""):
     return True
 
 
+class PlatformApiCache:
+    """
+    Platform API(internal-api)の呼び出し
+        スレッド毎のrequests.Session(keep-alive)を使い回して接続を再利用する
+        メンテナンスモード・上限値など全ユーザ共通の取得結果はプロセス内で短時間キャッシュする
+        有効期限: env PLATFORM_API_CACHE_TTL(秒, default 5, 0でキャッシュ無効)
+        メンテナンスモードの状態が変化した場合はキャッシュを全て破棄する
+        メンテナンス中はメンテナンスモードをキャッシュせず、解除を即時に反映する
+    """
+
+    _lock = threading.Lock()
+    _local = threading.local()
+
+    # key: api_url, value: {"expire": float, "data": dict}
+    _cache = {}
+    # 最後に取得したメンテナンスモードの設定値
+    _maintenance_mode = None
+
+    @classmethod
+    def get_ttl(cls):
+        """
+        get cache ttl
+
+        Returns:
+            ttl: (float) seconds
+        """
+        return float(os.environ.get("PLATFORM_API_CACHE_TTL", 5))
+
+    @classmethod
+    def get_session(cls):
+        """
+        スレッド毎のrequests.Sessionを取得する
+            fork後は親プロセスと接続を共有しないように作り直す
+
+        Returns:
+            requests.Session
+        """
+        session = getattr(cls._local, "session", None)
+        if session is None or cls._local.pid != os.getpid():
+            session = requests.Session()
+            cls._local.session = session
+            cls._local.pid = os.getpid()
+        return session
+
+    @classmethod
+    def get(cls, api_url, header_para, use_cache=True, refresh=False):
+        """
+        Platform APIをGETで呼び出す
+
+        Arguments:
+            api_url: api url
+            header_para: request header
+            use_cache: True=キャッシュを使用する(ユーザに依存しないAPIのみ)
+            refresh: True=キャッシュを使用せず再取得する
+        Returns:
+            response_data: dict
+        """
+        if use_cache is True and refresh is False:
+            with cls._lock:
+                entry = cls._cache.get(api_url)
+                if entry is not None and entry["expire"] > time.time():
+                    # 呼び出し元での変更がキャッシュに及ばないようにコピーを返す
+                    return copy.deepcopy(entry["data"])
+
+        request_response = cls.get_session().get(api_url, headers=header_para, timeout=(12, 600))
+
+        response_data = json.loads(request_response.text)
+
+        if request_response.status_code != 200:
+            raise AppException('999-00005', [api_url, response_data])
+
+        ttl = cls.get_ttl()
+        if use_cache is True and ttl > 0:
+            with cls._lock:
+                cls._cache[api_url] = {"expire": time.time() + ttl, "data": copy.deepcopy(response_data)}
+
+        return response_data
+
+    @classmethod
+    def set_maintenance_mode(cls, api_url, maintenance_mode):
+        """
+        取得したメンテナンスモードを記録する
+            状態が変化した場合はキャッシュを全て破棄し、メンテナンス中はキャッシュしない
+
+        Arguments:
+            api_url: maintenance-mode-settingのapi url
+            maintenance_mode: メンテナンスモードの設定値
+        """
+        with cls._lock:
+            if cls._maintenance_mode is not None and cls._maintenance_mode != maintenance_mode:
+                cls._cache.clear()
+            cls._maintenance_mode = copy.deepcopy(maintenance_mode)
+
+            if isinstance(maintenance_mode, dict) and "1" in [str(value) for value in maintenance_mode.values()]:
+                cls._cache.pop(api_url, None)
+
+    @classmethod
+    def invalidate(cls):
+        """
+        キャッシュを破棄する
+        """
+        with cls._lock:
+            cls._cache.clear()
+            cls._maintenance_mode = None
+
+
 def get_exastro_platform_workspaces():
     """
     ユーザが所属するworkspaceの一覧と、操作中のworkspaceに所属する環境をExastroPlatformに問い合わせて取得する
@@ -658,7 +766,7 @@ def get_exastro_platform_workspaces():
     else:
         # API呼出
         api_url = "http://{}:{}/internal-api/{}/platform/users/{}/workspaces".format(host_name, port, organization_id, user_id)
-        request_response = requests.get(api_url, headers=header_para, timeout=(12, 600))
+        request_response = PlatformApiCache.get_session().get(api_url, headers=header_para, timeout=(12, 600))
 
         response_data = json.loads(request_response.text)
 
@@ -717,7 +825,7 @@ def get_workspace_roles():
     else:
         # API呼出
         api_url = "http://{}:{}/internal-api/{}/platform/workspaces/{}/roles".format(host_name, port, organization_id, workspace_id)
-        request_response = requests.get(api_url, headers=header_para, timeout=(12, 600))
+        request_response = PlatformApiCache.get_session().get(api_url, headers=header_para, timeout=(12, 600))
 
         response_data = json.loads(request_response.text)
 
@@ -773,7 +881,7 @@ def get_exastro_platform_users():
     else:
         # API呼出
         api_url = "http://{}:{}/internal-api/{}/platform/workspaces/{}/users".format(host_name, port, organization_id, workspace_id)
-        request_response = requests.get(api_url, headers=header_para, timeout=(12, 600))
+        request_response = PlatformApiCache.get_session().get(api_url, headers=header_para, timeout=(12, 600))
 
         response_data = json.loads(request_response.text)
 
@@ -830,12 +938,7 @@ def get_all_execution_limit(limit_key):
 
     # API呼出
     api_url = "http://{}:{}/internal-api/platform/settings/common".format(host_name, port)
-    request_response = requests.get(api_url, headers=header_para, timeout=(12, 600))
-
-    response_data = json.loads(request_response.text)
-
-    if request_response.status_code != 200:
-        raise AppException('999-00005', [api_url, response_data])
+    response_data = PlatformApiCache.get(api_url, header_para)
 
     # システム全体の設定値取得
     limit = 0
@@ -865,12 +968,7 @@ def get_org_execution_limit(limit_key):
 
     # API呼出
     api_url = "http://{}:{}/internal-api/platform/limits".format(host_name, port)
-    request_response = requests.get(api_url, headers=header_para, timeout=(12, 600))
-
-    response_data = json.loads(request_response.text)
-
-    if request_response.status_code != 200:
-        raise AppException('999-00005', [api_url, response_data])
+    response_data = PlatformApiCache.get(api_url, header_para)
 
     # システム全体の同時実行数最大値取得
     limit_list = {}
@@ -901,13 +999,7 @@ def _get_platform_limits(organization_id):
     }
     # API呼出
     api_url = "http://{}:{}/internal-api/{}/platform/limits".format(host_name, port, organization_id)
-    request_response = requests.get(api_url, headers=header_para, timeout=(12, 600))
-
-    if request_response.status_code != 200:
-        raise AppException('999-00005', [api_url, response_data])
-
-    response_data = json.loads(request_response.text)
-    del request_response
+    response_data = PlatformApiCache.get(api_url, header_para)
 
     return response_data
 
@@ -1301,10 +1393,12 @@ def put_uploadfiles_jnl(ws_db, config_file_path, src_dir, dest_dir):
     return True
 
 
-def get_maintenance_mode_setting():
+def get_maintenance_mode_setting(refresh=False):
     """
     メンテナンスモードの状態を取得する
 
+    Arguments:
+        refresh: True=キャッシュを使用せず再取得する
     Returns:
         maintenance_mode
     """
@@ -1318,15 +1412,11 @@ def get_maintenance_mode_setting():
 
     # API呼出
     api_url = "http://{}:{}/internal-api/platform/maintenance-mode-setting".format(host_name, port)
-    request_response = requests.get(api_url, headers=header_para, timeout=(12, 600))
-
-    response_data = json.loads(request_response.text)
-
-    if request_response.status_code != 200:
-        raise AppException('999-00005', [api_url, response_data])
+    response_data = PlatformApiCache.get(api_url, header_para, refresh=refresh)
 
     # メンテナンスモードの設定値を取得
     maintenance_mode = response_data.get('data')
+    PlatformApiCache.set_maintenance_mode(api_url, maintenance_mode)
 
     return maintenance_mode
 
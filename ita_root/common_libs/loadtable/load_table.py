@@ -27,7 +27,9 @@ import gc
 from flask import g
 from common_libs.column import *  # noqa: F403
 from common_libs.common import *  # noqa: F403
-from common_libs.common.util import print_exception_msg, get_iso_datetime, arrange_stacktrace_format
+from common_libs.common.util import print_exception_msg, get_iso_datetime, arrange_stacktrace_format, get_timestamp
+from common_libs.loadtable.menu_info_cache import MenuInfoCache
+from common_libs.loadtable.unique_constraint_checker import UniqueConstraintChecker
 
 
 # 定数
@@ -107,6 +109,14 @@ SEARCH_MODE_RANGE = 'RANGE'
 REGISTER_DEFAULT_MENU = ['0', '1', '2', '3', '4']
 REGISTER_SET_PRYMARY_MENU = ['14']
 
+# 一括登録で実行できる個別処理(valid_cmdb_menu: 対象テーブルのレコードを参照しないもの)
+BULK_SAFE_VALIDATORS = [
+    'set_reference_value',
+    'set_reference_operation',
+    'varlistup_backyard_valid_menu_before',
+    'external_valid_menu_after',
+]
+
 
 class loadTable():
     """
@@ -153,6 +163,14 @@ class loadTable():
         # DBのカラム、PK
         self.primary_key = ''
         self.column_list = ''
+        # table_columns_getの結果(exclusion_parameter用)
+        self.table_columns = None
+
+        # 一括登録用: 登録するレコード、履歴の付加情報、未登録レコードの一意制約の値
+        self.bulk_rows = None
+        self.bulk_history = None
+        self.bulk_pending_unique = None
+        self.unique_constraint_checker = None
 
         # メニュー関連情報
         self.objtable = {}
@@ -377,6 +395,19 @@ class loadTable():
         cols_info = {}
         list_info = {}
 
+        # メニュー定義が更新されていなければキャッシュを使用する
+        menu_version = None
+        if MenuInfoCache.is_enabled():
+            menu_version = MenuInfoCache.get_version(self.objdbca)
+            menu_cache = MenuInfoCache.get(self.objdbca, self.menu, menu_version)
+            if menu_cache is not None:
+                self.set_column_list(menu_cache["column_list"])
+                self.set_primary_key(menu_cache["primary_key"])
+                return {
+                    MENUINFO: menu_cache["menu_info"],
+                    COLINFO: menu_cache["cols_info"]
+                }
+
         menu_id = None
         # メニュー情報
         query_str = textwrap.dedent("""
@@ -425,6 +456,9 @@ class loadTable():
         self.set_column_list(column_list)
         self.set_primary_key(primary_key_list[0])
 
+        if menu_version is not None:
+            MenuInfoCache.set(self.objdbca, self.menu, menu_version, menu_info, cols_info, column_list, primary_key_list[0])
+
         result_data = {
             MENUINFO: menu_info,
             COLINFO: cols_info
@@ -882,7 +916,7 @@ class loadTable():
         return result
 
     # [filter]:メニューのレコード取得
-    def rest_filter(self, parameter, mode='nomal', base64_file_flg=True):
+    def rest_filter(self, parameter, mode='nomal', base64_file_flg=True, stream=False):
         """
             RESTAPI[filter]:メニューのレコード取得
             ARGS:
@@ -893,6 +927,7 @@ class loadTable():
                     nomal:本体 / jnl:履歴 / jnl_all:履歴 /
                     excel:本体Excel用 / excel_jnl:履歴Excel用 / excel_jnl_all:全履歴Excel用 /
                     count:件数 / count_jnl:履歴件数 / count_jnl_all:全履歴件数
+                stream: True=レコードを主キー順にページ単位で取得し、変換したレコードを返すジェネレータを返却(inner/nomalのみ)
             RETRUN:
                 status_code, result, msg,
         """
@@ -1159,20 +1194,16 @@ class loadTable():
                     str_orderby = ''
                     where_str = where_str + str_orderby
 
-            if mode in ['inner', 'nomal', 'excel', 'jnl', 'excel_jnl', 'jnl_all', 'excel_jnl_all']:
+            if stream is True and mode in ['inner', 'nomal']:
+                # データ取得(ページ単位)
+                result_list = self.iter_filter_rows(table_name, where_str, bind_value_list, mode, base64_file_flg)
+            elif mode in ['inner', 'nomal', 'excel', 'jnl', 'excel_jnl', 'jnl_all', 'excel_jnl_all']:
                 # データ取得
                 tmp_result = self.objdbca.table_select(table_name, where_str, bind_value_list)
 
                 # RESTパラメータへキー変換
                 for rows in tmp_result:
-                    target_uuid = rows.get(primary_key)
-                    target_uuid_jnl = rows.get(COLNAME_JNL_SEQ_NO)
-                    rest_parameter, rest_file, rest_file_path = self.convert_colname_restkey(rows, target_uuid, target_uuid_jnl, mode, base64_file_flg=base64_file_flg)
-                    tmp_data = {}
-                    tmp_data.setdefault(REST_PARAMETER_KEYNAME, rest_parameter)
-                    if mode != 'excel' or mode != 'excel_jnl' or mode != 'excel_jnl_all':
-                        tmp_data.setdefault(REST_FILE_KEYNAME, rest_file)
-                    result_list.append(tmp_data)
+                    result_list.append(self.convert_filter_row(rows, mode, base64_file_flg))
             elif mode in ['count', 'count_jnl', 'jnl_count_all']:
                 # 件数取得
                 tmp_result = self.objdbca.table_count(table_name, where_str, bind_value_list)
@@ -1184,6 +1215,70 @@ class loadTable():
             result = result_list
         return status_code, result, msg,
 
+    def convert_filter_row(self, rows, mode='nomal', base64_file_flg=True):
+        """
+            RESTAPI[filter]:レコードをRESTパラメータへキー変換
+            ARGS:
+                rows:レコード
+                mode:rest_filterのmode
+                base64_file_flg: ファイル有無（True:含める、False:含めない）
+            RETRUN:
+                {"parameter": {}, "file": {}}
+        """
+        target_uuid = rows.get(self.get_primary_key())
+        target_uuid_jnl = rows.get(COLNAME_JNL_SEQ_NO)
+        rest_parameter, rest_file, rest_file_path = self.convert_colname_restkey(rows, target_uuid, target_uuid_jnl, mode, base64_file_flg=base64_file_flg)
+        tmp_data = {}
+        tmp_data.setdefault(REST_PARAMETER_KEYNAME, rest_parameter)
+        if mode != 'excel' or mode != 'excel_jnl' or mode != 'excel_jnl_all':
+            tmp_data.setdefault(REST_FILE_KEYNAME, rest_file)
+        return tmp_data
+
+    def iter_filter_rows(self, table_name, where_str, bind_value_list, mode='nomal', base64_file_flg=True):
+        """
+            RESTAPI[filter]:レコードを主キー順にページ単位で取得し、RESTパラメータへキー変換して返す
+                保持するレコードは1ページ分のみ(件数に関わらずメモリ使用量が一定)
+                レコード変換時にSQLを実行するため、非バッファカーソルではなく主キーのキーセットでページングする
+                env LOADTABLE_FILTER_PAGE_ROWS: 1ページの件数(default 1000)
+                1ページ目は呼び出し時に取得する(SQLエラーをレスポンス開始前に返すため)
+            ARGS:
+                table_name:テーブル名/VIEW名
+                where_str:検索条件(ORDER BYなし)
+                bind_value_list:検索条件のバインド値
+                mode:rest_filterのmode
+                base64_file_flg: ファイル有無（True:含める、False:含めない）
+            RETRUN:
+                generator {"parameter": {}, "file": {}}
+        """
+        page_rows = int(os.environ.get("LOADTABLE_FILTER_PAGE_ROWS", 1000))
+        primary_key = self.get_primary_key()
+
+        def select_page(last_uuid):
+            tmp_where_list = []
+            tmp_bind_value_list = list(bind_value_list)
+            tmp_where_str = where_str.strip()
+            if tmp_where_str[:5].lower() == 'where':
+                tmp_where_str = tmp_where_str[5:].strip()
+            if tmp_where_str:
+                tmp_where_list.append("({})".format(tmp_where_str))
+            if last_uuid is not None:
+                tmp_where_list.append("`{}` > %s".format(primary_key))
+                tmp_bind_value_list.append(last_uuid)
+            page_where_str = "ORDER BY `{}` LIMIT {}".format(primary_key, page_rows)
+            if tmp_where_list:
+                page_where_str = "where {} {}".format(" and ".join(tmp_where_list), page_where_str)
+            return self.objdbca.table_select(table_name, page_where_str, tmp_bind_value_list)
+
+        def generate(tmp_result):
+            while True:
+                for rows in tmp_result:
+                    yield self.convert_filter_row(rows, mode, base64_file_flg)
+                if len(tmp_result) < page_rows:
+                    break
+                tmp_result = select_page(tmp_result[-1].get(primary_key))
+
+        return generate(select_page(None))
+
     # [maintenance]:メニューのレコード操作
     def rest_maintenance(self, parameters, target_uuid='', file_paths={}):
         """
@@ -1309,6 +1404,11 @@ class loadTable():
             else:
                 tmp_result = self.objdbca.table_lock([self.get_table_name()])
 
+            # 一括登録: 全件をメモリ上で検証し、INSERTは最後にまとめて実施する
+            bulk_mode = self.is_bulk_maintenance(list_parameters, file_paths)
+            if bulk_mode is True:
+                self.start_bulk_maintenance()
+
             file_index = 0
             for tmp_parameters in list_parameters:
                 cmd_type = tmp_parameters.get("type")
@@ -1329,13 +1429,18 @@ class loadTable():
                     target_uuid = ''
 
                 # maintenance呼び出し
-                tmp_result = self.exec_maintenance(parameters, target_uuid, cmd_type, record_file_paths=record_file_paths)
+                tmp_result = self.exec_maintenance(parameters, target_uuid, cmd_type, record_file_paths=record_file_paths, bulk_mode=bulk_mode)
 
                 # エラーメッセージ保存
                 self.set_error_message()
 
                 file_index += 1
 
+            if bulk_mode is True:
+                if self.get_error_message_count() == 0:
+                    self.exec_bulk_insert()
+                self.end_bulk_maintenance()
+
             # エラーなし
             if self.get_error_message_count() == 0:
                 # コミット
@@ -1370,6 +1475,125 @@ class loadTable():
 
         return status_code, result, msg,
 
+    def is_bulk_maintenance(self, list_parameters, file_paths={}):
+        """
+            一括登録(複数行INSERT)で処理できるか判定
+                全件が登録で、ファイル項目がなく、個別処理が対象テーブルのレコードを参照しないメニューが対象
+                env LOADTABLE_BULK_MAINTENANCE_THRESHOLD: 一括登録にする件数(default 100, 0で無効)
+            ARGS:
+                list_parameters:パラメータ
+                file_paths: 登録/更新/廃止/復活するファイルのパス
+            RETRUN:
+                bool
+        """
+        threshold = int(os.environ.get("LOADTABLE_BULK_MAINTENANCE_THRESHOLD", 100))
+        if threshold <= 0 or len(list_parameters) < threshold or len(file_paths) > 0:
+            return False
+
+        for parameters in list_parameters:
+            if parameters.get("type") != CMD_REGISTER or parameters.get(REST_FILE_KEYNAME):
+                return False
+
+        validators = [self.get_menu_before_validate_register(), self.get_menu_after_validate_register()]
+        for objcol in self.get_objcols().values():
+            if objcol.get(COLNAME_COLUMN_CLASS_NAME) in ['FileUploadColumn', 'FileUploadEncryptColumn']:
+                return False
+            validators.append(objcol.get(COLNAME_BEFORE_VALIDATE_REGISTER))
+            validators.append(objcol.get(COLNAME_AFTER_VALIDATE_REGISTER))
+
+        for validator in validators:
+            if not validator:
+                continue
+            # パラメータシート作成機能で作成したメニュー(valid_cmdb_menu)の個別処理のみ許可
+            if str(self.get_sheet_type()) not in ["1", "2", "3", "4"] or validator not in BULK_SAFE_VALIDATORS:
+                return False
+
+        return True
+
+    def start_bulk_maintenance(self):
+        """
+            一括登録を開始する
+                未登録のレコードとの一意制約の重複を確認できるように、一意項目のカラムクラスに値の保持先を設定する
+                組み合わせ一意制約はUniqueConstraintCheckerで確認する
+        """
+        self.bulk_rows = []
+        self.bulk_history = []
+        self.bulk_pending_unique = {}
+
+        # 組み合わせ一意制約は登録済みのレコードを一括で取得して確認する
+        unique_constraint = self.get_unique_constraint()
+        if unique_constraint is not None:
+            self.unique_constraint_checker = UniqueConstraintChecker(self, json.loads(unique_constraint))
+
+        for rest_key, objcol in self.get_objcols().items():
+            if objcol.get('UNIQUE_ITEM') == '1':
+                self.bulk_pending_unique[rest_key] = {}
+                self.get_columnclass(rest_key, CMD_REGISTER).set_pending_unique_values(self.bulk_pending_unique[rest_key])
+
+    def end_bulk_maintenance(self):
+        """
+            一括登録を終了する
+        """
+        for rest_key in self.bulk_pending_unique:
+            self.get_columnclass(rest_key, CMD_REGISTER).set_pending_unique_values(None)
+
+        self.bulk_rows = None
+        self.bulk_history = None
+        self.bulk_pending_unique = None
+        self.unique_constraint_checker = None
+
+    def set_bulk_insert(self, colname_parameter, entry_parameter, primary_key, history_flg):
+        """
+            一括登録するレコードを保持する
+                table_insertと同様にPK、最終更新日時、履歴の付加情報を設定する
+            ARGS:
+                colname_parameter: 登録するレコード(カラム名)
+                entry_parameter: 登録するレコード(rest_key)
+                primary_key: PKのカラム名
+                history_flg: 履歴テーブル有無
+            RETRUN:
+                ([colname_parameter], journal_seq_no / None)
+        """
+        timestamp = get_timestamp()
+        if not colname_parameter.get(primary_key):
+            colname_parameter[primary_key] = self.objdbca.genarate_primary_key_value()
+        colname_parameter['LAST_UPDATE_TIMESTAMP'] = timestamp
+        target_uuid = colname_parameter[primary_key]
+
+        jnl_uuid = None
+        if history_flg is True:
+            jnl_uuid = self.objdbca.genarate_primary_key_value()
+            self.bulk_history.append({
+                COLNAME_JNL_SEQ_NO: jnl_uuid,
+                COLNAME_JNL_REG_DATETIME: timestamp,
+                COLNAME_JNL_ACTION_CLASS: 'INSERT',
+            })
+        self.bulk_rows.append(colname_parameter)
+
+        # 以降のレコードの一意制約の確認対象にする
+        for rest_key, pending_values in self.bulk_pending_unique.items():
+            pending_values.setdefault(Column.get_unique_key(entry_parameter.get(rest_key)), []).append(target_uuid)  # noqa: F405
+        if self.unique_constraint_checker is not None:
+            self.unique_constraint_checker.add_pending(entry_parameter, target_uuid)
+
+        return [colname_parameter], jnl_uuid
+
+    def exec_bulk_insert(self):
+        """
+            一括登録するレコードを複数行INSERTで登録する
+        """
+        if len(self.bulk_rows) == 0:
+            return
+
+        history_flg = self.get_history_flg()
+        self.objdbca.table_insert_bulk(
+            self.get_table_name(),
+            self.bulk_rows,
+            self.get_primary_key(),
+            history_flg,
+            self.bulk_history if history_flg is True else None
+        )
+
     def file_delete(self, list_parameters, delete_mode=False, error_break=True):
         """ファイルの物理削除前処理 / File physical deletion preprocessing
 
@@ -1645,12 +1869,13 @@ class loadTable():
 
 
     # [maintenance]:メニューのレコード操作
-    def exec_maintenance(self, parameters, target_uuid='', cmd_type='', pk_use_flg=False, auth_check=True, inner_mode=False, force_conv=False, import_mode=False, record_file_paths={}):
+    def exec_maintenance(self, parameters, target_uuid='', cmd_type='', pk_use_flg=False, auth_check=True, inner_mode=False, force_conv=False, import_mode=False, record_file_paths={}, bulk_mode=False):  # noqa: E501
         """
             RESTAPI[filter]:メニューのレコード操作
             ARGS:
                 parameters:パラメータ
                 cmd_type: 登録/更新/廃止/復活
+                bulk_mode: True=登録のINSERTを行わずにset_bulk_insertで保持する(start_bulk_maintenanceで開始していること)
             RETRUN:
                 retBool, result or msg
         """
@@ -1964,6 +2189,8 @@ class loadTable():
 
             g.applogger.debug(f"{cmd_type=}:{self.get_table_name()=}:{colname_parameter=}")
 
+            bulk_jnl_uuid = None
+
             if import_mode is True:
                 # 登録・更新処理
                 if cmd_type == CMD_REGISTER:
@@ -1976,7 +2203,10 @@ class loadTable():
                     result = self.objdbca.table_update(self.get_table_name(), colname_parameter, primary_key, False)
             else:
                 # 登録・更新処理
-                if cmd_type == CMD_REGISTER:
+                if cmd_type == CMD_REGISTER and bulk_mode is True:
+                    # 一括登録時はrest_maintenance_allでまとめてINSERTする
+                    result, bulk_jnl_uuid = self.set_bulk_insert(colname_parameter, entry_parameter, primary_key, history_flg)
+                elif cmd_type == CMD_REGISTER:
                     result = self.objdbca.table_insert(self.get_table_name(), colname_parameter, primary_key, history_flg)
                 elif cmd_type == CMD_UPDATE:
                     result = self.objdbca.table_update(self.get_table_name(), colname_parameter, primary_key, history_flg)
@@ -2007,7 +2237,9 @@ class loadTable():
                 result = tmp_result[0]
             else:
                 result_uuid = result[0].get(primary_key)
-                if history_flg is True:
+                if history_flg is True and bulk_jnl_uuid is not None:
+                    result_uuid_jnl = bulk_jnl_uuid
+                elif history_flg is True:
                     _jnl_uuid = self.get_maintenance_uuid(result_uuid)
                     if _jnl_uuid:
                         result_uuid_jnl = _jnl_uuid[0].get(COLNAME_JNL_SEQ_NO)
@@ -2357,8 +2589,13 @@ class loadTable():
             column_list = self.get_column_list()
             primary_key = self.get_primary_key()
             tmp_constraint = json.loads(unique_constraint)
+            # 一括登録時は値の組み合わせで比較する
+            checker = self.unique_constraint_checker
+            uq_keys = None
+            if checker is not None:
+                uq_keys = checker.get_keys(parameter)
             # 組み合わせ一意検索用Where句生成
-            for tmp_uq in tmp_constraint:
+            for uq_index, tmp_uq in enumerate(tmp_constraint):
                 bind_value_list = []
                 where_str = ''
                 dict_bind_kv = {}
@@ -2374,7 +2611,7 @@ class loadTable():
                         if val:
                             bind_value_list.append(val)
                         else:
-                            tmp_where_str = " (`{}` is NULL or '{}' = '')".format(tmp_constraint_key, tmp_constraint_key)
+                            tmp_where_str = " (`{}` is NULL or `{}` = '')".format(tmp_constraint_key, tmp_constraint_key)
                         where_str = where_str + ' {} {}'.format(conjunction, tmp_where_str)
                         objcolumn = self.get_columnclass(self.get_rest_key(tmp_constraint_key))
                         tmp_bool, tmp_msg, output_val = objcolumn.convert_value_output(val)
@@ -2401,7 +2638,7 @@ class loadTable():
                                         bind_value_list.append(val)
                                 else:
                                     # 入力値が「空」および「JSONとしてのnull(None)」場合、登録されている値が「空」であるかどうかとJSON_TYPEがnullであるかどうかを判定する。
-                                    where_str = where_str + conjunction + ' JSON_TYPE(JSON_EXTRACT(`{0}`,"$.{1}")) = "NULL" OR JSON_UNQUOTE(JSON_EXTRACT(`{0}`,"$.{1}")) = ""'.format(  # noqa: E501
+                                    where_str = where_str + conjunction + ' (JSON_TYPE(JSON_EXTRACT(`{0}`,"$.{1}")) = "NULL" OR JSON_UNQUOTE(JSON_EXTRACT(`{0}`,"$.{1}")) = "")'.format(  # noqa: E501
                                         self.get_col_name(tmp_constraint_key),
                                         tmp_constraint_key,
                                     )
@@ -2415,7 +2652,7 @@ class loadTable():
                                 if val:
                                     bind_value_list.append(val)
                                 else:
-                                    tmp_where_str = " (`{}` is NULL or '{}' = '')".format(tmp_constraint_col_name, tmp_constraint_col_name)
+                                    tmp_where_str = " (`{}` is NULL or `{}` = '')".format(tmp_constraint_col_name, tmp_constraint_col_name)
                                 where_str = where_str + ' {} {}'.format(conjunction, tmp_where_str)
                                 objcolumn = self.get_columnclass(tmp_constraint_key)
                                 tmp_bool, tmp_msg, output_val = objcolumn.convert_value_output(val)
@@ -2432,12 +2669,20 @@ class loadTable():
                 else:
                     where_str = " where `{}` <> 1 ".format("DISUSE_FLAG")
 
-                table_count = self.objdbca.table_select(self.get_table_name(), where_str, bind_value_list)
-                if len(table_count) != 0:
-                    list_uuids = []
+                list_uuids = []
+                if checker is not None and checker.is_batched(uq_index):
+                    # 登録済みのレコード(制約毎に1回だけ取得)との重複
+                    list_uuids = checker.get_existing_uuids(uq_index, uq_keys[uq_index])
+                else:
+                    table_count = self.objdbca.table_select(self.get_table_name(), where_str, bind_value_list)
                     for table_count_rows in table_count:
                         list_uuids.append(table_count_rows.get(primary_key))
 
+                # 一括登録で未登録のレコードとの重複
+                if checker is not None:
+                    list_uuids.extend(checker.get_pending_uuids(uq_index, uq_keys[uq_index]))
+
+                if len(list_uuids) != 0:
                     status_code = 'MSG-00006'
                     msg_args = [str(dict_bind_kv), str(list_uuids)]
                     msg = g.appmsg.get_api_message(status_code, msg_args)
@@ -2710,7 +2955,9 @@ class loadTable():
                 parameter
         """
         # テーブル情報（カラム、PK取得）
-        column_list, primary_key_list = self.objdbca.table_columns_get(self.get_table_name())
+        if self.table_columns is None:
+            self.table_columns = self.objdbca.table_columns_get(self.get_table_name())
+        column_list, primary_key_list = self.table_columns
         # 入力項目 PK以外除外
         err_keys = []
         for tmp_keys in list(parameter.keys()):
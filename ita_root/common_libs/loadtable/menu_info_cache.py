@@ -0,0 +1,176 @@
+# Copyright 2025 NEC Corporation#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""
+in-process cache of menu metadata for loadTable
+"""
+import os
+import threading
+import time
+import textwrap
+from collections import OrderedDict
+
+
+# メニュー定義のテーブル(いずれかが更新されたらキャッシュを破棄する)
+MENU_DEFINITION_TABLES = [
+    'T_COMN_MENU',
+    'T_COMN_MENU_TABLE_LINK',
+    'T_COMN_MENU_COLUMN_LINK',
+    'T_COMN_COLUMN_CLASS',
+]
+
+
+class MenuInfoCache:
+    """
+    loadTableのメニュー情報(メニュー・カラム情報、テーブルのカラム一覧)をプロセス内でキャッシュする
+        key: 接続先のworkspace-db + メニュー名(rest)
+        メニュー定義のテーブルの最終更新日時・件数が変わった場合は再取得する(最終更新日時・件数はLOADTABLE_MENU_CACHE_VERSION_TTL秒毎に確認する)
+
+        env
+            LOADTABLE_MENU_CACHE_ENABLED: "1"=キャッシュを使用する(default) / "0"=使用しない
+            LOADTABLE_MENU_CACHE_SIZE: 保持するメニュー数の上限(default 1000, 古いものから破棄する)
+            LOADTABLE_MENU_CACHE_VERSION_TTL: メニュー定義のバージョンを再取得せずに使う秒数(default 5, 0=毎回取得する)
+    """
+
+    _lock = threading.Lock()
+
+    # key: (host, port, database, menu), value: {"version": tuple, "menu_info": dict, "cols_info": dict, "column_list": list, "primary_key": str}
+    _cache = OrderedDict()
+
+    # key: (host, port, database), value: (取得した時刻, version)
+    _versions = {}
+
+    @classmethod
+    def is_enabled(cls):
+        """
+        キャッシュを使用するか
+
+        Returns:
+            bool
+        """
+        return os.environ.get("LOADTABLE_MENU_CACHE_ENABLED", "1") == "1"
+
+    @classmethod
+    def get_version(cls, objdbca):
+        """
+        メニュー定義のバージョン(テーブル毎の最終更新日時・件数)を取得する
+            loadTable毎にメニュー定義のテーブルを集計しないように、取得したバージョンを一定時間使い回す
+
+        Arguments:
+            objdbca: DB接続クラス DBConnectWs()
+        Returns:
+            version: tuple
+        """
+        ttl = float(os.environ.get("LOADTABLE_MENU_CACHE_VERSION_TTL", 5))
+        key = cls._get_key(objdbca, None)[:3]
+        now = time.monotonic()
+        if ttl > 0:
+            with cls._lock:
+                memo = cls._versions.get(key)
+            if memo is not None and now - memo[0] < ttl:
+                return memo[1]
+
+        version = cls._query_version(objdbca)
+
+        if ttl > 0:
+            with cls._lock:
+                cls._versions[key] = (now, version)
+        return version
+
+    @classmethod
+    def get(cls, objdbca, menu, version):
+        """
+        キャッシュしたメニュー情報を取得する
+
+        Arguments:
+            objdbca: DB接続クラス DBConnectWs()
+            menu: メニュー名(rest)
+            version: get_versionの戻り値
+        Returns:
+            {"menu_info", "cols_info", "column_list", "primary_key"} or None(キャッシュなし)
+        """
+        key = cls._get_key(objdbca, menu)
+        with cls._lock:
+            entry = cls._cache.get(key)
+            if entry is None:
+                return None
+            if entry["version"] != version:
+                cls._cache.pop(key)
+                return None
+            cls._cache.move_to_end(key)
+
+        # loadTableがインスタンス毎に書き換えるため、コピーを返す
+        return cls._copy(entry)
+
+    @classmethod
+    def set(cls, objdbca, menu, version, menu_info, cols_info, column_list, primary_key):
+        """
+        メニュー情報をキャッシュする
+
+        Arguments:
+            objdbca: DB接続クラス DBConnectWs()
+            menu: メニュー名(rest)
+            version: get_versionの戻り値(メニュー情報の取得前に取得したもの)
+            menu_info: メニュー情報
+            cols_info: カラム情報
+            column_list: テーブルのカラム一覧
+            primary_key: テーブルの主キー
+        """
+        max_size = int(os.environ.get("LOADTABLE_MENU_CACHE_SIZE", 1000))
+        entry = cls._copy({
+            "menu_info": menu_info,
+            "cols_info": cols_info,
+            "column_list": column_list,
+            "primary_key": primary_key,
+        })
+        entry["version"] = version
+
+        key = cls._get_key(objdbca, menu)
+        with cls._lock:
+            cls._cache[key] = entry
+            cls._cache.move_to_end(key)
+            while len(cls._cache) > max_size:
+                cls._cache.popitem(last=False)
+
+    @classmethod
+    def clear(cls):
+        """
+        キャッシュを破棄する
+        """
+        with cls._lock:
+            cls._cache.clear()
+            cls._versions.clear()
+
+    @staticmethod
+    def _query_version(objdbca):
+        query_list = []
+        for table_name in MENU_DEFINITION_TABLES:
+            query_list.append(textwrap.dedent("""
+                SELECT '{table}' AS `TABLE_NAME`, MAX(`LAST_UPDATE_TIMESTAMP`) AS `LAST_UPDATE_TIMESTAMP`, COUNT(*) AS `ROW_COUNT` FROM `{table}`
+            """).format(table=table_name).strip())
+        rows = objdbca.sql_execute(" UNION ALL ".join(query_list))
+
+        return tuple((row['TABLE_NAME'], row['LAST_UPDATE_TIMESTAMP'], row['ROW_COUNT']) for row in rows)
+
+    @staticmethod
+    def _get_key(objdbca, menu):
+        return (getattr(objdbca, "_host", None), getattr(objdbca, "_port", None), getattr(objdbca, "_db", None), menu)
+
+    @staticmethod
+    def _copy(entry):
+        return {
+            "menu_info": dict(entry["menu_info"]),
+            "cols_info": {rest_name: dict(col_info) for rest_name, col_info in entry["cols_info"].items()},
+            "column_list": list(entry["column_list"]),
+            "primary_key": entry["primary_key"],
+        }
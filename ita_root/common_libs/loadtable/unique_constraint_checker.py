@@ -0,0 +1,180 @@
+# Copyright 2025 NEC Corporation#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""
+batched combination-unique constraint checker for loadTable
+"""
+import json
+
+
+# 値をそのまま比較できるカラムの型(数値・日時型はDB側で型変換して比較するため対象外)
+STRING_DATA_TYPES = ['char', 'varchar', 'tinytext', 'text', 'mediumtext', 'longtext']
+
+
+class UniqueConstraintChecker:
+    """
+    組み合わせ一意制約を一括で確認する
+        登録済みのレコードの値の組み合わせを制約毎に1回だけ取得してハッシュ化し、
+        バッチ内で未登録のレコードの値の組み合わせと合わせて重複を確認する
+        比較は「空」「null(None)」を同一とし、末尾の空白を無視する(DBの照合順序と同じ)
+
+        登録済みのレコードが変更されない一括登録(loadTable.start_bulk_maintenance)でのみ使用する
+    """
+
+    def __init__(self, objmenu, unique_constraint):
+        """
+        Arguments:
+            objmenu: loadTable
+            unique_constraint: 組み合わせ一意制約(json.loads後) ex.[["name", "host"], ...]
+        """
+        self.objmenu = objmenu
+        self.constraints = []
+        for tmp_uq in unique_constraint:
+            targets = []
+            for tmp_constraint_key in tmp_uq:
+                target = self._get_target(tmp_constraint_key)
+                if target is not None:
+                    targets.append(target)
+            self.constraints.append(targets)
+
+        # 制約毎 {値の組み合わせ: [uuid, ...]}
+        self.existing = [None] * len(self.constraints)
+        self.pending = [{} for targets in self.constraints]
+        self.batched = None
+
+    def get_keys(self, parameter):
+        """
+        パラメータの値の組み合わせ(制約毎)
+
+        Arguments:
+            parameter: パラメータ(rest_key)
+        Returns:
+            [(値, ...), ...] 組み合わせ一意制約の順
+        """
+        result = []
+        for targets in self.constraints:
+            result.append(tuple(self.normalize(parameter.get(target["rest_key"])) for target in targets))
+        return result
+
+    def is_batched(self, uq_index):
+        """
+        登録済みのレコードを一括で確認できる制約か(レコード毎のSQLで確認する必要がないか)
+
+        Arguments:
+            uq_index: 組み合わせ一意制約の番号
+        Returns:
+            bool
+        """
+        if self.batched is None:
+            self.batched = self._get_batched()
+        return self.batched[uq_index]
+
+    def get_existing_uuids(self, uq_index, key):
+        """
+        値の組み合わせが重複する登録済みのレコード
+
+        Arguments:
+            uq_index: 組み合わせ一意制約の番号
+            key: get_keysの戻り値の要素
+        Returns:
+            [uuid, ...]
+        """
+        if self.existing[uq_index] is None:
+            self.existing[uq_index] = self._select_existing(self.constraints[uq_index])
+        return list(self.existing[uq_index].get(key, []))
+
+    def get_pending_uuids(self, uq_index, key):
+        """
+        値の組み合わせが重複する未登録のレコード
+
+        Arguments:
+            uq_index: 組み合わせ一意制約の番号
+            key: get_keysの戻り値の要素
+        Returns:
+            [uuid, ...]
+        """
+        return list(self.pending[uq_index].get(key, []))
+
+    def add_pending(self, parameter, target_uuid):
+        """
+        未登録のレコードを以降のレコードの確認対象にする
+
+        Arguments:
+            parameter: パラメータ(rest_key)
+            target_uuid: レコードのuuid
+        """
+        for uq_index, key in enumerate(self.get_keys(parameter)):
+            self.pending[uq_index].setdefault(key, []).append(target_uuid)
+
+    @staticmethod
+    def normalize(val):
+        """
+        比較する値
+
+        Arguments:
+            val: 値
+        Returns:
+            string / None(「空」「null(None)」)
+        """
+        if val is None or val == '':
+            return None
+        if isinstance(val, bool):
+            val = json.dumps(val)
+        return str(val).rstrip(' ')
+
+    def _get_target(self, tmp_constraint_key):
+        objmenu = self.objmenu
+        # カラム名,rest_name_keyか判定
+        if tmp_constraint_key in objmenu.get_column_list():
+            return {"rest_key": objmenu.get_rest_key(tmp_constraint_key), "col_name": tmp_constraint_key, "json_key": None}
+        if objmenu.get_objcol(tmp_constraint_key) is not None:
+            json_key = tmp_constraint_key if objmenu.get_save_type(tmp_constraint_key) == 'JSON' else None
+            return {"rest_key": tmp_constraint_key, "col_name": objmenu.get_col_name(tmp_constraint_key), "json_key": json_key}
+        return None
+
+    def _get_batched(self):
+        query_str = "SELECT `COLUMN_NAME`, `DATA_TYPE` FROM `information_schema`.`COLUMNS` WHERE `TABLE_SCHEMA` = DATABASE() AND `TABLE_NAME` = %s"
+        rows = self.objmenu.objdbca.sql_execute(query_str, [self.objmenu.get_table_name()])
+        data_types = {row['COLUMN_NAME']: str(row['DATA_TYPE']).lower() for row in rows}
+
+        result = []
+        for targets in self.constraints:
+            result.append(all(target["json_key"] is not None or data_types.get(target["col_name"]) in STRING_DATA_TYPES for target in targets))
+        return result
+
+    def _select_existing(self, targets):
+        objmenu = self.objmenu
+        primary_key = objmenu.get_primary_key()
+
+        col_names = [primary_key]
+        for target in targets:
+            if target["col_name"] not in col_names:
+                col_names.append(target["col_name"])
+        query_str = "SELECT {} FROM `{}` WHERE `DISUSE_FLAG` <> 1".format(
+            ", ".join(["`{}`".format(col_name) for col_name in col_names]),
+            objmenu.get_table_name()
+        )
+
+        result = {}
+        for row in objmenu.objdbca.sql_execute(query_str, []):
+            json_data = {}
+            key = []
+            for target in targets:
+                val = row.get(target["col_name"])
+                if target["json_key"] is not None:
+                    if target["col_name"] not in json_data:
+                        json_data[target["col_name"]] = json.loads(val) if val else {}
+                    val = json_data[target["col_name"]].get(target["json_key"])
+                key.append(self.normalize(val))
+            result.setdefault(tuple(key), []).append(row.get(primary_key))
+        return result
@@ -16,6 +16,7 @@ import copy
 import json
 import os
 import re
+import threading
 from abc import ABC, abstractmethod
 import concurrent.futures
 
@@ -26,7 +27,7 @@ from flask import g
 from jinja2 import Template
 from requests.adapters import HTTPAdapter
 from urllib3.util import Retry
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 
 
 class Notification(ABC):
@@ -113,7 +114,7 @@ class Notification(ABC):
                 for template_item in template_list:
                     tmp_item = copy.deepcopy(item)
                     template = template_item.get("template")
-                    message = cls._create_notise_message(tmp_item, template)
+                    message = cls._create_notise_message(tmp_item, template, template_item.get("template_key"))
                     if message is None:
                         # Jinja2テンプレート変換処理の中で例外が発生した場合は_error_message_listに詰める
                         err_list.append([tmp_item, template])
@@ -232,7 +233,7 @@ class Notification(ABC):
                 # _convert_messageでitemを直接書き換えると再実行時にエラーが発生する可能性があるため、複製したデータをベースに処理を行う。
                 tmp_item = copy.deepcopy(item)
                 template = template_item.get("template")
-                message = cls._create_notise_message(tmp_item, template)
+                message = cls._create_notise_message(tmp_item, template, template_item.get("template_key"))
 
                 # messageがNoneの場合、テンプレートの変換に失敗しているので次のループに進む
                 if message is None:
@@ -286,16 +287,17 @@ class Notification(ABC):
         pass
 
     @classmethod
-    def _create_notise_message(cls, item, template):
+    def _create_notise_message(cls, item, template, template_key=None):
         """
         通知するメッセージを作成する。
         Args:
             item: 通知するイベント
             template: メッセージのテンプレート
+            template_key: コンパイル済みテンプレートのキャッシュのキー(Noneの場合はキャッシュしない)
         """
         item = cls._convert_message(item)
 
-        jinja_template = Template(template)
+        jinja_template = cls._get_compiled_template(template, template_key)
         try:
             tmp_message = jinja_template.render(item)
         except Exception as e:
@@ -326,6 +328,59 @@ class Notification(ABC):
 
         return result
 
+    # コンパイル済みテンプレートのキャッシュ(プロセス内で共有)
+    #   _template_cache[テンプレートのキー] = (テンプレート, jinja2.Template)
+    #   テンプレートのキーはテンプレートのIDと最終更新日時を含むため、テンプレートが更新されると別のキーになる
+    _template_cache = OrderedDict()
+    _template_cache_lock = threading.Lock()
+
+    @classmethod
+    def _get_compiled_template(cls, template, template_key=None):
+        """
+        コンパイル済みのテンプレートを取得する
+        Args:
+            template: メッセージのテンプレート
+            template_key: キャッシュのキー(Noneの場合はキャッシュしない)
+        Returns:
+            jinja2.Template
+        """
+        if template_key is None:
+            return Template(template)
+
+        # 並列で同じテンプレートを何度もコンパイルしないよう、コンパイルもロックの中で行う
+        with Notification._template_cache_lock:
+            cached = Notification._template_cache.get(template_key)
+            if cached is not None and cached[0] == template:
+                Notification._template_cache.move_to_end(template_key)
+                return cached[1]
+
+            jinja_template = Template(template)
+            Notification._template_cache[template_key] = (template, jinja_template)
+            Notification._template_cache.move_to_end(template_key)
+            cache_size = int(os.environ.get("NOTIFICATION_TEMPLATE_CACHE_SIZE", 100))
+            while len(Notification._template_cache) > cache_size:
+                Notification._template_cache.popitem(last=False)
+
+        return jinja_template
+
+    @classmethod
+    def _get_cached_template(cls, template_key):
+        """
+        キャッシュ済みのテンプレートを取得する(テンプレートファイルの読み込みを省略するため)
+        Args:
+            template_key: キャッシュのキー
+        Returns:
+            テンプレート(キャッシュに無い場合はNone)
+        """
+        with Notification._template_cache_lock:
+            cached = Notification._template_cache.get(template_key)
+        return cached[0] if cached is not None else None
+
+    @classmethod
+    def clear_template_cache(cls):
+        with Notification._template_cache_lock:
+            Notification._template_cache.clear()
+
     @staticmethod
     def _convert_message(item):
         """
@@ -357,6 +412,35 @@ class Notification(ABC):
     _setting_notification_cache_org_id = None
     _setting_notification_cache_ws_id = None
 
+    # 通知API呼び出し用のrequests.Session(プロセス内で共有し、接続(keep-alive)を使い回す)
+    #   fork後の子プロセスではpidが変わるため作り直す
+    _session = None
+    _session_pid = None
+    _session_lock = threading.Lock()
+
+    @classmethod
+    def _get_session(cls):
+        """
+        通知API呼び出し用のrequests.Sessionを取得する
+        Returns:
+            requests.Session
+        """
+        with Notification._session_lock:
+            if Notification._session is None or Notification._session_pid != os.getpid():
+                # 並列で通知APIを呼び出すスレッド数分の接続をプールする
+                pool_maxsize = int(os.environ.get("MAX_WORKER_THREAD_POOL_SIZE", 12))
+                retries = Retry(total=5,
+                                backoff_factor=1)
+
+                s = requests.Session()
+                s.mount('http://', HTTPAdapter(max_retries=retries, pool_maxsize=pool_maxsize))
+                s.mount('https://', HTTPAdapter(max_retries=retries, pool_maxsize=pool_maxsize))
+
+                Notification._session = s
+                Notification._session_pid = os.getpid()
+
+            return Notification._session
+
     @classmethod
     def _call_setting_notification_api(cls, event_type_true: list = None, event_type_false: list = None, use_cache: bool = True):
         """
@@ -411,13 +495,7 @@ class Notification(ABC):
         # API呼出
         api_url = f"http://{host_name}:{port}/internal-api/{organization_id}/platform/workspaces/{workspace_id}/settings/notifications"
 
-        s = requests.Session()
-
-        retries = Retry(total=5,
-                        backoff_factor=1)
-
-        s.mount('http://', HTTPAdapter(max_retries=retries))
-        s.mount('https://', HTTPAdapter(max_retries=retries))
+        s = cls._get_session()
 
         request_response = s.request(method='GET', url=api_url, timeout=2, headers=header_para, params=query_params)
 
@@ -499,13 +577,7 @@ class Notification(ABC):
             # API呼出
             api_url = f"http://{host_name}:{port}/internal-api/{organization_id}/platform/workspaces/{workspace_id}/notifications"
 
-            s = requests.Session()
-
-            retries = Retry(total=5,
-                            backoff_factor=1)
-
-            s.mount('http://', HTTPAdapter(max_retries=retries))
-            s.mount('https://', HTTPAdapter(max_retries=retries))
+            s = cls._get_session()
 
             request_response = s.request(method='POST', url=api_url, timeout=2, headers=header_para, data=data_encode)
 
@@ -632,10 +704,7 @@ class Notification(ABC):
 
         try:
             # APIリクエスト設定
-            session = requests.Session()
-            retries = Retry(total=5, backoff_factor=1)
-            session.mount('http://', HTTPAdapter(max_retries=retries))
-            session.mount('https://', HTTPAdapter(max_retries=retries))
+            session = cls._get_session()
 
             # API呼び出し
             response = session.request(
@@ -689,13 +758,7 @@ class Notification(ABC):
         # API呼出
         api_url = f"http://{host_name}:{port}/internal-api/{cls._send_buffer_org_id}/platform/workspaces/{cls._send_buffer_ws_id}/notifications"
 
-        s = requests.Session()
-
-        retries = Retry(total=5,
-                        backoff_factor=1)
-
-        s.mount('http://', HTTPAdapter(max_retries=retries))
-        s.mount('https://', HTTPAdapter(max_retries=retries))
+        s = cls._get_session()
 
         request_response = s.request(method='POST', url=api_url, timeout=2, headers=header_para, data=data_encode)
 
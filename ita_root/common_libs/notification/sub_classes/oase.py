@@ -143,9 +143,9 @@ class OASE(Notification):
             # 以下のような返却値に変換
             # record = {
             #   'NOTIFICATION_DESTINATION': [
-            #     {'id': None,                       'UUID': 1,         'TEMPLATE_FILE': 'New.j2',   'IS_DEFAULT': '●'},
-            #     {'id': ["mailID"],                 'UUID': a-a-a-a-a, 'TEMPLATE_FILE': 'new02.j2', 'IS_DEFAULT': None},
-            #     {'id': ["webfookID","workflowID"], 'UUID': b-b-b-b-b, 'TEMPLATE_FILE': 'new03.j2', 'IS_DEFAULT': None},
+            #     {'id': None,                       'UUID': 1,         'TEMPLATE_FILE': 'New.j2',   'IS_DEFAULT': '●', 'LAST_UPDATE_TIMESTAMP': datetime},
+            #     {'id': ["mailID"],                 'UUID': a-a-a-a-a, 'TEMPLATE_FILE': 'new02.j2', 'IS_DEFAULT': None, 'LAST_UPDATE_TIMESTAMP': datetime},
+            #     {'id': ["webfookID","workflowID"], 'UUID': b-b-b-b-b, 'TEMPLATE_FILE': 'new03.j2', 'IS_DEFAULT': None, 'LAST_UPDATE_TIMESTAMP': datetime},
             #   ]
             # }
 
@@ -164,6 +164,7 @@ class OASE(Notification):
                     "UUID": row.get("UUID"),
                     "TEMPLATE_FILE": row.get("TEMPLATE_FILE"),
                     "IS_DEFAULT": row.get("IS_DEFAULT"),
+                    "LAST_UPDATE_TIMESTAMP": row.get("LAST_UPDATE_TIMESTAMP"),
                 })
 
             return {"NOTIFICATION_DESTINATION": transformed_records}
@@ -183,6 +184,7 @@ class OASE(Notification):
                 "UUID": row.get("UUID"),
                 "TEMPLATE_FILE": row.get("TEMPLATE_FILE"),
                 "IS_DEFAULT": None,
+                "LAST_UPDATE_TIMESTAMP": row.get("LAST_UPDATE_TIMESTAMP"),
             })
 
             return {"NOTIFICATION_DESTINATION": transformed_records}
@@ -205,6 +207,16 @@ class OASE(Notification):
             if file_name is None or file_name == '':
                 item["template"] = None
             else:
+                # テンプレートのID・最終更新日時が同じであれば、キャッシュ済みのテンプレートを使う
+                last_update_timestamp = item.get("LAST_UPDATE_TIMESTAMP")
+                if last_update_timestamp is not None:
+                    template_key = (g.get("ORGANIZATION_ID"), workspace_id, menu_id, rest_name, uuid, file_name, last_update_timestamp)
+                    item["template_key"] = template_key
+                    template = cls._get_cached_template(template_key)
+                    if template is not None:
+                        item["template"] = template
+                        continue
+
                 path = get_upload_file_path(workspace_id, menu_id, uuid, rest_name, file_name, "")
                 # 一時パスの生成: /tmp/<organization_id>/<workspace_id>/tmp/<uuid>/<file_name>
                 tmp_path = get_tmp_file_path(workspace_id, file_name)
@@ -310,7 +322,7 @@ class OASE(Notification):
         # T_OASE_NOTIFICATION_TEMPLATE_COMMON 共通部分の定義
         notification_template_common_base = {
             "table": "T_OASE_NOTIFICATION_TEMPLATE_COMMON",
-            "display_column": "NOTIFICATION_TEMPLATE_ID AS UUID, TEMPLATE_FILE, NOTIFICATION_DESTINATION, IS_DEFAULT",
+            "display_column": "NOTIFICATION_TEMPLATE_ID AS UUID, TEMPLATE_FILE, NOTIFICATION_DESTINATION, IS_DEFAULT, LAST_UPDATE_TIMESTAMP",
             "condition_column": "EVENT_TYPE=%s"
         }
 
@@ -348,11 +360,11 @@ class OASE(Notification):
             },
             OASENotificationType.BEFORE_ACTION: {
                 **rule_base,
-                "display_column": "RULE_ID AS UUID, BEFORE_NOTIFICATION AS TEMPLATE_FILE, BEFORE_NOTIFICATION_DESTINATION AS NOTIFICATION_DESTINATION",
+                "display_column": "RULE_ID AS UUID, BEFORE_NOTIFICATION AS TEMPLATE_FILE, BEFORE_NOTIFICATION_DESTINATION AS NOTIFICATION_DESTINATION, LAST_UPDATE_TIMESTAMP",
             },
             OASENotificationType.AFTER_ACTION: {
                 **rule_base,
-                "display_column": "RULE_ID AS UUID, AFTER_NOTIFICATION AS TEMPLATE_FILE, AFTER_NOTIFICATION_DESTINATION AS NOTIFICATION_DESTINATION",
+                "display_column": "RULE_ID AS UUID, AFTER_NOTIFICATION AS TEMPLATE_FILE, AFTER_NOTIFICATION_DESTINATION AS NOTIFICATION_DESTINATION, LAST_UPDATE_TIMESTAMP",
             }
         }
 
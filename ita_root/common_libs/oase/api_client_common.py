@@ -30,6 +30,10 @@ class APIClientCommon:
     """
         メールおよびAPI呼び出し用共通クラス
     """
+    # API・IMAPサーバー呼び出しのタイムアウト(接続, 読み込み)(秒)
+    #   イベント収集はスレッドで並列に呼び出し、待ち時間を超えた呼び出しは終了を待たないため、必ずタイムアウトを指定する
+    REQUEST_TIMEOUT = (12, 30)
+
     # 必要項目定義
     def __init__(self, setting, last_fetched_event):
         self.event_collection_settings_id = setting["EVENT_COLLECTION_SETTINGS_ID"]
@@ -54,7 +58,8 @@ class APIClientCommon:
         self.mailbox_name = setting["MAILBOXNAME"]
         # 前回イベント収集日時（初回イベント収取時は、システム日時が設定されている）
         self.last_fetched_timestamp = setting["LAST_FETCHED_TIMESTAMP"] if setting["LAST_FETCHED_TIMESTAMP"] else 0
-        self.saved_ids = setting["SAVED_IDS"] if "SAVED_IDS" in setting else None
+        # 過去に取得したイベントのid（重複チェックで使用するためセットで保持する）
+        self.saved_ids = set(setting["SAVED_IDS"]) if setting.get("SAVED_IDS") is not None else None
         self.last_fetched_event = last_fetched_event
 
         self.response_list_flag = setting["RESPONSE_LIST_FLAG"]
@@ -164,7 +169,7 @@ class APIClientCommon:
                 data=json.dumps(self.parameter).encode() if self.request_method == "POST" else None,
                 verify=self.verify,
                 proxies=proxies,
-                timeout=(12, 30)
+                timeout=self.REQUEST_TIMEOUT
             )
 
             if response.status_code < 200 or response.status_code > 299:
@@ -40,7 +40,8 @@ class IMAPAuthClient(APIClientCommon):
                 host=self.url,
                 port=self.port,
                 ssl=self.ssl,
-                ssl_context=self.ssl_context
+                ssl_context=self.ssl_context,
+                timeout=self.REQUEST_TIMEOUT[1]
             )
 
             # StartTLSの場合
@@ -0,0 +1,157 @@
+# Copyright 2025 NEC Corporation#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""
+in-process cache of undetermined labeled events for oase conclusion
+"""
+import os
+import threading
+from collections import OrderedDict
+from typing import Any
+
+from flask import g
+
+
+# 評価対象(未確定)のイベントの条件
+UNDETERMINED_SEARCH_VALUE = {
+    "labels._exastro_timeout": "0",
+    "labels._exastro_evaluated": "0",
+    "labels._exastro_undetected": "0",
+}
+
+# 登録後に更新されるフィールド(値が変わったイベントはドキュメント全体を再取得する)
+#   labels._exastro_end_time, exastro_filter_group, exastro_dup_notification_queue: WriterProcess(conclusion)
+#   labels._exastro_checked: conclusion
+#   exastro_edit_count: 重複排除(receiver)
+SYNC_FIELDS = [
+    "labels._exastro_end_time",
+    "labels._exastro_checked",
+    "exastro_filter_group",
+    "exastro_edit_count",
+    "exastro_dup_notification_queue",
+]
+
+
+class LabeledEventCache:
+    """
+    未確定(timeout, evaluated, undetected が "0")のイベントをworkspace毎にプロセス内でキャッシュする
+        key: organization_id, workspace_id, mongodbのデータベース名
+        毎回の判定で未確定のイベントのid・SYNC_FIELDSのみを取得して突き合わせ、
+        新規のイベント・SYNC_FIELDSが変わったイベントのみドキュメント全体を取得する
+        未確定でなくなったイベントはキャッシュから破棄する
+
+        env
+            OASE_EVENT_CACHE_ENABLED: "1"=キャッシュを使用する(default) / "0"=使用しない
+            OASE_EVENT_CACHE_SIZE: 保持するworkspace数の上限(default 100, 古いものから破棄する)
+            OASE_EVENT_CACHE_FETCH_ROWS: ドキュメント全体を取得する際の1回あたりの件数(default 1000)
+    """
+
+    _lock = threading.Lock()
+
+    # key: (organization_id, workspace_id, database), value: {_id: event}
+    _cache = OrderedDict()
+
+    @classmethod
+    def is_enabled(cls):
+        """
+        キャッシュを使用するか
+
+        Returns:
+            bool
+        """
+        return os.environ.get("OASE_EVENT_CACHE_ENABLED", "1") == "1"
+
+    @classmethod
+    def get_events(cls, ws_mongo, labeled_event_collection):
+        """
+        未確定のイベントを取得日時の昇順で取得する
+
+        Args:
+            ws_mongo: MONGOConnectWs
+            labeled_event_collection: labeled_event_collection
+        Returns:
+            list[Event] (呼び出し元で変更できるようにコピーを返す)
+        """
+        key = cls._get_key(ws_mongo)
+        if not cls.is_enabled() or key is None:
+            return list(labeled_event_collection.find(UNDETERMINED_SEARCH_VALUE).sort("labels._exastro_fetched_time", 1))
+
+        with cls._lock:
+            cached_events = cls._cache.pop(key, None)
+        if cached_events is None:
+            cached_events = {}
+
+        # 未確定のイベントのid・更新されるフィールドのみを取得して突き合わせる
+        projection = {field: 1 for field in SYNC_FIELDS}
+        projection["_id"] = 1
+        events = {}
+        fetch_ids = []
+        for row in labeled_event_collection.find(UNDETERMINED_SEARCH_VALUE, projection):
+            cached_event = cached_events.get(row["_id"])
+            if cached_event is not None and cls._get_sync_values(cached_event) == cls._get_sync_values(row):
+                events[row["_id"]] = cached_event
+            else:
+                fetch_ids.append(row["_id"])
+
+        # 新規・更新されたイベントのドキュメント全体を取得する
+        fetch_rows = int(os.environ.get("OASE_EVENT_CACHE_FETCH_ROWS", 1000))
+        for index in range(0, len(fetch_ids), fetch_rows):
+            search_value = dict(UNDETERMINED_SEARCH_VALUE)
+            search_value["_id"] = {"$in": fetch_ids[index:index + fetch_rows]}
+            for event in labeled_event_collection.find(search_value):
+                events[event["_id"]] = event
+
+        max_size = int(os.environ.get("OASE_EVENT_CACHE_SIZE", 100))
+        with cls._lock:
+            cls._cache[key] = events
+            cls._cache.move_to_end(key)
+            while len(cls._cache) > max_size:
+                cls._cache.popitem(last=False)
+
+        # 取得日時昇順にしておかないとグルーピングで先頭イベントが決定できなくなる
+        sorted_events = sorted(events.values(), key=lambda event: (int(event["labels"]["_exastro_fetched_time"]), str(event["_id"])))
+        return [cls._copy(event) for event in sorted_events]
+
+    @classmethod
+    def clear(cls):
+        """
+        キャッシュを破棄する
+        """
+        with cls._lock:
+            cls._cache.clear()
+
+    @staticmethod
+    def _get_key(ws_mongo):
+        organization_id = g.get('ORGANIZATION_ID')
+        workspace_id = g.get('WORKSPACE_ID')
+        if organization_id is None and workspace_id is None:
+            return None
+        return (organization_id, workspace_id, getattr(ws_mongo, "_db_name", None))
+
+    @staticmethod
+    def _get_sync_values(event: dict) -> tuple[Any, ...]:
+        values = []
+        for field in SYNC_FIELDS:
+            value = event
+            for key in field.split("."):
+                value = value.get(key) if isinstance(value, dict) else None
+            values.append(value)
+        return tuple(values)
+
+    @staticmethod
+    def _copy(event: dict) -> dict:
+        # ManageEventsはlabels等の2階層目までを書き換えるため、2階層目までコピーする
+        return {
+            key: dict(value) if isinstance(value, dict) else list(value) if isinstance(value, list) else value
+            for key, value in event.items()
+        }
@@ -25,6 +25,7 @@ from bson import ObjectId
 from flask import g
 
 from common_libs.oase.const import oaseConst
+from common_libs.oase.event_cache import LabeledEventCache
 from common_libs.common.mongoconnect.const import Const as mongoConst
 from common_libs.common.mongoconnect.mongoconnect import MONGOConnectWs
 from common_libs.notification.sub_classes.oase import OASENotificationType, OASE
@@ -78,6 +79,106 @@ class TtlGroup(TypedDict):
     """グループの後続イベント"""
 
 
+class LabelIndex:
+    """ラベルの転置インデックス(ラベルキー → ラベル値 → イベントIDのset)
+
+    フィルター条件の判定をイベント毎の走査ではなくsetの積・差で行う
+    イベントのラベルを変更した場合はupdateを呼び出してインデックスを更新すること
+    """
+
+    def __init__(self) -> None:
+        self._key_ids: dict[str, set[ObjectId]] = {}
+        """ラベルキー → ラベルキーを持つイベントID"""
+
+        self._value_ids: dict[str, dict[Any, set[ObjectId]]] = {}
+        """ラベルキー → ラベル値 → イベントID"""
+
+        self._indexed_labels: dict[ObjectId, dict[str, Any]] = {}
+        """インデックスに登録済みのラベル(イベントID毎)"""
+
+        self._order: dict[ObjectId, int] = {}
+        """イベントの登録順(イベントキャッシュの順序で結果を返すため)"""
+
+        self.active_ids: set[ObjectId] = set()
+        """判定対象(未タイムアウトかつ未評価)のイベントID"""
+
+    def __len__(self) -> int:
+        return len(self._indexed_labels)
+
+    def update(self, event: Event) -> None:
+        """イベントを登録する(登録済みの場合は変更されたラベルのみ更新する)
+
+        Args:
+            event (Event): イベント
+        """
+        event_id = event["_id"]
+        labels = event.get("labels") or {}
+        indexed_labels = self._indexed_labels.get(event_id, {})
+        self._order.setdefault(event_id, len(self._order))
+
+        for key, value in indexed_labels.items():
+            if key not in labels or labels[key] != value:
+                self._discard(event_id, key, value)
+        for key, value in labels.items():
+            if key not in indexed_labels or indexed_labels[key] != value:
+                self._add(event_id, key, value)
+        self._indexed_labels[event_id] = dict(labels)
+
+        # タイムアウトイベント、処理済みイベントは判定対象外
+        if str(labels.get("_exastro_timeout")) == "0" and str(labels.get("_exastro_evaluated")) == "0":
+            self.active_ids.add(event_id)
+        else:
+            self.active_ids.discard(event_id)
+
+    def find(self, event_judge_list: list[dict[str, str]]) -> list[ObjectId]:
+        """全てのラベル条件に合致する判定対象のイベントIDを返す
+
+        Args:
+            event_judge_list (list[dict[str, str]]): ラベル条件(LabelKey, LabelValue, LabelCondition)
+
+        Returns:
+            list[ObjectId]: 合致したイベントID(登録順)
+        """
+        candidate_ids = self.active_ids
+        for item in event_judge_list:
+            key = item["LabelKey"]
+            value = item["LabelValue"]
+            key_ids = self._key_ids.get(key, set())
+            value_ids = self._value_ids.get(key, {}).get(value, set()) if self._is_hashable(value) else set()
+            if str(item["LabelCondition"]) == oaseConst.DF_TEST_EQ:
+                # 「*」はワイルドカードとして扱う
+                candidate_ids = candidate_ids & (key_ids if value == "*" else value_ids)
+            else:
+                candidate_ids = (candidate_ids & key_ids) - value_ids
+            if not candidate_ids:
+                return []
+
+        return sorted(candidate_ids, key=self._order.__getitem__)
+
+    def _add(self, event_id: ObjectId, key: str, value: Any) -> None:
+        self._key_ids.setdefault(key, set()).add(event_id)
+        if self._is_hashable(value):
+            self._value_ids.setdefault(key, {}).setdefault(value, set()).add(event_id)
+
+    def _discard(self, event_id: ObjectId, key: str, value: Any) -> None:
+        self._key_ids.get(key, set()).discard(event_id)
+        if self._is_hashable(value):
+            values = self._value_ids.get(key, {})
+            value_ids = values.get(value, set())
+            value_ids.discard(event_id)
+            if not value_ids:
+                values.pop(value, None)
+
+    @staticmethod
+    def _is_hashable(value: Any) -> bool:
+        try:
+            hash(value)
+        except TypeError:
+            # list、dictのラベル値は文字列の条件値と一致しないため、キーのみ登録する
+            return False
+        return True
+
+
 class ManageEvents:
     def __init__(self, ws_mongo: MONGOConnectWs, judge_time: int) -> None:
         self._label_master: dict[str, str] = {}
@@ -92,22 +193,15 @@ class ManageEvents:
 
         # イベントキャッシュの作成
 
-        # 以下条件のイベントを取得
-        undetermined_search_value = {
-            "labels._exastro_timeout": "0",
-            "labels._exastro_evaluated": "0",
-            "labels._exastro_undetected": "0",
-        }
-        labeled_events = self.labeled_event_collection.find(
-            undetermined_search_value
-        ).sort(
-            # 取得日時昇順にしておかないとグルーピングで先頭イベントが決定できなくなる
-            "labels._exastro_fetched_time",
-            1,
+        # 未確定(timeout, evaluated, undetected が "0")のイベントを取得日時昇順で取得
+        # 前回の判定から追加・更新されたイベントのみをDBから取得する
+        labeled_events = LabeledEventCache.get_events(
+            ws_mongo, self.labeled_event_collection
         )
 
         self.labeled_events_dict: dict[ObjectId, Event] = {}
         self.unevaluated_event_ids = set()
+        self.label_index = LabelIndex()
 
         for event in labeled_events:
             event[oaseConst.DF_LOCAL_LABLE_NAME] = {}
@@ -128,6 +222,7 @@ class ManageEvents:
                 event_status,
             )
             self.labeled_events_dict[event["_id"]] = event
+            self.label_index.update(event)
 
             self.collect_unevaluated_event(event["_id"], event, initial=True)
 
@@ -167,42 +262,20 @@ class ManageEvents:
         return event
 
     def find_events(self, event_judge_list):
-        used_event_list = []
+        # イベントキャッシュが直接変更されている場合はインデックスを作り直す
+        if len(self.label_index) != len(self.labeled_events_dict):
+            self.rebuild_label_index()
 
-        for event_id, event in self.labeled_events_dict.items():
-            # タイムアウトイベント判定
-            if str(event["labels"]["_exastro_timeout"]) != "0":
-                continue
-            # 処理済みイベント判定
-            if str(event["labels"]["_exastro_evaluated"]) != "0":
-                continue
-            labels = event["labels"]
-            judge_result = {}
-            judge_result["count"] = 0
-            judge_result["True"] = 0
-            judge_result["False"] = 0
-            for item in event_judge_list:
-                judge_result["count"] += 1
-                key = item["LabelKey"]
-                value = item["LabelValue"]
-                condition = item["LabelCondition"]
-                hit = False
-                if key in labels:
-                    if str(condition) == oaseConst.DF_TEST_EQ:
-                        # 「*」はワイルドカードとして扱う
-                        if labels[key] == value or value == "*":
-                            hit = True
-                    else:
-                        if labels[key] != value:
-                            hit = True
-                judge_result[str(hit)] += 1
-                if hit is False:
-                    break
-            if judge_result["count"] == judge_result["True"]:
-                used_event_list.append(event["_id"])
+        used_event_list = self.label_index.find(event_judge_list)
 
         return True, used_event_list
 
+    def rebuild_label_index(self):
+        """ラベルの転置インデックスをイベントキャッシュから作り直す"""
+        self.label_index = LabelIndex()
+        for event in self.labeled_events_dict.values():
+            self.label_index.update(event)
+
     def count_events(self):
         return len(self.labeled_events_dict)
 
@@ -256,6 +329,7 @@ class ManageEvents:
         )
         # キャッシュに保存
         self.labeled_events_dict[event["_id"]] = event
+        self.label_index.update(event)
         self.collect_unevaluated_event(event["_id"], event)
 
     def get_events(self, event_id):
@@ -294,6 +368,7 @@ class ManageEvents:
                 post_proc_timeout_event_ids.append(event_id)
                 # 通知用には labels._exastro_timeout: 1 に変更したものを返す
                 event["labels"]["_exastro_timeout"] = "1"
+                self.label_index.update(event)
                 post_proc_timeout_event_rows.append(event)
 
         return post_proc_timeout_event_ids, post_proc_timeout_event_rows
@@ -345,6 +420,7 @@ class ManageEvents:
                 return False
             for key, value in update_flag_dict.items():
                 self.labeled_events_dict[event_id]["labels"][key] = value
+            self.label_index.update(self.labeled_events_dict[event_id])
 
             self.collect_unevaluated_event(event_id)
 
@@ -369,6 +445,7 @@ class ManageEvents:
             event = self.labeled_events_dict.get(event_id)
             if event:
                 event["labels"].update(update_labels_dict)
+                self.label_index.update(event)
                 self.collect_unevaluated_event(event_id, event)
 
             # MongoDB更新
@@ -606,6 +683,8 @@ class ManageEvents:
                 for remaining_event in ttl_group["remaining_events"]:
                     remaining_event["labels"][f"_exastro_{disable_type}"] = "1"
                     del remaining_event["exastro_filter_group"]
+                    if remaining_event["_id"] in self.labeled_events_dict:
+                        self.label_index.update(self.labeled_events_dict[remaining_event["_id"]])
                 break
 
         # グルーピング情報削除、無効のMongoDB更新
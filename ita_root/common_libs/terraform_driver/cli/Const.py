@@ -82,6 +82,9 @@ class Const(CommonConst):
     DIR_EXECUTE = '/driver/terraform_cli/execute'  # 作業状態確認
     DIR_WORK = '/driver/terraform_cli/workspace'  # Terraform CLIコマンド実行用
     DIR_TEMP = '/tmp/driver/terraform_cli'  # Temporary
+    DIR_PLUGIN_CACHE = '/driver/terraform_cli/plugin_cache'  # providerのキャッシュ(TF_PLUGIN_CACHE_DIR)
+    DIR_PROVIDER_MIRROR = '/driver/terraform_cli/provider_mirror'  # providerのミラー(filesystem_mirror)
+    DIR_LOCK_FILE = '/driver/terraform_cli/lock_file'  # Module毎の依存関係ロックファイル(.terraform.lock.hcl)
 
     # ファイル名
     FILE_EMERGENCY_STOP = 'emergency_stop'  # 緊急停止の検知用ファイル
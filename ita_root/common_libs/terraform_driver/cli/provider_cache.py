@@ -0,0 +1,209 @@
+#   Copyright 2025 NEC Corporation
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""
+terraform initで取得するproviderを作業実行間で共有するモジュール
+"""
+import fcntl
+import glob
+import hashlib
+import os
+import shutil
+import time
+from contextlib import contextmanager
+
+from common_libs.terraform_driver.cli.Const import Const as TFCLIConst
+
+
+class ProviderCache:
+    """
+    terraform initで取得するproviderを作業実行間で共有する
+        ・TF_PLUGIN_CACHE_DIRにproviderをキャッシュし、2回目以降のダウンロードを省略する
+        ・provider_mirrorディレクトリがある場合はfilesystem_mirrorとして優先して参照する
+        ・Module(*.tf)の内容が同じ作業実行では依存関係ロックファイル(.terraform.lock.hcl)を再利用する
+    TF_PLUGIN_CACHE_DIRは複数のterraform initから同時に書き込めないため、initはlock()の中で実行する
+    ロックを取得できない場合は、キャッシュを使わずにinitを実行する(get_env_without_plugin_cache)
+    """
+
+    LOCK_FILE_NAME = ".terraform.lock.hcl"
+    # lock()の待ち時間(秒)
+    LOCK_WAIT_INTERVAL = 1
+    LOCK_WAIT_TIMEOUT = 60
+
+    def __init__(self, base_dir):
+        """
+        Arguments:
+            base_dir: /storage/{organization_id}/{workspace_id}
+        """
+        self.plugin_cache_dir = base_dir + TFCLIConst.DIR_PLUGIN_CACHE
+        self.provider_mirror_dir = base_dir + TFCLIConst.DIR_PROVIDER_MIRROR
+        self.lock_file_dir = base_dir + TFCLIConst.DIR_LOCK_FILE
+        self.cli_config_file_path = self.plugin_cache_dir + "/.terraformrc"
+        self.exclusive_lock_path = self.plugin_cache_dir + "/.tf_plugin_cache_lock"
+
+        os.makedirs(self.plugin_cache_dir, exist_ok=True)
+        os.makedirs(self.lock_file_dir, exist_ok=True)
+
+    def get_env(self):
+        """
+        terraformコマンドに渡す環境変数を取得
+
+        Returns:
+            env: dict
+        """
+        env = os.environ.copy()
+        env["TF_PLUGIN_CACHE_DIR"] = self.plugin_cache_dir
+
+        # 利用者がCLI設定ファイルを指定している場合はそちらを優先する
+        if os.path.isdir(self.provider_mirror_dir) and "TF_CLI_CONFIG_FILE" not in os.environ:
+            config = (
+                'provider_installation {\n'
+                '  filesystem_mirror {\n'
+                '    path = "%s"\n'
+                '  }\n'
+                '  direct {}\n'
+                '}\n'
+            ) % (self.provider_mirror_dir)
+            self._write_cli_config(config)
+            env["TF_CLI_CONFIG_FILE"] = self.cli_config_file_path
+
+        return env
+
+    def _write_cli_config(self, config):
+        """
+        CLI設定ファイルを書き込む
+            他の作業実行のterraformが読み込み中の場合があるため、内容が異なる場合のみ一時ファイルから置き換える
+
+        Arguments:
+            config: CLI設定ファイルの内容
+        """
+        try:
+            with open(self.cli_config_file_path) as f:
+                if f.read() == config:
+                    return
+        except FileNotFoundError:
+            pass
+
+        tmp_cli_config_file_path = "{}.{}".format(self.cli_config_file_path, os.getpid())
+        with open(tmp_cli_config_file_path, "w") as f:
+            f.write(config)
+        os.replace(tmp_cli_config_file_path, self.cli_config_file_path)
+
+    def get_env_without_plugin_cache(self, env):
+        """
+        TF_PLUGIN_CACHE_DIRを使わない環境変数を取得(lock()を取得できなかった場合のinit用)
+
+        Arguments:
+            env: get_env()の戻り値
+        Returns:
+            env: dict
+        """
+        env = dict(env)
+        env.pop("TF_PLUGIN_CACHE_DIR", None)
+        return env
+
+    @contextmanager
+    def lock(self, timeout=None, is_cancelled=None):
+        """
+        TF_PLUGIN_CACHE_DIRの排他ロック
+            他のterraform initが終わるまで待つ
+            待ち時間を超えた場合・is_cancelled()がTrueになった場合は、ロックを取得せずにFalseを返す
+
+        Arguments:
+            timeout: 待ち時間(秒) 未指定の場合はLOCK_WAIT_TIMEOUT
+            is_cancelled: 待つのをやめるか判定する関数(緊急停止など)
+        Yields:
+            locked: bool ロックを取得できたか
+        """
+        if timeout is None:
+            timeout = self.LOCK_WAIT_TIMEOUT
+
+        fd = open(self.exclusive_lock_path, "a")
+        try:
+            limit = time.time() + timeout
+            locked = False
+            while True:
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    locked = True
+                    break
+                except BlockingIOError:
+                    if time.time() >= limit or (is_cancelled is not None and is_cancelled() is True):
+                        break
+                    time.sleep(min(self.LOCK_WAIT_INTERVAL, max(limit - time.time(), 0)))
+            yield locked
+        finally:
+            fd.close()
+
+    def get_module_key(self, workspace_work_dir):
+        """
+        Module(*.tf)の内容からロックファイルの保存キーを生成
+
+        Arguments:
+            workspace_work_dir: terraformの実行ディレクトリ
+        Returns:
+            key: str (Moduleがない場合はNone)
+        """
+        tf_file_list = sorted(glob.glob(workspace_work_dir + "/*.tf"))
+        if len(tf_file_list) == 0:
+            return None
+
+        sha256 = hashlib.sha256()
+        for tf_file in tf_file_list:
+            sha256.update(os.path.basename(tf_file).encode())
+            sha256.update(b"\0")
+            with open(tf_file, "rb") as f:
+                sha256.update(hashlib.sha256(f.read()).digest())
+        return sha256.hexdigest()
+
+    def restore_lock_file(self, module_key, workspace_work_dir):
+        """
+        同じModuleで保存したロックファイルを実行ディレクトリにコピー
+
+        Arguments:
+            module_key: get_module_key()の戻り値
+            workspace_work_dir: terraformの実行ディレクトリ
+        Returns:
+            bool: コピーした場合True
+        """
+        if module_key is None:
+            return False
+
+        saved_lock_file_path = "{}/{}{}".format(self.lock_file_dir, module_key, self.LOCK_FILE_NAME)
+        if not os.path.isfile(saved_lock_file_path):
+            return False
+
+        shutil.copyfile(saved_lock_file_path, "{}/{}".format(workspace_work_dir, self.LOCK_FILE_NAME))
+        return True
+
+    def save_lock_file(self, module_key, workspace_work_dir):
+        """
+        terraform initで作成されたロックファイルをModule毎に保存
+
+        Arguments:
+            module_key: get_module_key()の戻り値
+            workspace_work_dir: terraformの実行ディレクトリ
+        Returns:
+            bool: 保存した場合True
+        """
+        work_lock_file_path = "{}/{}".format(workspace_work_dir, self.LOCK_FILE_NAME)
+        if module_key is None or not os.path.isfile(work_lock_file_path):
+            return False
+
+        saved_lock_file_path = "{}/{}{}".format(self.lock_file_dir, module_key, self.LOCK_FILE_NAME)
+        # 途中の状態を読み込まないように一時ファイルからrenameする
+        tmp_lock_file_path = "{}.{}".format(saved_lock_file_path, os.getpid())
+        shutil.copyfile(work_lock_file_path, tmp_lock_file_path)
+        os.replace(tmp_lock_file_path, saved_lock_file_path)
+        return True
@@ -101,6 +101,10 @@ class Const(CommonConst):
     DIR_EXECUTE = '/driver/terraform_cloud_ep/execute'  # 作業状態確認
     DIR_TEMP = '/tmp/driver/terraform_cloud_ep'  # Temporary
 
+    # Workspace Variable同期
+    VAR_SYNC_MAX_WORKERS = 4  # Variableの登録/更新/削除を並列実行するスレッド数
+    VAR_SYNC_DESCRIPTION_PREFIX = 'ita-hash:'  # Variableのdescriptionに記録する値のハッシュの接頭辞
+
     # Terraform RUN Status
     TF_RUN_CANCEL = 'canceled'
 
@@ -30,6 +30,7 @@ class RestApiCaller():
         Terraform Cloud/Enterprise用 REST API call クラス
     """
     API_BASE_PATH = "/api/v2"
+    RETRY_AFTER_MAX = 60  # Retry-Afterに従って待つ最大秒数
 
     def __init__(self, protocol, hostName, portNo=None, encryptedAuthToken=None, proxySetting=None):
         if portNo:
@@ -111,7 +112,8 @@ class RestApiCaller():
         print_url = "URL: %s\n" % (url)
 
         # RESTAPI失敗時は３回までリトライ
-        for t in range(3):
+        retry_count = 3
+        for t in range(retry_count):
             ################################
             # RestCall
             ################################
@@ -155,6 +157,7 @@ class RestApiCaller():
             except urllib.error.HTTPError as e:
                 # 返却用のArrayを編集
                 response_array['statusCode'] = e.code
+                response_array['responseHeaders'] = list(e.headers.items()) if e.headers else []
                 e_read = json.loads(e.read())
                 if e_read:
                     errors = e_read.get('errors')
@@ -250,7 +253,9 @@ class RestApiCaller():
 
             # ステータスコードがが200～399ではない場合はリトライ
             if response_array['statusCode'] < 200 or response_array['statusCode'] >= 400:
-                time.sleep(1)
+                # Rate Limit(429)の場合はRetry-Afterに従って待つ(最後の試行の後は待たない)
+                if t < retry_count - 1:
+                    time.sleep(self.getRetryAfter(response_array, 1))
                 continue
             else:
                 break
@@ -374,6 +379,27 @@ class RestApiCaller():
 
         return False
 
+    def getRetryAfter(self, response_array, default):
+        """
+            Rate Limit(429)時の待ち時間をRetry-Afterヘッダから取得する
+            ARGS:
+                response_array: rest_callの返却値
+                default: Retry-Afterが取得できない場合の待ち時間(秒)
+            RETRUN:
+                待ち時間(秒)
+        """
+        if response_array.get('statusCode') != 429:
+            return default
+
+        for arrHeader in response_array.get('responseHeaders') or []:
+            if arrHeader[0].strip().lower() == 'retry-after':
+                try:
+                    return min(max(float(arrHeader[1]), 0), self.RETRY_AFTER_MAX)
+                except (TypeError, ValueError):
+                    break
+
+        return default
+
     def getAccessToken(self):
         return self.accessToken
 
@@ -278,7 +278,7 @@ def delete_tf_workspace_var(restApiCaller, tf_manage_variable_id):
     return response_array
 
 
-def create_tf_workspace_var(restApiCaller, tf_manage_workspace_id, key, value, hcl=False, sensitive=False, category="terraform"):
+def create_tf_workspace_var(restApiCaller, tf_manage_workspace_id, key, value, hcl=False, sensitive=False, category="terraform", description=""):
     """
         連携先Terraformから対象のVariables(変数)を削除する
         ARGS:
@@ -289,6 +289,7 @@ def create_tf_workspace_var(restApiCaller, tf_manage_workspace_id, key, value, h
             hcl: HCL設定のON/OFF(True or False)
             sensitive: Sensitive設定のON/OFF(True or False)
             category: "terraform" or "env"
+            description: 変数の説明
         RETRUN:
             response_array: RESTAPI返却値
 
@@ -300,7 +301,7 @@ def create_tf_workspace_var(restApiCaller, tf_manage_workspace_id, key, value, h
             "attributes": {
                 "key": key,
                 "value": value,
-                "description": "",
+                "description": description,
                 "category": category,
                 "hcl": hcl,
                 "sensitive": sensitive
@@ -320,6 +321,40 @@ def create_tf_workspace_var(restApiCaller, tf_manage_workspace_id, key, value, h
     return response_array
 
 
+def update_tf_workspace_var(restApiCaller, tf_manage_variable_id, key, value, hcl=False, sensitive=False, description=""):
+    """
+        連携先Terraformに登録されている対象のVariables(変数)を更新する
+        ARGS:
+            restApiCaller: RESTAPIコールクラス
+            tf_manage_variable_id: Terraformで管理しているVarableのID
+            key: 更新する変数のkey
+            value: 更新する変数のvalue
+            hcl: HCL設定のON/OFF(True or False)
+            sensitive: Sensitive設定のON/OFF(True or False)
+            description: 変数の説明
+        RETRUN:
+            response_array: RESTAPI返却値
+
+    """
+    api_uri = '/vars/%s' % (tf_manage_variable_id)
+    request_contents = {
+        "data": {
+            "id": tf_manage_variable_id,
+            "type": "vars",
+            "attributes": {
+                "key": key,
+                "value": value,
+                "description": description,
+                "hcl": hcl,
+                "sensitive": sensitive
+            }
+        }
+    }
+    response_array = restApiCaller.rest_call('PATCH', api_uri, request_contents)
+
+    return response_array
+
+
 def get_upload_url(restApiCaller, tf_manage_workspace_id):
     """
         tar.gzファイルをアップロードするためのURLを取得する
@@ -0,0 +1,247 @@
+#   Copyright 2025 NEC Corporation
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""
+連携先TerraformのWorkspace Variablesを差分で同期するモジュール
+"""
+import concurrent.futures
+import copy
+import hashlib
+import hmac
+
+from flask import g, current_app, has_app_context
+
+from common_libs.common.encrypt import ENCRYPT_KEY
+from common_libs.terraform_driver.cloud_ep.Const import Const as TFCloudEPConst
+from common_libs.terraform_driver.cloud_ep.terraform_restapi import \
+    create_tf_workspace_var, update_tf_workspace_var, delete_tf_workspace_var
+
+
+class WorkspaceVarSync:
+    """
+    連携先TerraformのWorkspace Variablesを、登録したいVariableに合わせて差分で同期する
+        ・登録済みVariableの一覧(1回取得したもの)とcategory+keyで突き合わせ、登録/更新/削除の対象を求める
+        ・値はdescriptionに記録したハッシュで比較する(sensitiveの値は読み返せないため)
+        ・変更があるVariableのみ、スレッド数を制限して並列にRESTAPIを実行する
+        ・Rate Limit(429)のリトライはRestApiCaller.rest_callで行う(Retry-Afterに従う)
+    """
+
+    ACTION_CREATE = 'create'
+    ACTION_UPDATE = 'update'
+    ACTION_DELETE = 'delete'
+    ACTION_RECREATE = 'recreate'
+
+    # 各操作が成功した場合のステータスコード
+    SUCCESS_STATUS_CODE = {
+        ACTION_CREATE: (201, ),
+        ACTION_UPDATE: (200, ),
+        ACTION_DELETE: (204, 404),
+    }
+
+    def __init__(self, restApiCaller, tf_manage_workspace_id, max_workers=TFCloudEPConst.VAR_SYNC_MAX_WORKERS):
+        """
+        Arguments:
+            restApiCaller: RESTAPIコールクラス
+            tf_manage_workspace_id: Terraformで管理するWorkspaceのID
+            max_workers: 並列実行するスレッド数
+        """
+        self.restApiCaller = restApiCaller
+        self.tf_manage_workspace_id = tf_manage_workspace_id
+        self.max_workers = max(int(max_workers), 1)
+        self.vars = {}
+
+    def add_var(self, key, value, hcl=False, sensitive=False, category="terraform"):
+        """
+        登録したいVariableを追加する(同じcategory+keyは後から追加したものが優先)
+
+        Arguments:
+            key: 変数のkey
+            value: 変数のvalue
+            hcl: HCL設定のON/OFF(True or False)
+            sensitive: Sensitive設定のON/OFF(True or False)
+            category: "terraform" or "env"
+        """
+        value = "" if value is None else str(value)
+        self.vars[(category, key)] = {
+            "key": key,
+            "value": value,
+            "hcl": bool(hcl),
+            "sensitive": bool(sensitive),
+            "category": category,
+            "description": self.get_description(value),
+        }
+
+    @staticmethod
+    def get_description(value):
+        """
+        descriptionに記録する値のハッシュを取得する(ENCRYPT_KEYをキーにしたHMAC-SHA256)
+
+        Arguments:
+            value: 変数のvalue
+        Returns:
+            description: str
+        """
+        digest = hmac.new(ENCRYPT_KEY, value.encode('utf-8'), hashlib.sha256).hexdigest()
+        return TFCloudEPConst.VAR_SYNC_DESCRIPTION_PREFIX + digest
+
+    def plan(self, current_var_list):
+        """
+        登録済みVariableの一覧と突き合わせ、実行する操作を求める
+
+        Arguments:
+            current_var_list: 登録済みVariableの一覧(get_tf_workspace_var_listのresponseContentsのdata)
+        Returns:
+            operation_list: [{"action", "key", "category", "var_id", "var"}, ...]
+        """
+        current_vars = {}
+        operation_list = []
+        for data in current_var_list or []:
+            attributes = data.get('attributes') or {}
+            var_key = (attributes.get('category'), attributes.get('key'))
+            if var_key in self.vars and var_key not in current_vars:
+                current_vars[var_key] = data
+                continue
+
+            # 登録したいVariableに無いもの、重複して登録されているものは削除
+            operation_list.append(self._operation(self.ACTION_DELETE, var_key[1], var_key[0], data.get('id')))
+
+        for var_key, var in self.vars.items():
+            data = current_vars.get(var_key)
+            if data is None:
+                operation_list.append(self._operation(self.ACTION_CREATE, var['key'], var['category'], None, var))
+                continue
+
+            attributes = data.get('attributes') or {}
+            if attributes.get('sensitive') is True and var['sensitive'] is False:
+                # sensitiveは解除できないため、削除して登録し直す
+                operation_list.append(self._operation(self.ACTION_RECREATE, var['key'], var['category'], data.get('id'), var))
+                continue
+
+            if attributes.get('hcl') == var['hcl'] and \
+                    attributes.get('sensitive') == var['sensitive'] and \
+                    attributes.get('description') == var['description'] and \
+                    (var['sensitive'] is True or attributes.get('value') == var['value']):
+                continue
+
+            operation_list.append(self._operation(self.ACTION_UPDATE, var['key'], var['category'], data.get('id'), var))
+
+        return operation_list
+
+    def apply(self, operation_list):
+        """
+        操作を並列に実行する
+
+        Arguments:
+            operation_list: plan()の返却値
+        Returns:
+            failed_list: 失敗した操作のlist(各操作に"statusCode"を設定し、get_failed_priorityの順で返す)
+        """
+        failed_list = []
+        if len(operation_list) == 0:
+            return failed_list
+
+        if self.max_workers == 1 or len(operation_list) == 1:
+            for operation in operation_list:
+                if self._execute(operation) is False:
+                    failed_list.append(operation)
+            return self._sort_failed_list(operation_list, failed_list)
+
+        # gの内容はスレッド毎のapp_contextに複製して渡す
+        app = current_app._get_current_object() if has_app_context() else None
+        g_values = {name: getattr(g, name) for name in g} if app is not None else {}
+
+        max_workers = min(self.max_workers, len(operation_list))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tf_var_sync") as executor:
+            futures = {executor.submit(self._execute_in_context, app, g_values, operation): operation for operation in operation_list}
+            for future in concurrent.futures.as_completed(futures):
+                if future.result() is False:
+                    failed_list.append(futures[future])
+
+        return self._sort_failed_list(operation_list, failed_list)
+
+    def get_failed_priority(self, operation):
+        """
+        失敗した操作の優先順を取得する
+            削除 > env変数の登録/更新 > terraform変数の登録/更新
+
+        Arguments:
+            operation: 失敗した操作
+        Returns:
+            priority: int(小さいほど優先)
+        """
+        if operation['action'] == self.ACTION_DELETE:
+            return 0
+        if operation['category'] == "env":
+            return 1
+        return 2
+
+    def sync(self, current_var_list):
+        """
+        登録済みVariableの一覧と突き合わせ、差分のみ同期する
+
+        Arguments:
+            current_var_list: 登録済みVariableの一覧(get_tf_workspace_var_listのresponseContentsのdata)
+        Returns:
+            failed_list: 失敗した操作のlist
+        """
+        return self.apply(self.plan(current_var_list))
+
+    def _sort_failed_list(self, operation_list, failed_list):
+        # 完了順は実行毎に異なるため、優先順・planの順に並べ直す
+        order = {id(operation): index for index, operation in enumerate(operation_list)}
+        return sorted(failed_list, key=lambda operation: (self.get_failed_priority(operation), order[id(operation)]))
+
+    def _operation(self, action, key, category, var_id, var=None):
+        return {"action": action, "key": key, "category": category, "var_id": var_id, "var": var, "statusCode": None}
+
+    def _execute_in_context(self, app, g_values, operation):
+        if app is None:
+            return self._execute(operation)
+
+        with app.app_context():
+            for name, value in g_values.items():
+                setattr(g, name, value)
+            return self._execute(operation)
+
+    def _execute(self, operation):
+        # RestApiCallerは呼び出し毎に結果(RestResultList)を保持するため、スレッド毎に複製して使う
+        restApiCaller = copy.copy(self.restApiCaller)
+        action = operation['action']
+        var = operation['var']
+
+        if action in (self.ACTION_DELETE, self.ACTION_RECREATE):
+            status_code = self._call(restApiCaller, delete_tf_workspace_var, operation['var_id'])
+            operation['statusCode'] = status_code
+            if status_code not in self.SUCCESS_STATUS_CODE[self.ACTION_DELETE]:
+                return False
+            if action == self.ACTION_DELETE:
+                return True
+
+        if action in (self.ACTION_CREATE, self.ACTION_RECREATE):
+            status_code = self._call(
+                restApiCaller, create_tf_workspace_var, self.tf_manage_workspace_id, var['key'], var['value'],
+                var['hcl'], var['sensitive'], var['category'], var['description'])
+            operation['statusCode'] = status_code
+            return status_code in self.SUCCESS_STATUS_CODE[self.ACTION_CREATE]
+
+        status_code = self._call(
+            restApiCaller, update_tf_workspace_var, operation['var_id'], var['key'], var['value'],
+            var['hcl'], var['sensitive'], var['description'])
+        operation['statusCode'] = status_code
+        return status_code in self.SUCCESS_STATUS_CODE[self.ACTION_UPDATE]
+
+    def _call(self, restApiCaller, func, *args):
+        # リトライ(Rate Limit(429)を含む)はrest_callで行うため、ここでは1回だけ実行する
+        response_array = func(restApiCaller, *args)
+        return response_array.get('statusCode')
@@ -17,16 +17,19 @@ import time
 import os
 import glob
 import json
-import re
 import mimetypes
 
 from flask import g
 from common_libs.common import *  # noqa: F403
 from common_libs.ag.util import app_exception, exception
+from common_libs.common.child_process_pool import ChildProcessPool
 from common_libs.ansible_driver.classes.AnscConstClass import AnscConst
 from agent.libs.exastro_api import Exastro_API
 from libs.util import *  # noqa: F403
 
+# 作業実行の子プロセスの起動スクリプト
+CHILD_INIT_PATH = "agent/agent_child_init.py"
+
 
 def agent_main(organization_id, workspace_id, loop_count, interval):
 
@@ -129,9 +132,7 @@ def main_logic(organization_id, workspace_id, exastro_api, baseUrl):
                 # 子プロ起動
                 g.applogger.info(g.appmsg.get_log_message("MSG-11006", [workspace_id, execution_no]))
 
-                command = ["python3", "agent/agent_child_init.py", organization_id, workspace_id, execution_no, value["driver_id"], value["build_type"], runtime_data_del, "start"]
-
-                subprocess.Popen(command)
+                ChildProcessPool.start(CHILD_INIT_PATH, [organization_id, workspace_id, execution_no, value["driver_id"], value["build_type"], runtime_data_del, "start"])
 
                 # 子プロ起動状態ファイル生成
                 create_execution_status_file(organization_id, workspace_id, value["driver_id"], execution_no)  # noqa: F405
@@ -217,42 +218,14 @@ def child_process_exist_check(organization_id, workspace_id, execution_no, drive
     Returns:
         bool
     """
-    # psコマンドでagent/agent_child_init.pyの起動プロセスリストを作成
-    # psコマンドがマレに起動プロセスリストを取りこぼすことがあるので3回分を作成
-    # command = ["python3", "agent/agent_child_init.py", organization_id, workspace_id, execution_no, driver_id]
-
-    child_process_1 = child_process_exist_check_ps()
-    time.sleep(0.05)
-    child_process_2 = child_process_exist_check_ps()
-    time.sleep(0.05)
-    child_process_3 = child_process_exist_check_ps()
-
     # プロセス再起動上限値
     # 子プロ再起動は行わない
     # プロセス再起動上限値は0とする
     child_process_retry_limit = int(os.getenv('CHILD_PROCESS_RETRY_LIMIT', 0))
 
     # 子プロ起動確認
-    is_running = False
-    # command = ["python3", "agent/agent_child_init.py", organization_id, workspace_id, execution_no]
-    command_args = "{} {} {} {}".format('agent/agent_child_init.py', organization_id, workspace_id, execution_no)
-
-    child_process_arr = child_process_1.split('\n')
-    for r_child_process in child_process_arr:
-        if re.search(command_args, r_child_process) is not None:
-            is_running = True
-
-    if is_running is False:
-        child_process_arr = child_process_2.split('\n')
-        for r_child_process in child_process_arr:
-            if re.search(command_args, r_child_process) is not None:
-                is_running = True
-
-    if is_running is False:
-        child_process_arr = child_process_3.split('\n')
-        for r_child_process in child_process_arr:
-            if re.search(command_args, r_child_process) is not None:
-                is_running = True
+    # 起動した子プロセスはChildProcessPoolで管理する（psコマンドは使用しない）
+    is_running = ChildProcessPool.is_running(CHILD_INIT_PATH, [organization_id, workspace_id, execution_no])
 
     if is_running is False:
         # ステータスファイルがあるか確認
@@ -271,8 +244,7 @@ def child_process_exist_check(organization_id, workspace_id, execution_no, drive
 
                 g.applogger.info(g.appmsg.get_log_message("MSG-11005", [workspace_id, execution_no, str(reboot_cnt)]))
                 # 子プロ再起動
-                command = ["python3", "agent/agent_child_init.py", organization_id, workspace_id, execution_no, driver_id, runtime_data_del, "restart"]
-                cp = subprocess.Popen(command)  # noqa: F841
+                ChildProcessPool.start(CHILD_INIT_PATH, [organization_id, workspace_id, execution_no, driver_id, runtime_data_del, "restart"])
             else:
                 g.applogger.info(g.appmsg.get_log_message("MSG-11004", [workspace_id, execution_no]))
                 return False
@@ -280,49 +252,6 @@ def child_process_exist_check(organization_id, workspace_id, execution_no, drive
     return True
 
 
-def child_process_exist_check_ps():
-    """
-    実行中の子プロのpsコマンド取得結果
-
-    Returns:
-        stdout row
-    """
-    # ps -efw | grep agent/agent_child_init.py | grep -v grep
-    cp1 = subprocess.run(
-        ["ps", "-efw"],
-        capture_output=True,
-        text=True
-    )
-    if cp1.returncode != 0 and cp1.stderr:
-        cp1.check_returncode()
-
-    cp2 = subprocess.run(
-        ["grep", "agent/agent_child_init.py"],
-        capture_output=True,
-        text=True,
-        input=cp1.stdout
-    )
-    if cp2.returncode != 0 and cp2.stderr:
-        cp2.check_returncode()
-
-    cp3 = subprocess.run(
-        ["grep", "-v", "grep"],
-        capture_output=True,
-        text=True,
-        input=cp2.stdout
-    )
-
-    if cp3.returncode == 0:
-        # 検索結果あり
-        return cp3.stdout
-    elif cp3.returncode == 1 and not cp3.stderr:
-        # 検索結果なし（0行）
-        return ""
-    else:
-        # 例外を起こす
-        cp3.check_returncode()
-
-
 def get_working_child_process(organization_id, workspace_id, start_up_list):
     """ステータスファイルから作業一覧取得
     Args:
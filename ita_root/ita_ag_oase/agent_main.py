@@ -188,109 +188,12 @@ def collection_logic(sqliteDB, organization_id, workspace_id, exastro_api):
 
     # ITAに送信するデータを取得
     g.applogger.debug(g.appmsg.get_log_message("AGT-10016", []))
-    post_body = {
-        "events": []
-    }
-    unsent_event_rowids = {}  # アップデート用rowidリスト
-    unsent_timestamp_rowids = {}  # アップデート用rowidリスト
-    send_to_ita_flag = False
-
-    # event_collection_settings_nameとfetched_timeの組み合わせで辞書を作成
-    # 設定名ごとに未送信の「取得回」を取得
-    for name in setting_name_list:
-        unsent_event_rowids[name] = []
-        unsent_timestamp_rowids[name] = []
-
-        try:
-            sqliteDB.db_cursor.execute(
-                """
-                SELECT rowid, event_collection_settings_name, fetched_time FROM sent_timestamp
-                WHERE event_collection_settings_name=? AND sent_flag=?
-                """,
-                (name, 0)
-            )
-            unsent_timestamp = sqliteDB.db_cursor.fetchall()
-            unsent_timestamp_rowids[name].extend([row[0] for row in unsent_timestamp])
-        except sqlite3.OperationalError:
-            continue
-
-        if unsent_timestamp == []:
-            continue
-        else:
-            send_to_ita_flag = True
-
-        # 作成した辞書を使用して「イベント」をDBから検索
-        for item in unsent_timestamp:
-            unsent_event = {}
-            event_collection_settings_name = item[1]
-            fetched_time = item[2]
-            unsent_event["fetched_time"] = fetched_time
-            unsent_event["event_collection_settings_name"] = event_collection_settings_name
-            unsent_event["agent"] = g.AGENT_INFO
-            unsent_event["event"] = []
-
-            sqliteDB.db_cursor.execute(
-                """
-                SELECT rowid, event_collection_settings_name, event, fetched_time FROM events
-                WHERE event_collection_settings_name=? AND fetched_time=? AND sent_flag=?
-                """,
-                (event_collection_settings_name, fetched_time, 0)
-            )
-            unsent_events = sqliteDB.db_cursor.fetchall()
-            for row in unsent_events:
-                unsent_event_rowids[name].append(row[0])
-                # 文字列で保存されていたイベントをJSON形式に再変換
-                json_event = json.loads(row[2])
-                unsent_event["event"].append(json_event)
-
-            post_body["events"].append(unsent_event)
+    unsent_timestamp_list = get_unsent_timestamp(sqliteDB, setting_name_list)
 
     # ITAにデータを送信
-    if send_to_ita_flag is True:
-        status_code = None
-        response = None
-        event_count = 0
-        for event in post_body["events"]:
-            event_count = event_count + len(event["event"])
-        # "Sending {} events to Exastro IT Automation"
-        g.applogger.info(g.appmsg.get_log_message("AGT-10017", [event_count]))
+    if len(unsent_timestamp_list) > 0:
         endpoint = f"/api/{organization_id}/workspaces/{workspace_id}/oase_agent/events"
-        try:
-            status_code, response = exastro_api.api_request(
-                "POST",
-                endpoint,
-                post_body
-            )
-        except AppException as e:  # noqa E405
-            app_exception(e)
-
-        # データ送信に成功した場合、sent_flagカラムの値をtrueにアップデート
-        if status_code == 200:
-            # "Successfully sent events to Exastro IT Automation."
-            response_data = response["data"]
-            if isinstance(response_data, list) is True and len(response_data) > 0:
-                msg = " Here are not saved events\n{}".format(",\n".join(response_data))
-            else:
-                msg = ""
-            # del response_data
-            g.applogger.info(g.appmsg.get_log_message("AGT-10018", [msg]))
-
-            for name in setting_name_list:
-                for table_name, data_list in {"events": unsent_event_rowids[name], "sent_timestamp": unsent_timestamp_rowids[name]}.items():
-                    try:
-                        sqliteDB.db_connect.execute("BEGIN")
-                        sqliteDB.update_sent_flag(table_name, data_list)
-                        sqliteDB.db_connect.commit()
-                    except AppException as e:  # noqa E405
-                        sqliteDB.db_connect.rollback()
-                        app_exception(e)
-                        break
-
-            g.applogger.debug(g.appmsg.get_log_message("AGT-10019", []))
-        else:
-            g.applogger.info(g.appmsg.get_log_message("AGT-10020", [status_code, response]))
-            g.applogger.info("post_body={}".format(post_body))
-
+        send_events(sqliteDB, exastro_api, endpoint, unsent_timestamp_list)
     else:
         g.applogger.info(g.appmsg.get_log_message("AGT-10021", []))
 
@@ -356,6 +259,162 @@ def collection_logic(sqliteDB, organization_id, workspace_id, exastro_api):
     return
 
 
+def get_unsent_timestamp(sqliteDB, setting_name_list):
+    """
+    未送信の「取得回」(イベント収集設定名 x fetched_time)を取得する
+
+    Args:
+        sqliteDB: sqliteConnect
+        setting_name_list: イベント収集設定名のリスト
+    Returns:
+        [(rowid, event_collection_settings_name, fetched_time)] (fetched_timeの昇順)
+    """
+    unsent_timestamp_list = []
+    for name in setting_name_list:
+        try:
+            sqliteDB.db_cursor.execute(
+                """
+                SELECT rowid, event_collection_settings_name, fetched_time FROM sent_timestamp
+                WHERE event_collection_settings_name=? AND sent_flag=?
+                """,
+                (name, 0)
+            )
+            unsent_timestamp_list.extend(sqliteDB.db_cursor.fetchall())
+        except sqlite3.OperationalError:
+            continue
+
+    # ITA側では、送信済みのfetched_timeより古い取得回は保存されないため、古いものから送信する
+    unsent_timestamp_list.sort(key=lambda item: (item[2], item[0]))
+    return unsent_timestamp_list
+
+
+def send_events(sqliteDB, exastro_api, endpoint, unsent_timestamp_list):
+    """
+    未送信のイベントを、件数・サイズの上限毎に分割してITAに送信する
+        取得回(イベント収集設定名 x fetched_time)の途中では分割しない
+        送信に成功した分は都度sent_flagを更新し、失敗した場合は以降の送信を次回に持ち越す
+
+        env
+            EVENT_SEND_MAX_EVENTS: 1回の送信に含めるイベント数の上限(default 1000)
+            EVENT_SEND_MAX_BYTES: 1回の送信に含めるイベントのサイズ(圧縮前)の上限(default 10MB)
+            EVENT_SEND_COMPRESS: "1"=リクエストボディをgzip圧縮する(default) / "0"=圧縮しない
+
+    Args:
+        sqliteDB: sqliteConnect
+        exastro_api: Exastro_API
+        endpoint: 送信先のエンドポイント
+        unsent_timestamp_list: get_unsent_timestamp の戻り値
+    Returns:
+        bool: 全て送信できたか
+    """
+    max_events = int(os.environ.get("EVENT_SEND_MAX_EVENTS", 1000))
+    max_bytes = int(os.environ.get("EVENT_SEND_MAX_BYTES", 10 * 1024 * 1024))
+
+    batch = []
+    batch_event_count = 0
+    batch_bytes = 0
+    for timestamp_rowid, event_collection_settings_name, fetched_time in unsent_timestamp_list:
+        unsent_event = {}
+        unsent_event["fetched_time"] = fetched_time
+        unsent_event["event_collection_settings_name"] = event_collection_settings_name
+        unsent_event["agent"] = g.AGENT_INFO
+        unsent_event["event"] = []
+
+        # 作成した取得回を使用して「イベント」をDBから検索
+        sqliteDB.db_cursor.execute(
+            """
+            SELECT rowid, event_collection_settings_name, event, fetched_time FROM events
+            WHERE event_collection_settings_name=? AND fetched_time=? AND sent_flag=?
+            """,
+            (event_collection_settings_name, fetched_time, 0)
+        )
+        event_rowids = []
+        event_bytes = 0
+        for row in sqliteDB.db_cursor.fetchall():
+            event_rowids.append(row[0])
+            event_bytes += len(row[2])
+            # 文字列で保存されていたイベントをJSON形式に再変換
+            unsent_event["event"].append(json.loads(row[2]))
+
+        # 上限を超える場合は、ここまでの分を送信する
+        if len(batch) > 0 and (batch_event_count + len(event_rowids) > max_events or batch_bytes + event_bytes > max_bytes):
+            if post_events(sqliteDB, exastro_api, endpoint, batch) is False:
+                return False
+            batch = []
+            batch_event_count = 0
+            batch_bytes = 0
+
+        batch.append((timestamp_rowid, event_rowids, unsent_event))
+        batch_event_count += len(event_rowids)
+        batch_bytes += event_bytes
+
+    if len(batch) > 0:
+        return post_events(sqliteDB, exastro_api, endpoint, batch)
+    return True
+
+
+def post_events(sqliteDB, exastro_api, endpoint, batch):
+    """
+    イベントをITAに送信し、送信に成功した場合はsent_flagを更新する
+
+    Args:
+        sqliteDB: sqliteConnect
+        exastro_api: Exastro_API
+        endpoint: 送信先のエンドポイント
+        batch: [(sent_timestampのrowid, eventsのrowidのリスト, 送信する取得回のデータ)]
+    Returns:
+        bool: 送信に成功したか
+    """
+    post_body = {
+        "events": [unsent_event for _, _, unsent_event in batch]
+    }
+    status_code = None
+    response = None
+    event_count = sum(len(unsent_event["event"]) for unsent_event in post_body["events"])
+    # "Sending {} events to Exastro IT Automation"
+    g.applogger.info(g.appmsg.get_log_message("AGT-10017", [event_count]))
+    try:
+        status_code, response = exastro_api.api_request(
+            "POST",
+            endpoint,
+            post_body,
+            compress=os.environ.get("EVENT_SEND_COMPRESS", "1") == "1"
+        )
+    except AppException as e:  # noqa E405
+        app_exception(e)
+
+    # データ送信に成功した場合、sent_flagカラムの値をtrueにアップデート
+    if status_code != 200:
+        g.applogger.info(g.appmsg.get_log_message("AGT-10020", [status_code, response]))
+        g.applogger.info("post_body={}".format(post_body))
+        return False
+
+    # "Successfully sent events to Exastro IT Automation."
+    response_data = response["data"]
+    if isinstance(response_data, list) is True and len(response_data) > 0:
+        msg = " Here are not saved events\n{}".format(",\n".join(response_data))
+    else:
+        msg = ""
+    g.applogger.info(g.appmsg.get_log_message("AGT-10018", [msg]))
+
+    update_rowids = {
+        "events": [rowid for _, event_rowids, _ in batch for rowid in event_rowids],
+        "sent_timestamp": [timestamp_rowid for timestamp_rowid, _, _ in batch],
+    }
+    for table_name, data_list in update_rowids.items():
+        try:
+            sqliteDB.db_connect.execute("BEGIN")
+            sqliteDB.update_sent_flag(table_name, data_list)
+            sqliteDB.db_connect.commit()
+        except AppException as e:  # noqa E405
+            sqliteDB.db_connect.rollback()
+            app_exception(e)
+            break
+
+    g.applogger.debug(g.appmsg.get_log_message("AGT-10019", []))
+    return True
+
+
 def get_agent_version():
     """
         agent_versionの取得
@@ -13,7 +13,10 @@
 #
 
 from flask import g
+import concurrent.futures
+import contextvars
 import datetime
+import os
 import jmespath
 import json
 import sqlite3
@@ -27,79 +30,184 @@ from common_libs.oase.encrypt import agent_decrypt
 # イベント収集
 ######################################################
 def collect_event(sqlite_db, event_collection_settings, last_fetched_timestamps=None):
+    """
+    イベント収集設定毎にAPIを呼び出してイベントを収集する
+        SQLiteの読み込み・APIクライアントの生成は順番に行い、APIの呼び出しのみ並列に行う
+        戻り値はイベント収集設定の順に並べる
+
+        env
+            EVENT_COLLECTION_MAX_WORKERS: APIを同時に呼び出す数の上限(default 8)
+            EVENT_COLLECTION_TIMEOUT: 全てのAPI呼び出しを待つ時間の上限(秒, default 120)
+    """
     events_list = []
     event_collection_result_list = []  # イベント収集対象の収集結果（最新収集日時の保存の可否に利用する）
     pass_phrase = g.ORGANIZATION_ID + " " + g.WORKSPACE_ID
 
+    api_client_list = []
     for setting in event_collection_settings:
         setting["LAST_FETCHED_TIMESTAMP"] = last_fetched_timestamps[setting["EVENT_COLLECTION_SETTINGS_NAME"]]
 
         # 過去に取得したevent_collection_settings_nameに対応するデータ（idリスト、イベント）をDBから取得する
-        # idリスト -> 重複取得防止のためチェックに利用
-        # イベント -> 最後に取得したイベントをAPIのパラメータに利用するため（探しやすいようにID降順で後ろから検索）
-        try:
-            sqlite_db.db_cursor.execute(
-                "SELECT id, event, fetched_time, sent_flag FROM events WHERE event_collection_settings_name=? ORDER BY fetched_time DESC, id DESC",
-                (setting["EVENT_COLLECTION_SETTINGS_NAME"], )
-            )
-            saved_event_data_list = sqlite_db.db_cursor.fetchall()
-
-            # 保存されているイベントのidのリスト
-            saved_ids = [saved_event_data[0] for saved_event_data in saved_event_data_list]
-
-            # 最後に取得したイベントを検索
-            last_fetched_event = None
-            last_fetched_event_is_found = False
-            for saved_event_data in saved_event_data_list:
-                if last_fetched_event_is_found is False:
-                    try:
-                        saved_event = json.loads(saved_event_data[1])
-                        if "_exastro_not_available" not in saved_event:
-                            last_fetched_event = saved_event
-                            last_fetched_event_is_found = True
-                    except Exception as e:
-                        g.applogger.info("Error occured while checking latest event({}). ERROR={}".format(saved_event_data, e))
-            saved_event_data_list = None
-        except sqlite3.OperationalError:  # テーブルがまだ作成されていない時の例外処理
-            saved_ids = []
+        saved_ids, last_fetched_event = get_saved_events(sqlite_db, setting["EVENT_COLLECTION_SETTINGS_NAME"])
         setting["SAVED_IDS"] = saved_ids
 
-        fetched_time = datetime.datetime.now()  # API取得時間
-
-        # イベント収集設定名とfetched_timeを記録しておく（次回の取得日時に利用するためのdbへの保存の可否に利用する）
-        event_collection_result = {}
-        event_collection_result["name"] = setting["EVENT_COLLECTION_SETTINGS_NAME"]
-        event_collection_result["fetched_time"] = int(fetched_time.timestamp())
-        event_collection_result["is_save"] = True
-
         # パスワードカラムを複合化しておく
         setting['AUTH_TOKEN'] = agent_decrypt(setting['AUTH_TOKEN'], pass_phrase)
         setting['PASSWORD'] = agent_decrypt(setting['PASSWORD'], pass_phrase)
         setting['SECRET_ACCESS_KEY'] = agent_decrypt(setting['SECRET_ACCESS_KEY'], pass_phrase)
 
-        # APIの呼び出し
+        # APIクライアントの生成
         api_client = get_auth_client(setting=setting, last_fetched_event=last_fetched_event)  # noqa: F405
-        org_json_data = {}
-        try:
-            _, org_json_data = api_client.call_api()
-        except AppException as e:
-            g.applogger.info(g.appmsg.get_log_message("AGT-10001", [setting["EVENT_COLLECTION_SETTINGS_ID"]]))
-            app_exception(e)
-            event_collection_result["is_save"] = False
+        api_client_list.append(api_client)
+
+    if len(api_client_list) == 0:
+        return events_list, event_collection_result_list
+
+    # APIの呼び出し（並列）
+    max_workers = max(1, min(int(os.environ.get("EVENT_COLLECTION_MAX_WORKERS", 8)), len(api_client_list)))
+    timeout = float(os.environ.get("EVENT_COLLECTION_TIMEOUT", 120))
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        futures = []
+        for api_client in api_client_list:
+            # スレッドからもgを参照できるように、コンテキストをコピーして実行する
+            futures.append(executor.submit(contextvars.copy_context().run, call_event_api, api_client))
+
+        # 全てのAPI呼び出しを合わせて待ち時間の上限までだけ待つ
+        concurrent.futures.wait(futures, timeout=timeout)
+
+        for setting, future in zip(event_collection_settings, futures):
+            # イベント収集設定名とfetched_timeを記録しておく（次回の取得日時に利用するためのdbへの保存の可否に利用する）
+            event_collection_result = {}
+            event_collection_result["name"] = setting["EVENT_COLLECTION_SETTINGS_NAME"]
+            event_collection_result["is_save"] = True
+
+            org_json_data = {}
+            if not future.done():
+                # 待ち時間を超えた(未開始の場合は取り消す)
+                future.cancel()
+                fetched_time = datetime.datetime.now()
+                g.applogger.info(g.appmsg.get_log_message("AGT-10001", [setting["EVENT_COLLECTION_SETTINGS_ID"]]))
+                g.applogger.info("API call timed out. timeout={}s event_collection_settings_id={}".format(timeout, setting["EVENT_COLLECTION_SETTINGS_ID"]))
+                event_collection_result["is_save"] = False
+            else:
+                try:
+                    fetched_time, org_json_data = future.result()
+                except CallEventApiError as e:
+                    fetched_time = e.fetched_time
+                    g.applogger.info(g.appmsg.get_log_message("AGT-10001", [setting["EVENT_COLLECTION_SETTINGS_ID"]]))
+                    app_exception(e.app_exception)
+                    event_collection_result["is_save"] = False
+            event_collection_result["fetched_time"] = int(fetched_time.timestamp())
+
+            # 戻り値のevent_collection_result_listに追加しておく
+            event_collection_result["len"] = 0
+            event_collection_result_list.append(event_collection_result)
+
+            events, event_length = extract_events(setting, fetched_time, org_json_data)
+
+            if event_length > 0:
+                events_list.extend(events)
+                event_collection_result["len"] = event_length  # イベント収集数の更新
+
+            g.applogger.debug(f'{event_collection_result=}')
+    finally:
+        # 待ち時間を超えたAPI呼び出しの終了は待たない(APIClientCommon.REQUEST_TIMEOUTで終了する)
+        executor.shutdown(wait=False, cancel_futures=True)
 
-        # 戻り値のevent_collection_result_listに追加しておく
-        event_collection_result["len"] = 0
-        event_collection_result_list.append(event_collection_result)
+    return events_list, event_collection_result_list
 
-        events, event_length = extract_events(setting, fetched_time, org_json_data)
 
-        if event_length > 0:
-            events_list.extend(events)
-            event_collection_result["len"] = event_length  # イベント収集数の更新
+class CallEventApiError(Exception):
+    """
+    API呼び出しのAppExceptionを、呼び出した時刻とともに呼び出し元のスレッドへ返す
+    """
+    def __init__(self, fetched_time, app_exception):
+        super().__init__(app_exception)
+        self.fetched_time = fetched_time
+        self.app_exception = app_exception
 
-        g.applogger.debug(f'{event_collection_result=}')
 
-    return events_list, event_collection_result_list
+def call_event_api(api_client):
+    """
+    APIを呼び出す(スレッドで実行する)
+
+    Args:
+        api_client: get_auth_clientで生成したAPIクライアント
+    Returns:
+        fetched_time: API取得時間
+        org_json_data: レスポンス
+    """
+    fetched_time = datetime.datetime.now()  # API取得時間
+    try:
+        _, org_json_data = api_client.call_api()
+    except AppException as e:
+        raise CallEventApiError(fetched_time, e)
+    return fetched_time, org_json_data
+
+
+def get_saved_events(sqlite_db, event_collection_settings_name):
+    """
+    過去に取得したイベントのidセット、最後に取得したイベントをSQLiteから取得する
+        idセット -> 重複取得防止のためチェックに利用（イベント本体は読まずにインデックスのみで取得する）
+        イベント -> 最後に取得したイベントをAPIのパラメータに利用するため（last_eventテーブルのポインタから取得し、
+                    無い場合はID降順で後ろから検索）
+
+    Args:
+        sqlite_db: sqliteConnect
+        event_collection_settings_name: イベント収集設定名
+    Returns:
+        saved_ids: 保存されているイベントのidのセット
+        last_fetched_event: 最後に取得したイベント(無い場合はNone)
+    """
+    last_fetched_event = None
+    try:
+        sqlite_db.db_cursor.execute(
+            "SELECT id FROM events WHERE event_collection_settings_name=?",
+            (event_collection_settings_name, )
+        )
+        # 保存されているイベントのidのセット
+        saved_ids = {saved_event_data[0] for saved_event_data in sqlite_db.db_cursor.fetchall()}
+    except sqlite3.OperationalError:  # テーブルがまだ作成されていない時の例外処理
+        return set(), last_fetched_event
+
+    try:
+        # ポインタが指すイベントが削除されていない場合はそのイベントを使う
+        sqlite_db.db_cursor.execute(
+            """
+                SELECT events.id, events.event, events.fetched_time, events.sent_flag FROM last_event
+                INNER JOIN events ON events.rowid = last_event.event_rowid
+                    AND events.event_collection_settings_name = last_event.event_collection_settings_name
+                    AND events.fetched_time = last_event.fetched_time
+                    AND events.id IS last_event.id
+                WHERE last_event.event_collection_settings_name=?
+            """,
+            (event_collection_settings_name, )
+        )
+        saved_event_data = sqlite_db.db_cursor.fetchone()
+    except sqlite3.OperationalError:  # テーブルがまだ作成されていない時の例外処理
+        saved_event_data = None
+    if saved_event_data is not None:
+        try:
+            return saved_ids, json.loads(saved_event_data[1])
+        except Exception as e:
+            g.applogger.info("Error occured while checking latest event({}). ERROR={}".format(saved_event_data, e))
+
+    # 最後に取得したイベントを検索（見つかった時点で読み込みを終了する）
+    cursor = sqlite_db.db_cursor.execute(
+        "SELECT id, event, fetched_time, sent_flag FROM events WHERE event_collection_settings_name=? ORDER BY fetched_time DESC, id DESC",
+        (event_collection_settings_name, )
+    )
+    for saved_event_data in cursor:
+        try:
+            saved_event = json.loads(saved_event_data[1])
+            if "_exastro_not_available" not in saved_event:
+                last_fetched_event = saved_event
+                break
+        except Exception as e:
+            g.applogger.info("Error occured while checking latest event({}). ERROR={}".format(saved_event_data, e))
+
+    return saved_ids, last_fetched_event
 
 
 def extract_events(setting, fetched_time, org_json_data):
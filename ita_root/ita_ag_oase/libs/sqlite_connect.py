@@ -42,6 +42,24 @@ class sqliteConnect:
                 )
             """
         )
+        # 重複取得防止のidの検索・最後に取得したイベントの検索用のインデックス
+        self.db_cursor.execute(
+            """
+                CREATE INDEX IF NOT EXISTS events_name_fetched_time_id
+                ON events(event_collection_settings_name, fetched_time, id)
+            """
+        )
+        # last_eventテーブル(イベント収集設定毎に、最後に取得したイベントのrowidを保持する)
+        self.db_cursor.execute(
+            """
+                CREATE TABLE IF NOT EXISTS last_event(
+                    event_collection_settings_name TEXT PRIMARY KEY,
+                    event_rowid INTEGER NOT NULL,
+                    id TEXT,
+                    fetched_time INTEGER NOT NULL
+                )
+            """
+        )
         # sent_timestampテーブル
         self.db_cursor.execute(
             f"""
@@ -71,6 +89,7 @@ class sqliteConnect:
 
         timestamp_info = []
         processed = set()
+        last_events = {}  # イベント収集設定毎の最後に取得したイベントのキー (fetched_time, id)
         try:
             for event in events:
                 # データの加工
@@ -84,6 +103,13 @@ class sqliteConnect:
                 event_data = (event["_exastro_event_collection_settings_name"], unique_id, json.dumps(event), event["_exastro_fetched_time"], False)
 
                 event_data_group.append(event_data)
+
+                # 最後に取得したイベント(_exastro_not_available のイベントは除く)
+                if "_exastro_not_available" not in event:
+                    name = event["_exastro_event_collection_settings_name"]
+                    last_event_key = (event["_exastro_fetched_time"], unique_id)
+                    if name not in last_events or self._last_event_order(last_event_key) >= self._last_event_order(last_events[name]):
+                        last_events[name] = last_event_key
                 rec_count = rec_count + 1
                 rec_num = rec_num + 1
 
@@ -107,6 +133,13 @@ class sqliteConnect:
             g.applogger.info('insert_events error')
             raise AppException("AGT-10027", [e, event])
 
+        try:
+            for name, last_event_key in last_events.items():
+                self.update_last_event(name, *last_event_key)
+        except Exception as e:
+            g.applogger.info('update_last_event error')
+            raise AppException("AGT-10027", [e, name])
+
         try:
             # イベントが1件以上ある場合のみ保存
             for info in timestamp_info:
@@ -198,6 +231,37 @@ class sqliteConnect:
                 (fetched_time, id)
             )
 
+    def update_last_event(self, name, fetched_time, id):
+        """
+        最後に取得したイベントのポインタを更新する（保存済みのものより新しい場合のみ）
+        """
+        table_name = "last_event"
+
+        # 同じキーのイベントが複数ある場合は後から保存したものを指す
+        self.db_cursor.execute(
+            "SELECT rowid FROM events WHERE event_collection_settings_name=? AND fetched_time=? AND id IS ? ORDER BY rowid DESC LIMIT 1",
+            (name, fetched_time, None if id is None else str(id))
+        )
+        record = self.db_cursor.fetchone()
+        if record is None:
+            return
+
+        self.db_cursor.execute(f"SELECT fetched_time, id FROM {table_name} WHERE event_collection_settings_name=?", (name, ))
+        last_event = self.db_cursor.fetchone()
+        if last_event is not None and self._last_event_order(last_event) > self._last_event_order((fetched_time, id)):
+            return
+
+        self.db_cursor.execute(
+            f"INSERT OR REPLACE INTO {table_name} (event_collection_settings_name, event_rowid, id, fetched_time) VALUES (?, ?, ?, ?)",
+            (name, record[0], None if id is None else str(id), fetched_time)
+        )
+
+    @staticmethod
+    def _last_event_order(last_event_key):
+        # SELECT ... ORDER BY fetched_time DESC, id DESC と同じ並び順(idはTEXT型、NULLは最小)にする
+        fetched_time, id = last_event_key
+        return (int(fetched_time), id is not None, "" if id is None else str(id))
+
     def select_all(self, table_name, where_str=None, bind_value=None):
         sql_str = f"SELECT * FROM {table_name}"
         if where_str is not None:
@@ -15,20 +15,33 @@ import pytest
 from flask import Flask, g
 import datetime
 import jmespath
+import sqlite3
+import threading
+import time
+from types import SimpleNamespace
 from common_libs.oase.api_client_common import APIClientCommon
 from tests.common_libs.oase.test_api_client_common import test_response_parameters
+from common_libs.common.exception import AppException
+from libs import collect_event as ce
 from libs.collect_event import extract_events
 
 app = Flask(__name__)
 
 
 class DummyLogger:
-    def debug(self, msg): pass
-    def info(self, msg): pass
+    def debug(self, msg):
+        pass
+
+    def info(self, msg):
+        pass
+
+    def error(self, msg):
+        pass
 
 
 class DummyAppMsg:
-    def get_log_message(self, code, args=None): return code
+    def get_log_message(self, code, args=None):
+        return code
 
 
 @pytest.fixture(autouse=True)
@@ -36,6 +49,8 @@ def setup_g():
     with app.app_context():
         g.applogger = DummyLogger()
         g.appmsg = DummyAppMsg()
+        g.ORGANIZATION_ID = "org"
+        g.WORKSPACE_ID = "ws"
         yield
 
 
@@ -82,3 +97,111 @@ def test_extract_events(api_response_raw_json, dummy_setting, expected_response,
     # テスト結果の検証
     assert event_length == len(expected_events)
     assert events == expected_events
+
+
+class DummyApiClient:
+    """応答までの時間を指定できるAPIクライアント"""
+    running = 0
+    max_running = 0
+    lock = threading.Lock()
+
+    def __init__(self, setting, last_fetched_event):
+        self.setting = setting
+
+    def call_api(self):
+        with DummyApiClient.lock:
+            DummyApiClient.running += 1
+            DummyApiClient.max_running = max(DummyApiClient.max_running, DummyApiClient.running)
+        try:
+            # スレッド内でもgを参照できる
+            g.applogger.debug("call_api {}".format(self.setting["EVENT_COLLECTION_SETTINGS_NAME"]))
+            time.sleep(self.setting["WAIT"])
+            if self.setting["ERROR"]:
+                raise AppException("AGT-10029", ["HTTP STATUS = 500"])
+            return True, [{"id": self.setting["EVENT_COLLECTION_SETTINGS_NAME"]}]
+        finally:
+            with DummyApiClient.lock:
+                DummyApiClient.running -= 1
+
+
+def create_setting(name, wait, error=False):
+    return {
+        "EVENT_COLLECTION_SETTINGS_ID": "id-" + name,
+        "EVENT_COLLECTION_SETTINGS_NAME": name,
+        "AUTH_TOKEN": "",
+        "PASSWORD": "",
+        "SECRET_ACCESS_KEY": "",
+        "RESPONSE_KEY": None,
+        "RESPONSE_LIST_FLAG": "1",
+        "EVENT_ID_KEY": "id",
+        "TTL": 60,
+        "WAIT": wait,
+        "ERROR": error,
+    }
+
+
+def test_collect_event_parallel(monkeypatch):
+    """
+    APIの呼び出しを並列に行い、結果はイベント収集設定の順に返す
+    """
+    monkeypatch.setenv("EVENT_COLLECTION_MAX_WORKERS", "2")
+    monkeypatch.setattr(ce, "get_auth_client", DummyApiClient)
+    monkeypatch.setattr(ce, "agent_decrypt", lambda value, pass_phrase: value)
+    monkeypatch.setattr(ce, "app_exception", lambda e: None)
+    DummyApiClient.max_running = 0
+
+    # eventsテーブルが無いSQLite
+    sqlite_db = SimpleNamespace(db_cursor=sqlite3.connect(":memory:").cursor())
+    settings = [create_setting("a", 0.3), create_setting("b", 0.1, error=True), create_setting("c", 0.1)]
+    timestamps = {"a": 0, "b": 0, "c": 0}
+
+    start = time.perf_counter()
+    events, results = ce.collect_event(sqlite_db, settings, timestamps)
+    elapsed = time.perf_counter() - start
+
+    assert DummyApiClient.max_running == 2
+    assert elapsed < 0.5
+    assert [result["name"] for result in results] == ["a", "b", "c"]
+    assert [result["is_save"] for result in results] == [True, False, True]
+    assert [result["len"] for result in results] == [1, 0, 1]
+    assert [event["id"] for event in events] == ["a", "c"]
+    assert all(setting["SAVED_IDS"] == set() for setting in settings)
+
+
+def test_collect_event_timeout(monkeypatch):
+    """
+    待ち時間を超えたAPI呼び出しは保存しない
+    """
+    monkeypatch.setenv("EVENT_COLLECTION_TIMEOUT", "0.1")
+    monkeypatch.setattr(ce, "get_auth_client", DummyApiClient)
+    monkeypatch.setattr(ce, "agent_decrypt", lambda value, pass_phrase: value)
+
+    sqlite_db = SimpleNamespace(db_cursor=sqlite3.connect(":memory:").cursor())
+    settings = [create_setting("slow", 0.5), create_setting("fast", 0)]
+
+    events, results = ce.collect_event(sqlite_db, settings, {"slow": 0, "fast": 0})
+
+    assert [(result["name"], result["is_save"], result["len"]) for result in results] == [("slow", False, 0), ("fast", True, 1)]
+    assert [event["id"] for event in events] == ["fast"]
+
+
+def test_collect_event_deadline(monkeypatch):
+    """
+    待ち時間の上限は全てのAPI呼び出しを合わせたもので、超えた時点で未完了・未開始の呼び出しは保存しない
+    """
+    monkeypatch.setenv("EVENT_COLLECTION_MAX_WORKERS", "1")
+    monkeypatch.setenv("EVENT_COLLECTION_TIMEOUT", "0.5")
+    monkeypatch.setattr(ce, "get_auth_client", DummyApiClient)
+    monkeypatch.setattr(ce, "agent_decrypt", lambda value, pass_phrase: value)
+
+    sqlite_db = SimpleNamespace(db_cursor=sqlite3.connect(":memory:").cursor())
+    settings = [create_setting("a", 0.3), create_setting("b", 0.3), create_setting("c", 0.3)]
+
+    start = time.perf_counter()
+    events, results = ce.collect_event(sqlite_db, settings, {"a": 0, "b": 0, "c": 0})
+    elapsed = time.perf_counter() - start
+
+    # 設定毎に待つと0.9秒かかる
+    assert elapsed < 0.8
+    assert [(result["name"], result["is_save"]) for result in results] == [("a", True), ("b", False), ("c", False)]
+    assert [event["id"] for event in events] == ["a"]
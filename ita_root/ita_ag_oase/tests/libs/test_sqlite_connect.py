@@ -0,0 +1,103 @@
+# Copyright 2025 NEC Corporation#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import sqlite3
+
+import pytest
+from flask import Flask, g
+
+from libs import sqlite_connect
+from libs.collect_event import get_saved_events
+
+app = Flask(__name__)
+
+
+class DummyLogger:
+    def debug(self, msg):
+        pass
+
+    def info(self, msg):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def setup_g():
+    with app.app_context():
+        g.applogger = DummyLogger()
+        g.AGENT_NAME = "agent"
+        yield
+
+
+@pytest.fixture
+def sqlite_db(monkeypatch):
+    connect = sqlite3.connect
+    monkeypatch.setattr(sqlite_connect.sqlite3, "connect", lambda db_name: connect(":memory:"))
+    db = sqlite_connect.sqliteConnect("org", "ws")
+    yield db
+    db.db_close()
+
+
+def create_event(name, event_id, fetched_time, not_available=False):
+    event = {
+        "_exastro_event_collection_settings_name": name,
+        "_exastro_fetched_time": fetched_time,
+        "_exastro_oase_event_id": event_id,
+    }
+    if not_available:
+        event["_exastro_not_available"] = "Invalid Event"
+    return event
+
+
+def test_get_saved_events_last_event_pointer(sqlite_db):
+    """
+    重複チェック用のidはセットで返し、最後に取得したイベントはlast_eventテーブルのポインタから取得する
+    """
+    sqlite_db.insert_events([
+        create_event("a", "1", 100),
+        create_event("a", "3", 200),
+        create_event("a", "2", 200),
+        create_event("a", "4", 300, not_available=True),
+        create_event("b", "9", 100),
+    ], [])
+    sqlite_db.insert_events([create_event("a", "0", 150)], [])
+
+    saved_ids, last_fetched_event = get_saved_events(sqlite_db, "a")
+    assert saved_ids == {"0", "1", "2", "3", "4"}
+    assert last_fetched_event["_exastro_oase_event_id"] == "3"
+
+    saved_ids, last_fetched_event = get_saved_events(sqlite_db, "b")
+    assert saved_ids == {"9"}
+    assert last_fetched_event["_exastro_oase_event_id"] == "9"
+
+    assert get_saved_events(sqlite_db, "c") == (set(), None)
+
+
+def test_get_saved_events_pointer_deleted(sqlite_db):
+    """
+    ポインタが指すイベントが削除されている・ポインタが無い場合は、保存されているイベントから検索する
+    """
+    sqlite_db.insert_events([create_event("a", "1", 100), create_event("a", "2", 200)], [])
+    sqlite_db.delete("events", "WHERE fetched_time=?", [200])
+
+    saved_ids, last_fetched_event = get_saved_events(sqlite_db, "a")
+    assert saved_ids == {"1"}
+    assert last_fetched_event["_exastro_oase_event_id"] == "1"
+
+    # ポインタが無いデータベース(旧バージョンで保存したイベント)
+    sqlite_db.db_cursor.execute("DELETE FROM last_event")
+    sqlite_db.insert_event([("a", "5", json.dumps(create_event("a", "5", 300)), 300, False)])
+
+    saved_ids, last_fetched_event = get_saved_events(sqlite_db, "a")
+    assert saved_ids == {"1", "5"}
+    assert last_fetched_event["_exastro_oase_event_id"] == "5"
@@ -14,8 +14,17 @@
 #   limitations under the License.
 # from unittest import mock
 
+import gzip
+import json
+import sqlite3
+
 import pytest
-from agent_main import get_agent_version
+from flask import Flask, g
+
+import agent_main
+from agent_main import get_agent_version, get_unsent_timestamp, send_events
+from agent.libs.exastro_api import Exastro_API
+from libs import sqlite_connect
 
 # get_agent_version用のpytest
 
@@ -57,3 +66,117 @@ def test_get_agent_version_file_not_found(monkeypatch):
 
     with pytest.raises(FileNotFoundError):
         get_agent_version()
+
+
+# send_events用のpytest
+
+class DummyLogger:
+    def debug(self, msg):
+        pass
+
+    def info(self, msg):
+        pass
+
+
+class DummyAppMsg:
+    def get_log_message(self, code, args=None):
+        return code
+
+
+class DummyExastroAPI:
+    def __init__(self, status_codes):
+        self.status_codes = list(status_codes)
+        self.bodies = []
+
+    def api_request(self, method, endpoint, body=None, query=None, compress=False):
+        self.bodies.append(body)
+        return self.status_codes.pop(0), {"data": []}
+
+
+@pytest.fixture
+def sqlite_db(monkeypatch):
+    app = Flask(__name__)
+    with app.app_context():
+        g.applogger = DummyLogger()
+        g.appmsg = DummyAppMsg()
+        g.AGENT_NAME = "agent"
+        g.AGENT_INFO = {"name": "agent", "version": "2.7.0"}
+
+        connect = sqlite3.connect
+        monkeypatch.setattr(sqlite_connect.sqlite3, "connect", lambda db_name: connect(":memory:"))
+        db = sqlite_connect.sqliteConnect("org", "ws")
+        events = []
+        for name, fetched_time, count in [("a", 300, 1), ("a", 100, 2), ("b", 200, 2)]:
+            for i in range(count):
+                events.append({
+                    "_exastro_event_collection_settings_name": name,
+                    "_exastro_fetched_time": fetched_time,
+                    "_exastro_oase_event_id": "{}-{}-{}".format(name, fetched_time, i),
+                })
+        db.insert_events(events, [])
+        db.db_connect.commit()
+        yield db
+        db.db_close()
+
+
+def get_unsent_count(sqlite_db):
+    sqlite_db.db_cursor.execute("SELECT COUNT(*) FROM events WHERE sent_flag=0")
+    return sqlite_db.db_cursor.fetchone()[0]
+
+
+def test_send_events_batch(sqlite_db, monkeypatch):
+    """
+    send_events：取得回を分割せず、fetched_timeの昇順に上限件数毎に分けて送信する
+    """
+    monkeypatch.setenv("EVENT_SEND_MAX_EVENTS", "3")
+    exastro_api = DummyExastroAPI([200, 200])
+
+    assert send_events(sqlite_db, exastro_api, "/events", get_unsent_timestamp(sqlite_db, ["a", "b"])) is True
+
+    assert [[(group["event_collection_settings_name"], group["fetched_time"], len(group["event"])) for group in body["events"]] for body in exastro_api.bodies] == [
+        [("a", 100, 2)],
+        [("b", 200, 2), ("a", 300, 1)],
+    ]
+    assert get_unsent_count(sqlite_db) == 0
+    assert get_unsent_timestamp(sqlite_db, ["a", "b"]) == []
+
+
+def test_send_events_failed(sqlite_db, monkeypatch):
+    """
+    send_events：送信に成功した分のみsent_flagを更新し、失敗した以降の送信は次回に持ち越す
+    """
+    monkeypatch.setenv("EVENT_SEND_MAX_EVENTS", "2")
+    monkeypatch.setattr(agent_main, "app_exception", lambda e: None)
+    exastro_api = DummyExastroAPI([200, 500])
+
+    assert send_events(sqlite_db, exastro_api, "/events", get_unsent_timestamp(sqlite_db, ["a", "b"])) is False
+
+    assert len(exastro_api.bodies) == 2
+    assert get_unsent_count(sqlite_db) == 3
+    assert [(name, fetched_time) for _, name, fetched_time in get_unsent_timestamp(sqlite_db, ["a", "b"])] == [("b", 200), ("a", 300)]
+
+
+def test_api_request_compress(monkeypatch):
+    """
+    Exastro_API.api_request：compress=Trueの場合、gzip圧縮したボディを送信する
+    """
+    requests_args = {}
+
+    class DummyResponse:
+        status_code = 200
+
+        def json(self):
+            return {"data": []}
+
+    def dummy_request(**kwargs):
+        requests_args.update(kwargs)
+        return DummyResponse()
+
+    monkeypatch.setattr("agent.libs.exastro_api.requests.request", dummy_request)
+    body = {"events": [{"event": [{"id": "1"}]}]}
+
+    Exastro_API("http://localhost", "user", "password").api_request("POST", "/events", body, compress=True)
+
+    assert requests_args["json"] is None
+    assert requests_args["headers"]["Content-Encoding"] == "gzip"
+    assert json.loads(gzip.decompress(requests_args["data"])) == body
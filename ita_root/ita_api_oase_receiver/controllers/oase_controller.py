@@ -147,11 +147,20 @@ def post_events(body: str, organization_id: str, workspace_id: str) -> tuple:  #
         if "fetched_time" in event_group_list[0]:
             # fetched_timeがあればソートしておく
             event_group_list.sort(key=lambda x: x['fetched_time'])
+
+        # イベント収集設定、イベント収集経過(最新のfetched_time)をリクエスト内の全グループ分まとめて取得
+        settings_by_name, settings_by_id = get_event_collection_settings(wsDb, event_group_list)
+        latest_fetched_time_map = get_latest_fetched_time(
+            wsDb,
+            [settings["EVENT_COLLECTION_SETTINGS_ID"] for settings in settings_by_id.values() if settings["DISUSE_FLAG"] != '1'],
+            [get_agent_name(event_group, _undefined_exastro_agent) for event_group in event_group_list]
+        )
+
         for event_group in event_group_list:
             # event_collection_settings_nameもしくは、event_collection_settings_idは必須
             if "event_collection_settings_name" in event_group:
                 event_collection_settings_name = event_group["event_collection_settings_name"]
-                event_collection_settings = wsDb.table_select(oaseConst.T_OASE_EVENT_COLLECTION_SETTINGS, "WHERE EVENT_COLLECTION_SETTINGS_NAME = %s ORDER BY DISUSE_FLAG", [event_collection_settings_name])  # noqa: E501
+                event_collection_settings = settings_by_name.get(get_collation_key(event_collection_settings_name), [])
                 # 受信したデータに不備があるため、イベントは保存されませんでした。({})
                 if len(event_collection_settings) == 0:
                     is_err_res = True
@@ -169,7 +178,8 @@ def post_events(body: str, organization_id: str, workspace_id: str) -> tuple:  #
                 event_collection_settings_id = event_collection_settings[0]["EVENT_COLLECTION_SETTINGS_ID"]
             elif "event_collection_settings_id" in event_group:
                 event_collection_settings_id = event_group["event_collection_settings_id"]
-                event_collection_settings = wsDb.table_select(oaseConst.T_OASE_EVENT_COLLECTION_SETTINGS, "WHERE EVENT_COLLECTION_SETTINGS_ID = %s", [event_collection_settings_id])  # noqa: E501
+                event_collection_settings = settings_by_id.get(get_collation_key(event_collection_settings_id))
+                event_collection_settings = [event_collection_settings] if event_collection_settings is not None else []
                 # 受信したデータに不備があるため、イベントは保存されませんでした。({})
                 if len(event_collection_settings) == 0:
                     msg = g.appmsg.get_log_message("499-01801", [f"{event_collection_settings_id=}"])
@@ -220,11 +230,10 @@ def post_events(body: str, organization_id: str, workspace_id: str) -> tuple:  #
             collection_group_data["AGENT_NAME"] = exastro_agent.get("name")
 
             # イベント収集経過テーブルからイベント収集設定IDとエージェント名を基準にfetched_timeの最新1件を取得し、送信されてきたfetched_timeと比較
-            collection_progress = wsDb.table_select(oaseConst.T_OASE_EVENT_COLLECTION_PROGRESS, "WHERE EVENT_COLLECTION_SETTINGS_ID = %s AND AGENT_NAME = %s ORDER BY `FETCHED_TIME` DESC LIMIT 1", [event_collection_settings_id, collection_group_data["AGENT_NAME"]])  # noqa: E501
-            if len(collection_progress) == 0:
+            last_fetched_time = latest_fetched_time_map.get((get_collation_key(event_collection_settings_id), get_collation_key(collection_group_data["AGENT_NAME"])))  # noqa: E501
+            if last_fetched_time is None:
                 collection_group_list.append(collection_group_data)
             else:
-                last_fetched_time = int(collection_progress[0]["FETCHED_TIME"])
                 if collection_group_data["FETCHED_TIME"] > last_fetched_time:
                     # リストに格納
                     collection_group_list.append(collection_group_data)
@@ -324,6 +333,94 @@ def post_events(body: str, organization_id: str, workspace_id: str) -> tuple:  #
     return not_available_event_msg_list,
 
 
+def get_event_collection_settings(wsDb, event_group_list):
+    """ リクエスト内の全グループのイベント収集設定を1回のSELECTで取得する\n
+        Args:
+            wsDb: MariaDBのWSDBコネクション
+            event_group_list: 受信したイベントのグループ
+        Returns:
+            tuple: 2つの辞書 (settings_by_name, settings_by_id)
+                - settings_by_name (dict): イベント収集設定名 → レコードのリスト(廃止されていないものが先)
+                - settings_by_id (dict): イベント収集設定ID → レコード
+    """
+    settings_name_list = []
+    settings_id_list = []
+    for event_group in event_group_list:
+        if "event_collection_settings_name" in event_group:
+            settings_name_list.append(event_group["event_collection_settings_name"])
+        elif "event_collection_settings_id" in event_group:
+            settings_id_list.append(event_group["event_collection_settings_id"])
+
+    settings_by_name = {}
+    settings_by_id = {}
+    where_list = []
+    if len(settings_name_list) > 0:
+        where_list.append("EVENT_COLLECTION_SETTINGS_NAME IN ({})".format(", ".join(["%s"] * len(settings_name_list))))
+    if len(settings_id_list) > 0:
+        where_list.append("EVENT_COLLECTION_SETTINGS_ID IN ({})".format(", ".join(["%s"] * len(settings_id_list))))
+    if len(where_list) == 0:
+        return settings_by_name, settings_by_id
+
+    where_str = "WHERE {} ORDER BY DISUSE_FLAG".format(" OR ".join(where_list))
+    for settings in wsDb.table_select(oaseConst.T_OASE_EVENT_COLLECTION_SETTINGS, where_str, settings_name_list + settings_id_list):
+        settings_by_name.setdefault(get_collation_key(settings["EVENT_COLLECTION_SETTINGS_NAME"]), []).append(settings)
+        settings_by_id[get_collation_key(settings["EVENT_COLLECTION_SETTINGS_ID"])] = settings
+
+    return settings_by_name, settings_by_id
+
+
+def get_latest_fetched_time(wsDb, settings_id_list, agent_name_list):
+    """ イベント収集設定ID x エージェント名 毎の最新のfetched_timeを1回のSELECTで取得する\n
+        Args:
+            wsDb: MariaDBのWSDBコネクション
+            settings_id_list: イベント収集設定IDのリスト
+            agent_name_list: エージェント名のリスト
+        Returns:
+            dict: (イベント収集設定ID, エージェント名) → 最新のfetched_time
+    """
+    settings_id_list = list(dict.fromkeys(settings_id_list))
+    agent_name_list = list(dict.fromkeys(agent_name_list))
+    latest_fetched_time_map = {}
+    if len(settings_id_list) == 0 or len(agent_name_list) == 0:
+        return latest_fetched_time_map
+
+    sql = "SELECT `EVENT_COLLECTION_SETTINGS_ID`, `AGENT_NAME`, MAX(`FETCHED_TIME`) AS `FETCHED_TIME` FROM `{}` WHERE `EVENT_COLLECTION_SETTINGS_ID` IN ({}) AND `AGENT_NAME` IN ({}) GROUP BY `EVENT_COLLECTION_SETTINGS_ID`, `AGENT_NAME`".format(  # noqa: E501
+        oaseConst.T_OASE_EVENT_COLLECTION_PROGRESS,
+        ", ".join(["%s"] * len(settings_id_list)),
+        ", ".join(["%s"] * len(agent_name_list))
+    )
+    for row in wsDb.sql_execute(sql, settings_id_list + agent_name_list):
+        if row["FETCHED_TIME"] is None:
+            continue
+        key = (get_collation_key(row["EVENT_COLLECTION_SETTINGS_ID"]), get_collation_key(row["AGENT_NAME"]))
+        latest_fetched_time_map[key] = int(row["FETCHED_TIME"])
+
+    return latest_fetched_time_map
+
+
+def get_agent_name(event_group, undefined_exastro_agent):
+    """ イベントのグループのエージェント名(未定義の場合は固定値)\n
+        Args:
+            event_group: 受信したイベントのグループ
+            undefined_exastro_agent: エージェント名、バージョンの初期値
+        Returns:
+            str: エージェント名
+    """
+    if isinstance(event_group.get("agent"), dict) and event_group["agent"].get("name"):
+        return event_group["agent"]["name"]
+    return undefined_exastro_agent["name"]
+
+
+def get_collation_key(value):
+    """ DBの照合順序(末尾の空白を無視する)に合わせた比較用の値\n
+        Args:
+            value: 値
+        Returns:
+            str: 比較用の値
+    """
+    return str(value).rstrip(' ')
+
+
 def add_notification_queue(wsdb, recieve_notification_list, duplicate_notification_list):
     """ スレッド処理で実施するイベント通知キューに追加する\n
         Args:
@@ -19,7 +19,7 @@ import jmespath
 import json
 from common_libs.common.util import stacktrace
 # oase
-from common_libs.oase.const import oaseConst
+from libs.labeling_rule_cache import LabelingRuleCache
 
 # 比較方法のキーから、比較方法を取り出すためのマスタ(正規表現の場合は正規表現オプション値がとれるように)
 # t_oase_comparison_methodに対応
@@ -67,21 +67,16 @@ LABEL_KEY_MAP = {}
 
 # イベントにラベルを付与する
 def label_event(wsDb, wsMongo, events):  # noqa: C901
-    # ラベル付与の設定を取得
-    labeling_settings = wsDb.table_select(
-        oaseConst.T_OASE_LABELING_SETTINGS,
-        "WHERE DISUSE_FLAG=0 ORDER BY LABELING_SETTINGS_NAME ASC"
-    )
-    if len(labeling_settings) == 0:
+    # ラベル付与の設定・ラベルのマスタ・コンパイル済みのルールを取得
+    labeling_rule = LabelingRuleCache.get(wsDb, compile_labeling_settings)
+    labeling_rules = labeling_rule["rules"]
+
+    if len(labeling_rule["labeling_settings"]) == 0:
         # ラベル付与設定を取得できませんでした。
         msg = g.appmsg.get_log_message("499-01804")
         g.applogger.info(msg)
 
-    # ラベルのマスタを取得
-    label_keys = wsDb.table_select(
-        oaseConst.V_OASE_LABEL_KEY_GROUP,
-        "WHERE DISUSE_FLAG=0"
-    )
+    label_keys = labeling_rule["label_keys"]
     if len(label_keys) == 0:
         # ラベルのマスタを取得できませんでした。
         msg = g.appmsg.get_log_message("499-01805")
@@ -116,11 +111,9 @@ def label_event(wsDb, wsMongo, events):  # noqa: C901
         # パターンD-2：search_key_nameが存在するデータに対してlabel_key: target_keyの持つ値のラベルを追加
         # パターンE：type_idが7であり、search_key_nameに対応する値がFalseの値（空文字、[]、{}、0、False）である際、labelのkey: labelのvalueのラベルを追加
         # パターンF: ラベルの正規表現での置換
-        for setting in labeling_settings:
-            # 収集した_exastro_event_collection_settings_idとイベント収集設定IDが一致しないものはスキップ
-            if labeled_event["labels"]["_exastro_event_collection_settings_id"] != setting["EVENT_COLLECTION_SETTINGS_ID"]:
-                continue
-
+        # 収集した_exastro_event_collection_settings_idとイベント収集設定IDが一致するルールのみ
+        for rule in labeling_rules.get(labeled_event["labels"]["_exastro_event_collection_settings_id"], []):
+            setting = rule["setting"]
             try:
                 # ラベル付与内search_key_nameが収集したデータの中の"event"と"labels"のどちらの配下に存在するか確認する
                 # ラベル付与設定内にsearch_key_nameが存在しない(パターンC用)
@@ -136,9 +129,10 @@ def label_event(wsDb, wsMongo, events):  # noqa: C901
                     labeled_event_location = labeled_event["event"]
 
                 # "event"もしくは"labels"配下にラベル付与設定のsearch_key_nameが存在するかどうか
-                query = create_jmespath_query(setting["SEARCH_KEY_NAME"])
+                if isinstance(rule["query_error"], Exception):
+                    raise rule["query_error"]
                 try:
-                    is_key_exists = get_value_from_jsonpath(query, labeled_event_location)
+                    is_key_exists = get_value_from_jsonpath(rule["query"], labeled_event_location)
                 except Exception:  # noqa: E722
                     is_key_exists = False
 
@@ -155,12 +149,12 @@ def label_event(wsDb, wsMongo, events):  # noqa: C901
                     if setting["LABEL_VALUE_NAME"]:
                         labeled_event = add_label(labeled_event, setting)  # パターンD-1
                     else:
-                        target_value_collection = get_value_from_jsonpath(setting["SEARCH_KEY_NAME"], labeled_event_location)
+                        target_value_collection = get_value_from_jsonpath(rule["search_key"], labeled_event_location)
                         labeled_event = add_label(labeled_event, setting, target_value_collection)  # パターンD-2
                 # [パターンA,B,E,F用]
                 else:
                     # 取得してきたイベントの"event"もしくは"labels"配下に、ラベル付与設定のsearch_key_nameに該当する値を取得する
-                    target_value_collection = get_value_from_jsonpath(setting["SEARCH_KEY_NAME"], labeled_event_location)
+                    target_value_collection = get_value_from_jsonpath(rule["search_key"], labeled_event_location)
                     if setting["TYPE_ID"] == "7":  # 空判定 [パターンE用]
                         if setting["COMPARISON_METHOD_ID"] == "1":  # ==
                             # ラベル付与設定内search_key_nameが収集してきたイベント内"event"か"labels"配下に存在するものの中でvalueが空判定のものが存在するか確認
@@ -171,12 +165,14 @@ def label_event(wsDb, wsMongo, events):  # noqa: C901
                             if (target_value_collection in ["", [], {}, 0, False, None]) is False:
                                 labeled_event = add_label(labeled_event, setting)  # パターンE(比較方法が'≠')
                     else:
-                        # ラベル付与設定内target_valueをラベル付与設定内target_type（値の型）に合わせて変換 [パターンA,B,F用]
-                        target_value_setting = TARGET_VALUE_TYPE[setting["TYPE_ID"]](setting["SEARCH_VALUE_NAME"])
+                        # ラベル付与設定内target_valueをラベル付与設定内target_type（値の型）に合わせて変換したもの [パターンA,B,F用]
+                        if isinstance(rule["target_value_error"], Exception):
+                            raise rule["target_value_error"]
+                        target_value_setting = rule["target_value"]
                         # 収集してきたJSONデータのvalueとラベル付与設定内search_value_nameをcomparison_method_idを使用して比較
                         compare_result, compare_match = comparison_values(setting["COMPARISON_METHOD_ID"], target_value_collection, target_value_setting)  # noqa: E501
                         if compare_result is True:
-                            labeled_event = add_label(labeled_event, setting, compare_match)  # パターンA,B,F
+                            labeled_event = add_label(labeled_event, setting, compare_match, rule["label_regex"])  # パターンA,B,F
             except Exception as e:
                 g.applogger.info(stacktrace())
                 g.applogger.info("event={}".format(labeled_event))
@@ -225,6 +221,79 @@ def add_exastro_label(event):
     return labeled_event
 
 
+def compile_labeling_settings(labeling_settings):
+    """
+    ラベル付与の設定を、イベント毎に繰り返さないように事前にコンパイルする
+        jmespath・正規表現のコンパイル、比較値の型変換を設定毎に1回だけ行う
+        失敗した場合は例外を保持し、イベント毎の処理で従来と同じ箇所で送出する
+
+    Arguments:
+        labeling_settings: ラベル付与の設定(LABELING_SETTINGS_NAME順)
+    Returns:
+        rules: {EVENT_COLLECTION_SETTINGS_ID: [rule, ...]} (LABELING_SETTINGS_NAME順)
+    """
+    rules = {}
+    for setting in labeling_settings:
+        rule = {
+            "setting": setting,
+            "query_error": None,
+            "query": None,
+            "search_key": None,
+            "target_value_error": None,
+            "target_value": None,
+            "label_regex": None,
+        }
+
+        if setting["SEARCH_KEY_NAME"] is not None or setting["TYPE_ID"] is not None or setting["SEARCH_VALUE_NAME"] is not None:
+            # search_key_nameが存在するかを確認するクエリ
+            try:
+                query = create_jmespath_query(setting["SEARCH_KEY_NAME"])
+            except Exception as e:
+                rule["query_error"] = e
+            else:
+                rule["query"] = compile_jsonpath(query)
+            # search_key_nameに対応する値を取得するクエリ
+            rule["search_key"] = compile_jsonpath(setting["SEARCH_KEY_NAME"])
+
+            # 比較値の型変換・正規表現のコンパイル [パターンA,B,F用]
+            if setting["TYPE_ID"] != "7" and (setting["TYPE_ID"] or setting["SEARCH_VALUE_NAME"] or setting["COMPARISON_METHOD_ID"]):
+                try:
+                    rule["target_value"] = TARGET_VALUE_TYPE[setting["TYPE_ID"]](setting["SEARCH_VALUE_NAME"])
+                except Exception as e:
+                    rule["target_value_error"] = e
+
+                if setting["COMPARISON_METHOD_ID"] in ["7", "8", "9"]:
+                    regex_option = COMPARISON_OPERATOR[setting["COMPARISON_METHOD_ID"]]
+                    try:
+                        rule["target_value"] = re.compile(rule["target_value"], regex_option)
+                    except Exception:
+                        # 比較時に従来通りエラーを出力する
+                        pass
+                    try:
+                        rule["label_regex"] = re.compile(setting["SEARCH_VALUE_NAME"], regex_option)
+                    except Exception:
+                        pass
+
+        rules.setdefault(setting["EVENT_COLLECTION_SETTINGS_ID"], []).append(rule)
+
+    return rules
+
+
+def compile_jsonpath(jsonpath):
+    """
+    jmespathのクエリをコンパイルする
+
+    Arguments:
+        jsonpath: ドット区切りの文字列
+    Returns:
+        コンパイル済みのクエリ(失敗した場合は例外)
+    """
+    try:
+        return jmespath.compile(jsonpath)
+    except Exception as e:
+        return e
+
+
 # json構造を検索するためのクエリを生成
 def create_jmespath_query(json_path):
     # .に合わせて分割
@@ -242,8 +311,13 @@ def create_jmespath_query(json_path):
 # ドット区切りの文字列で辞書を指定して値を取得
 # 1.get_value_from_jsonpath(setting["SEARCH_KEY_NAME"], event_collection_data_location) →　条件に合わせて値を返却
 # 2.get_value_from_jsonpath(query, event_collection_data_location) → 条件に合わせて真偽値を返却
+# 3.get_value_from_jsonpath(compile_jsonpathの戻り値, event_collection_data_location) → コンパイル済みのクエリで検索
 def get_value_from_jsonpath(jsonpath, data):
-    value = jmespath.search(jsonpath, data)
+    if isinstance(jsonpath, Exception):
+        raise jsonpath
+    if isinstance(jsonpath, str):
+        return jmespath.search(jsonpath, data)
+    value = jsonpath.search(data)
     return value
 
 
@@ -255,7 +329,7 @@ def comparison_values(comparison_method_id="1", collect_value=None, compare_valu
     Arguments:
         comparison_method_id: 比較方法
         collect_value: 収集した値
-        compare_value: 比較値
+        compare_value: 比較値(正規表現の場合はコンパイル済みのパターンも可)
     Returns: tupple
         compare_result: 比較結果(該当すればtrue)
         compare_match: 正規表現比較の場合、マッチした結果
@@ -267,7 +341,10 @@ def comparison_values(comparison_method_id="1", collect_value=None, compare_valu
         # 正規表現での比較
         if comparison_method_id in ["7", "8", "9"]:
             regex_option = COMPARISON_OPERATOR[comparison_method_id]  # 正規表現オプションを取り出す
-            regex_pattern = re.compile(compare_value, regex_option)
+            if isinstance(compare_value, re.Pattern):
+                regex_pattern = compare_value
+            else:
+                regex_pattern = re.compile(compare_value, regex_option)
             regex_result = regex_pattern.search(collect_value)
             # g.applogger.debug("comparison by regular expression")
             # g.applogger.debug("compare_value={}, regex_option={}".format(compare_value, regex_option))
@@ -287,7 +364,7 @@ def comparison_values(comparison_method_id="1", collect_value=None, compare_valu
     return compare_result, compare_match
 
 # ラベル付与処理
-def add_label(event, setting, compare_match=""):
+def add_label(event, setting, compare_match="", regex_pattern=None):
     """
     設定に従ってラベルを付与する
 
@@ -295,6 +372,7 @@ def add_label(event, setting, compare_match=""):
         event: 収集したイベントデータ
         setting: ラベル付与の設定
         compare_match: 正規表現で検索マッチした値 or 検索キーに対応する値
+        regex_pattern: 置換に使用するコンパイル済みの正規表現(Noneの場合はsearch_value_nameをコンパイルする)
     Returns:
         event: イベントデータ
     """
@@ -312,8 +390,9 @@ def add_label(event, setting, compare_match=""):
             # [パターンB] label_valueが空の場合、matchした文字列をlabel_valueに代入
             label_value = compare_match
         else:
-            regex_option = COMPARISON_OPERATOR[comparison_method_id]  # 正規表現オプションを取り出す
-            regex_pattern = re.compile(setting["SEARCH_VALUE_NAME"], regex_option)
+            if regex_pattern is None:
+                regex_option = COMPARISON_OPERATOR[comparison_method_id]  # 正規表現オプションを取り出す
+                regex_pattern = re.compile(setting["SEARCH_VALUE_NAME"], regex_option)
             label_value = regex_pattern.sub(setting["LABEL_VALUE_NAME"], compare_match)
     else:
         if setting["LABEL_VALUE_NAME"] is None or not setting["LABEL_VALUE_NAME"]:
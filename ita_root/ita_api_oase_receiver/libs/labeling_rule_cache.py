@@ -0,0 +1,132 @@
+# Copyright 2025 NEC Corporation#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""
+in-process cache of compiled labeling rules for oase receiver
+"""
+import os
+import threading
+import textwrap
+from collections import OrderedDict
+
+from common_libs.oase.const import oaseConst
+
+
+# ラベル付与で使用するテーブル(いずれかが更新されたらキャッシュを破棄する)
+LABELING_RULE_TABLES = [
+    oaseConst.T_OASE_LABELING_SETTINGS,
+    oaseConst.V_OASE_LABEL_KEY_GROUP,
+]
+
+
+class LabelingRuleCache:
+    """
+    ラベル付与の設定・ラベルのマスタと、設定をコンパイルしたルールをプロセス内でキャッシュする
+        key: 接続先のworkspace-db
+        ラベル付与の設定・ラベルのマスタの最終更新日時・件数が変わった場合は再取得する
+
+        env
+            OASE_LABELING_RULE_CACHE_ENABLED: "1"=キャッシュを使用する(default) / "0"=使用しない
+            OASE_LABELING_RULE_CACHE_SIZE: 保持するworkspace数の上限(default 100, 古いものから破棄する)
+    """
+
+    _lock = threading.Lock()
+
+    # key: (host, port, database), value: {"version": tuple, "labeling_settings": list, "label_keys": list, "rules": dict}
+    _cache = OrderedDict()
+
+    @classmethod
+    def is_enabled(cls):
+        """
+        キャッシュを使用するか
+
+        Returns:
+            bool
+        """
+        return os.environ.get("OASE_LABELING_RULE_CACHE_ENABLED", "1") == "1"
+
+    @classmethod
+    def get(cls, wsDb, build_rules):
+        """
+        ラベル付与の設定・ラベルのマスタ・ルールを取得する
+
+        Arguments:
+            wsDb: DB接続クラス DBConnectWs()
+            build_rules: ラベル付与の設定からルールを作成する関数
+        Returns:
+            {"labeling_settings", "label_keys", "rules"}
+            (複数のリクエストで共有するため、呼び出し元で変更しないこと)
+        """
+        if not cls.is_enabled():
+            return cls._select(wsDb, build_rules)
+
+        version = cls._get_version(wsDb)
+        key = cls._get_key(wsDb)
+        with cls._lock:
+            entry = cls._cache.get(key)
+            if entry is not None and entry["version"] == version:
+                cls._cache.move_to_end(key)
+                return entry
+
+        entry = cls._select(wsDb, build_rules)
+        entry["version"] = version
+
+        max_size = int(os.environ.get("OASE_LABELING_RULE_CACHE_SIZE", 100))
+        with cls._lock:
+            cls._cache[key] = entry
+            cls._cache.move_to_end(key)
+            while len(cls._cache) > max_size:
+                cls._cache.popitem(last=False)
+
+        return entry
+
+    @classmethod
+    def clear(cls):
+        """
+        キャッシュを破棄する
+        """
+        with cls._lock:
+            cls._cache.clear()
+
+    @classmethod
+    def _select(cls, wsDb, build_rules):
+        # ラベル付与の設定を取得
+        labeling_settings = wsDb.table_select(
+            oaseConst.T_OASE_LABELING_SETTINGS,
+            "WHERE DISUSE_FLAG=0 ORDER BY LABELING_SETTINGS_NAME ASC"
+        )
+        # ラベルのマスタを取得
+        label_keys = wsDb.table_select(
+            oaseConst.V_OASE_LABEL_KEY_GROUP,
+            "WHERE DISUSE_FLAG=0"
+        )
+        return {
+            "labeling_settings": labeling_settings,
+            "label_keys": label_keys,
+            "rules": build_rules(labeling_settings),
+        }
+
+    @classmethod
+    def _get_version(cls, wsDb):
+        query_list = []
+        for table_name in LABELING_RULE_TABLES:
+            query_list.append(textwrap.dedent("""
+                SELECT '{table}' AS `TABLE_NAME`, MAX(`LAST_UPDATE_TIMESTAMP`) AS `LAST_UPDATE_TIMESTAMP`, COUNT(*) AS `ROW_COUNT` FROM `{table}`
+            """).format(table=table_name).strip())
+        rows = wsDb.sql_execute(" UNION ALL ".join(query_list))
+
+        return tuple((row['TABLE_NAME'], row['LAST_UPDATE_TIMESTAMP'], row['ROW_COUNT']) for row in rows)
+
+    @staticmethod
+    def _get_key(wsDb):
+        return (getattr(wsDb, "_host", None), getattr(wsDb, "_port", None), getattr(wsDb, "_db", None))
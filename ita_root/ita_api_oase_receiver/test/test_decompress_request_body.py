@@ -0,0 +1,73 @@
+#   Copyright 2025 NEC Corporation
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import gzip
+import json
+
+import pytest
+from unittest.mock import MagicMock
+from flask import Flask, g, request
+from werkzeug.test import EnvironBuilder
+
+from common_libs.common.exception import AppException
+from libs.oase_receiver_common import decompress_request_body
+
+"""
+    test_decompress_request_body_gzip: gzip圧縮されたボディを展開してget_jsonで参照できる
+    test_decompress_request_body_plain: 圧縮されていないボディはそのまま
+    test_decompress_request_body_invalid: 展開できない・上限を超えるボディはエラー
+"""
+
+BODY = {"events": [{"event_collection_settings_name": "test", "fetched_time": 1754555100, "event": [{"id": "1"}]}]}
+
+
+def request_context(app, **kwargs):
+    return app.request_context(EnvironBuilder(path="/", method="POST", **kwargs).get_environ())
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config['TESTING'] = True
+    yield app
+
+
+def test_decompress_request_body_gzip(app):
+    data = gzip.compress(json.dumps(BODY).encode("utf-8"))
+    with request_context(app, data=data, headers={"Content-Type": "application/json", "Content-Encoding": "gzip"}):
+        g.applogger = MagicMock()
+        decompress_request_body()
+        assert request.get_json() == BODY
+
+
+def test_decompress_request_body_plain(app):
+    with request_context(app, json=BODY):
+        g.applogger = MagicMock()
+        decompress_request_body()
+        assert request.get_json() == BODY
+
+
+@pytest.mark.parametrize("data, max_size", [
+    (b"not gzip", None),
+    (gzip.compress(json.dumps(BODY).encode("utf-8"))[:-10], None),
+    (gzip.compress(json.dumps(BODY).encode("utf-8")), "10"),
+], ids=["not_gzip", "truncated", "too_large"])
+def test_decompress_request_body_invalid(app, monkeypatch, data, max_size):
+    if max_size is not None:
+        monkeypatch.setenv("REQUEST_BODY_MAX_DECOMPRESSED_SIZE", max_size)
+    with request_context(app, data=data, headers={"Content-Type": "application/json", "Content-Encoding": "gzip"}):
+        g.applogger = MagicMock()
+        with pytest.raises(AppException) as e:
+            decompress_request_body()
+        assert e.value.args[0] == "400-00002"
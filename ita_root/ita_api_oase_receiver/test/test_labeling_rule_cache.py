@@ -0,0 +1,170 @@
+#   Copyright 2025 NEC Corporation
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import pytest
+import datetime
+
+from libs import label_event
+from libs.labeling_rule_cache import LabelingRuleCache
+
+"""
+    test_labeling_rule_cache_reuse: 設定が変わらない限りラベル付与の設定を再取得しない
+    test_compile_labeling_settings_group: イベント収集設定ID毎にルールをまとめる
+    test_label_event_compiled_rules: コンパイル済みのルールでラベルを付与する
+"""
+
+ECS_ID = "ecs-0001"
+OTHER_ECS_ID = "ecs-0002"
+
+
+def create_setting(settings_id, name, ecs_id=ECS_ID, **kwargs):
+    setting = {
+        'LABELING_SETTINGS_ID': settings_id,
+        'LABELING_SETTINGS_NAME': name,
+        'EVENT_COLLECTION_SETTINGS_ID': ecs_id,
+        'SEARCH_KEY_NAME': None,
+        'TYPE_ID': None,
+        'COMPARISON_METHOD_ID': None,
+        'SEARCH_VALUE_NAME': None,
+        'LABEL_KEY_ID': 'key-host',
+        'LABEL_VALUE_NAME': None,
+    }
+    setting.update(kwargs)
+    return setting
+
+
+LABELING_SETTINGS = [
+    # パターンF: 正規表現での置換
+    create_setting('ls-1', 'label_1', SEARCH_KEY_NAME='host.name', TYPE_ID='1', COMPARISON_METHOD_ID='7',
+                   SEARCH_VALUE_NAME='^web-(\\d+)$', LABEL_VALUE_NAME='server\\1'),
+    # パターンA: 数値の比較
+    create_setting('ls-2', 'label_2', SEARCH_KEY_NAME='severity', TYPE_ID='2', COMPARISON_METHOD_ID='5',
+                   SEARCH_VALUE_NAME='3', LABEL_KEY_ID='key-severity', LABEL_VALUE_NAME='critical'),
+    # 型変換に失敗する設定(イベント毎にスキップされる)
+    create_setting('ls-3', 'label_3', SEARCH_KEY_NAME='severity', TYPE_ID='2', COMPARISON_METHOD_ID='1',
+                   SEARCH_VALUE_NAME='abc', LABEL_KEY_ID='key-error', LABEL_VALUE_NAME='error'),
+    # 別のイベント収集設定
+    create_setting('ls-4', 'label_4', ecs_id=OTHER_ECS_ID, LABEL_KEY_ID='key-other', LABEL_VALUE_NAME='other'),
+]
+
+LABEL_KEYS = [
+    {'LABEL_KEY_ID': 'key-host', 'LABEL_KEY_NAME': 'host'},
+    {'LABEL_KEY_ID': 'key-severity', 'LABEL_KEY_NAME': 'severity'},
+    {'LABEL_KEY_ID': 'key-error', 'LABEL_KEY_NAME': 'error'},
+    {'LABEL_KEY_ID': 'key-other', 'LABEL_KEY_NAME': 'other'},
+]
+
+
+class DummyWsDb:
+    """ラベル付与の設定を返すDB接続クラスのモック"""
+
+    def __init__(self):
+        self._host = "dummy-host"
+        self._port = 3306
+        self._db = "dummy-db"
+        self.last_update_timestamp = datetime.datetime(2025, 8, 7, 16, 14, 30)
+        self.table_select_calls = []
+
+    def sql_execute(self, sql, bind_value_list=[]):
+        return [
+            {'TABLE_NAME': 'T_OASE_LABELING_SETTINGS', 'LAST_UPDATE_TIMESTAMP': self.last_update_timestamp, 'ROW_COUNT': len(LABELING_SETTINGS)},
+            {'TABLE_NAME': 'V_OASE_LABEL_KEY_GROUP', 'LAST_UPDATE_TIMESTAMP': self.last_update_timestamp, 'ROW_COUNT': len(LABEL_KEYS)},
+        ]
+
+    def table_select(self, table_name, where_str="", bind_value_list=[]):
+        self.table_select_calls.append(table_name)
+        if table_name == 'T_OASE_LABELING_SETTINGS':
+            return [dict(setting) for setting in LABELING_SETTINGS]
+        return [dict(label_key) for label_key in LABEL_KEYS]
+
+
+@pytest.fixture(scope="session")
+def app_context():
+    from flask import Flask
+    app = Flask(__name__)
+    with app.app_context():
+        yield
+
+
+@pytest.fixture
+def mock_g(mocker):
+    mock_g_object = mocker.MagicMock()
+    mocker.patch('libs.label_event.g', new=mock_g_object)
+    return mock_g_object
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    LabelingRuleCache.clear()
+    yield
+    LabelingRuleCache.clear()
+
+
+def create_event(ecs_id, host_name, severity):
+    return {
+        'host': {'name': host_name},
+        'severity': severity,
+        '_exastro_event_collection_settings_name': 'test',
+        '_exastro_event_collection_settings_id': ecs_id,
+        '_exastro_fetched_time': 1754555100,
+        '_exastro_end_time': 1754555110,
+        '_exastro_agent_name': 'oase_ag_001',
+        '_exastro_agent_version': '2.7.0',
+        '_exastro_created_at': datetime.datetime(2025, 8, 7, 8, 25, 2, tzinfo=datetime.timezone.utc),
+    }
+
+
+def test_labeling_rule_cache_reuse(mock_g, app_context):
+    ws_db = DummyWsDb()
+
+    label_event.label_event(ws_db, None, [create_event(ECS_ID, 'web-01', 5)])
+    label_event.label_event(ws_db, None, [create_event(ECS_ID, 'web-02', 5)])
+    assert len(ws_db.table_select_calls) == 2
+
+    # 設定が更新された場合は再取得する
+    ws_db.last_update_timestamp = datetime.datetime(2025, 8, 8, 0, 0, 0)
+    label_event.label_event(ws_db, None, [create_event(ECS_ID, 'web-03', 5)])
+    assert len(ws_db.table_select_calls) == 4
+
+
+def test_compile_labeling_settings_group():
+    rules = label_event.compile_labeling_settings(LABELING_SETTINGS)
+
+    assert [rule["setting"]["LABELING_SETTINGS_ID"] for rule in rules[ECS_ID]] == ['ls-1', 'ls-2', 'ls-3']
+    assert [rule["setting"]["LABELING_SETTINGS_ID"] for rule in rules[OTHER_ECS_ID]] == ['ls-4']
+    assert rules[ECS_ID][0]["target_value"].pattern == '^web-(\\d+)$'
+    assert rules[ECS_ID][1]["target_value"] == 3
+    assert isinstance(rules[ECS_ID][2]["target_value_error"], ValueError)
+
+
+def test_label_event_compiled_rules(mock_g, app_context):
+    ws_db = DummyWsDb()
+    events = [
+        create_event(ECS_ID, 'web-01', 5),
+        create_event(ECS_ID, 'db-01', 1),
+        create_event(OTHER_ECS_ID, 'web-02', 5),
+    ]
+
+    result = label_event.label_event(ws_db, None, events)
+
+    assert result[0]["labels"]["host"] == 'server01'
+    assert result[0]["labels"]["severity"] == 'critical'
+    assert result[0]["exastro_labeling_settings"] == {'host': 'ls-1', 'severity': 'ls-2'}
+    assert "error" not in result[0]["labels"]
+    assert "host" not in result[1]["labels"]
+    assert "severity" not in result[1]["labels"]
+    assert result[2]["labels"]["other"] == 'other'
+    assert "host" not in result[2]["labels"]
+    # 型変換に失敗した設定はイベント毎にログを出力してスキップする
+    assert any(call.args[0] == "499-01806" for call in mock_g.appmsg.get_log_message.call_args_list)
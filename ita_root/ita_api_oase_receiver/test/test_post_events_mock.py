@@ -18,11 +18,13 @@ from unittest.mock import MagicMock
 from flask import Flask
 from pymongo import InsertOne
 
+import controllers.oase_controller as oase_controller
 from controllers.oase_controller import post_events
 
 
 """
     test_post_events_success: 正常系
+    test_post_events_multi_group_batched_lookup: 正常系(複数グループのメタデータをまとめて取得)
     test_post_events_maintenance_mode: 異常系(メンテナンス中)
     test_post_events_permission_error: 異常系(権限なし)
     test_post_events_invalid_settings_name: 異常系(不正なイベント設定名)
@@ -318,6 +320,52 @@ class TestPostEvents:
         args, kwargs = labeled_event_collection.bulk_write.call_args
         assert args == (expected_bulk_writes,)
 
+    # 正常系のテスト # 複数グループ
+    def test_post_events_multi_group_batched_lookup(self, app, mocker):
+        """複数グループのイベント収集設定・最新のfetched_timeを1回ずつのSELECTで取得し、グループ毎に受付可否を判定する"""
+
+        body = get_valid_body()
+        base_group = body["events"][0]
+        body["events"] = [
+            # 受付(最新のfetched_timeより新しい)
+            dict(base_group, fetched_time=1754609600, event_collection_settings_name="test_name"),
+            # 拒否(最新のfetched_time以前)
+            {"event": base_group["event"], "fetched_time": 1754609500, "event_collection_settings_id": "67890", "agent": base_group["agent"]},
+            # 拒否(存在しない設定)
+            dict(base_group, fetched_time=1754609700, event_collection_settings_name="unknown_name"),
+        ]
+
+        self.mock_db_ws.table_select.return_value = [
+            {"EVENT_COLLECTION_SETTINGS_ID": "12345", "EVENT_COLLECTION_SETTINGS_NAME": "test_name", "DISUSE_FLAG": "0", "TTL": "3600"},
+            {"EVENT_COLLECTION_SETTINGS_ID": "67890", "EVENT_COLLECTION_SETTINGS_NAME": "other_name", "DISUSE_FLAG": "0", "TTL": "3600"},
+        ]
+        self.mock_db_ws.sql_execute.return_value = [
+            {"EVENT_COLLECTION_SETTINGS_ID": "12345", "AGENT_NAME": "oase_ag_001", "FETCHED_TIME": 1754609550},
+            {"EVENT_COLLECTION_SETTINGS_ID": "67890", "AGENT_NAME": "oase_ag_001", "FETCHED_TIME": 1754609550},
+        ]
+        self.mock_db_ws.table_insert.return_value = [{
+            "EVENT_COLLECTION_ID": "1",
+            "EVENT_COLLECTION_SETTINGS_ID": "12345"
+        }]
+        self.mock_db_ws.table_count.return_value = 0
+        mocker.patch('controllers.oase_controller.label_event', return_value=[])
+        mocker.patch('controllers.oase_controller.duplicate_check', return_value=(True, [], []))
+
+        with app.test_request_context('/oase/api/v1/event_collection/event_list/'):
+            result, status_code = post_events(body, self.organization_id, self.workspace_id)
+
+        assert status_code == 200
+        assert self.mock_db_ws.table_select.call_count == 1
+        assert self.mock_db_ws.sql_execute.call_count == 1
+
+        # 受付したグループのみイベント収集経過に保存する
+        args, kwargs = self.mock_db_ws.table_insert.call_args
+        assert [(data["EVENT_COLLECTION_SETTINGS_ID"], data["FETCHED_TIME"]) for data in args[1]] == [("12345", 1754609600)]
+
+        msg_ids = [call.args[0] for call in oase_controller.g.appmsg.get_log_message.call_args_list]
+        assert "499-01818" in msg_ids
+        assert "499-01801" in msg_ids
+
     # 異常系のテスト ##
     def test_post_events_maintenance_mode(self, mocker, app):
         """メンテナンスモード時にAppExceptionがraiseされることを確認する"""
@@ -18,7 +18,7 @@ import sys
 sys.path.append('../../')
 from common_libs.common import *  # noqa: F403
 from common_libs.common.dbconnect import DBConnectWs
-from common_libs.api import api_filter, api_filter_download_file
+from common_libs.api import api_filter, api_filter_download_file, api_filter_stream
 from libs.organization_common import check_menu_info, check_auth_menu, check_sheet_type
 from libs import menu_filter
 
@@ -66,7 +66,7 @@ def get_filter_count(organization_id, workspace_id, menu):  # noqa: E501
     return result_data,
 
 
-@api_filter
+@api_filter_stream
 def get_filter(organization_id, workspace_id, menu, file=None):  # noqa: E501
     """get_filter
 
@@ -107,13 +107,14 @@ def get_filter(organization_id, workspace_id, menu, file=None):  # noqa: E501
             base64_file_flg = False;
 
         filter_parameter = {}
-        result_data = menu_filter.rest_filter(objdbca, menu, filter_parameter, base64_file_flg=base64_file_flg)
+        result_data = menu_filter.rest_filter(objdbca, menu, filter_parameter, base64_file_flg=base64_file_flg, stream=True)
 
     except Exception as e:
-        raise e
-    finally:
+        # レスポンス開始前のエラーはここで切断する(正常時はレスポンス終了時に切断)
         objdbca.db_disconnect()
-    return result_data,
+        raise e
+    # レコードはレスポンス出力時にページ単位で取得する
+    return result_data, objdbca.db_disconnect
 
 
 @api_filter
@@ -164,7 +165,7 @@ def get_journal(organization_id, workspace_id, menu, uuid, file=None):  # noqa:
     return result_data,
 
 
-@api_filter
+@api_filter_stream
 def post_filter(organization_id, workspace_id, menu, body=None, file=None):  # noqa: E501
     """post_filter
 
@@ -213,13 +214,14 @@ def post_filter(organization_id, workspace_id, menu, body=None, file=None):  # n
             base64_file_flg = False;
 
         # メニューのカラム情報を取得
-        result_data = menu_filter.rest_filter(objdbca, menu, filter_parameter, base64_file_flg=base64_file_flg)
+        result_data = menu_filter.rest_filter(objdbca, menu, filter_parameter, base64_file_flg=base64_file_flg, stream=True)
 
     except Exception as e:
-        raise e
-    finally:
+        # レスポンス開始前のエラーはここで切断する(正常時はレスポンス終了時に切断)
         objdbca.db_disconnect()
-    return result_data,
+        raise e
+    # レコードはレスポンス出力時にページ単位で取得する
+    return result_data, objdbca.db_disconnect
 
 
 @api_filter
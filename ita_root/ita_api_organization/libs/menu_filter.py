@@ -67,7 +67,7 @@ def rest_count(objdbca, menu, filter_parameter):
     return result
 
 
-def rest_filter(objdbca, menu, filter_parameter, base64_file_flg=True):
+def rest_filter(objdbca, menu, filter_parameter, base64_file_flg=True, stream=False):
     """
         メニューのレコード取得
         ARGS:
@@ -76,6 +76,7 @@ def rest_filter(objdbca, menu, filter_parameter, base64_file_flg=True):
             filter_parameter: 検索条件  {}
             base64_file_flg: ファイル有無（True:含める、False:含めない）
             wsMongo:DB接続クラス  MONGOConnectWs()
+            stream: True=レコードをページ単位で取得するジェネレータを返す(MongoDBを利用するシートタイプはlist)
         RETRUN:
             statusCode, {}, msg
     """
@@ -102,7 +103,7 @@ def rest_filter(objdbca, menu, filter_parameter, base64_file_flg=True):
             wsMongo.disconnect()
 
     else:
-        status_code, result, msg = objmenu.rest_filter(filter_parameter, mode, base64_file_flg=base64_file_flg)
+        status_code, result, msg = objmenu.rest_filter(filter_parameter, mode, base64_file_flg=base64_file_flg, stream=stream)
 
     if status_code != '000-00000':
         log_msg_args = [msg]
@@ -21,6 +21,7 @@ import textwrap
 import re
 
 from common_libs.common.dbconnect import *  # noqa: F403
+from common_libs.common.dbconnect.connect_info_cache import ConnectInfoCache
 from common_libs.common.exception import AppException
 from common_libs.common.logger import AppLog
 from common_libs.common.message_class import MessageTemplate
@@ -84,15 +85,13 @@ def before_request_handler():
                 g.appmsg.set_lang(language)
                 g.applogger.debug("LANGUAGE({}) is set".format(language))
 
-            # initialize setting organization-db connect_info and connect check
-            common_db = DBConnectCommon()  # noqa: F405
-            g.applogger.debug("ITA_DB is connected")
-
             # set maintenance mode value
             g.maintenance_mode = get_maintenance_mode_setting()
 
-            orgdb_connect_info = common_db.get_orgdb_connect_info(organization_id)
-            common_db.db_disconnect()
+            # initialize setting organization-db connect_info and connect check
+            #   接続情報はプロセス内でキャッシュし、キャッシュ済みの場合はDBへ接続しない
+            is_connect_info_cached = ConnectInfoCache.is_cached(organization_id, workspace_id)
+            orgdb_connect_info = ConnectInfoCache.get_orgdb_connect_info(organization_id)
             if orgdb_connect_info is False:
                 raise AppException("999-00001", ["ORGANIZATION_ID=" + organization_id])
 
@@ -116,11 +115,7 @@ def before_request_handler():
             g.gitlab_connect_info['GITLAB_TOKEN'] = orgdb_connect_info.get('GITLAB_TOKEN')
 
             # initialize setting workspcae-db connect_info and connect check
-            org_db = DBConnectOrg()  # noqa: F405
-            g.applogger.debug("ORG_DB:{} can be connected".format(organization_id))
-
-            wsdb_connect_info = org_db.get_wsdb_connect_info(workspace_id)
-            org_db.db_disconnect()
+            wsdb_connect_info = ConnectInfoCache.get_wsdb_connect_info(organization_id, workspace_id)
             if wsdb_connect_info is False:
                 raise AppException("999-00001", ["WORKSPACE_ID=" + workspace_id])
 
@@ -134,13 +129,17 @@ def before_request_handler():
             g.db_connect_info["WS_MONGO_USER"] = wsdb_connect_info["MONGO_USER"]
             g.db_connect_info["WS_MONGO_PASSWORD"] = wsdb_connect_info["MONGO_PASSWORD"]
 
-            ws_db = DBConnectWs(workspace_id)  # noqa: F405
-            g.applogger.debug("WS_DB:{} can be connected".format(workspace_id))
+            if is_connect_info_cached is False:
+                ws_db = DBConnectWs(workspace_id)  # noqa: F405
+                g.applogger.debug("WS_DB:{} can be connected".format(workspace_id))
 
-            # set log-level for user setting
-            # g.applogger.set_user_setting(ws_db)
-            ws_db.db_disconnect()
+                # set log-level for user setting
+                # g.applogger.set_user_setting(ws_db)
+                ws_db.db_disconnect()
     except AppException as e:
+        if e.args[0] == "999-00002" and "ORGANIZATION_ID" in g:
+            # DB接続エラーの場合は接続情報が変更されている可能性があるため、キャッシュを破棄する
+            ConnectInfoCache.invalidate(g.ORGANIZATION_ID)
         # catch - raise AppException("xxx-xxxxx", log_format, msg_format)
         return app_exception_response(e)
     except Exception as e:
@@ -0,0 +1,189 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+import pytest
+from unittest.mock import MagicMock
+from flask import Flask, g
+
+from common_libs.ansible_driver.classes.ansibletowerlibs import ExecuteDirector as execute_director_module
+from common_libs.ansible_driver.classes.ansibletowerlibs.RestApiCaller import RestApiCaller
+from common_libs.ansible_driver.classes.ansibletowerlibs.restapi_command.AnsibleTowerRestApiJobs import AnsibleTowerRestApiJobs
+
+
+JOB_ID = 10
+
+
+class StubController:
+    """
+    Ansible Automation Controllerのスタブ (接続数・レスポンスのバイト数を記録する)
+    """
+    def __init__(self):
+        self.events = []
+        self.connections = 0
+        self.sent_bytes = []
+
+    def add_events(self, count):
+        for _ in range(count):
+            counter = len(self.events) + 1
+            self.events.append({"counter": counter, "stdout": "\x1b[0;32mok: [host%04d]\x1b[0m" % (counter)})
+
+    def stdout(self):
+        return "".join("ok: [host%04d]\n" % (event["counter"]) for event in self.events)
+
+
+@pytest.fixture(scope='function')
+def controller():
+    stub = StubController()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self):
+            super().setup()
+            stub.connections += 1
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            query = parse_qs(url.query)
+            if url.path == "/api/v2/jobs/%s/job_events/" % (JOB_ID):
+                counter = int(query["counter__gt"][0])
+                page_size = int(query["page_size"][0])
+                results = [event for event in stub.events if event["counter"] > counter][:page_size]
+                body = json.dumps({"count": len(results), "results": results}).encode()
+            else:
+                body = json.dumps({"path": url.path}).encode()
+            stub.sent_bytes.append(len(body))
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    stub.port = server.server_address[1]
+
+    flask_app = Flask(__name__)
+    with flask_app.app_context():
+        g.applogger = MagicMock()
+        g.AACRestAPITimout = 5
+        yield stub
+
+    server.shutdown()
+    server.server_close()
+
+
+def make_caller(stub):
+    return RestApiCaller("http", "127.0.0.1", stub.port, "", {"address": "", "port": ""})
+
+
+def test_rest_call_keep_alive(controller):
+    """
+    RestApiCallerを作り直しても同じ接続を再利用する
+    """
+    for _ in range(3):
+        caller = make_caller(controller)
+        caller.authorize()
+        response_array = caller.restCall("GET", "config/")
+        assert response_array['statusCode'] == 200
+        assert response_array['responseContents'] == {"path": "/api/v2/config/"}
+
+    assert controller.connections == 1
+
+
+def test_get_stdout_events_incremental(controller):
+    """
+    ポーリング毎に追加されたjob_eventsだけを取得し、転送量がログ全体の大きさに依存しない
+    """
+    caller = make_caller(controller)
+    caller.authorize()
+
+    # counterの桁数を揃えるため、先に1000件取得しておく
+    controller.add_events(1000)
+    response_array = AnsibleTowerRestApiJobs.getStdOutEvents(caller, JOB_ID, 0)
+    stdout = response_array['responseContents']['stdout']
+    counter = response_array['responseContents']['counter']
+
+    poll_bytes = []
+    for _ in range(5):
+        controller.add_events(50)
+        controller.sent_bytes = []
+        response_array = AnsibleTowerRestApiJobs.getStdOutEvents(caller, JOB_ID, counter)
+        assert response_array['success'] is True
+
+        stdout += response_array['responseContents']['stdout']
+        counter = response_array['responseContents']['counter']
+        poll_bytes.append(sum(controller.sent_bytes))
+
+    assert counter == 1250
+    assert stdout == controller.stdout()
+    assert len(set(poll_bytes)) == 1
+    assert controller.connections == 1
+
+
+def test_get_stdout_events_paging(controller):
+    """
+    1ページに収まらないjob_eventsはcounterで続きを取得する
+    """
+    controller.add_events(AnsibleTowerRestApiJobs.JOB_EVENTS_PAGE_SIZE * 2 + 1)
+    caller = make_caller(controller)
+    caller.authorize()
+
+    response_array = AnsibleTowerRestApiJobs.getStdOutEvents(caller, JOB_ID, 0)
+
+    assert response_array['success'] is True
+    assert response_array['responseContents']['counter'] == len(controller.events)
+    assert response_array['responseContents']['stdout'] == controller.stdout()
+
+
+def test_get_stdout_events_gap(controller):
+    """
+    未登録のイベントがある場合はその手前までを返し、ジョブ終了後は最後まで返す
+    """
+    controller.add_events(10)
+    del controller.events[4]
+    caller = make_caller(controller)
+    caller.authorize()
+
+    response_array = AnsibleTowerRestApiJobs.getStdOutEvents(caller, JOB_ID, 0)
+    assert response_array['responseContents']['counter'] == 4
+
+    response_array = AnsibleTowerRestApiJobs.getStdOutEvents(caller, JOB_ID, 4, allow_gap=True)
+    assert response_array['responseContents']['counter'] == 10
+
+
+def test_get_job_stdout_no_duplicate(controller, tmp_path, monkeypatch):
+    """
+    counterの保存に失敗した場合・counterが無い場合も、stdoutを重複して追記しない
+    """
+    monkeypatch.setenv("STORAGEPATH", "/storage/")
+    monkeypatch.setattr(execute_director_module, "getAnsibleExecutDirPath", lambda AnsConstObj, execution_no: str(tmp_path))
+    director = object.__new__(execute_director_module.ExecuteDirector)
+    director.AnsConstObj = None
+    director.restApiCaller = make_caller(controller)
+    director.restApiCaller.authorize()
+    director.ExceptionErrorLog = MagicMock()
+    job_data = {"status": "running"}
+
+    controller.add_events(10)
+    assert director.getJobStdOut("1", JOB_ID, job_data)['responseContents'] == controller.stdout()
+
+    # stdoutの追記後、counterの保存前に失敗
+    controller.add_events(5)
+    original_write_text = execute_director_module.storage_write_text.write_text
+    monkeypatch.setattr(execute_director_module.storage_write_text, "write_text", MagicMock(side_effect=OSError("disk full")))
+    director.getJobStdOut("1", JOB_ID, job_data)
+    monkeypatch.setattr(execute_director_module.storage_write_text, "write_text", original_write_text)
+
+    controller.add_events(5)
+    assert director.getJobStdOut("1", JOB_ID, job_data)['responseContents'] == controller.stdout()
+
+    # counterが無い場合は最初から取得して書き直す
+    (tmp_path / "tmp" / ("job_stdout_%s.json" % (JOB_ID))).unlink()
+    assert director.getJobStdOut("1", JOB_ID, job_data)['responseContents'] == controller.stdout()
+    assert (tmp_path / "tmp" / ("job_stdout_%s.log" % (JOB_ID))).read_text() == controller.stdout()
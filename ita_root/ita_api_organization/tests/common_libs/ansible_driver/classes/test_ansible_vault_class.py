@@ -0,0 +1,106 @@
+import os
+import shutil
+import subprocess
+import pytest
+
+from common_libs.ansible_driver.classes.AnsibleVaultClass import AnsibleVault, VAULT_HEADER
+
+
+VAULT_PASSWORD = "vault_password"
+
+VALUES = [
+    "password",
+    "",
+    "日本語のパスワード",
+    "x" * 200,
+    "line1\r\nline2",
+]
+
+
+@pytest.mark.parametrize("value", VALUES)
+def test_vault_encrypt_decrypt(value):
+    """
+    暗号化した文字列を復号すると元の文字列(CR+LFはLF)に戻る
+    """
+    obj = AnsibleVault()
+    vaulttext = obj.VaultEncrypt(VAULT_PASSWORD, value)
+
+    lines = vaulttext.split("\n")
+    assert lines[0] == VAULT_HEADER
+    assert lines[-1] == ""
+    assert all(len(line) <= 80 for line in lines)
+    assert obj.VaultDecrypt(VAULT_PASSWORD, vaulttext) == value.replace("\r\n", "\n")
+
+    # パスワードが異なる場合は復号できない
+    with pytest.raises(ValueError):
+        obj.VaultDecrypt("other_password", vaulttext)
+
+
+def test_vault_encrypt_list():
+    """
+    一括暗号化はVault()と同じ形式(先頭に改行)で重複を除いて返す
+    """
+    obj = AnsibleVault()
+    result = obj.VaultEncryptList(VAULT_PASSWORD, ["pass1", "pass2", "pass1"])
+
+    assert list(result.keys()) == ["pass1", "pass2"]
+    for value, vaulttext in result.items():
+        assert vaulttext.startswith("\n" + VAULT_HEADER + "\n")
+        assert obj.VaultDecrypt(VAULT_PASSWORD, vaulttext) == value
+
+    # インデントを付加しても復号できる
+    indento_text = obj.setValutPasswdIndento(" !vault |" + result["pass1"], "    ")
+    assert obj.VaultDecrypt(VAULT_PASSWORD, indento_text.replace(" !vault |", "", 1)) == "pass1"
+
+
+@pytest.mark.parametrize("value", VALUES)
+def test_vault_encrypt_compatible_with_ansible(value):
+    """
+    同じsaltを使用した場合にansibleのVaultAES256と同じバイト列になる
+    """
+    vault = pytest.importorskip("ansible.parsing.vault")
+
+    salt = os.urandom(32)
+    b_ciphertext = vault.VaultAES256.encrypt(value.replace("\r\n", "\n").encode(), vault.VaultSecret(VAULT_PASSWORD.encode()), salt=salt)
+    expected = vault.format_vaulttext_envelope(b_ciphertext, "AES256").decode()
+
+    assert AnsibleVault().VaultEncrypt(VAULT_PASSWORD, value, salt=salt) == expected
+
+
+@pytest.mark.skipif(shutil.which("ansible-vault") is None, reason="ansible-vault is not installed")
+@pytest.mark.parametrize("value", VALUES)
+def test_vault_decrypt_by_ansible_vault(tmp_path, value):
+    """
+    暗号化した文字列をansible-vaultコマンドで復号できる
+    """
+    password_file = tmp_path / "vault_password"
+    password_file.write_text(VAULT_PASSWORD + "\n")
+    vault_file = tmp_path / "vault_value"
+    vault_file.write_text(AnsibleVault().VaultEncrypt(VAULT_PASSWORD, value))
+
+    ret = subprocess.run(["ansible-vault", "decrypt", "--vault-password-file", str(password_file), "--output", "-", str(vault_file)],
+                         stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+    assert ret.returncode == 0, ret.stderr
+    assert ret.stdout.decode() == value.replace("\r\n", "\n")
+
+
+@pytest.mark.parametrize("password", [" vault_password\t", "\tvault_password \r\n", "vault_password\n"])
+def test_vault_password_strip_compatible_with_ansible(tmp_path, password):
+    """
+    パスワードの前後の空白はansibleのパスワードファイルと同様に除去する
+    """
+    vault = pytest.importorskip("ansible.parsing.vault")
+    dataloader = pytest.importorskip("ansible.parsing.dataloader")
+    password_file = tmp_path / "vault_password"
+    password_file.write_text(password)
+    secret = vault.FileVaultSecret(filename=str(password_file), loader=dataloader.DataLoader())
+    secret.load()
+    vault_lib = vault.VaultLib([("default", secret)])
+
+    obj = AnsibleVault()
+    vaulttext = obj.VaultEncrypt(password, "password")
+    assert vault_lib.decrypt(vaulttext) == b"password"
+
+    b_vaulttext = vault_lib.encrypt("password", secret)
+    assert obj.VaultDecrypt(password, b_vaulttext.decode()) == "password"
@@ -0,0 +1,44 @@
+import json
+from unittest.mock import MagicMock
+from flask import current_app, g
+
+from common_libs.api.util import make_response_stream
+
+
+def test_make_response_stream(app_context_with_mock_g):
+    """
+    レコード単位で出力し、make_responseと同じ構造のJSONを返す
+    """
+    g.applogger = MagicMock()
+    on_close = MagicMock()
+    with current_app.test_request_context():
+        resp, status_code = make_response_stream((row for row in [{"parameter": {"name": "名前"}}, {"parameter": {"name": None}}]), on_close)
+        body = resp.get_data(as_text=True)
+        resp.close()
+
+    assert status_code == 200
+    assert json.loads(body) == {
+        "data": [{"parameter": {"name": "名前"}}, {"parameter": {"name": None}}],
+        "result": "000-00000",
+        "message": "SUCCESS",
+        "ts": None,
+    }
+    on_close.assert_called_once()
+
+
+def test_make_response_stream_error(app_context_with_mock_g):
+    """
+    出力中のエラーはログ出力してレスポンスを中断する
+    """
+    g.applogger = MagicMock()
+
+    def rows():
+        yield {"parameter": {}}
+        raise Exception("error")
+
+    with current_app.test_request_context():
+        resp, status_code = make_response_stream(rows())
+        body = resp.get_data(as_text=True)
+
+    assert body == '{"data": [{"parameter": {}}'
+    g.applogger.error.assert_called_once()
@@ -0,0 +1,108 @@
+import datetime
+import pytest
+from flask import g
+
+from common_libs.column.id_class import IDColumn
+from common_libs.column.id_reference_cache import IDReferenceCache
+
+
+class DummyDBConnectWs:
+    """
+    DBConnectWsのダミー (参照先テーブルを返し、実行したSQLを記録する)
+    """
+    def __init__(self, table_type="BASE TABLE"):
+        self._host = "db-host"
+        self._port = 3306
+        self._db = "WS_DB"
+        self.table_type = table_type
+        self.queries = []
+        self.rows = [
+            {"HOST_ID": "h1", "HOST_NAME": "server01", "DISUSE_FLAG": "0"},
+            {"HOST_ID": "h2", "HOST_NAME": "server02", "DISUSE_FLAG": "0"},
+            {"HOST_ID": "h3", "HOST_NAME": "server01", "DISUSE_FLAG": "0"},
+        ]
+        self.last_update = datetime.datetime(2025, 1, 1)
+
+    def sql_execute(self, sql, bind_value_list=[]):
+        if "information_schema" in sql:
+            return [{"TABLE_TYPE": self.table_type, "TIMESTAMP_COUNT": 1}]
+        self.queries.append("version")
+        return [{"LAST_UPDATE_TIMESTAMP": self.last_update, "ROW_COUNT": len(self.rows)}]
+
+    def table_select(self, table_name, where_str="", bind_value_list=[]):
+        self.queries.append("select")
+        return [dict(row) for row in self.rows]
+
+
+def create_column(objdbca, table_name="T_TEST"):
+    objtable = {
+        "MENUINFO": {"TABLE_NAME": table_name},
+        "COLINFO": {
+            "host": {
+                "COL_NAME": "HOST_ID",
+                "REF_TABLE_NAME": "T_ANSC_DEVICE",
+                "REF_PKEY_NAME": "HOST_ID",
+                "REF_COL_NAME": "HOST_NAME",
+                "REF_MULTI_LANG": "0",
+            }
+        }
+    }
+    return IDColumn(objdbca, objtable, "host", "Register")
+
+
+@pytest.fixture(scope='function')
+def reference_cache(app_context_with_mock_g, monkeypatch):
+    monkeypatch.setenv("IDCOLUMN_REFERENCE_CACHE_ENABLED", "1")
+    g.LANGUAGE = "ja"
+    IDReferenceCache.clear()
+    yield
+    IDReferenceCache.clear()
+
+
+def test_get_values_by_value(reference_cache):
+    """
+    値から参照先の主キーを取得する(同じ値が複数ある場合は全て返す)
+    """
+    column = create_column(DummyDBConnectWs())
+
+    assert column.get_values_by_value(["server01"]) == {"h1": "server01", "h3": "server01"}
+    assert column.get_values_by_value(["server02", None, "nothing"]) == {"h2": "server02", None: None}
+    assert column.get_values_by_value([], "02") == {"h2": "server02"}
+    assert column.convert_value_input("server02") == (True, "", "h2")
+
+
+def test_reference_cached(reference_cache):
+    """
+    参照先テーブルが更新されていなければ、カラム(loadTable)を跨いでリストを再取得しない
+    """
+    objdbca = DummyDBConnectWs()
+    create_column(objdbca).get_values_by_value(["server01"])
+    column = create_column(objdbca)
+    column.get_values_by_value(["server01"])
+    assert objdbca.queries == ["version", "select", "version"]
+
+    # 返したリストを変更してもキャッシュには影響しない
+    column.get_id_data_list()["h9"] = "server09"
+    assert "h9" not in create_column(objdbca).get_values_by_key()
+
+    # 参照先テーブルが更新された場合は再取得する
+    objdbca.rows.append({"HOST_ID": "h4", "HOST_NAME": "server04", "DISUSE_FLAG": "0"})
+    objdbca.queries = []
+    assert create_column(objdbca).get_values_by_value(["server04"]) == {"h4": "server04"}
+    assert objdbca.queries == ["version", "select"]
+
+
+def test_reference_not_cached(reference_cache, monkeypatch):
+    """
+    VIEWの場合、キャッシュを無効にした場合は毎回取得する
+    """
+    objdbca = DummyDBConnectWs("VIEW")
+    create_column(objdbca).get_id_data_list()
+    create_column(objdbca).get_id_data_list()
+    assert objdbca.queries == ["select", "select"]
+
+    monkeypatch.setenv("IDCOLUMN_REFERENCE_CACHE_ENABLED", "0")
+    objdbca = DummyDBConnectWs()
+    create_column(objdbca).get_id_data_list()
+    create_column(objdbca).get_id_data_list()
+    assert objdbca.queries == ["select", "select"]
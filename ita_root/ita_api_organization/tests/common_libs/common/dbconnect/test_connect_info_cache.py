@@ -0,0 +1,86 @@
+import pytest
+from unittest.mock import MagicMock
+from flask import g
+
+from common_libs.common.dbconnect import connect_info_cache
+from common_libs.common.dbconnect.connect_info_cache import ConnectInfoCache
+
+
+ORGDB_INFO = {"DB_HOST": "org-host", "DB_PORT": 3306, "DB_DATABASE": "ORG_DB"}
+WSDB_INFO = {"DB_HOST": "ws-host", "DB_PORT": 3306, "DB_DATABASE": "WS_DB"}
+
+
+@pytest.fixture(scope='function')
+def mock_db(app_context_with_mock_g, monkeypatch):
+    """
+    DBConnectCommon/DBConnectOrgをモックし、接続回数を記録する
+    """
+    g.applogger = MagicMock()
+    ConnectInfoCache.invalidate()
+
+    common_db = MagicMock()
+    common_db.get_orgdb_connect_info.return_value = ORGDB_INFO
+    org_db = MagicMock()
+    org_db.get_wsdb_connect_info.return_value = WSDB_INFO
+
+    common_db_class = MagicMock(return_value=common_db)
+    org_db_class = MagicMock(return_value=org_db)
+    monkeypatch.setattr(connect_info_cache, "DBConnectCommon", common_db_class)
+    monkeypatch.setattr(connect_info_cache, "DBConnectOrg", org_db_class)
+
+    yield common_db_class, org_db_class
+
+    ConnectInfoCache.invalidate()
+
+
+def test_connect_info_cached(mock_db, monkeypatch):
+    """
+    2回目以降はDBへ接続せずにキャッシュから返す
+    """
+    monkeypatch.setenv("CONNECT_INFO_CACHE_TTL", "60")
+    common_db_class, org_db_class = mock_db
+
+    assert ConnectInfoCache.is_cached("org1", "ws1") is False
+    for _ in range(3):
+        assert ConnectInfoCache.get_orgdb_connect_info("org1") == ORGDB_INFO
+        assert ConnectInfoCache.get_wsdb_connect_info("org1", "ws1") == WSDB_INFO
+
+    assert ConnectInfoCache.is_cached("org1", "ws1") is True
+    assert common_db_class.call_count == 1
+    assert org_db_class.call_count == 1
+
+
+def test_connect_info_invalidate(mock_db, monkeypatch):
+    """
+    invalidateしたorganizationは再取得する
+    """
+    monkeypatch.setenv("CONNECT_INFO_CACHE_TTL", "60")
+    common_db_class, org_db_class = mock_db
+
+    ConnectInfoCache.get_orgdb_connect_info("org1")
+    ConnectInfoCache.get_wsdb_connect_info("org1", "ws1")
+    ConnectInfoCache.invalidate("org1")
+
+    assert ConnectInfoCache.is_cached("org1", "ws1") is False
+    ConnectInfoCache.get_orgdb_connect_info("org1")
+    ConnectInfoCache.get_wsdb_connect_info("org1", "ws1")
+    assert common_db_class.call_count == 2
+    assert org_db_class.call_count == 2
+
+
+def test_connect_info_not_cached(mock_db, monkeypatch):
+    """
+    TTL=0の場合、存在しない接続情報の場合はキャッシュしない
+    """
+    common_db_class, org_db_class = mock_db
+
+    monkeypatch.setenv("CONNECT_INFO_CACHE_TTL", "0")
+    ConnectInfoCache.get_orgdb_connect_info("org1")
+    ConnectInfoCache.get_orgdb_connect_info("org1")
+    assert common_db_class.call_count == 2
+
+    monkeypatch.setenv("CONNECT_INFO_CACHE_TTL", "60")
+    common_db_class.return_value.get_orgdb_connect_info.return_value = False
+    assert ConnectInfoCache.get_orgdb_connect_info("org2") is False
+    assert ConnectInfoCache.get_orgdb_connect_info("org2") is False
+    assert common_db_class.call_count == 4
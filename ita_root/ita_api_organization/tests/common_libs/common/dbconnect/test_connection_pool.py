@@ -0,0 +1,136 @@
+import threading
+import pytest
+
+from common_libs.common.dbconnect.connection_pool import DBConnectionPool
+
+
+KEY = ("db-host", 3306, "ws_user", "WS_DB", "DictCursor", "hash")
+
+
+class DummyConnection:
+    """
+    pymysql.connections.Connectionのダミー
+    """
+    def __init__(self):
+        self.open = True
+        self.rollback_count = 0
+        self.ping_error = False
+
+    def rollback(self):
+        self.rollback_count += 1
+
+    def ping(self, reconnect=False):
+        if self.ping_error:
+            raise Exception("ping error")
+
+    def close(self):
+        self.open = False
+
+
+@pytest.fixture(scope='function', autouse=True)
+def reset_pool(monkeypatch):
+    monkeypatch.setenv("DB_POOL_SIZE", "2")
+    monkeypatch.setenv("DB_POOL_TIMEOUT", "0.1")
+    DBConnectionPool._reset_after_fork()
+    yield
+    DBConnectionPool._reset_after_fork()
+
+
+def test_checkout_reuse():
+    """
+    返却した接続はrollbackして再利用する
+    """
+    con1, pooled = DBConnectionPool.checkout(KEY, DummyConnection)
+    assert pooled is True
+    DBConnectionPool.checkin(KEY, con1, pooled)
+    assert con1.rollback_count == 1
+
+    con2, pooled = DBConnectionPool.checkout(KEY, DummyConnection)
+    assert con2 is con1
+
+    stats = DBConnectionPool.get_stats()["ws_user@db-host:3306/WS_DB"]
+    assert stats["created"] == 1
+    assert stats["reused"] == 1
+    assert stats["in_use"] == 1
+    assert stats["idle"] == 0
+
+
+def test_checkout_overflow():
+    """
+    最大接続数を超えた場合は待った後にプール外の接続を作成し、返却時に切断する
+    """
+    con1, _ = DBConnectionPool.checkout(KEY, DummyConnection)
+    con2, _ = DBConnectionPool.checkout(KEY, DummyConnection)
+    con3, pooled = DBConnectionPool.checkout(KEY, DummyConnection)
+    assert pooled is False
+
+    DBConnectionPool.checkin(KEY, con3, pooled)
+    assert con3.open is False
+
+    stats = DBConnectionPool.get_stats()["ws_user@db-host:3306/WS_DB"]
+    assert stats["overflow"] == 1
+    assert stats["in_use"] == 2
+    assert stats["wait_time"] >= 0.1
+
+
+def test_checkout_wait_for_checkin():
+    """
+    最大接続数に達している場合は返却を待って貸し出す
+    """
+    con1, _ = DBConnectionPool.checkout(KEY, DummyConnection)
+    con2, _ = DBConnectionPool.checkout(KEY, DummyConnection)
+
+    timer = threading.Timer(0.02, DBConnectionPool.checkin, args=(KEY, con1, True))
+    timer.start()
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("DB_POOL_TIMEOUT", "5")
+        con3, pooled = DBConnectionPool.checkout(KEY, DummyConnection)
+    timer.join()
+
+    assert pooled is True
+    assert con3 is con1
+
+
+def test_checkout_health_check(monkeypatch):
+    """
+    pingに失敗した接続は破棄して新規に接続する
+    """
+    monkeypatch.setenv("DB_POOL_PING_INTERVAL", "0")
+    con1, _ = DBConnectionPool.checkout(KEY, DummyConnection)
+    DBConnectionPool.checkin(KEY, con1)
+    con1.ping_error = True
+
+    con2, _ = DBConnectionPool.checkout(KEY, DummyConnection)
+    assert con2 is not con1
+    assert con1.open is False
+
+
+def test_checkin_after_fork():
+    """
+    fork前に貸し出された接続は切断せずに破棄する
+    """
+    con1, _ = DBConnectionPool.checkout(KEY, DummyConnection)
+    con1._pool_pid = -1
+    DBConnectionPool.checkin(KEY, con1)
+
+    assert con1.open is True
+    assert con1.rollback_count == 0
+
+
+def test_checkin_session_changed():
+    """
+    セッション変数を変更した接続は次の貸出先に引き継がずに切断する
+    """
+    con1, pooled = DBConnectionPool.checkout(KEY, DummyConnection)
+    DBConnectionPool.mark_session_changed(con1)
+    DBConnectionPool.checkin(KEY, con1, pooled)
+    assert con1.open is False
+
+    con2, pooled = DBConnectionPool.checkout(KEY, DummyConnection)
+    assert con2 is not con1
+    DBConnectionPool.checkin(KEY, con2, pooled)
+    assert con2.open is True
+
+    stats = DBConnectionPool.get_stats()["ws_user@db-host:3306/WS_DB"]
+    assert stats["created"] == 2
+    assert stats["closed"] == 1
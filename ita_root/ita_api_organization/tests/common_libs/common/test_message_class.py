@@ -0,0 +1,86 @@
+import json
+import os
+import pytest
+
+from common_libs.common.message_class import MessageCatalog, MessageTemplate
+
+
+MESSAGES_DIR = os.path.join(os.path.dirname(__file__), "../../../../messages")
+
+
+@pytest.fixture(scope='function')
+def messages_dir(monkeypatch):
+    """
+    メッセージファイルのディレクトリ(ita_root/messages)を参照するようにPYTHONPATHを設定する
+    """
+    monkeypatch.setenv("PYTHONPATH", os.path.dirname(os.path.abspath(MESSAGES_DIR)))
+    MessageCatalog.clear()
+    yield os.path.abspath(MESSAGES_DIR)
+    MessageCatalog.clear()
+
+
+def test_get_message(messages_dir):
+    """
+    言語毎のメッセージを取得できる(インスタンス毎に言語を保持する)
+    """
+    with open(os.path.join(messages_dir, "API_JA.json"), encoding="utf-8") as f:
+        api_ja = json.load(f)
+    with open(os.path.join(messages_dir, "API_EN.json"), encoding="utf-8") as f:
+        api_en = json.load(f)
+    with open(os.path.join(messages_dir, "LOG.json"), encoding="utf-8") as f:
+        log = json.load(f)
+
+    msg_ja = MessageTemplate("ja")
+    msg_en = MessageTemplate("en")
+
+    assert msg_ja.get_api_message("MSG-00001") == api_ja["MSG-00001"]
+    assert msg_en.get_api_message("MSG-00001") == api_en["MSG-00001"]
+    assert msg_ja.get_log_message("BKY-00005") == log["BKY-00005"]
+    assert msg_ja.get_api_message("XXX-99999") == "Message id is not found.(Called-ID[XXX-99999])"
+    assert msg_ja.messages["api"]["en"] == api_en
+
+
+def test_message_files_loaded_once(messages_dir, mocker):
+    """
+    メッセージファイルはプロセス内で1回だけ読み込む(言語毎に必要になった時点で読み込む)
+    """
+    spy = mocker.spy(MessageCatalog, "_load_json")
+
+    for _ in range(10):
+        MessageTemplate("ja").get_api_message("MSG-00001")
+    assert spy.call_count == 1
+
+    for _ in range(10):
+        MessageTemplate("ja").get_log_message("BKY-00005")
+    assert spy.call_count == 2
+
+
+def test_message_marshal_cache(messages_dir, monkeypatch, tmp_path, mocker):
+    """
+    MESSAGE_CACHE_DIRを指定した場合、2回目以降のプロセスはmarshalキャッシュから読み込む
+    """
+    monkeypatch.setenv("MESSAGE_CACHE_DIR", str(tmp_path))
+    expected = MessageTemplate("en").get_api_message("MSG-00001")
+    assert os.path.isfile(tmp_path / "API_EN.json.marshal")
+
+    MessageCatalog.clear()
+    spy = mocker.spy(MessageCatalog, "_load_json")
+    assert MessageTemplate("en").get_api_message("MSG-00001") == expected
+    assert spy.call_count == 0
+
+
+def test_shared_per_request(messages_dir, mocker):
+    """
+    before_request_handler相当(リクエスト毎にMessageTemplateを生成してメッセージを取得)でも、
+    メッセージファイルは1回だけ解析し、共有した内容を使い回す
+    """
+    spy = mocker.spy(json, "load")
+
+    messages_list = []
+    for _ in range(50):
+        msg = MessageTemplate("ja")
+        msg.get_api_message("MSG-00001")
+        messages_list.append(MessageCatalog.get_api_messages(msg.path, "ja"))
+
+    assert spy.call_count == 1
+    assert all(messages is messages_list[0] for messages in messages_list)
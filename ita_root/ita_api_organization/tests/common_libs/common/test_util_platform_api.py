@@ -0,0 +1,96 @@
+import json
+import pytest
+from unittest.mock import MagicMock
+from flask import g
+
+from common_libs.common.exception import AppException
+from common_libs.common.util import PlatformApiCache, get_maintenance_mode_setting, get_org_upload_file_size_limit
+
+
+MAINTENANCE_OFF = {"backyard_execute_stop": "0", "data_update_stop": "0"}
+MAINTENANCE_ON = {"backyard_execute_stop": "1", "data_update_stop": "1"}
+
+
+class DummySession:
+    """
+    requests.Sessionのダミー (api_url毎のレスポンスを返し、呼び出し回数を記録する)
+    """
+    def __init__(self):
+        self.responses = {}
+        self.calls = []
+
+    def get(self, api_url, headers=None, timeout=None):
+        self.calls.append(api_url)
+        status_code, data = self.responses[api_url.split("/internal-api/")[1]]
+        response = MagicMock()
+        response.status_code = status_code
+        response.text = json.dumps(data)
+        return response
+
+
+@pytest.fixture(scope='function')
+def platform_api(app_context_with_mock_g, monkeypatch):
+    monkeypatch.setenv("PLATFORM_API_HOST", "platform-api")
+    monkeypatch.setenv("PLATFORM_API_PORT", "8000")
+    monkeypatch.setenv("PLATFORM_API_CACHE_TTL", "60")
+    session = DummySession()
+    session.responses["platform/maintenance-mode-setting"] = (200, {"data": MAINTENANCE_OFF})
+    session.responses["org1/platform/limits"] = (200, {"data": {"ita.organization.common.upload_file_size_limit": 100}})
+    monkeypatch.setattr(PlatformApiCache, "get_session", classmethod(lambda cls: session))
+    PlatformApiCache.invalidate()
+    yield session
+    PlatformApiCache.invalidate()
+    g.pop("ORG_UPLOAD_FILE_SIZE_LIMIT", None)
+
+
+def test_platform_api_cached(platform_api):
+    """
+    有効期限内はPlatform APIを呼び出さずにキャッシュから返す
+    """
+    for _ in range(3):
+        assert get_maintenance_mode_setting() == MAINTENANCE_OFF
+        assert get_org_upload_file_size_limit("org1") == 100
+        g.pop("ORG_UPLOAD_FILE_SIZE_LIMIT")
+
+    assert len(platform_api.calls) == 2
+
+    # 戻り値を変更してもキャッシュには影響しない
+    get_maintenance_mode_setting()["data_update_stop"] = "1"
+    assert get_maintenance_mode_setting() == MAINTENANCE_OFF
+
+
+def test_platform_api_not_cached(platform_api, monkeypatch):
+    """
+    TTL=0の場合、エラー応答の場合はキャッシュしない
+    """
+    monkeypatch.setenv("PLATFORM_API_CACHE_TTL", "0")
+    get_maintenance_mode_setting()
+    get_maintenance_mode_setting()
+    assert len(platform_api.calls) == 2
+
+    monkeypatch.setenv("PLATFORM_API_CACHE_TTL", "60")
+    platform_api.responses["org1/platform/limits"] = (500, {"message": "error"})
+    for _ in range(2):
+        with pytest.raises(AppException):
+            get_org_upload_file_size_limit("org1")
+    assert len(platform_api.calls) == 4
+
+
+def test_platform_api_maintenance_transition(platform_api):
+    """
+    メンテナンス中はメンテナンスモードを毎回取得し、状態が変化したらキャッシュを破棄する
+    """
+    get_maintenance_mode_setting()
+    get_org_upload_file_size_limit("org1")
+    g.pop("ORG_UPLOAD_FILE_SIZE_LIMIT")
+
+    platform_api.responses["platform/maintenance-mode-setting"] = (200, {"data": MAINTENANCE_ON})
+    assert get_maintenance_mode_setting(refresh=True) == MAINTENANCE_ON
+    assert get_maintenance_mode_setting() == MAINTENANCE_ON
+    get_org_upload_file_size_limit("org1")
+
+    platform_api.responses["platform/maintenance-mode-setting"] = (200, {"data": MAINTENANCE_OFF})
+    assert get_maintenance_mode_setting() == MAINTENANCE_OFF
+
+    assert platform_api.calls.count("http://platform-api:8000/internal-api/platform/maintenance-mode-setting") == 4
+    assert platform_api.calls.count("http://platform-api:8000/internal-api/org1/platform/limits") == 2
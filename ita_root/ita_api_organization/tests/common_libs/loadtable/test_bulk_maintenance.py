@@ -0,0 +1,99 @@
+import json
+import pytest
+from flask import g
+
+from common_libs.loadtable import loadTable
+from common_libs.loadtable.menu_info_cache import MenuInfoCache
+
+
+class DummyDBConnectWs:
+    """
+    DBConnectWsのダミー (メニュー定義を返し、一括登録したレコードを記録する)
+    """
+    def __init__(self, menu_info={}):
+        self._host = "db-host"
+        self._port = 3306
+        self._db = "WS_DB"
+        self.menu_info = menu_info
+        self.uuid_count = 0
+        self.bulk_insert = []
+
+    def sql_execute(self, sql, bind_value_list=[]):
+        if "T_COMN_MENU_TABLE_LINK" in sql:
+            return [dict({"MENU_ID": "m1", "TABLE_NAME": "T_TEST", "HISTORY_TABLE_FLAG": "1"}, **self.menu_info)]
+        return [
+            {"COLUMN_NAME_REST": "uuid", "COL_NAME": "ROW_ID", "COLUMN_DISP_SEQ": 1, "COLUMN_CLASS_NAME": "SingleTextColumn"},
+            {"COLUMN_NAME_REST": "name", "COL_NAME": "NAME", "COLUMN_DISP_SEQ": 2, "COLUMN_CLASS_NAME": "SingleTextColumn", "UNIQUE_ITEM": "1"},
+            {"COLUMN_NAME_REST": "host", "COL_NAME": "HOST", "COLUMN_DISP_SEQ": 3, "COLUMN_CLASS_NAME": "SingleTextColumn"},
+        ]
+
+    def table_columns_get(self, table_name):
+        return (["ROW_ID", "NAME", "HOST"], ["ROW_ID"])
+
+    def genarate_primary_key_value(self):
+        self.uuid_count += 1
+        return "uuid-{}".format(self.uuid_count)
+
+    def table_insert_bulk(self, table_name, data_list, primary_key_name, is_register_history=False, history_data_list=None):
+        self.bulk_insert.append((table_name, data_list, primary_key_name, is_register_history, history_data_list))
+        return data_list
+
+
+@pytest.fixture(scope='function')
+def bulk_env(app_context_with_mock_g, monkeypatch):
+    monkeypatch.setenv("LOADTABLE_MENU_CACHE_ENABLED", "0")
+    monkeypatch.setenv("LOADTABLE_BULK_MAINTENANCE_THRESHOLD", "2")
+    g.LANGUAGE = "ja"
+    g.USER_ID = "user1"
+    MenuInfoCache.clear()
+    yield
+
+
+def get_parameters(count, cmd_type="Register"):
+    return [{"type": cmd_type, "parameter": {"name": "name{}".format(i)}} for i in range(count)]
+
+
+def test_is_bulk_maintenance(bulk_env):
+    """
+    件数が閾値以上で全件が登録、レコードを参照する個別処理がないメニューのみ一括登録にする
+    """
+    objmenu = loadTable(DummyDBConnectWs(), "test_menu")
+    assert objmenu.is_bulk_maintenance(get_parameters(2)) is True
+    assert objmenu.is_bulk_maintenance(get_parameters(1)) is False
+    assert objmenu.is_bulk_maintenance(get_parameters(2) + get_parameters(1, "Update")) is False
+    assert objmenu.is_bulk_maintenance(get_parameters(2), {"0": {"file": "/tmp/file"}}) is False
+
+    # パラメータシートの個別処理は許可
+    objmenu = loadTable(DummyDBConnectWs({"SHEET_TYPE": "1", "BEFORE_VALIDATE_REGISTER": "set_reference_value"}), "test_menu")
+    assert objmenu.is_bulk_maintenance(get_parameters(2)) is True
+
+    objmenu = loadTable(DummyDBConnectWs({"SHEET_TYPE": "1", "AFTER_VALIDATE_REGISTER": "menu_create_valid"}), "test_menu")
+    assert objmenu.is_bulk_maintenance(get_parameters(2)) is False
+
+
+def test_set_bulk_insert(bulk_env):
+    """
+    一括登録するレコードは、以降のレコードの一意制約の確認対象になる
+    """
+    objdbca = DummyDBConnectWs({"UNIQUE_CONSTRAINT": json.dumps([["name", "host"]])})
+    objmenu = loadTable(objdbca, "test_menu")
+    objmenu.start_bulk_maintenance()
+    objcolumn = objmenu.get_columnclass("name", "Register")
+
+    entry_parameter = {"name": "name1", "host": "host1"}
+    result, jnl_uuid = objmenu.set_bulk_insert({"NAME": "name1", "HOST": "host1"}, entry_parameter, "ROW_ID", True)
+    assert result[0]["ROW_ID"] == "uuid-1"
+    assert jnl_uuid == "uuid-2"
+
+    assert objcolumn.get_pending_unique_uuids("name1") == ["uuid-1"]
+    assert objcolumn.get_pending_unique_uuids("name2") == []
+    assert objmenu.unique_constraint_checker.get_pending_uuids(0, ("name1", "host1")) == ["uuid-1"]
+
+    objmenu.exec_bulk_insert()
+    table_name, data_list, primary_key, history_flg, history_data_list = objdbca.bulk_insert[0]
+    assert (table_name, primary_key, history_flg) == ("T_TEST", "ROW_ID", True)
+    assert data_list[0]["LAST_UPDATE_TIMESTAMP"] == history_data_list[0]["JOURNAL_REG_DATETIME"]
+    assert history_data_list[0]["JOURNAL_SEQ_NO"] == "uuid-2"
+
+    objmenu.end_bulk_maintenance()
+    assert objcolumn.get_pending_unique_uuids("name1") == []
@@ -0,0 +1,81 @@
+import pytest
+from flask import g
+
+from common_libs.loadtable import loadTable
+from common_libs.loadtable.menu_info_cache import MenuInfoCache
+
+
+class DummyDBConnectWs:
+    """
+    DBConnectWsのダミー (主キー順・LIMITでレコードを返し、実行した検索条件を記録する)
+    """
+    def __init__(self, count):
+        self._host = "db-host"
+        self._port = 3306
+        self._db = "WS_DB"
+        self.rows = [{"ROW_ID": "uuid-{:02}".format(i), "NAME": "name{}".format(i)} for i in range(count)]
+        self.selects = []
+
+    def sql_execute(self, sql, bind_value_list=[]):
+        if "T_COMN_MENU_TABLE_LINK" in sql:
+            return [{"MENU_ID": "m1", "TABLE_NAME": "T_TEST", "HISTORY_TABLE_FLAG": "1"}]
+        return [
+            {"COLUMN_NAME_REST": "uuid", "COL_NAME": "ROW_ID", "COLUMN_DISP_SEQ": 1, "COLUMN_CLASS_NAME": "SingleTextColumn"},
+            {"COLUMN_NAME_REST": "name", "COL_NAME": "NAME", "COLUMN_DISP_SEQ": 2, "COLUMN_CLASS_NAME": "SingleTextColumn"},
+        ]
+
+    def table_columns_get(self, table_name):
+        return (["ROW_ID", "NAME"], ["ROW_ID"])
+
+    def table_select(self, table_name, where_str="", bind_value_list=[]):
+        self.selects.append((where_str, list(bind_value_list)))
+        rows = self.rows
+        if "`ROW_ID` > %s" in where_str:
+            rows = [row for row in rows if row["ROW_ID"] > bind_value_list[-1]]
+        limit = int(where_str.rsplit("LIMIT", 1)[1])
+        return [dict(row) for row in rows[:limit]]
+
+
+@pytest.fixture(scope='function')
+def stream_env(app_context_with_mock_g, monkeypatch):
+    monkeypatch.setenv("LOADTABLE_MENU_CACHE_ENABLED", "0")
+    monkeypatch.setenv("LOADTABLE_FILTER_PAGE_ROWS", "2")
+    g.LANGUAGE = "ja"
+    g.USER_ID = "user1"
+    MenuInfoCache.clear()
+    yield
+
+
+def test_rest_filter_stream(stream_env):
+    """
+    主キーのキーセットでページ単位に取得し、1ページ分ずつ変換して返す
+    """
+    objdbca = DummyDBConnectWs(5)
+    objmenu = loadTable(objdbca, "test_menu")
+    status_code, result, msg = objmenu.rest_filter({}, 'nomal', stream=True)
+
+    # 1ページ目は呼び出し時に取得する
+    assert len(objdbca.selects) == 1
+    assert next(result) == {"parameter": {"uuid": "uuid-00", "name": "name0"}, "file": {}}
+    rows = list(result)
+    assert [row["parameter"]["uuid"] for row in rows] == ["uuid-01", "uuid-02", "uuid-03", "uuid-04"]
+
+    assert objdbca.selects == [
+        ("ORDER BY `ROW_ID` LIMIT 2", []),
+        ("where `ROW_ID` > %s ORDER BY `ROW_ID` LIMIT 2", ["uuid-01"]),
+        ("where `ROW_ID` > %s ORDER BY `ROW_ID` LIMIT 2", ["uuid-03"]),
+    ]
+
+
+def test_rest_filter_stream_where(stream_env):
+    """
+    検索条件はまとめて括弧で囲み、キーセットの条件と結合する
+    """
+    objdbca = DummyDBConnectWs(4)
+    objmenu = loadTable(objdbca, "test_menu")
+    rows = list(objmenu.iter_filter_rows("T_TEST", " where `NAME` = %s or `NAME` = %s", ["name1", "name2"]))
+
+    assert len(rows) == 4
+    assert objdbca.selects[1] == ("where (`NAME` = %s or `NAME` = %s) and `ROW_ID` > %s ORDER BY `ROW_ID` LIMIT 2", ["name1", "name2", "uuid-01"])
+    # 最終ページが1ページの件数と同じ場合は空のページを取得して終了
+    assert len(objdbca.selects) == 3
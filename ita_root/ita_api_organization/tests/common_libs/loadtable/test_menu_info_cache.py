@@ -0,0 +1,108 @@
+import datetime
+import pytest
+from flask import g
+
+from common_libs.loadtable import loadTable
+from common_libs.loadtable import menu_info_cache
+from common_libs.loadtable.menu_info_cache import MenuInfoCache
+
+
+class DummyDBConnectWs:
+    """
+    DBConnectWsのダミー (メニュー定義のテーブルを返し、実行したSQLを記録する)
+    """
+    def __init__(self, db="WS_DB"):
+        self._host = "db-host"
+        self._port = 3306
+        self._db = db
+        self.queries = []
+        self.last_update = datetime.datetime(2025, 1, 1)
+
+    def sql_execute(self, sql, bind_value_list=[]):
+        self.queries.append(sql)
+        if "UNION ALL" in sql:
+            return [{"TABLE_NAME": "T_COMN_MENU", "LAST_UPDATE_TIMESTAMP": self.last_update, "ROW_COUNT": 1}]
+        if "T_COMN_MENU_TABLE_LINK" in sql:
+            return [{"MENU_ID": "m1", "TABLE_NAME": "T_TEST", "HISTORY_TABLE_FLAG": "1"}]
+        return [
+            {"COLUMN_NAME_REST": "uuid", "COL_NAME": "ROW_ID", "COLUMN_DISP_SEQ": 1},
+            {"COLUMN_NAME_REST": "name", "COL_NAME": "NAME", "COLUMN_DISP_SEQ": 2},
+        ]
+
+    def table_columns_get(self, table_name):
+        self.queries.append("SHOW COLUMNS")
+        return (["ROW_ID", "NAME"], ["ROW_ID"])
+
+
+@pytest.fixture(scope='function')
+def menu_cache(app_context_with_mock_g, monkeypatch):
+    monkeypatch.setenv("LOADTABLE_MENU_CACHE_ENABLED", "1")
+    g.LANGUAGE = "ja"
+    g.USER_ID = "user1"
+    MenuInfoCache.clear()
+    yield
+    MenuInfoCache.clear()
+
+
+def test_menu_info_cached(menu_cache):
+    """
+    メニュー定義が更新されていなければ、メニュー・カラム情報を再取得しない
+    """
+    objdbca = DummyDBConnectWs()
+    objmenu1 = loadTable(objdbca, "test_menu")
+    objmenu1.set_history_flg(False)
+    objmenu1.objtable["COLINFO"]["uuid"]["objcolumn"] = object()
+
+    objdbca.queries = []
+    objmenu2 = loadTable(objdbca, "test_menu")
+
+    # バージョンも一定時間は使い回す
+    assert len(objdbca.queries) == 0
+    assert objmenu2.get_restkey_list() == ["uuid", "name"]
+    assert objmenu2.get_column_list() == ["ROW_ID", "NAME"]
+    assert objmenu2.get_primary_key() == "ROW_ID"
+    # インスタンス毎の変更は共有しない
+    assert objmenu2.get_history_flg() is True
+    assert "objcolumn" not in objmenu2.objtable["COLINFO"]["uuid"]
+
+
+def test_menu_info_invalidated(menu_cache, monkeypatch):
+    """
+    メニュー定義が更新された場合、別workspaceの場合は再取得する
+    """
+    now = [1000.0]
+    monkeypatch.setattr(menu_info_cache.time, "monotonic", lambda: now[0])
+    objdbca = DummyDBConnectWs()
+    loadTable(objdbca, "test_menu")
+
+    # バージョンの保持期間内は更新を確認しない
+    objdbca.last_update = datetime.datetime(2025, 1, 2)
+    objdbca.queries = []
+    now[0] += 4
+    loadTable(objdbca, "test_menu")
+    assert len(objdbca.queries) == 0
+
+    now[0] += 1
+    loadTable(objdbca, "test_menu")
+    assert len(objdbca.queries) == 4
+
+    # 保持期間が0の場合は毎回確認する
+    monkeypatch.setenv("LOADTABLE_MENU_CACHE_VERSION_TTL", "0")
+    objdbca.queries = []
+    loadTable(objdbca, "test_menu")
+    assert len(objdbca.queries) == 1
+
+    other_ws = DummyDBConnectWs("WS_DB2")
+    loadTable(other_ws, "test_menu")
+    assert len(other_ws.queries) == 4
+
+
+def test_menu_info_cache_disabled(menu_cache, monkeypatch):
+    """
+    キャッシュを無効にした場合は毎回取得する
+    """
+    monkeypatch.setenv("LOADTABLE_MENU_CACHE_ENABLED", "0")
+    objdbca = DummyDBConnectWs()
+    loadTable(objdbca, "test_menu")
+    loadTable(objdbca, "test_menu")
+    assert len(objdbca.queries) == 6
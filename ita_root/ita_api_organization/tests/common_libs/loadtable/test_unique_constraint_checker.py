@@ -0,0 +1,108 @@
+import json
+import pytest
+from flask import g
+
+from common_libs.loadtable import loadTable
+from common_libs.loadtable.menu_info_cache import MenuInfoCache
+
+
+class DummyDBConnectWs:
+    """
+    DBConnectWsのダミー (パラメータシートのメニュー定義・レコードを返し、実行したSQLを記録する)
+    """
+    def __init__(self):
+        self._host = "db-host"
+        self._port = 3306
+        self._db = "WS_DB"
+        self.queries = []
+        self.rows = [
+            {"ROW_ID": "uuid-1", "HOST_ID": "host1", "DATA_JSON": json.dumps({"name": "name1", "num": 1})},
+            {"ROW_ID": "uuid-2", "HOST_ID": "host2", "DATA_JSON": json.dumps({"name": None, "num": 2})},
+        ]
+
+    def sql_execute(self, sql, bind_value_list=[]):
+        if "T_COMN_MENU_TABLE_LINK" in sql:
+            return [{
+                "MENU_ID": "m1", "TABLE_NAME": "T_TEST", "HISTORY_TABLE_FLAG": "1", "SHEET_TYPE": "1",
+                "UNIQUE_CONSTRAINT": json.dumps([["host_name", "name"], ["num", "LAST_UPDATE_TIMESTAMP"]])
+            }]
+        if "T_COMN_MENU_COLUMN_LINK" in sql:
+            return [
+                {"COLUMN_NAME_REST": "uuid", "COL_NAME": "ROW_ID", "COLUMN_DISP_SEQ": 1, "COLUMN_CLASS_NAME": "SingleTextColumn"},
+                {"COLUMN_NAME_REST": "host_name", "COL_NAME": "HOST_ID", "COLUMN_DISP_SEQ": 2, "COLUMN_CLASS_NAME": "SingleTextColumn"},
+                {"COLUMN_NAME_REST": "name", "COL_NAME": "DATA_JSON", "COLUMN_DISP_SEQ": 3, "COLUMN_CLASS_NAME": "SingleTextColumn", "SAVE_TYPE": "JSON"},
+                {"COLUMN_NAME_REST": "num", "COL_NAME": "DATA_JSON", "COLUMN_DISP_SEQ": 4, "COLUMN_CLASS_NAME": "NumColumn", "SAVE_TYPE": "JSON"},
+                {"COLUMN_NAME_REST": "last_update_date_time", "COL_NAME": "LAST_UPDATE_TIMESTAMP", "COLUMN_DISP_SEQ": 5, "COLUMN_CLASS_NAME": "LastUpdateDateColumn"},
+            ]
+        self.queries.append(sql)
+        if "information_schema" in sql:
+            return [
+                {"COLUMN_NAME": "ROW_ID", "DATA_TYPE": "varchar"},
+                {"COLUMN_NAME": "HOST_ID", "DATA_TYPE": "varchar"},
+                {"COLUMN_NAME": "DATA_JSON", "DATA_TYPE": "longtext"},
+                {"COLUMN_NAME": "LAST_UPDATE_TIMESTAMP", "DATA_TYPE": "datetime"},
+            ]
+        return self.rows
+
+    def table_columns_get(self, table_name):
+        return (["ROW_ID", "HOST_ID", "DATA_JSON", "LAST_UPDATE_TIMESTAMP"], ["ROW_ID"])
+
+    def table_select(self, table_name, where_str, bind_value_list=[]):
+        self.queries.append(where_str)
+        return []
+
+
+@pytest.fixture(scope='function')
+def checker_env(app_context_with_mock_g, monkeypatch):
+    monkeypatch.setenv("LOADTABLE_MENU_CACHE_ENABLED", "0")
+    g.LANGUAGE = "ja"
+    g.USER_ID = "user1"
+    MenuInfoCache.clear()
+    yield
+
+
+def test_unique_constraint_checker(checker_env):
+    """
+    登録済みのレコードは制約毎に1回だけ取得し、値の組み合わせで重複を確認する
+    """
+    objdbca = DummyDBConnectWs()
+    objmenu = loadTable(objdbca, "test_menu")
+    objmenu.start_bulk_maintenance()
+    checker = objmenu.unique_constraint_checker
+
+    assert checker.get_keys({"host_name": "host1 ", "name": "", "num": 1}) == [("host1", None), ("1", None)]
+    # 日時型のカラムを含む制約はレコード毎にSQLで確認する
+    assert checker.is_batched(0) is True
+    assert checker.is_batched(1) is False
+
+    for index in range(3):
+        assert checker.get_existing_uuids(0, ("host1", "name1")) == ["uuid-1"]
+        assert checker.get_existing_uuids(0, ("host2", None)) == ["uuid-2"]
+        assert checker.get_existing_uuids(0, ("host2", "name1")) == []
+    assert len([sql for sql in objdbca.queries if "SELECT `ROW_ID`, `HOST_ID`, `DATA_JSON`" in sql]) == 1
+
+    checker.add_pending({"host_name": "host3", "name": "name3"}, "uuid-3")
+    assert checker.get_pending_uuids(0, ("host3", "name3")) == ["uuid-3"]
+
+
+def test_exec_unique_constraint_batched(checker_env):
+    """
+    一括登録時は登録済み・未登録のレコードとの重複をMSG-00006で返す
+    """
+    objdbca = DummyDBConnectWs()
+    objmenu = loadTable(objdbca, "test_menu")
+    objmenu.start_bulk_maintenance()
+    objmenu.unique_constraint_checker.add_pending({"host_name": "host9", "name": "name9"}, "uuid-9")
+    objmenu.get_message = lambda *args: None
+    messages = []
+    objmenu.set_message = lambda dict_msg, key, level: messages.append(dict_msg)
+
+    objmenu.exec_unique_constraint({"host_name": "host1", "name": "name1", "num": "9"}, None)
+    objmenu.exec_unique_constraint({"host_name": "host9", "name": "name9", "num": "9"}, None)
+    objmenu.exec_unique_constraint({"host_name": "host5", "name": "name5", "num": "9"}, None)
+
+    assert [msg["status_code"] for msg in messages] == ["MSG-00006", "MSG-00006"]
+    assert messages[0]["msg_args"][1] == str(["uuid-1"])
+    assert messages[1]["msg_args"][1] == str(["uuid-9"])
+    # 日時型を含む制約のみレコード毎にSQLを実行する
+    assert len([sql for sql in objdbca.queries if "DISUSE_FLAG" in sql and "SELECT" not in sql]) == 3
@@ -0,0 +1,152 @@
+import os
+import threading
+import time
+import pytest
+
+from common_libs.terraform_driver.cli.Const import Const as TFCLIConst
+from common_libs.terraform_driver.cli.provider_cache import ProviderCache
+
+
+MAIN_TF = 'terraform {\n  required_providers {\n    null = {\n      source = "hashicorp/null"\n    }\n  }\n}\n'
+LOCK_HCL = 'provider "registry.terraform.io/hashicorp/null" {\n  version = "3.2.2"\n}\n'
+
+
+@pytest.fixture(scope='function')
+def base_dir(tmp_path, monkeypatch):
+    monkeypatch.delenv("TF_CLI_CONFIG_FILE", raising=False)
+    return str(tmp_path / "storage")
+
+
+def make_work_dir(base_dir, tf_workspace_id, main_tf=MAIN_TF):
+    work_dir = base_dir + TFCLIConst.DIR_WORK + "/{}/work".format(tf_workspace_id)
+    os.makedirs(work_dir, exist_ok=True)
+    with open(work_dir + "/main.tf", "w") as f:
+        f.write(main_tf)
+    return work_dir
+
+
+def test_get_env(base_dir):
+    """
+    TF_PLUGIN_CACHE_DIRを設定し、ミラーディレクトリがある場合のみCLI設定ファイルを作成する
+    """
+    provider_cache = ProviderCache(base_dir)
+
+    env = provider_cache.get_env()
+    assert env["TF_PLUGIN_CACHE_DIR"] == base_dir + TFCLIConst.DIR_PLUGIN_CACHE
+    assert os.path.isdir(env["TF_PLUGIN_CACHE_DIR"])
+    assert "TF_CLI_CONFIG_FILE" not in env
+
+    os.makedirs(base_dir + TFCLIConst.DIR_PROVIDER_MIRROR)
+    env = provider_cache.get_env()
+    with open(env["TF_CLI_CONFIG_FILE"]) as f:
+        config = f.read()
+    assert 'path = "{}"'.format(base_dir + TFCLIConst.DIR_PROVIDER_MIRROR) in config
+    assert "direct {}" in config
+
+    # 内容が同じ場合は書き直さない(読み込み中のterraformに影響しない)
+    inode = os.stat(env["TF_CLI_CONFIG_FILE"]).st_ino
+    provider_cache.get_env()
+    assert os.stat(env["TF_CLI_CONFIG_FILE"]).st_ino == inode
+    assert [name for name in os.listdir(os.path.dirname(env["TF_CLI_CONFIG_FILE"])) if name.startswith(".terraformrc.")] == []
+
+
+def test_get_env_user_cli_config(base_dir, monkeypatch):
+    """
+    TF_CLI_CONFIG_FILEが指定されている場合は上書きしない
+    """
+    monkeypatch.setenv("TF_CLI_CONFIG_FILE", "/etc/terraformrc")
+    os.makedirs(base_dir + TFCLIConst.DIR_PROVIDER_MIRROR)
+
+    env = ProviderCache(base_dir).get_env()
+    assert env["TF_CLI_CONFIG_FILE"] == "/etc/terraformrc"
+
+
+def test_lock_file_reuse(base_dir):
+    """
+    同じ内容のModuleであれば、別のworkspaceでもロックファイルを再利用する
+    """
+    provider_cache = ProviderCache(base_dir)
+    work_dir1 = make_work_dir(base_dir, "1")
+    work_dir2 = make_work_dir(base_dir, "2")
+    work_dir3 = make_work_dir(base_dir, "3", MAIN_TF + "# changed\n")
+
+    module_key = provider_cache.get_module_key(work_dir1)
+    assert module_key == provider_cache.get_module_key(work_dir2)
+    assert module_key != provider_cache.get_module_key(work_dir3)
+
+    # terraform initの前は保存されていない
+    assert provider_cache.restore_lock_file(module_key, work_dir1) is False
+    assert provider_cache.save_lock_file(module_key, work_dir1) is False
+
+    # terraform initで作成されたロックファイルを保存
+    with open(work_dir1 + "/.terraform.lock.hcl", "w") as f:
+        f.write(LOCK_HCL)
+    assert provider_cache.save_lock_file(module_key, work_dir1) is True
+
+    assert provider_cache.restore_lock_file(module_key, work_dir2) is True
+    with open(work_dir2 + "/.terraform.lock.hcl") as f:
+        assert f.read() == LOCK_HCL
+
+    assert provider_cache.restore_lock_file(provider_cache.get_module_key(work_dir3), work_dir3) is False
+    assert provider_cache.get_module_key(base_dir) is None
+
+
+def test_lock(base_dir):
+    """
+    terraform initは同時に1つだけ実行する
+    """
+    provider_cache = ProviderCache(base_dir)
+    provider_cache.LOCK_WAIT_INTERVAL = 0.01
+    active = []
+    max_active = []
+
+    def init():
+        with provider_cache.lock():
+            active.append(1)
+            max_active.append(len(active))
+            time.sleep(0.05)
+            active.pop()
+
+    threads = [threading.Thread(target=init) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert max(max_active) == 1
+
+
+def test_lock_timeout(base_dir):
+    """
+    ロックを取得できない場合・待つのをやめる場合は、エラーにせずFalseを返す
+    """
+    provider_cache = ProviderCache(base_dir)
+    provider_cache.LOCK_WAIT_INTERVAL = 0.01
+
+    with provider_cache.lock() as locked:
+        assert locked is True
+
+        start = time.time()
+        with provider_cache.lock(timeout=0.1) as locked2:
+            assert locked2 is False
+        assert time.time() - start < 1
+
+        start = time.time()
+        with provider_cache.lock(timeout=10, is_cancelled=lambda: True) as locked2:
+            assert locked2 is False
+        assert time.time() - start < 1
+
+    with provider_cache.lock(timeout=0) as locked:
+        assert locked is True
+
+
+def test_get_env_without_plugin_cache(base_dir):
+    """
+    ロックを取得できない場合のinitはTF_PLUGIN_CACHE_DIRを使わない
+    """
+    provider_cache = ProviderCache(base_dir)
+    env = provider_cache.get_env()
+
+    init_env = provider_cache.get_env_without_plugin_cache(env)
+    assert "TF_PLUGIN_CACHE_DIR" not in init_env
+    assert "TF_PLUGIN_CACHE_DIR" in env
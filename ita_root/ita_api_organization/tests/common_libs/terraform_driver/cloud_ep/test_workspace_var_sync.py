@@ -0,0 +1,227 @@
+import itertools
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock
+import pytest
+from flask import g
+
+from common_libs.terraform_driver.cloud_ep.Const import Const as TFCloudEPConst
+from common_libs.terraform_driver.cloud_ep import RestApiCaller as rest_api_caller_module
+from common_libs.terraform_driver.cloud_ep.RestApiCaller import RestApiCaller
+from common_libs.terraform_driver.cloud_ep.terraform_restapi import get_tf_workspace_var_list, update_tf_workspace_var
+from common_libs.terraform_driver.cloud_ep.workspace_var_sync import WorkspaceVarSync
+
+
+TF_MANAGE_WORKSPACE_ID = "ws-test"
+
+
+class DummyRestApiCaller(RestApiCaller):
+    """
+    連携先TerraformのVariables APIを模擬するRestApiCaller
+    """
+    def __init__(self, rate_limit_count=0, wait=0):
+        super().__init__("https", "app.terraform.io", proxySetting={})
+        self.store = {}
+        self.calls = []
+        # スレッド毎に複製されるため、状態はdictで共有する
+        self.stats = {"rate_limit_count": rate_limit_count, "active": 0, "max_active": 0}
+        self.wait = wait
+        self.lock = threading.Lock()
+        self.seq = itertools.count(1)
+
+    def add(self, key, value, hcl=False, sensitive=False, category="terraform", description=""):
+        var_id = "var-%s" % (next(self.seq))
+        self.store[var_id] = {"key": key, "value": value, "hcl": hcl, "sensitive": sensitive, "category": category, "description": description}
+        return var_id
+
+    def data(self):
+        return [
+            {"id": var_id, "type": "vars", "attributes": dict(attributes, value=None if attributes["sensitive"] else attributes["value"])}
+            for var_id, attributes in self.store.items()
+        ]
+
+    def rest_call(self, method, api_uri, content=None, header=None, module_upload_flag=False, direct_url="", get_log=False):
+        with self.lock:
+            if method != 'GET':
+                self.calls.append((method, api_uri))
+            if method != 'GET' and self.stats["rate_limit_count"] > 0:
+                self.stats["rate_limit_count"] -= 1
+                return {"statusCode": 429, "responseHeaders": [("Retry-After", "0")], "responseContents": {"errorMessage": "Too many requests"}}
+            self.stats["active"] += 1
+            self.stats["max_active"] = max(self.stats["max_active"], self.stats["active"])
+
+        time.sleep(self.wait)
+
+        with self.lock:
+            self.stats["active"] -= 1
+            if method == 'GET':
+                return {"statusCode": 200, "responseContents": json.dumps({"data": self.data()})}
+            if method == 'DELETE':
+                var_id = api_uri.split('/')[-1]
+                if self.store.pop(var_id, None) is None:
+                    return {"statusCode": 404, "responseContents": {"errorMessage": "not found"}}
+                return {"statusCode": 204, "responseContents": ""}
+
+            attributes = content["data"]["attributes"]
+            if method == 'POST':
+                for var in self.store.values():
+                    if (var["category"], var["key"]) == (attributes["category"], attributes["key"]):
+                        return {"statusCode": 422, "responseContents": {"errorMessage": "has already been taken"}}
+                self.add(**attributes)
+                return {"statusCode": 201, "responseContents": ""}
+
+            var = self.store[api_uri.split('/')[-1]]
+            if var["sensitive"] and not attributes["sensitive"]:
+                return {"statusCode": 422, "responseContents": {"errorMessage": "sensitive can not be changed"}}
+            var.update(attributes)
+            return {"statusCode": 200, "responseContents": ""}
+
+
+def current_var_list(restApiCaller):
+    response_array = get_tf_workspace_var_list(restApiCaller, TF_MANAGE_WORKSPACE_ID)
+    return json.loads(response_array['responseContents'])['data']
+
+
+def make_var_sync(restApiCaller, max_workers=TFCloudEPConst.VAR_SYNC_MAX_WORKERS):
+    var_sync = WorkspaceVarSync(restApiCaller, TF_MANAGE_WORKSPACE_ID, max_workers)
+    var_sync.add_var('TF_CLI_ARGS', '-no-color', category="env")
+    var_sync.add_var('region', 'ap-northeast-1')
+    var_sync.add_var('tags', '{"env" = "dev"}', hcl=True)
+    var_sync.add_var('password', 'secret', sensitive=True)
+    return var_sync
+
+
+def test_sync_only_changes(app_context_with_mock_g):
+    """
+    2回目以降は変更のあったVariableのみRESTAPIを実行する
+    """
+    restApiCaller = DummyRestApiCaller()
+    restApiCaller.add('old_var', 'x')
+
+    assert make_var_sync(restApiCaller).sync(current_var_list(restApiCaller)) == []
+    assert sorted(m for m, _ in restApiCaller.calls) == ['DELETE', 'POST', 'POST', 'POST', 'POST']
+    assert sorted((v["category"], v["key"]) for v in restApiCaller.store.values()) == \
+        [('env', 'TF_CLI_ARGS'), ('terraform', 'password'), ('terraform', 'region'), ('terraform', 'tags')]
+
+    # 変更なし
+    restApiCaller.calls = []
+    var_sync = make_var_sync(restApiCaller)
+    assert var_sync.plan(current_var_list(restApiCaller)) == []
+    assert var_sync.sync(current_var_list(restApiCaller)) == []
+    assert restApiCaller.calls == []
+
+    # 値の変更(sensitiveを含む)と削除
+    var_sync = WorkspaceVarSync(restApiCaller, TF_MANAGE_WORKSPACE_ID)
+    var_sync.add_var('TF_CLI_ARGS', '-no-color', category="env")
+    var_sync.add_var('region', 'us-east-1')
+    var_sync.add_var('password', 'secret2', sensitive=True)
+    operation_list = var_sync.plan(current_var_list(restApiCaller))
+    assert sorted((o["action"], o["key"]) for o in operation_list) == [('delete', 'tags'), ('update', 'password'), ('update', 'region')]
+    assert var_sync.apply(operation_list) == []
+    values = {v["key"]: v["value"] for v in restApiCaller.store.values()}
+    assert values == {'TF_CLI_ARGS': '-no-color', 'region': 'us-east-1', 'password': 'secret2'}
+
+
+def test_sync_detects_external_change(app_context_with_mock_g):
+    """
+    連携先Terraform側で値が変更されたVariable、sensitiveを解除するVariableも同期する
+    """
+    restApiCaller = DummyRestApiCaller()
+    make_var_sync(restApiCaller).sync(current_var_list(restApiCaller))
+    for var in restApiCaller.store.values():
+        if var["key"] == 'region':
+            var["value"] = 'changed'
+
+    var_sync = make_var_sync(restApiCaller)
+    var_sync.add_var('password', 'secret', sensitive=False)
+    operation_list = var_sync.plan(current_var_list(restApiCaller))
+    assert sorted((o["action"], o["key"]) for o in operation_list) == [('recreate', 'password'), ('update', 'region')]
+    assert var_sync.apply(operation_list) == []
+    assert {v["key"]: (v["value"], v["sensitive"]) for v in restApiCaller.store.values()}['password'] == ('secret', False)
+
+    # sensitiveへの変更は更新で行う
+    operation_list = make_var_sync(restApiCaller).plan(current_var_list(restApiCaller))
+    assert [(o["action"], o["key"]) for o in operation_list] == [('update', 'password')]
+
+
+def test_sync_concurrency(app_context_with_mock_g):
+    """
+    同時実行数はmax_workersまでに制限する
+    """
+    restApiCaller = DummyRestApiCaller(wait=0.05)
+    var_sync = WorkspaceVarSync(restApiCaller, TF_MANAGE_WORKSPACE_ID, max_workers=3)
+    for i in range(12):
+        var_sync.add_var('var_%s' % (i), str(i))
+
+    assert var_sync.sync(current_var_list(restApiCaller)) == []
+    assert len(restApiCaller.store) == 12
+    assert restApiCaller.stats["max_active"] == 3
+    assert len(restApiCaller.calls) == 12
+
+
+def test_sync_failed(app_context_with_mock_g):
+    """
+    失敗した操作を優先順(削除 > env変数 > terraform変数)、planの順に返却する
+        リトライはrest_callで行うため、各操作は1回だけ実行する
+    """
+    restApiCaller = DummyRestApiCaller(rate_limit_count=100)
+    restApiCaller.add('old_var', 'x')
+    var_sync = make_var_sync(restApiCaller)
+
+    for _ in range(3):
+        restApiCaller.calls = []
+        failed_list = var_sync.sync(current_var_list(restApiCaller))
+        assert [o["key"] for o in failed_list] == ['old_var', 'TF_CLI_ARGS', 'region', 'tags', 'password']
+        assert all(o["statusCode"] == 429 for o in failed_list)
+        assert len(restApiCaller.calls) == 5
+
+
+def test_rest_call_rate_limit(app_context_with_mock_g, monkeypatch):
+    """
+    Rate Limit(429)はrest_callで3回まで実行し、最後の試行の後は待たない
+    """
+    g.applogger = MagicMock()
+    requests = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_PATCH(self):
+            requests.append(self.path)
+            body = json.dumps({"errors": [{"status": "429", "title": "Too many requests"}]}).encode()
+            self.send_response(429)
+            self.send_header("Retry-After", "30")
+            self.send_header("Content-Type", "application/vnd.api+json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    sleeps = []
+    monkeypatch.setattr(rest_api_caller_module.time, "sleep", sleeps.append)
+    try:
+        restApiCaller = RestApiCaller("http", "127.0.0.1", server.server_address[1], proxySetting={})
+        response_array = update_tf_workspace_var(restApiCaller, "var-1", "key", "value", False, False, "")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert response_array["statusCode"] == 429
+    assert len(requests) == 3
+    assert sleeps == [30, 30]
+
+
+@pytest.mark.parametrize("response_array, expected", [
+    ({"statusCode": 429, "responseHeaders": [("Retry-After", "3")]}, 3),
+    ({"statusCode": 429, "responseHeaders": [("retry-after", "600")]}, RestApiCaller.RETRY_AFTER_MAX),
+    ({"statusCode": 429, "responseHeaders": [("Retry-After", "Wed, 21 Oct 2015 07:28:00 GMT")]}, 1),
+    ({"statusCode": 429}, 1),
+    ({"statusCode": 500, "responseHeaders": [("Retry-After", "3")]}, 1),
+])
+def test_get_retry_after(response_array, expected):
+    assert RestApiCaller("https", "app.terraform.io", proxySetting={}).getRetryAfter(response_array, 1) == expected
@@ -12,9 +12,6 @@
 # limitations under the License.
 #
 
-import subprocess
-import time
-import re
 import os
 import hashlib
 import datetime
@@ -29,6 +26,7 @@ from common_libs.ansible_driver.functions.util import getAnsibleConst
 from common_libs.ansible_driver.functions.ag_util import get_AGChildProcessRestartCountFilepath
 from common_libs.ansible_driver.classes.controll_ansible_agent import DockerMode, KubernetesMode
 from common_libs.common.exception import AppException
+from common_libs.common.child_process_pool import ChildProcessPool
 from libs import common_functions as cm
 import traceback
 from common_libs.common.util import get_iso_datetime, arrange_stacktrace_format
@@ -36,6 +34,9 @@ from common_libs.common.util import get_iso_datetime, arrange_stacktrace_format
 # ansible共通の定数をロード
 ansc_const = AnscConst()
 
+# 作業実行の子プロセスの起動スクリプト
+CHILD_INIT_PATH = "backyard/backyard_child_init.py"
+
 
 def backyard_main(common_db, organization_id=None, workspace_id=None):
     """
@@ -292,16 +293,6 @@ def child_process_exist_check(common_db, target_shema, ansibleAg):
     # 再起動は行わない。
     restart_count_max = int(os.environ.get("CHILD_PROCESS_RETRY_LIMIT", 10))
 
-    # psコマンドでbackyard_child_init.pyの起動プロセスリストを作成
-    # psコマンドがマレに起動プロセスリストを取りこぼすことがあるので3回分を作成
-    # command = ["python3", "backyard/backyard_child_init.py", organization_id, workspace_id, execution_no, driver_id]
-
-    child_process_1 = child_process_exist_check_ps()
-    time.sleep(0.05)
-    child_process_2 = child_process_exist_check_ps()
-    time.sleep(0.05)
-    child_process_3 = child_process_exist_check_ps()
-
     records = get_running_process(common_db, target_shema)
     for rec in records:
         driver_id = rec["DRIVER_ID"]
@@ -326,26 +317,8 @@ def child_process_exist_check(common_db, target_shema, ansibleAg):
         ans_if_info = result
 
         # 子プロ起動確認
-        is_running = False
-        # command = ["python3", "backyard/backyard_child_init.py", organization_id, workspace_id, execution_no, driver_id]
-        command_args = "{} {} {} {} {}".format('backyard/backyard_child_init.py', organization_id, workspace_id, execution_no, driver_id)
-
-        child_process_arr = child_process_1.split('\n')
-        for r_child_process in child_process_arr:
-            if re.search(command_args, r_child_process) is not None:
-                is_running = True
-
-        if is_running is False:
-            child_process_arr = child_process_2.split('\n')
-            for r_child_process in child_process_arr:
-                if re.search(command_args, r_child_process) is not None:
-                    is_running = True
-
-        if is_running is False:
-            child_process_arr = child_process_3.split('\n')
-            for r_child_process in child_process_arr:
-                if re.search(command_args, r_child_process) is not None:
-                    is_running = True
+        # 起動した子プロセスはChildProcessPoolで管理する（psコマンドは使用しない）
+        is_running = ChildProcessPool.is_running(CHILD_INIT_PATH, [organization_id, workspace_id, execution_no, driver_id])
 
         # DBのステータスが実行中なのに、子プロセスが存在しない
         # 実行エンジンがansibel agent以外の場合
@@ -449,49 +422,6 @@ def child_process_exist_check(common_db, target_shema, ansibleAg):
     return True
 
 
-def child_process_exist_check_ps():
-    """
-    実行中の子プロのpsコマンド取得結果
-
-    Returns:
-        stdout row
-    """
-    # ps -efw | grep backyard/backyard_child_init.py | grep -v grep
-    cp1 = subprocess.run(
-        ["ps", "-efw"],
-        capture_output=True,
-        text=True
-    )
-    if cp1.returncode != 0 and cp1.stderr:
-        cp1.check_returncode()
-
-    cp2 = subprocess.run(
-        ["grep", "backyard/backyard_child_init.py"],
-        capture_output=True,
-        text=True,
-        input=cp1.stdout
-    )
-    if cp2.returncode != 0 and cp2.stderr:
-        cp2.check_returncode()
-
-    cp3 = subprocess.run(
-        ["grep", "-v", "grep"],
-        capture_output=True,
-        text=True,
-        input=cp2.stdout
-    )
-
-    if cp3.returncode == 0:
-        # 検索結果あり
-        return cp3.stdout
-    elif cp3.returncode == 1 and not cp3.stderr:
-        # 検索結果なし（0行）
-        return ""
-    else:
-        # 例外を起こす
-        cp3.check_returncode()
-
-
 def get_running_process(common_db, target_shema):
     """
     実行中の作業データを取得
@@ -600,9 +530,7 @@ def run_child_process(wsDb, execute_data, organization_id, workspace_id):
     # 子プロセスにして、実行
     g.applogger.debug(g.appmsg.get_log_message("MSG-10745", [driver_name, execution_no]))
 
-    command = ["python3", "backyard/backyard_child_init.py", organization_id, workspace_id, execution_no, driver_id, "run"]
-    # cp = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-    cp = subprocess.Popen(command)  # noqa: F841
+    ChildProcessPool.start(CHILD_INIT_PATH, [organization_id, workspace_id, execution_no, driver_id, "run"])
 
     return True,
 
@@ -628,8 +556,6 @@ def rerun_child_process(wsDb, ansc_const, execute_data, organization_id, workspa
     driver_id = ansc_const.vg_driver_id
     execution_no = execute_data["EXECUTION_NO"]
 
-    command = ["python3", "backyard/backyard_child_init.py", organization_id, workspace_id, execution_no, driver_id, "rerun"]
-    # cp = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-    cp = subprocess.Popen(command)  # noqa: F841
+    ChildProcessPool.start(CHILD_INIT_PATH, [organization_id, workspace_id, execution_no, driver_id, "rerun"])
 
     return True,
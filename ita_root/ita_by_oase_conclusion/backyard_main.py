@@ -21,6 +21,7 @@ import gc
 from common_libs.common.dbconnect import DBConnectWs
 from common_libs.common.util import arrange_stacktrace_format, get_iso_datetime
 from common_libs.common.mongoconnect.mongoconnect import MONGOConnectWs
+from common_libs.common.mongoconnect.client_registry import MongoClientRegistry
 
 from common_libs.oase.const import oaseConst
 from common_libs.oase.manage_events import ManageEvents
@@ -57,6 +58,7 @@ def backyard_main(organization_id, workspace_id):
     if workspace_gc_trigger_counter % workspace_gc_trigger_interval == 0:
         g.applogger.debug("Execute Garbage Collection")
         gc.collect()
+        g.applogger.debug_lazy(lambda: "MongoDB client registry stats: {}".format(MongoClientRegistry.get_stats()))
 
     # strage_path = os.environ.get('STORAGEPATH')
     # workspace_path = strage_path + "/".join([organization_id, workspace_id])
@@ -96,18 +98,14 @@ def backyard_main(organization_id, workspace_id):
         action_status_monitor = ActionStatusMonitor(wsDb, EventObj)
 
         # アクションの実行
-        tmp_msg = g.appmsg.get_log_message("BKY-90072", ['Started'])
-        g.applogger.debug(addline_msg('{}'.format(tmp_msg)))  # noqa: F405
+        g.applogger.debug_lazy(lambda: addline_msg(g.appmsg.get_log_message("BKY-90072", ['Started'])))  # noqa: F405
         action_status_monitor.checkRuleMatch(actionObj)
-        tmp_msg = g.appmsg.get_log_message("BKY-90072", ['Ended'])
-        g.applogger.debug(addline_msg('{}'.format(tmp_msg)))  # noqa: F405
+        g.applogger.debug_lazy(lambda: addline_msg(g.appmsg.get_log_message("BKY-90072", ['Ended'])))  # noqa: F405
 
         # アクション実行後の通知と結論イベント登録
-        tmp_msg = g.appmsg.get_log_message("BKY-90002", ['Started'])
-        g.applogger.debug(addline_msg('{}'.format(tmp_msg)))  # noqa: F405
+        g.applogger.debug_lazy(lambda: addline_msg(g.appmsg.get_log_message("BKY-90002", ['Started'])))  # noqa: F405
         action_status_monitor.checkExecuting()
-        tmp_msg = g.appmsg.get_log_message("BKY-90002", ['Ended'])
-        g.applogger.debug(addline_msg('{}'.format(tmp_msg)))  # noqa: F405
+        g.applogger.debug_lazy(lambda: addline_msg(g.appmsg.get_log_message("BKY-90002", ['Ended'])))  # noqa: F405
 
         # 「新規(統合時) TTL切れ」通知処理
         dudup_eventrow_list = EventObj.get_dudup_eventrow(wsDb, judgeTime)
@@ -143,19 +141,16 @@ def JudgeMain(wsDb: DBConnectWs, judgeTime: int, EventObj: ManageEvents, actionO
     count = EventObj.count_events()
     if count == 0:
         # No events to process
-        tmp_msg = g.appmsg.get_log_message("BKY-90004", [])
-        g.applogger.debug(addline_msg('{}'.format(tmp_msg)))  # noqa: F405
+        g.applogger.debug_lazy(lambda: addline_msg(g.appmsg.get_log_message("BKY-90004", [])))  # noqa: F405
         return False
 
     # Event collected. Time: {} Acquired items: {}
-    tmp_msg = g.appmsg.get_log_message("BKY-90005", [judgeTime, count])
-    g.applogger.debug(addline_msg('{}'.format(tmp_msg)))  # noqa: F405
+    g.applogger.debug_lazy(lambda: addline_msg(g.appmsg.get_log_message("BKY-90005", [judgeTime, count])))  # noqa: F405
 
     # タイムアウト（TTL*2）の抽出
     # Expiration verdict. Timeout number: {}
     timeout_Event_Id_List = EventObj.get_timeout_event()
-    tmp_msg = g.appmsg.get_log_message("BKY-90006", [len(timeout_Event_Id_List)])
-    g.applogger.debug(addline_msg('{}'.format(tmp_msg)))  # noqa: F405
+    g.applogger.debug_lazy(lambda: addline_msg(g.appmsg.get_log_message("BKY-90006", [len(timeout_Event_Id_List)])))  # noqa: F405
 
     # タイムアウトイベント有無判定
     if len(timeout_Event_Id_List) > 0:
@@ -163,8 +158,7 @@ def JudgeMain(wsDb: DBConnectWs, judgeTime: int, EventObj: ManageEvents, actionO
         update_Flag_Dict = {"_exastro_timeout": '1'}
         EventObj.set_timeout(timeout_Event_Id_List)
         # Event updated. Timeout({}) ids: {}
-        tmp_msg = g.appmsg.get_log_message("BKY-90007", [str(update_Flag_Dict), str(timeout_Event_Id_List)])
-        g.applogger.debug(addline_msg('{}'.format(tmp_msg)))  # noqa: F405
+        g.applogger.debug_lazy(lambda: addline_msg(g.appmsg.get_log_message("BKY-90007", [str(update_Flag_Dict), str(timeout_Event_Id_List)])))  # noqa: F405
 
         timeout_notification_list = []  # 通知処理（既知(時間切れ)）
         for event_id in timeout_Event_Id_List:
@@ -191,8 +185,7 @@ def JudgeMain(wsDb: DBConnectWs, judgeTime: int, EventObj: ManageEvents, actionO
         return False
 
     # Acquired rule management. Items: {}
-    tmp_msg = g.appmsg.get_log_message("BKY-90011", [str(len(ruleList))])
-    g.applogger.debug(addline_msg('{}'.format(tmp_msg)))  # noqa: F405
+    g.applogger.debug_lazy(lambda: addline_msg(g.appmsg.get_log_message("BKY-90011", [str(len(ruleList))])))  # noqa: F405
 
     # ラベルマスタの取得
     label_master = getLabelGroup(wsDb)
@@ -226,43 +219,36 @@ def JudgeMain(wsDb: DBConnectWs, judgeTime: int, EventObj: ManageEvents, actionO
     EventObj.update_label_flag(new_Event_id_List, update_Flag_Dict)
     if len(new_Event_id_List) > 0:
         # Creating new event notification incident flag({}) ids: {}
-        tmp_msg = g.appmsg.get_log_message("BKY-90012", [str(update_Flag_Dict), str(new_Event_id_List)])
-        g.applogger.debug(addline_msg('{}'.format(tmp_msg)))  # noqa: F405
+        g.applogger.debug_lazy(lambda: addline_msg(g.appmsg.get_log_message("BKY-90012", [str(update_Flag_Dict), str(new_Event_id_List)])))  # noqa: F405
 
     # Filtering process Started
-    tmp_msg = g.appmsg.get_log_message("BKY-90013", ['Started'])
-    g.applogger.debug(addline_msg('{}'.format(tmp_msg)))  # noqa: F405
+    g.applogger.debug_lazy(lambda: addline_msg(g.appmsg.get_log_message("BKY-90013", ['Started'])))  # noqa: F405
 
     for filterId, filterRow in filterIDMap.items():
         ret, JudgeEventId = judgeObj.getFilterMatch(filterRow)
         if ret is True:
             # Filtering verdict results. Matched FILTER_ID: {} EVENT_ID: <<{}>>
-            tmp_msg = g.appmsg.get_log_message("BKY-90014", [filterId, JudgeEventId])
-            g.applogger.debug(addline_msg('{}'.format(tmp_msg)))  # noqa: F405
+            g.applogger.debug_lazy(lambda: addline_msg(g.appmsg.get_log_message("BKY-90014", [filterId, JudgeEventId])))  # noqa: F405
             IncidentDict[filterId] = JudgeEventId
         else:
             # Filtering verdict results. No Match FILTER_ID: {} EVENT_ID: <<{}>>
-            tmp_msg = g.appmsg.get_log_message("BKY-90015", [filterId, None])
-            g.applogger.debug(addline_msg('{}'.format(tmp_msg)))  # noqa: F405
+            g.applogger.debug_lazy(lambda: addline_msg(g.appmsg.get_log_message("BKY-90015", [filterId, None])))  # noqa: F405
 
     # Filtering process Ended
-    tmp_msg = g.appmsg.get_log_message("BKY-90013", ['Ended'])
-    g.applogger.debug(addline_msg('{}'.format(tmp_msg)))  # noqa: F405
+    g.applogger.debug_lazy(lambda: addline_msg(g.appmsg.get_log_message("BKY-90013", ['Ended'])))  # noqa: F405
 
     # ルールで使用しているフィルタを集計
     FiltersUsedinRulesDict = judgeObj.SummaryofFiltersUsedinRules(ruleList)
 
     # Rule match loop process Started
-    tmp_msg = g.appmsg.get_log_message("BKY-90016", ['Started'])
-    g.applogger.debug(addline_msg('{}'.format(tmp_msg)))  # noqa: F405
+    g.applogger.debug_lazy(lambda: addline_msg(g.appmsg.get_log_message("BKY-90016", ['Started'])))  # noqa: F405
 
     # 「アクション」からレコードを取得
     actionIdList = []
     ret_action = wsDb.table_select(oaseConst.T_OASE_ACTION, 'WHERE DISUSE_FLAG = %s', [0])
     if not ret_action:
         # No records to process. Table: T_OASE_ACTION
-        tmp_msg = g.appmsg.get_log_message("BKY-90009", [oaseConst.T_OASE_ACTION])
-        g.applogger.debug(addline_msg('{}'.format(tmp_msg)))  # noqa: F405
+        g.applogger.debug_lazy(lambda: addline_msg(g.appmsg.get_log_message("BKY-90009", [oaseConst.T_OASE_ACTION])))  # noqa: F405
     else:
         for actionRow in ret_action:
             actionIdList.append(actionRow['ACTION_ID'])
@@ -282,14 +268,13 @@ def JudgeMain(wsDb: DBConnectWs, judgeTime: int, EventObj: ManageEvents, actionO
         # region レベル毎のループ
         for TargetLevel in JudgeLevelList:
             # Level{} Rule verdict Started
-            tmp_msg = g.appmsg.get_log_message("BKY-90017", [TargetLevel, 'Started'])
-            g.applogger.debug(addline_msg('{}'.format(tmp_msg)))  # noqa: F405
+            g.applogger.debug_lazy(lambda: addline_msg(g.appmsg.get_log_message("BKY-90017", [TargetLevel, 'Started'])))  # noqa: F405
 
             newIncidentCount[TargetLevel] = 0
 
             # 各レベルに対応したルール抽出
             TargetRuleList = judgeObj.TargetRuleExtraction(TargetLevel, ruleList, FiltersUsedinRulesDict, IncidentDict)
-            g.applogger.debug(addline_msg('TargetRuleList={}'.format(TargetRuleList)))  # noqa: F405
+            g.applogger.debug_lazy(lambda: addline_msg('TargetRuleList={}'.format(TargetRuleList)))  # noqa: F405
 
             newIncident_Flg = True
             preserved_events = set()
@@ -330,13 +315,13 @@ def JudgeMain(wsDb: DBConnectWs, judgeTime: int, EventObj: ManageEvents, actionO
                             # 結論イベントに対応するフィルタ確認
                             ret, UsedFilterIdList = judgeObj.ConclusionLabelUsedInFilter(ConclusionEventRow["labels"], filterIDMap)
                             # Verifying conclusion event filters{}
-                            tmp_msg = g.appmsg.get_log_message("BKY-90021", [str(ret)])
-                            g.applogger.debug(addline_msg('{}'.format(tmp_msg)))  # noqa: F405
+                            g.applogger.debug_lazy(lambda: addline_msg(g.appmsg.get_log_message("BKY-90021", [str(ret)])))  # noqa: F405
 
                             if ret is True:
                                 for UsedFilterId in UsedFilterIdList:
                                     # Registering link between conclusion event filter and event. FILTER_ID: {} EVENT_ID: {}
-                                    tmp_msg = g.appmsg.get_log_message("BKY-90022", [UsedFilterId, ConclusionEventRow['_id']])
+                                    def link_msg():
+                                        return addline_msg(g.appmsg.get_log_message("BKY-90022", [UsedFilterId, ConclusionEventRow['_id']]))
 
                                     if UsedFilterId in IncidentDict:
                                         if len(IncidentDict[UsedFilterId]) > 0:
@@ -362,7 +347,7 @@ def JudgeMain(wsDb: DBConnectWs, judgeTime: int, EventObj: ManageEvents, actionO
                                                 if len(unevaluated_events) == 0:
                                                     # 判定済みのものしかなかったので、結論イベントを追加する
                                                     IncidentDict[UsedFilterId] = judged_events + [ConclusionEventRow['_id']]
-                                                    g.applogger.debug(addline_msg('{}'.format(tmp_msg)))  # noqa: F405
+                                                    g.applogger.debug_lazy(link_msg)  # noqa: F405
                                                     # 結論イベントを抽出対象とするフィルターを含むルールのマッチ候補となるイベントも予約済みにする
                                                     for rule in (
                                                         rule
@@ -382,7 +367,7 @@ def JudgeMain(wsDb: DBConnectWs, judgeTime: int, EventObj: ManageEvents, actionO
                                             else:
                                                 # キューイングの場合
                                                 IncidentDict[UsedFilterId].append(ConclusionEventRow['_id'])
-                                                g.applogger.debug(addline_msg('{}'.format(tmp_msg)))  # noqa: F405
+                                                g.applogger.debug_lazy(link_msg)  # noqa: F405
                                                 # 結論イベントを抽出対象とするフィルターを含むルールのマッチ候補となるイベントも予約済みにする
                                                 for rule in (
                                                     rule
@@ -400,7 +385,7 @@ def JudgeMain(wsDb: DBConnectWs, judgeTime: int, EventObj: ManageEvents, actionO
                                     else:
                                         # 初めてフィルターにかかった
                                         IncidentDict[UsedFilterId] = [ConclusionEventRow['_id']]
-                                        g.applogger.debug(addline_msg('{}'.format(tmp_msg)))  # noqa: F405
+                                        g.applogger.debug_lazy(link_msg)  # noqa: F405
                                         # 結論イベントを抽出対象とするフィルターを含むルールのマッチ候補となるイベントも予約済みにする
                                         for rule in (
                                             rule
@@ -432,10 +417,8 @@ def JudgeMain(wsDb: DBConnectWs, judgeTime: int, EventObj: ManageEvents, actionO
                 # 結論イベントの追加判定
                 if newIncident_Flg is True:
                     newIncidentCount[TargetLevel] += 1
-                    tmp_msg = g.appmsg.get_log_message("BKY-90023", [])
-                    g.applogger.debug(addline_msg('{}'.format(tmp_msg)))  # noqa: F405
-                    tmp_msg = g.appmsg.get_log_message("BKY-90024", [TargetLevel])
-                    g.applogger.debug(addline_msg('{}'.format(tmp_msg)))  # noqa: F405
+                    g.applogger.debug_lazy(lambda: addline_msg(g.appmsg.get_log_message("BKY-90023", [])))  # noqa: F405
+                    g.applogger.debug_lazy(lambda: addline_msg(g.appmsg.get_log_message("BKY-90024", [TargetLevel])))  # noqa: F405
 
                     if newIncidentCount[TargetLevel] > evaluate_latent_infinite_loop_limit:
                         # 未判定イベントが一定回数以上繰り返した場合は抜ける
@@ -447,12 +430,11 @@ def JudgeMain(wsDb: DBConnectWs, judgeTime: int, EventObj: ManageEvents, actionO
                         newIncident_Flg = False
                         newIncidentCount[TargetLevel] = 0
                 else:
-                    tmp_msg = g.appmsg.get_log_message("BKY-90026", [])
-                    g.applogger.debug(addline_msg('{}'.format(tmp_msg)))  # noqa: F405
+                    g.applogger.debug_lazy(lambda: addline_msg(g.appmsg.get_log_message("BKY-90026", [])))  # noqa: F405
 
             # endregion レベル毎の結論イベント未発生確認のループ
-            tmp_msg = g.appmsg.get_log_message("BKY-90017", [TargetLevel, 'Ended'])  # {} Rule verdict {}
-            g.applogger.debug(addline_msg('{}'.format(tmp_msg)))  # noqa: F405
+            # {} Rule verdict {}
+            g.applogger.debug_lazy(lambda: addline_msg(g.appmsg.get_log_message("BKY-90017", [TargetLevel, 'Ended'])))  # noqa: F405
 
         # endregion レベル毎のループ
 
@@ -465,42 +447,35 @@ def JudgeMain(wsDb: DBConnectWs, judgeTime: int, EventObj: ManageEvents, actionO
             break
 
     # endregion 全レベルループ
-    tmp_msg = g.appmsg.get_log_message("BKY-90016", ['Ended'])
-    g.applogger.debug(addline_msg('{}'.format(tmp_msg)))  # noqa: F405
+    g.applogger.debug_lazy(lambda: addline_msg(g.appmsg.get_log_message("BKY-90016", ['Ended'])))  # noqa: F405
 
     # 処理後タイムアウトイベント検出
     PostProcTimeoutEventIdList, PostProcTimeoutEventRowList = EventObj.get_post_proc_timeout_event()
     if len(PostProcTimeoutEventIdList) > 0:
-        tmp_msg = g.appmsg.get_log_message("BKY-90027", [str(PostProcTimeoutEventIdList)])
-        g.applogger.debug(addline_msg('{}'.format(tmp_msg)))  # noqa: F405
+        g.applogger.debug_lazy(lambda: addline_msg(g.appmsg.get_log_message("BKY-90027", [str(PostProcTimeoutEventIdList)])))  # noqa: F405
         # 処理後タイムアウトの_exastro_timeoutを1に更新
         update_Flag_Dict = {"_exastro_timeout": '1'}
         EventObj.set_timeout(PostProcTimeoutEventIdList)
-        tmp_msg = g.appmsg.get_log_message("BKY-90028", [str(update_Flag_Dict), str(PostProcTimeoutEventIdList)])
-        g.applogger.debug(addline_msg('{}'.format(tmp_msg)))  # noqa: F405
+        g.applogger.debug_lazy(lambda: addline_msg(g.appmsg.get_log_message("BKY-90028", [str(update_Flag_Dict), str(PostProcTimeoutEventIdList)])))  # noqa: F405
 
         # 通知処理（既知(時間切れ)）通知キューに入れる
         tmp_msg = g.appmsg.get_log_message("BKY-90008", ['Known(timeout)'])
         g.applogger.info(addline_msg('{}'.format(tmp_msg)))  # noqa: F405
         NotificationProcessManager.send_notification(PostProcTimeoutEventRowList, {"notification_type": OASENotificationType.TIMEOUT})
     else:
-        tmp_msg = g.appmsg.get_log_message("BKY-90029", [])
-        g.applogger.debug(addline_msg('{}'.format(tmp_msg)))  # noqa: F405
+        g.applogger.debug_lazy(lambda: addline_msg(g.appmsg.get_log_message("BKY-90029", [])))  # noqa: F405
 
     # 未知事象フラグを立てる（一括で行う）
     UnusedEventIdList = EventObj.get_unused_event(IncidentDict, filterIDMap)
     if len(UnusedEventIdList) > 0:
-        tmp_msg = g.appmsg.get_log_message("BKY-90030", [str(UnusedEventIdList)])
-        g.applogger.debug(addline_msg('{}'.format(tmp_msg)))  # noqa: F405
+        g.applogger.debug_lazy(lambda: addline_msg(g.appmsg.get_log_message("BKY-90030", [str(UnusedEventIdList)])))  # noqa: F405
         # MongoDBのインシデント情報を更新（一括で行う）
         # 未知イベントの_exastro_undetectedを1に更新
         update_Flag_Dict = {"_exastro_undetected": '1'}
         EventObj.set_undetected(UnusedEventIdList)
-        tmp_msg = g.appmsg.get_log_message("BKY-90031", [str(update_Flag_Dict), str(UnusedEventIdList)])
-        g.applogger.debug(addline_msg('{}'.format(tmp_msg)))  # noqa: F405
+        g.applogger.debug_lazy(lambda: addline_msg(g.appmsg.get_log_message("BKY-90031", [str(update_Flag_Dict), str(UnusedEventIdList)])))  # noqa: F405
     else:
-        tmp_msg = g.appmsg.get_log_message("BKY-90032", [])
-        g.applogger.debug(addline_msg('{}'.format(tmp_msg)))  # noqa: F405
+        g.applogger.debug_lazy(lambda: addline_msg(g.appmsg.get_log_message("BKY-90032", [])))  # noqa: F405
 
     # 通知処理（未知）
     unused_notification_list = []
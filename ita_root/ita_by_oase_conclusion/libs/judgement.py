@@ -86,24 +86,20 @@ class Judgement:
             Optional[Union[List[ObjectId], ObjectId]]: 合致したイベント（0件=None / 1件=ObjectId / 2件以上=List[ObjectId]）
         """
         # イベント 検索　Searching for events JSON:{}
-        tmp_msg = g.appmsg.get_log_message("BKY-90042", [str(EventJudgList)])
-        g.applogger.debug(addline_msg('{}'.format(tmp_msg)))  # noqa: F405
+        g.applogger.debug_lazy(lambda: addline_msg(g.appmsg.get_log_message("BKY-90042", [str(EventJudgList)])))  # noqa: F405
 
         ret, UsedEventIdList = self.EventObj.find_events(EventJudgList)
         if len(UsedEventIdList) == 0:
             # 対象イベントなし
-            tmp_msg = g.appmsg.get_log_message("BKY-90043", [str(UsedEventIdList)])
-            g.applogger.debug(addline_msg('{}'.format(tmp_msg)))  # noqa: F405
+            g.applogger.debug_lazy(lambda: addline_msg(g.appmsg.get_log_message("BKY-90043", [str(UsedEventIdList)])))  # noqa: F405
             return False, None
         elif len(UsedEventIdList) == 1:
             # 対象イベントあり
-            tmp_msg = g.appmsg.get_log_message("BKY-90044", [str(UsedEventIdList)])
-            g.applogger.debug(addline_msg('{}'.format(tmp_msg)))  # noqa: F405
+            g.applogger.debug_lazy(lambda: addline_msg(g.appmsg.get_log_message("BKY-90044", [str(UsedEventIdList)])))  # noqa: F405
             return True, UsedEventIdList
         else:
             # 対象イベント 複数あり
-            tmp_msg = g.appmsg.get_log_message("BKY-90045", [str(UsedEventIdList)])
-            g.applogger.debug(addline_msg('{}'.format(tmp_msg)))  # noqa: F405
+            g.applogger.debug_lazy(lambda: addline_msg(g.appmsg.get_log_message("BKY-90045", [str(UsedEventIdList)])))  # noqa: F405
             # 対象イベントが複数ある場合は[ObjectId('aaa'), ObjectId('bbb'), …]の形式で返す
             return True, UsedEventIdList
 
@@ -169,8 +165,7 @@ class Judgement:
             for FilterId in FilterList:
                 if FilterId not in FiltersUsedinRulesDict:
                     # Target filter is not registered RULE_ID {} FILTER_ID {}>>
-                    tmp_msg = g.appmsg.get_log_message("BKY-90046", [RuleRow['RULE_ID'], FilterId])
-                    g.applogger.debug(addline_msg('{}'.format(tmp_msg)))  # noqa: F405
+                    g.applogger.debug_lazy(lambda: addline_msg(g.appmsg.get_log_message("BKY-90046", [RuleRow['RULE_ID'], FilterId])))  # noqa: F405
                     hit = False
                     continue
                 # ルール抽出対象: 複数のルールで使用していないフィルタを使用しているルール or 重複しているルールの中で最上位のルール※1の場合
@@ -227,8 +222,7 @@ class Judgement:
                 elif TargetLevel == "Level3":
                     if FilterId not in IncidentDict:
                         # Target event not found RULE_ID {} FILTER_ID {}>>
-                        tmp_msg = g.appmsg.get_log_message("BKY-90047", [RuleRow['RULE_ID'], FilterId])
-                        g.applogger.debug(addline_msg('{}'.format(tmp_msg)))  # noqa: F405
+                        g.applogger.debug_lazy(lambda: addline_msg(g.appmsg.get_log_message("BKY-90047", [RuleRow['RULE_ID'], FilterId])))  # noqa: F405
                         hit = False
                         break
                     else:
@@ -310,8 +304,7 @@ class Judgement:
         UseEventIdList = []
 
         # Rule verdict process started RULE_ID:{} RULE_NAME:{} FILTER_A:{} FILTER_OPERATOR:{} FILTER_B:{}
-        tmp_msg = g.appmsg.get_log_message("BKY-90050", [RuleRow['RULE_ID'], RuleRow['RULE_NAME'], RuleRow['FILTER_A'], RuleRow['FILTER_OPERATOR'], RuleRow['FILTER_B']])
-        g.applogger.debug(addline_msg('{}'.format(tmp_msg)))  # noqa: F405
+        g.applogger.debug_lazy(lambda: addline_msg(g.appmsg.get_log_message("BKY-90050", [RuleRow['RULE_ID'], RuleRow['RULE_NAME'], RuleRow['FILTER_A'], RuleRow['FILTER_OPERATOR'], RuleRow['FILTER_B']])))  # noqa: F405
         # ルール内のフィルタ条件判定用辞書初期化
         FilterResultDict = {}
         FilterResultDict['True'] = 0
@@ -353,8 +346,7 @@ class Judgement:
         if RuleRow['FILTER_B'] is not None:
             Filter_AB_List.append(RuleRow['FILTER_B'])
         for FilterId in Filter_AB_List:
-            tmp_msg = g.appmsg.get_log_message("BKY-90052", [FilterId])
-            g.applogger.debug(addline_msg('{}'.format(tmp_msg)))  # noqa: F405
+            g.applogger.debug_lazy(lambda: addline_msg(g.appmsg.get_log_message("BKY-90052", [FilterId])))  # noqa: F405
 
             ret, EventRow = self.getFilterJudge(FilterId, IncidentDict, preserved_events)
             filtered_event_map[FilterId] = EventRow
@@ -381,14 +373,11 @@ class Judgement:
 
             # フィルタ判定に使用したイベントID退避
             if ret is True:
-                tmp_msg = g.appmsg.get_log_message("BKY-90053", [FilterId])
-                g.applogger.debug(addline_msg('{}'.format(tmp_msg)))  # noqa: F405
+                g.applogger.debug_lazy(lambda: addline_msg(g.appmsg.get_log_message("BKY-90053", [FilterId])))  # noqa: F405
             else:
-                tmp_msg = g.appmsg.get_log_message("BKY-90054", [FilterId])
-                g.applogger.debug(addline_msg('{}'.format(tmp_msg)))  # noqa: F405
+                g.applogger.debug_lazy(lambda: addline_msg(g.appmsg.get_log_message("BKY-90054", [FilterId])))  # noqa: F405
 
-        tmp_msg = g.appmsg.get_log_message("BKY-90055", [str(ret)])
-        g.applogger.debug(addline_msg('{}'.format(tmp_msg)))  # noqa: F405
+        g.applogger.debug_lazy(lambda: addline_msg(g.appmsg.get_log_message("BKY-90055", [str(ret)])))  # noqa: F405
 
         # フィルタ判定結果に沿ったフィルターの適用
         ret = self.apply_filter(FilterResultDict, IncidentDict, preserved_events)
@@ -421,11 +410,9 @@ class Judgement:
                     # FilterResultDict['EventList']からの削除は不要(存在しない)
 
         if ret is True:
-            tmp_msg = g.appmsg.get_log_message("BKY-90056", [RuleRow['RULE_ID'], RuleRow['RULE_NAME'], RuleRow['FILTER_A'], RuleRow['FILTER_OPERATOR'], RuleRow['FILTER_B']])
-            g.applogger.debug(addline_msg('{}'.format(tmp_msg)))  # noqa: F405
+            g.applogger.debug_lazy(lambda: addline_msg(g.appmsg.get_log_message("BKY-90056", [RuleRow['RULE_ID'], RuleRow['RULE_NAME'], RuleRow['FILTER_A'], RuleRow['FILTER_OPERATOR'], RuleRow['FILTER_B']])))  # noqa: F405
         else:
-            tmp_msg = g.appmsg.get_log_message("BKY-90057", [RuleRow['RULE_ID'], RuleRow['RULE_NAME'], RuleRow['FILTER_A'], RuleRow['FILTER_OPERATOR'], RuleRow['FILTER_B']])
-            g.applogger.debug(addline_msg('{}'.format(tmp_msg)))  # noqa: F405
+            g.applogger.debug_lazy(lambda: addline_msg(g.appmsg.get_log_message("BKY-90057", [RuleRow['RULE_ID'], RuleRow['RULE_NAME'], RuleRow['FILTER_A'], RuleRow['FILTER_OPERATOR'], RuleRow['FILTER_B']])))  # noqa: F405
             return False, UseEventIdList, judged_result_has_subsequent_event
 
         # ルールにマッチしたイベントを予約済みとする(下位ルールで使用しない)
@@ -451,8 +438,7 @@ class Judgement:
         # 判定につかうイベントは一つを想定している
         # 複数イベントがヒットしている場合はフィルターの「検索方法」項目を見て適切な値を返す。
         if FilterId not in IncidentDict:
-            tmp_msg = g.appmsg.get_log_message("BKY-90058", [FilterId])
-            g.applogger.debug(addline_msg('{}'.format(tmp_msg)))  # noqa: F405
+            g.applogger.debug_lazy(lambda: addline_msg(g.appmsg.get_log_message("BKY-90058", [FilterId])))  # noqa: F405
             return False, {}
 
         # 未評価のイベントを取得
@@ -460,8 +446,7 @@ class Judgement:
         if ret is True:
             return True, EventRow
         else:
-            tmp_msg = g.appmsg.get_log_message("BKY-90060", [FilterId])
-            g.applogger.debug(addline_msg('{}'.format(tmp_msg)))  # noqa: F405
+            g.applogger.debug_lazy(lambda: addline_msg(g.appmsg.get_log_message("BKY-90060", [FilterId])))  # noqa: F405
             return False, {}
 
     def apply_filter(
@@ -535,20 +520,17 @@ class Judgement:
         # ConclusionLablesDict = {'httpd': 'down', 'server': 'web01'}  # labelsプロパティの中身
 
         # Conclusion event Verdict JSON: {}
-        tmp_msg = g.appmsg.get_log_message("BKY-90065", [str(ConclusionLablesDict)])
-        g.applogger.debug(addline_msg('{}'.format(tmp_msg)))  # noqa: F405
+        g.applogger.debug_lazy(lambda: addline_msg(g.appmsg.get_log_message("BKY-90065", [str(ConclusionLablesDict)])))  # noqa: F405
 
         for FilterId, FilterRow in filterIDMap.items():
             ret = self.ConclusionFilterJudge(ConclusionLablesDict, FilterRow)
             if ret is True:
                 # Filter matched FilterId: {}
-                tmp_msg = g.appmsg.get_log_message("BKY-90063", [FilterId])
-                g.applogger.debug(addline_msg('{}'.format(tmp_msg)))  # noqa: F405
+                g.applogger.debug_lazy(lambda: addline_msg(g.appmsg.get_log_message("BKY-90063", [FilterId])))  # noqa: F405
                 UsedFilterIdList.append(FilterId)
             else:
                 # Filter did not match FilterId: {}
-                tmp_msg = g.appmsg.get_log_message("BKY-90064", [FilterId])
-                g.applogger.debug(addline_msg('{}'.format(tmp_msg)))  # noqa: F405
+                g.applogger.debug_lazy(lambda: addline_msg(g.appmsg.get_log_message("BKY-90064", [FilterId])))  # noqa: F405
 
         # マッチしたフィルタの数を判定
         if len(UsedFilterIdList) > 0:
@@ -594,8 +576,7 @@ class Judgement:
                 break
 
         if LabelHitCount != len(filter_condition):
-            tmp_msg = g.appmsg.get_log_message("BKY-90070", [])
-            g.applogger.debug(addline_msg('{}'.format(tmp_msg)))  # noqa: F405
+            g.applogger.debug_lazy(lambda: addline_msg(g.appmsg.get_log_message("BKY-90070", [])))  # noqa: F405
             return False
 
         return True
@@ -0,0 +1,111 @@
+#   Copyright 2025 NEC Corporation
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import json
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from flask import Flask, g
+
+from common_libs.ci.util import WorkspaceScheduler
+
+
+@pytest.fixture
+def scheduler_g(monkeypatch, tmp_path):
+    """WorkspaceScheduler用のapp_contextとgを用意する"""
+    monkeypatch.setenv("FILE_PATH_LIVENESS", str(tmp_path / "liveness"))
+    monkeypatch.delenv("FILE_PATH_LIVENESS_WORKSPACE", raising=False)
+    flask_app = Flask(__name__)
+    with flask_app.app_context():
+        g.ORGANIZATION_ID = "org1"
+        g.WORKSPACE_ID = None
+        g.applogger = MagicMock()
+        g.db_connect_info = {"ORGDB_HOST": "host"}
+        yield g
+
+
+def test_scheduler_sequential(scheduler_g):
+    """max_workers=1の場合は呼び出し元のスレッドで順番に実行する"""
+    calls = []
+    scheduler = WorkspaceScheduler(1)
+
+    for workspace_id in ["ws1", "ws2"]:
+        assert scheduler.run(("org1", workspace_id), lambda ws: calls.append((ws, threading.get_ident())), workspace_id) is True
+
+    assert calls == [("ws1", threading.get_ident()), ("ws2", threading.get_ident())]
+    assert scheduler.wait() == []
+    assert set(scheduler.timings.keys()) == {"org1/ws1", "org1/ws2"}
+
+
+def test_scheduler_parallel_isolates_g(scheduler_g):
+    """並列実行時はワークスペース毎にgが分離され、呼び出し元のgは変更されない"""
+    barrier = threading.Barrier(3, timeout=5)
+    results = {}
+
+    def job(workspace_id):
+        g.WORKSPACE_ID = workspace_id
+        g.db_connect_info["WSDB_HOST"] = workspace_id
+        # 3ワークスペースが同時に実行されていることを確認する
+        barrier.wait()
+        results[workspace_id] = (g.ORGANIZATION_ID, g.WORKSPACE_ID, g.db_connect_info["WSDB_HOST"])
+
+    scheduler = WorkspaceScheduler(3)
+    for workspace_id in ["ws1", "ws2", "ws3"]:
+        scheduler.run(("org1", workspace_id), job, workspace_id)
+
+    assert scheduler.wait() == []
+    scheduler.shutdown()
+
+    assert results == {ws: ("org1", ws, ws) for ws in ["ws1", "ws2", "ws3"]}
+    assert g.WORKSPACE_ID is None
+    assert g.db_connect_info == {"ORGDB_HOST": "host"}
+
+
+def test_scheduler_skip_running_workspace(scheduler_g):
+    """前サイクルのジョブが実行中のワークスペースは投入せず、他のワークスペースは実行する"""
+    release = threading.Event()
+    calls = []
+
+    def slow_job():
+        release.wait(5)
+
+    scheduler = WorkspaceScheduler(2, wait_timeout=0.1)
+    scheduler.run(("org1", "slow"), slow_job)
+    assert scheduler.wait() == [("org1", "slow")]
+
+    # 次サイクル
+    assert scheduler.run(("org1", "slow"), slow_job) is False
+    assert scheduler.run(("org1", "fast"), calls.append, "fast") is True
+    assert scheduler.wait() == [("org1", "slow")]
+    assert calls == ["fast"]
+
+    release.set()
+    scheduler.shutdown()
+    assert scheduler.timings["org1/slow"]["finished_at"] is not None
+
+
+def test_scheduler_write_timings(scheduler_g, tmp_path):
+    """ワークスペース毎の実行時間をFILE_PATH_LIVENESS_workspaceに出力する"""
+    scheduler = WorkspaceScheduler(1)
+    scheduler.run(("org1", "ws1"), time.sleep, 0.01)
+    scheduler.write_timings()
+
+    with open(tmp_path / "liveness_workspace") as f:
+        timings = json.load(f)
+
+    assert list(timings.keys()) == ["org1/ws1"]
+    assert timings["org1/ws1"]["elapsed"] >= 0.01
+    assert timings["org1/ws1"]["started_at"] <= timings["org1/ws1"]["finished_at"]
@@ -0,0 +1,106 @@
+#   Copyright 2025 NEC Corporation
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import os
+import time
+
+import pytest
+
+from common_libs.common.child_process_pool import ChildProcessPool
+
+# 引数をファイルに書き込み、終了指示のファイルが作成されるまで待機する起動スクリプト
+CHILD_INIT_SCRIPT = """
+import os
+import sys
+import time
+
+
+def main():
+    args = sys.argv
+    work_dir = os.path.dirname(os.path.abspath(__file__))
+    with open(os.path.join(work_dir, "started_{}".format(args[1])), "w") as f:
+        f.write(" ".join(args[1:]))
+    while not os.path.exists(os.path.join(work_dir, "stop_{}".format(args[1]))):
+        time.sleep(0.01)
+    sys.exit(3)
+
+
+if __name__ == '__main__':
+    main()
+"""
+
+
+def wait_for(func, timeout=10):
+    end_time = time.time() + timeout
+    while time.time() < end_time:
+        if func():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+@pytest.fixture
+def child_init_path(tmp_path, monkeypatch):
+    monkeypatch.setenv("CHILD_PROCESS_POOL_PID_DIR", str(tmp_path / "pid"))
+    path = tmp_path / "test_child_init.py"
+    path.write_text(CHILD_INIT_SCRIPT)
+    yield str(path)
+    for name in ("1", "2"):
+        (tmp_path / "stop_{}".format(name)).touch()
+    ChildProcessPool.shutdown()
+    ChildProcessPool._children.clear()
+
+
+def test_start_by_fork_server(app_context_with_mock_g, child_init_path, tmp_path):
+    """
+    ForkServerから起動した子プロセスの引数・生存確認
+    """
+    pid = ChildProcessPool.start(child_init_path, ["1", "ws", 10])
+
+    assert child_init_path in ChildProcessPool._servers
+    # 子プロセスがファイルを作成してから書き込むまでの間に読まないよう、内容が揃うまで待つ
+    assert wait_for(lambda: (tmp_path / "started_1").exists() and (tmp_path / "started_1").read_text() == "1 ws 10")
+    assert os.path.exists(tmp_path / "pid" / str(pid))
+
+    assert ChildProcessPool.is_running(child_init_path, ["1", "ws"]) is True
+    assert ChildProcessPool.is_running(child_init_path, ["1", "other"]) is False
+
+    # 親プロセスの再起動後もpidファイルで確認できる
+    children = dict(ChildProcessPool._children)
+    ChildProcessPool._children.clear()
+    assert ChildProcessPool.is_running(child_init_path, ["1", "ws"]) is True
+    ChildProcessPool._children.update(children)
+
+    (tmp_path / "stop_1").touch()
+    assert wait_for(lambda: ChildProcessPool.is_running(child_init_path, ["1", "ws"]) is False)
+    assert pid not in ChildProcessPool._children
+    assert not os.path.exists(tmp_path / "pid" / str(pid))
+
+
+def test_start_without_fork_server(app_context_with_mock_g, child_init_path, tmp_path, monkeypatch):
+    """
+    ForkServerを使用しない場合はpython3で起動し、/procのコマンドラインで確認する
+    """
+    monkeypatch.setenv("CHILD_PROCESS_POOL_ENABLED", "0")
+    pid = ChildProcessPool.start(child_init_path, ["2", "ws"])
+
+    assert ChildProcessPool._servers == {}
+    assert wait_for(lambda: (tmp_path / "started_2").exists())
+    assert ChildProcessPool._children[pid]["popen"] is not None
+
+    ChildProcessPool._children.clear()
+    assert ChildProcessPool.is_running(child_init_path, ["2", "ws"]) is True
+
+    (tmp_path / "stop_2").touch()
+    assert wait_for(lambda: ChildProcessPool.is_running(child_init_path, ["2", "ws"]) is False)
@@ -0,0 +1,58 @@
+#   Copyright 2025 NEC Corporation
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import logging
+
+from common_libs.common.queuing_logger import QueuingAppLogger
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def test_debug_lazy():
+    """
+    debugログを出力しない場合はメッセージを生成しない
+    """
+    logging.setLoggerClass(QueuingAppLogger)
+    try:
+        logger = logging.getLogger("test_debug_lazy")
+    finally:
+        logging.setLoggerClass(logging.Logger)
+    handler = ListHandler()
+    logger.addHandler(handler)
+    calls = []
+
+    def message():
+        calls.append(1)
+        return "lazy message"
+
+    logger.set_level(logging.INFO)
+    assert logger.is_debug_enabled() is False
+    logger.debug_lazy(message)
+    assert calls == []
+    assert handler.records == []
+
+    logger.set_level(logging.DEBUG)
+    assert logger.is_debug_enabled() is True
+    logger.debug_lazy(message)
+    assert calls == [1]
+    assert [record.getMessage() for record in handler.records] == ["lazy message"]
+    # 出力元は呼び出し元のファイル
+    assert handler.records[0].filename == "test_queuing_logger.py"
@@ -14,11 +14,11 @@ def test_fetch_table_valid_new_notification(app_context_with_mock_g, mocker):
 
     result = OASE._fetch_table(mock_dbca, decision_info)
 
-    expected_query = "SELECT NOTIFICATION_TEMPLATE_ID AS UUID, TEMPLATE_FILE, NOTIFICATION_DESTINATION, IS_DEFAULT FROM T_OASE_NOTIFICATION_TEMPLATE_COMMON WHERE DISUSE_FLAG=0 AND EVENT_TYPE=%s"
+    expected_query = "SELECT NOTIFICATION_TEMPLATE_ID AS UUID, TEMPLATE_FILE, NOTIFICATION_DESTINATION, IS_DEFAULT, LAST_UPDATE_TIMESTAMP FROM T_OASE_NOTIFICATION_TEMPLATE_COMMON WHERE DISUSE_FLAG=0 AND EVENT_TYPE=%s"
     expected_values = ["1"]
     mock_dbca.sql_execute.assert_called_once_with(expected_query, expected_values)
 
-    assert result == {"NOTIFICATION_DESTINATION": [{"id": None, "UUID": "1", "TEMPLATE_FILE": "template.txt", "IS_DEFAULT": "●"}]}
+    assert result == {"NOTIFICATION_DESTINATION": [{"id": None, "UUID": "1", "TEMPLATE_FILE": "template.txt", "IS_DEFAULT": "●", "LAST_UPDATE_TIMESTAMP": None}]}
 
 
 def test_fetch_table_valid_before_action_notification(app_context_with_mock_g, mocker):
@@ -32,11 +32,11 @@ def test_fetch_table_valid_before_action_notification(app_context_with_mock_g, m
 
     result = OASE._fetch_table(mock_dbca, decision_info)
 
-    expected_query = "SELECT RULE_ID AS UUID, BEFORE_NOTIFICATION AS TEMPLATE_FILE, BEFORE_NOTIFICATION_DESTINATION AS NOTIFICATION_DESTINATION FROM T_OASE_RULE WHERE DISUSE_FLAG=0 AND RULE_ID=%s"
+    expected_query = "SELECT RULE_ID AS UUID, BEFORE_NOTIFICATION AS TEMPLATE_FILE, BEFORE_NOTIFICATION_DESTINATION AS NOTIFICATION_DESTINATION, LAST_UPDATE_TIMESTAMP FROM T_OASE_RULE WHERE DISUSE_FLAG=0 AND RULE_ID=%s"
     expected_values = ["10"]
     mock_dbca.sql_execute.assert_called_once_with(expected_query, expected_values)
 
-    assert result == {"NOTIFICATION_DESTINATION": [{"id": ["dest1", "dest2"], "UUID": "10", "TEMPLATE_FILE": "before.txt", "IS_DEFAULT": None}]}
+    assert result == {"NOTIFICATION_DESTINATION": [{"id": ["dest1", "dest2"], "UUID": "10", "TEMPLATE_FILE": "before.txt", "IS_DEFAULT": None, "LAST_UPDATE_TIMESTAMP": None}]}
 
 
 def test_fetch_table_missing_rule_id_for_before_action(app_context_with_mock_g, mocker):
@@ -98,6 +98,41 @@ def test_get_template_file_read_error(app_context_with_mock_g, mocker):
     app_context_with_mock_g.applogger.error.assert_called()
 
 
+def test_get_template_cache(app_context_with_mock_g, mocker):
+    """
+    _get_templateメソッドが、テンプレートのID・最終更新日時が同じであればキャッシュ済みのテンプレートを使うことを確認
+    """
+    OASE.clear_template_cache()
+    mock_storage_access = mocker.patch('common_libs.common.storage_access.storage_read')
+    mock_access_file = mock_storage_access.return_value
+    mock_access_file.read.return_value = "[TITLE]\n{{ labels.title }}\n[BODY]\nbody"
+
+    mocker.patch('common_libs.common.util.get_upload_file_path').return_value = {"file_path": "/mock/path/to/template.txt"}
+    mocker.patch('common_libs.notification.sub_classes.oase.get_tmp_file_path').return_value = {"file_path": "/tmp/mock/template.txt"}
+
+    decision_info = {"notification_type": OASENotificationType.NEW}
+    last_update_timestamp = datetime(2025, 1, 1)
+
+    def get_template(last_update_timestamp):
+        fetch_data = {"NOTIFICATION_DESTINATION": [{"UUID": "mock_uuid", "TEMPLATE_FILE": "template.txt", "LAST_UPDATE_TIMESTAMP": last_update_timestamp}]}
+        return OASE._get_template(fetch_data, decision_info)[0]
+
+    template_item = get_template(last_update_timestamp)
+    assert OASE._create_notise_message({"labels": {"title": "a"}}, template_item["template"], template_item["template_key"]) == {"title": "a", "message": "body"}
+    assert mock_access_file.read.call_count == 1
+
+    # 2回目はファイルを読み込まない
+    assert get_template(last_update_timestamp) == template_item
+    assert mock_access_file.read.call_count == 1
+
+    # 更新されたテンプレートは読み込み直す
+    mock_access_file.read.return_value = "[TITLE]\nnew {{ labels.title }}\n[BODY]\nbody"
+    template_item = get_template(datetime(2025, 1, 2))
+    assert mock_access_file.read.call_count == 2
+    assert OASE._create_notise_message({"labels": {"title": "a"}}, template_item["template"], template_item["template_key"])["title"] == "new a"
+    OASE.clear_template_cache()
+
+
 def test_fetch_notification_destination_before_action_valid(app_context_with_mock_g, mocker):
     """
     _fetch_notification_destinationメソッドが、BEFORE_ACTIONタイプで通知先を正しくフェッチすることを確認
@@ -710,7 +710,7 @@ def test_bulksend_process_event_call_api_error(app_context_with_mock_g, mocker):
     mocker.patch.object(MockNotification, '_fetch_notification_destination', return_value=['AA', 'BB'])
 
     # Mock _create_notise_message to return None for one event (simulating error)
-    def side_effect(item, template):
+    def side_effect(item, template, template_key=None):
         if item["_id"] == "0000":
             return {'id': None, 'UUID': '11', 'TEMPLATE_FILE': 'Receive.j2', 'IS_DEFAULT': '●', 'template': '[TITLE]\nDefault Title\n[BODY]\nDefault Message'}
         return None
@@ -0,0 +1,154 @@
+#   Copyright 2025 NEC Corporation
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import threading
+from unittest import mock
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+from jinja2 import Template
+from requests.adapters import HTTPAdapter
+
+from common_libs.notification.notification_base import Notification
+
+EVENT_COUNT = 300
+MAX_WORKERS = 4
+
+
+class BenchmarkNotification(Notification):
+    @classmethod
+    def _fetch_table(cls, objdbca, decision_information):
+        return {"NOTIFICATION_DESTINATION": [
+            {"id": None, "UUID": "1", "TEMPLATE_FILE": "New00.j2", "IS_DEFAULT": "●", "LAST_UPDATE_TIMESTAMP": "2025-01-01 00:00:00.000000"},
+            {"id": ["aa"], "UUID": "2", "TEMPLATE_FILE": "New01.j2", "IS_DEFAULT": None, "LAST_UPDATE_TIMESTAMP": "2025-01-01 00:00:00.000000"},
+        ]}
+
+    @classmethod
+    def _get_template(cls, fetch_data, decision_information):
+        templates = []
+        for item in fetch_data["NOTIFICATION_DESTINATION"]:
+            templates.append({
+                "id": item["id"],
+                "template": (
+                    "[TITLE]\n{{ labels._exastro_host }} {{ labels.severity }}\n[BODY]\n"
+                    "{% for key, value in labels.items() %}{{ key }}: {{ value }}\n{% endfor %}"
+                    "{% if labels.severity == '1' %}critical{% else %}normal{% endif %}"
+                ),
+                "template_key": ("org", "ws", item["UUID"], item["TEMPLATE_FILE"], item["LAST_UPDATE_TIMESTAMP"]),
+                "IS_DEFAULT": item["IS_DEFAULT"],
+            })
+        return templates
+
+    @classmethod
+    def _fetch_notification_destination(cls, fetch_data, decision_information):
+        return ["aa", "bb"]
+
+
+class NotificationHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        body = b'{"data": null}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class CountingHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.connection_count = 0
+        self.lock = threading.Lock()
+
+    def process_request(self, request, client_address):
+        with self.lock:
+            self.connection_count += 1
+        super().process_request(request, client_address)
+
+
+@pytest.fixture
+def notification_server(monkeypatch):
+    server = CountingHTTPServer(("127.0.0.1", 0), NotificationHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setenv("PLATFORM_API_HOST", "127.0.0.1")
+    monkeypatch.setenv("PLATFORM_API_PORT", str(server.server_address[1]))
+    monkeypatch.setenv("MAX_WORKER_THREAD_POOL_SIZE", str(MAX_WORKERS))
+    monkeypatch.setattr(Notification, "_session", None)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def create_events(count):
+    return [
+        {"_id": "{:04d}".format(index), "labels": {"_exastro_host": "host{}".format(index % 200), "severity": str(index % 5), "service": "svc"}}
+        for index in range(count)
+    ]
+
+
+def run_burst(server, count=EVENT_COUNT):
+    start_connection_count = server.connection_count
+    result = BenchmarkNotification.bulksend(None, create_events(count), {})
+    return result, server.connection_count - start_connection_count
+
+
+def test_bulksend_benchmark(app_context_with_mock_g, notification_server, mocker):
+    """
+    イベントを通知し、テンプレートのコンパイル回数・接続数をキャッシュ無し(従来)と比較する
+    """
+    compiled = mocker.patch("common_libs.notification.notification_base.Template", side_effect=Template)
+    adapter = mocker.patch("common_libs.notification.notification_base.HTTPAdapter", side_effect=HTTPAdapter)
+
+    # 従来: テンプレートをイベント毎にコンパイルし、通知API呼び出し毎にSessionを作成する
+    BenchmarkNotification.clear_template_cache()
+
+    def new_session():
+        s = requests.Session()
+        s.mount("http://", HTTPAdapter())
+        return s
+
+    with mock.patch.object(BenchmarkNotification, "_get_session", side_effect=new_session), \
+            mock.patch.object(BenchmarkNotification, "_get_compiled_template", side_effect=lambda template, template_key=None: Template(template)):
+        result, before_connections = run_burst(notification_server)
+    assert result["success_notification_count"] == EVENT_COUNT * 2
+    assert before_connections >= EVENT_COUNT // 100
+
+    # キャッシュ: テンプレートは1回ずつコンパイルし、Session(http/httpsのHTTPAdapter)は1回だけ作成する
+    compiled.reset_mock()
+    result, after_connections = run_burst(notification_server)
+    assert result["success_notification_count"] == EVENT_COUNT * 2
+    assert result["failure"] == 0
+    assert compiled.call_count == 2
+    assert adapter.call_count == 2
+    assert after_connections <= MAX_WORKERS
+    session = BenchmarkNotification._session
+
+    # 2回目のバーストではSession・テンプレートとも再利用する
+    compiled.reset_mock()
+    result, connections = run_burst(notification_server)
+    assert compiled.call_count == 0
+    assert adapter.call_count == 2
+    assert BenchmarkNotification._session is session
+    assert connections <= MAX_WORKERS
+    BenchmarkNotification.clear_template_cache()
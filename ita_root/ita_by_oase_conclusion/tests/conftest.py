@@ -4,6 +4,7 @@ from unittest.mock import Mock
 from flask import Flask, g
 
 import common_libs.oase.manage_events as clome
+from common_libs.oase.event_cache import LabeledEventCache
 import backyard_main as bm
 import libs.action as la
 import libs.common_functions as cf
@@ -178,3 +179,11 @@ def patch_manage_events_using_modules(monkeypatch):
     monkeypatch.setattr(clome, "requests", requests)
 
     return {}
+
+
+@pytest.fixture(autouse=True)
+def clear_labeled_event_cache():
+    """テスト間で未確定イベントのキャッシュを共有しない"""
+    LabeledEventCache.clear()
+    yield
+    LabeledEventCache.clear()
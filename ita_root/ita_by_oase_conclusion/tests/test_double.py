@@ -401,6 +401,9 @@ class DummyLogger:
     def debug(self, msg):
         self.logs.append(("debug", msg))
 
+    def debug_lazy(self, message_func):
+        self.logs.append(("debug", message_func()))
+
     def info(self, msg):
         self.logs.append(("info", msg))
 
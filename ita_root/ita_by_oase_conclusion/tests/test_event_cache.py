@@ -0,0 +1,95 @@
+import copy
+
+from bson import ObjectId
+
+from common_libs.oase.const import oaseConst
+from common_libs.oase.manage_events import ManageEvents
+from tests.test_double import MockCollection, MockCursor, MockMONGOConnectWs
+
+JUDGE_TIME = 1000000
+
+
+class RecordingMONGOConnectWs(MockMONGOConnectWs):
+    """findの条件を記録するMONGOConnectWs"""
+
+    def __init__(self, test_events):
+        super().__init__(test_events)
+        self.find_queries = []
+
+    def collection(self, collection_name):
+        return RecordingCollection(collection_name, self)
+
+    def fetched_ids(self):
+        """ドキュメント全体を取得したイベントのid"""
+        result = []
+        for query in self.find_queries:
+            if "_id" in query:
+                result.extend(query["_id"]["$in"])
+        return result
+
+
+class RecordingCollection(MockCollection):
+    def find(self, query=None, projection=None):
+        # DBと同様に取得の都度新しいドキュメントを返す
+        self.mongo_instance.find_queries.append(query)
+        return MockCursor(copy.deepcopy(self.mongo_instance.test_events), query)
+
+
+def create_event(fetched_time):
+    return {
+        "_id": ObjectId(),
+        "labels": {
+            "_exastro_type": "event",
+            "_exastro_timeout": "0",
+            "_exastro_evaluated": "0",
+            "_exastro_undetected": "0",
+            "_exastro_fetched_time": fetched_time,
+            "_exastro_end_time": JUDGE_TIME + 100,
+            "_exastro_host": "host{}".format(fetched_time),
+        },
+    }
+
+
+def test_event_cache_fetches_only_changed_events(patch_global_g, patch_notification_and_writer):
+    """
+    2回目以降の判定では追加・更新されたイベントのみドキュメント全体を取得する
+    """
+    events = [create_event(JUDGE_TIME - 30), create_event(JUDGE_TIME - 10), create_event(JUDGE_TIME - 20)]
+    ws_mongo = RecordingMONGOConnectWs(events)
+
+    manage_events = ManageEvents(ws_mongo, JUDGE_TIME)
+    assert list(manage_events.labeled_events_dict) == [events[0]["_id"], events[2]["_id"], events[1]["_id"]]
+    assert sorted(ws_mongo.fetched_ids()) == sorted(event["_id"] for event in events)
+
+    # 判定中の変更はキャッシュに影響しない
+    manage_events.labeled_events_dict[events[0]["_id"]]["labels"]["_exastro_host"] = "changed"
+
+    # WriterProcessによる更新・評価済み・新規イベント
+    events[1]["labels"]["_exastro_end_time"] = JUDGE_TIME + 200
+    events[2]["labels"]["_exastro_evaluated"] = "1"
+    new_event = create_event(JUDGE_TIME - 40)
+    events.append(new_event)
+    ws_mongo.find_queries = []
+
+    manage_events = ManageEvents(ws_mongo, JUDGE_TIME)
+    assert list(manage_events.labeled_events_dict) == [new_event["_id"], events[0]["_id"], events[1]["_id"]]
+    assert sorted(ws_mongo.fetched_ids()) == sorted([events[1]["_id"], new_event["_id"]])
+    assert manage_events.labeled_events_dict[events[0]["_id"]]["labels"]["_exastro_host"] == "host{}".format(JUDGE_TIME - 30)
+    assert manage_events.labeled_events_dict[events[1]["_id"]]["labels"]["_exastro_end_time"] == JUDGE_TIME + 200
+    assert manage_events.labeled_events_dict[events[0]["_id"]][oaseConst.DF_LOCAL_LABLE_NAME]["status"] == oaseConst.DF_PROC_EVENT
+
+
+def test_event_cache_disabled(monkeypatch, patch_global_g, patch_notification_and_writer):
+    """
+    キャッシュを使用しない場合は毎回全件を取得する
+    """
+    monkeypatch.setenv("OASE_EVENT_CACHE_ENABLED", "0")
+    events = [create_event(JUDGE_TIME - 10), create_event(JUDGE_TIME - 20)]
+    ws_mongo = RecordingMONGOConnectWs(events)
+
+    for _ in range(2):
+        ws_mongo.find_queries = []
+        manage_events = ManageEvents(ws_mongo, JUDGE_TIME)
+        assert list(manage_events.labeled_events_dict) == [events[1]["_id"], events[0]["_id"]]
+        assert len(ws_mongo.find_queries) == 1
+        assert ws_mongo.fetched_ids() == []
@@ -0,0 +1,114 @@
+import random
+
+from bson import ObjectId
+
+from common_libs.oase.const import oaseConst
+from common_libs.oase.manage_events import ManageEvents
+from tests.test_double import MockMONGOConnectWs
+
+JUDGE_TIME = 1000000
+
+
+def find_events_scan(manage_events, event_judge_list):
+    """インデックス導入前のfind_events(全イベントを走査する)"""
+    used_event_list = []
+    for event_id, event in manage_events.labeled_events_dict.items():
+        if str(event["labels"]["_exastro_timeout"]) != "0":
+            continue
+        if str(event["labels"]["_exastro_evaluated"]) != "0":
+            continue
+        labels = event["labels"]
+        hit = True
+        for item in event_judge_list:
+            key = item["LabelKey"]
+            value = item["LabelValue"]
+            hit = False
+            if key in labels:
+                if str(item["LabelCondition"]) == oaseConst.DF_TEST_EQ:
+                    hit = labels[key] == value or value == "*"
+                else:
+                    hit = labels[key] != value
+            if hit is False:
+                break
+        if hit:
+            used_event_list.append(event["_id"])
+    return used_event_list
+
+
+def create_events(count, seed=0):
+    rand = random.Random(seed)
+    events = []
+    for index in range(count):
+        labels = {
+            "_exastro_type": "event",
+            "_exastro_timeout": "0",
+            "_exastro_evaluated": "0",
+            "_exastro_undetected": "0",
+            "_exastro_fetched_time": JUDGE_TIME - 10,
+            "_exastro_end_time": JUDGE_TIME + 100,
+            "_exastro_host": "host{}".format(rand.randrange(200)),
+            "service": "service{}".format(rand.randrange(20)),
+            "severity": str(rand.randrange(5)),
+        }
+        if index % 3 == 0:
+            labels["region"] = "region{}".format(rand.randrange(3))
+        events.append({"_id": ObjectId(), "labels": labels})
+    return events
+
+
+def create_filters(count, seed=1):
+    rand = random.Random(seed)
+    filters = []
+    for index in range(count):
+        conditions = [
+            {"LabelKey": "_exastro_host", "LabelValue": "host{}".format(rand.randrange(200)), "LabelCondition": oaseConst.DF_TEST_EQ},
+            {"LabelKey": "severity", "LabelValue": str(rand.randrange(5)), "LabelCondition": oaseConst.DF_TEST_NE},
+        ]
+        if index % 4 == 0:
+            conditions = [{"LabelKey": "region", "LabelValue": "*", "LabelCondition": oaseConst.DF_TEST_EQ}] + conditions[1:]
+        if index % 5 == 0:
+            conditions.append({"LabelKey": "service", "LabelValue": "service{}".format(rand.randrange(20)), "LabelCondition": oaseConst.DF_TEST_EQ})
+        if index % 7 == 0:
+            conditions.append({"LabelKey": "no_such_label", "LabelValue": "x", "LabelCondition": oaseConst.DF_TEST_NE})
+        filters.append(conditions)
+    return filters
+
+
+def test_find_events_index_update(patch_global_g, patch_notification_and_writer):
+    """
+    ラベルの変更(評価済み・タイムアウト・追加)がインデックスに反映される
+    """
+    events = create_events(30)
+    ev_obj = ManageEvents(MockMONGOConnectWs(events), JUDGE_TIME)
+    conditions = [{"LabelKey": "_exastro_type", "LabelValue": "event", "LabelCondition": oaseConst.DF_TEST_EQ}]
+    assert ev_obj.find_events(conditions)[1] == [event["_id"] for event in events]
+
+    ev_obj.update_label_flag([events[0]["_id"]], {"_exastro_evaluated": "1"})
+    ev_obj._update_label_force([events[1]["_id"]], {"_exastro_timeout": "1"})
+    new_event = create_events(1, seed=2)[0]
+    ev_obj.append_event(new_event)
+
+    expected = [event["_id"] for event in events[2:]] + [new_event["_id"]]
+    assert ev_obj.find_events(conditions)[1] == expected
+    assert ev_obj.find_events(conditions)[1] == find_events_scan(ev_obj, conditions)
+
+    # インデックスを経由せずにキャッシュへ追加された場合は作り直す
+    other_event = create_events(1, seed=3)[0]
+    ev_obj.labeled_events_dict[other_event["_id"]] = other_event
+    assert ev_obj.find_events(conditions)[1] == expected + [other_event["_id"]]
+
+
+def test_find_events_matches_scan(monkeypatch, patch_global_g, patch_notification_and_writer):
+    """
+    大量のイベント・フィルターで、全イベント走査とインデックスの結果が一致する
+    """
+    # モックの$in検索は線形探索のため、イベントキャッシュを使用しない
+    monkeypatch.setenv("OASE_EVENT_CACHE_ENABLED", "0")
+    ev_obj = ManageEvents(MockMONGOConnectWs(create_events(20000)), JUDGE_TIME)
+    filters = create_filters(300)
+
+    scan_results = [find_events_scan(ev_obj, conditions) for conditions in filters]
+    index_results = [ev_obj.find_events(conditions)[1] for conditions in filters]
+
+    assert index_results == scan_results
+    assert any(len(result) > 1 for result in index_results)
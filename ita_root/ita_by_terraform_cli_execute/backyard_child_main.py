@@ -29,6 +29,7 @@ from common_libs.common.util import get_timestamp, ky_encrypt, ky_decrypt, get_i
 from common_libs.ci.util import log_err
 from common_libs.driver.functions import operation_LAST_EXECUTE_TIMESTAMP_update
 from common_libs.terraform_driver.cli.Const import Const as TFCLIConst
+from common_libs.terraform_driver.cli.provider_cache import ProviderCache
 from common_libs.terraform_driver.common.SubValueAutoReg import SubValueAutoReg
 from common_libs.terraform_driver.common.by_execute import \
     get_type_info, encode_hcl, get_member_vars_ModuleVarsLinkID_for_hcl, generate_member_vars_array_for_hcl
@@ -272,11 +273,35 @@ def instance_execution(wsDb: DBConnectWs, execute_data):
     # 更新するステータスの初期値
     update_status = TFCLIConst.STATUS_COMPLETE
 
+    # providerのキャッシュ・依存関係ロックファイルを作業実行間で共有する
+    provider_cache = ProviderCache(base_dir)
+    module_key = provider_cache.get_module_key(workspace_work_dir)
+    provider_cache.restore_lock_file(module_key, workspace_work_dir)
+    tf_env = provider_cache.get_env()
+
     # initコマンド
+    # 他の作業実行がinit中の場合は待つが、待ち時間は遅延タイマの残り時間までとし、緊急停止されたらやめる
+    lock_timeout = None
+    if execute_data['I_TIME_LIMIT']:
+        limit_unixtime = execute_data['TIME_START'].timestamp() + (execute_data['I_TIME_LIMIT'] * 60)
+        lock_timeout = max(min(limit_unixtime - time.time(), ProviderCache.LOCK_WAIT_TIMEOUT), 0)
     command = ["terraform", "init", "-no-color"]
-    ret_status, execute_data = exec_command(wsDb, execute_data, command, init_log, error_log, True)
+    with provider_cache.lock(lock_timeout, lambda: os.path.exists(emergency_stop_file_path)) as locked:
+        if locked is False:
+            # 緊急停止のチェック
+            ret_emgy, execute_data = is_emergency_stop(wsDb, execute_data)
+            if ret_emgy is False:
+                lock.close()
+                return True, execute_data
+
+            # ロックを取得できない場合は、providerのキャッシュを使わずにinitする
+            g.applogger.info("terraform init runs without the plugin cache, because another execution is using it. (execution_no={})".format(execution_no))
+        init_env = tf_env if locked is True else provider_cache.get_env_without_plugin_cache(tf_env)
+        ret_status, execute_data = exec_command(wsDb, execute_data, command, init_log, error_log, True, init_env)
     if ret_status != TFCLIConst.STATUS_COMPLETE:
         update_status = ret_status
+    else:
+        provider_cache.save_lock_file(module_key, workspace_work_dir)
     result_matter_arr.append(error_log)
     result_matter_arr.append(workspace_work_dir + "/.terraform.lock.hcl")
     result_matter_arr.append(init_log)
@@ -299,7 +324,7 @@ def instance_execution(wsDb: DBConnectWs, execute_data):
             command = ["terraform", "plan", "-destroy"]
             command.extend(command_options)
 
-        ret_status, execute_data = exec_command(wsDb, execute_data, command, plan_log, error_log)
+        ret_status, execute_data = exec_command(wsDb, execute_data, command, plan_log, error_log, env=tf_env)
         if ret_status != TFCLIConst.STATUS_COMPLETE:
             update_status = ret_status
         result_matter_arr.append(plan_log)
@@ -323,7 +348,7 @@ def instance_execution(wsDb: DBConnectWs, execute_data):
             command = ["terraform", "destroy"]
             command.extend(command_options)
 
-        ret_status, execute_data = exec_command(wsDb, execute_data, command, apply_log, error_log)
+        ret_status, execute_data = exec_command(wsDb, execute_data, command, apply_log, error_log, env=tf_env)
         if ret_status != TFCLIConst.STATUS_COMPLETE:
             update_status = ret_status
         result_matter_arr.append(apply_log)
@@ -393,7 +418,7 @@ def update_status_error(wsDb: DBConnectWs, execute_data):
 
 
 # コマンド実行
-def exec_command(wsDb, execute_data, command, cmd_log, error_log, init_flg=False):
+def exec_command(wsDb, execute_data, command, cmd_log, error_log, init_flg=False, env=None):
     time_limit = execute_data['I_TIME_LIMIT']  # 遅延タイマ
     current_status = execute_data['STATUS_ID']
 
@@ -408,7 +433,7 @@ def exec_command(wsDb, execute_data, command, cmd_log, error_log, init_flg=False
     # terraformコマンドを発行
     str_command = " ".join(command)
     g.applogger.debug(g.appmsg.get_log_message("BKY-52004", [str_command]))
-    proc = subprocess.Popen(command, cwd=workspace_work_dir, text=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    proc = subprocess.Popen(command, cwd=workspace_work_dir, env=env, text=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
 
     # 結果ファイルにコマンドとPIDを書き込む
     str_body = str_command + " : PID=" + str(proc.pid) + "\n"
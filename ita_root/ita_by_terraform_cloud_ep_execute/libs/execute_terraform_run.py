@@ -26,6 +26,7 @@ from common_libs.common.util import ky_decrypt, get_iso_datetime, arrange_stackt
 from common_libs.driver.functions import operation_LAST_EXECUTE_TIMESTAMP_update
 from common_libs.terraform_driver.cloud_ep.Const import Const as TFCloudEPConst
 from common_libs.terraform_driver.cloud_ep.terraform_restapi import *  # noqa: F403
+from common_libs.terraform_driver.cloud_ep.workspace_var_sync import WorkspaceVarSync
 from common_libs.terraform_driver.common.by_execute import \
     get_type_info, encode_hcl, get_member_vars_ModuleVarsLinkID_for_hcl, generate_member_vars_array_for_hcl
 
@@ -208,7 +209,7 @@ def execute_terraform_run(objdbca, instance_data, destroy_flag=False):  # noqa:
                 objdbca.db_commit()
                 g.applogger.debug(g.appmsg.get_log_message("BKY-10003", [execution_no]))
 
-            # [RESTAPI]連携先Terraformに登録されているVariableの一覧を取得(削除対象を特定するため)
+            # [RESTAPI]連携先Terraformに登録されているVariableの一覧を取得(差分を求めるため)
             g.applogger.info(g.appmsg.get_log_message("BKY-51009", [execution_no]))
             response_array = get_tf_workspace_var_list(restApiCaller, tf_manage_workspace_id)  # noqa: F405
             response_status_code = response_array.get('statusCode')
@@ -218,41 +219,36 @@ def execute_terraform_run(objdbca, instance_data, destroy_flag=False):  # noqa:
                 msg = "[API Error]" + g.appmsg.get_api_message("MSG-82014", [])
                 raise AppException(msg)
             g.applogger.info(g.appmsg.get_log_message("BKY-51041", []))
-
-            # [RESTAPI]取得したVariable一覧について、削除するRESTAPIを実行する
-            g.applogger.info(g.appmsg.get_log_message("BKY-51010", [execution_no]))
             respons_contents_json = response_array.get('responseContents')
             respons_contents = json.loads(respons_contents_json)
             respons_contents_data = respons_contents.get('data')
-            for data in respons_contents_data:
-                tf_manage_variable_id = data.get('id')
-                response_array = delete_tf_workspace_var(restApiCaller, tf_manage_variable_id)  # noqa: F405
-                response_status_code = response_array.get('statusCode')
-                if not response_status_code == 204:
-                    log_msg = g.appmsg.get_log_message("MSG-82015", [])
-                    g.applogger.info(log_msg)
-                    msg = "[API Error]" + g.appmsg.get_api_message("MSG-82015", [])
-                    raise AppException(msg)
-            g.applogger.info(g.appmsg.get_log_message("BKY-51041", []))
 
-            # [RESTAPI]連携先Terraformに文字化け防止用の環境変数を設定する
-            g.applogger.info(g.appmsg.get_log_message("BKY-51011", [execution_no]))
-            key = 'TF_CLI_ARGS'
-            value = '-no-color'
-            response_array = create_tf_workspace_var(restApiCaller, tf_manage_workspace_id, key, value, hcl=False, sensitive=False, category="env")  # noqa: F405, E501
-            response_status_code = response_array.get('statusCode')
-            if not response_status_code == 201:
-                log_msg = g.appmsg.get_log_message("MSG-82016", [])
-                g.applogger.info(log_msg)
-                msg = "[API Error]" + g.appmsg.get_api_message("MSG-82016", [])
-                raise AppException(msg)
-            g.applogger.info(g.appmsg.get_log_message("BKY-51041", []))
+            # 連携先Terraformに文字化け防止用の環境変数を設定する
+            var_sync = WorkspaceVarSync(restApiCaller, tf_manage_workspace_id)
+            var_sync.add_var('TF_CLI_ARGS', '-no-color', hcl=False, sensitive=False, category="env")
 
             # 連携先Terraformに代入値管理に登録されている値があれば、Variableを設定する
-            ret = prepare_variables(objdbca, restApiCaller, instance_data, tf_manage_workspace_id)
+            ret = prepare_variables(objdbca, var_sync, instance_data)
             if not ret:
                 msg = "[API Error]" + g.appmsg.get_api_message("MSG-82017", [])
                 raise AppException(msg)
+
+            # [RESTAPI]登録済みVariableとの差分のみ、登録/更新/削除するRESTAPIを実行する
+            g.applogger.info(g.appmsg.get_log_message("BKY-51010", [execution_no]))
+            failed_list = var_sync.sync(respons_contents_data)
+            if len(failed_list) > 0:
+                # failed_listは優先順(削除 > env変数 > terraform変数)に並んでいる
+                failed = failed_list[0]
+                if failed['action'] == WorkspaceVarSync.ACTION_DELETE:
+                    msg_id = "MSG-82015"
+                elif failed['category'] == "env":
+                    msg_id = "MSG-82016"
+                else:
+                    msg_id = "MSG-82017"
+                g.applogger.info(g.appmsg.get_log_message(msg_id, []))
+                msg = "[API Error]" + g.appmsg.get_api_message(msg_id, [])
+                raise AppException(msg)
+            g.applogger.info(g.appmsg.get_log_message("BKY-51041", []))
         # -----[END]実行種別が「作業実行」「Plan確認」の場合のみ実施-----
 
         # Policy関連の処理スタート
@@ -547,14 +543,14 @@ def execute_terraform_run(objdbca, instance_data, destroy_flag=False):  # noqa:
         return False
 
 
-def prepare_variables(objdbca, restApiCaller, instance_data, tf_manage_workspace_id):  # noqa: C901
+def prepare_variables(objdbca, var_sync, instance_data):  # noqa: C901
     """
-        代入値管理に登録された変数を、連携先TerraformのWorkspaceのVariablesに登録する。
+        代入値管理に登録された変数を、連携先TerraformのWorkspaceのVariablesに登録する対象として追加する。
+        (RESTAPIの実行はWorkspaceVarSync.sync()で差分のみ行う)
         ARGS:
             objdbca: DB接クラス DBConnectWs()
+            var_sync: Variable同期クラス WorkspaceVarSync()
             instancce_data: 作業実行データ
-            restApiCaller: RESTAPIコールクラス
-            tf_manage_workspace_id: Terraformで管理するWorkspaceのID
         RETRUN:
             boolean
 
@@ -829,13 +825,9 @@ def prepare_variables(objdbca, restApiCaller, instance_data, tf_manage_workspace
                         var_value = encode_hcl(trg_member_vars_arr)
                         hclFlag = True
 
-                # [RESTAPI]連携先Terraformにvariablesを設定する
+                # 連携先Terraformに設定するvariablesとして追加
                 g.applogger.info(g.appmsg.get_log_message("BKY-51012", [execution_no, var_key]))
-                response_array = create_tf_workspace_var(restApiCaller, tf_manage_workspace_id, var_key, var_value, hclFlag, sensitiveFlag, category="terraform")  # noqa: F405, E501
-                response_status_code = response_array.get('statusCode')
-                if not response_status_code == 201:
-                    return False
-                g.applogger.info(g.appmsg.get_log_message("BKY-51041", []))
+                var_sync.add_var(var_key, var_value, hclFlag, sensitiveFlag, category="terraform")
 
     except Exception:
         t = traceback.format_exc()